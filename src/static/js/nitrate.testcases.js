@@ -248,10 +248,9 @@ Nitrate.TestCases.Details.on_load = function () {
   });
 
   jQ('.plan_expandable').on('click', function () {
+    let detailRow = jQ(this).parents('tr:first').next();
     new PlanCaseRunsExpansion(this).toggle(function () {
-      jQ('#table_case_runs_by_plan .expandable').on('click', function () {
-        new SimpleCaseRunDetailExpansion(this).toggle();
-      });
+      bindCaseRunsByPlanPane(detailRow);
     });
   });
 
@@ -522,6 +521,29 @@ function addCaseIssueViaEnterKey(element, e) {
   }
 }
 
+/**
+ * Bind event handlers to the case runs of a plan, which are loaded into the container. Clicking a
+ * page link loads that page of case runs into the same container.
+ *
+ * @param {jQuery} container - the container containing case runs of a plan.
+ */
+function bindCaseRunsByPlanPane(container) {
+  container.find('#table_case_runs_by_plan .expandable').on('click', function () {
+    new SimpleCaseRunDetailExpansion(this).toggle();
+  });
+  container.find('.js-case-runs-page').on('click', function () {
+    let pagination = jQ(this).parents('.case_runs_pagination:first');
+    sendHTMLRequest({
+      url: '/case/' + pagination.data('caseId') + '/caserun-list-pane/',
+      data: {plan_id: pagination.data('planId'), page: jQ(this).data('page')},
+      container: container[0],
+      callbackAfterFillIn: function () {
+        bindCaseRunsByPlanPane(container);
+      },
+    });
+  });
+}
+
 /**
  * Toggle case runs by plan
  *
@@ -789,12 +789,15 @@ Nitrate.TestRuns.Details.on_load = function () {
 
   bindEnvPropertyHandlers();
 
-  jQ('.js-caserun-total, .js-status-subtotal').on('click', function () {
+  // The statistics could be refreshed, hence the handler is bound to the container.
+  jQ('#run-statistics').on('click', '.js-caserun-total, .js-status-subtotal', function () {
     let form = document.forms['filterCaseRunsForm'];
     form.case_run_status__name.value = this.dataset.statusName;
     form.submit();
   });
 
+  watchRunProgress();
+
   jQ('.js-change-order').on('click', function (e) {
     const existingSortKey = parseInt(this.dataset.sortKey);
     Nitrate.Utils.changeOrderSortKey(
@@ -943,6 +946,63 @@ Nitrate.TestRuns.AssignCase.on_load = function () {
   jQ('.js-toggle-button, .js-case-summary').on('click', caseDetailExpansionHandler);
 };
 
+/**
+ * The event source receiving the run progress pushed from server, or null if it is not enabled.
+ *
+ * @type {EventSource|null}
+ */
+let runProgressSource = null;
+
+/**
+ * Watch the run progress pushed from server by Server-Sent Events and show it in the statistics
+ * section. It is enabled if the section has the URL of the stream in data-progress-stream-url.
+ */
+function watchRunProgress() {
+  let container = document.getElementById('run-statistics');
+  if (container === null || !container.dataset.progressStreamUrl || !window.EventSource) {
+    return;
+  }
+  runProgressSource = new EventSource(container.dataset.progressStreamUrl);
+  runProgressSource.addEventListener('progress', function (event) {
+    showRunProgress(JSON.parse(event.data));
+  });
+}
+
+/**
+ * Show the run progress in the statistics section.
+ *
+ * @param {object} progress - the run progress pushed from server.
+ * @param {object} progress.statuses - mapping from status name to the number of case runs.
+ * @param {number} progress.total - the number of case runs.
+ * @param {number} progress.complete_percent - the percent of complete case runs.
+ * @param {number} progress.failure_percent_in_complete - the percent of failures in complete case
+ *                                                        runs.
+ * @param {number} progress.issues_count - the number of issues.
+ */
+function showRunProgress(progress) {
+  let statistics = jQ('#run-statistics');
+  statistics.find('#complete_percent').text(Math.round(progress.complete_percent));
+  statistics.find('.progress-inner').css('width', Math.round(progress.complete_percent) + '%');
+  statistics.find('.progress-failed')
+    .css('width', Math.round(progress.failure_percent_in_complete) + '%');
+
+  for (let statusName in progress.statuses) {
+    let count = progress.statuses[statusName];
+    let link = jQ('<a>').text(count);
+    if (count !== 0) {
+      link.prop('href', 'javascript:void(0)')
+        .addClass('js-status-subtotal')
+        .attr('data-status-name', statusName);
+    }
+    statistics.find('#' + statusName).empty().append('[', link, ']');
+  }
+  statistics.find('.js-caserun-total').text(progress.total);
+
+  showTheNumberOfCaseRunIssues(
+    progress.issues_count, document.getElementById('value_run_id').value
+  );
+}
+
 /**
  * A function registered to the form submit event, from where to add comment to or change status for
  * a case run.
@@ -974,11 +1034,13 @@ function updateCaseRunStatus(expansion, form) {
         new_value: parseInt(caseRunStatusId),
       },
       success: function () {
-        // Refresh the statistics section
-        sendHTMLRequest({
-          url: '/run/' + document.getElementById('value_run_id').value + '/statistics/',
-          container: document.getElementById('run-statistics')
-        })
+        // Refresh the statistics section unless the progress is pushed from server
+        if (runProgressSource === null) {
+          sendHTMLRequest({
+            url: '/run/' + document.getElementById('value_run_id').value + '/statistics/',
+            container: document.getElementById('run-statistics')
+          });
+        }
 
         // Update the case run status icon
         let crs = Nitrate.TestRuns.CaseRunStatus;
@@ -28,4 +28,7 @@ class AppConfig(DjangoAppConfig):
     verbose_name = _("Core auth")
 
     def ready(self):
+        from tcms.auth.permissions import connect_signals
+
         patch_user_model_clean()
+        connect_signals()
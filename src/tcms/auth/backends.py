@@ -10,11 +10,41 @@ from django.core.validators import validate_email
 
 # from tcms
 from tcms.auth import initiate_user_with_default_setups
+from tcms.auth.permissions import cache_permissions, get_cached_permissions
 
 logger = logging.getLogger(__name__)
 
 
-class EmailBackend(ModelBackend):
+class CachedPermissionsMixin:
+    """Cache user and group permissions in the shared cache
+
+    This works with ModelBackend and its subclasses. Permissions are still
+    cached on the user instance as ModelBackend does, and loaded from the
+    shared cache before querying database.
+    """
+
+    def _get_permissions(self, user_obj, obj, from_name):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+
+        perm_cache_name = f"_{from_name}_perm_cache"
+        if hasattr(user_obj, perm_cache_name):
+            return getattr(user_obj, perm_cache_name)
+
+        perms = get_cached_permissions(user_obj.pk, from_name)
+        if perms is None:
+            perms = super()._get_permissions(user_obj, obj, from_name)
+            cache_permissions(user_obj.pk, from_name, perms)
+        else:
+            setattr(user_obj, perm_cache_name, perms)
+        return perms
+
+
+class CachedModelBackend(CachedPermissionsMixin, ModelBackend):
+    """ModelBackend with permissions cached in the shared cache"""
+
+
+class EmailBackend(CachedPermissionsMixin, ModelBackend):
     # The source code is based on: http://www.djangosnippets.org/snippets/74/
     # All rights reserved by the orignal authors.
     """
@@ -40,7 +70,7 @@ class EmailBackend(ModelBackend):
             return user
 
 
-class BugzillaBackend(ModelBackend):
+class BugzillaBackend(CachedPermissionsMixin, ModelBackend):
     """
     Bugzilla authorization backend for TCMS.
 
@@ -91,7 +121,7 @@ class BugzillaBackend(ModelBackend):
             return user
 
 
-class KerberosBackend(ModelBackend):
+class KerberosBackend(CachedPermissionsMixin, ModelBackend):
     """
     Kerberos authorization backend for TCMS.
 
@@ -132,7 +162,7 @@ class KerberosBackend(ModelBackend):
         return user
 
 
-class ModAuthKerbBackend(RemoteUserBackend):
+class ModAuthKerbBackend(CachedPermissionsMixin, RemoteUserBackend):
     """
     mod_auth_kerb modules authorization backend for TCMS.
     Based on DjangoRemoteUser backend.
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+"""Shared cache of user permissions
+
+Django's ModelBackend caches permissions on the user instance only, which
+lives as long as a single request. This module caches them in the default
+cache, so that permission checks from XML-RPC calls and AJAX requests do not
+repeat the group and permission queries every time.
+
+Cache keys include a version number. Changes to a user's groups, permissions
+or superuser status delete the cached permissions of that user. Changes to
+the permissions of a group or to permissions themselves bump the version, so
+that all cached permissions are dropped at once.
+"""
+
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+PERMISSION_CACHE_VERSION_KEY = "tcms.auth.permissions.version"
+
+# from_name passed to ModelBackend._get_permissions
+PERMISSION_SOURCES = ("user", "group")
+
+
+def get_permission_cache_version() -> int:
+    return cache.get_or_set(PERMISSION_CACHE_VERSION_KEY, 1, timeout=None)
+
+
+def get_permission_cache_key(user_id: int, from_name: str, version: Optional[int] = None) -> str:
+    if version is None:
+        version = get_permission_cache_version()
+    return f"tcms.auth.permissions.{version}.{user_id}.{from_name}"
+
+
+def get_cached_permissions(user_id: int, from_name: str) -> Optional[set[str]]:
+    return cache.get(get_permission_cache_key(user_id, from_name))
+
+
+def cache_permissions(user_id: int, from_name: str, perms: set[str]) -> None:
+    cache.set(
+        get_permission_cache_key(user_id, from_name),
+        perms,
+        timeout=settings.PERMISSION_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_permission_cache(user_id: Optional[int] = None) -> None:
+    """Invalidate cached permissions
+
+    :param user_id: invalidate the cached permissions of this user. If
+        omitted, cached permissions of all users are invalidated.
+    :type user_id: int or None
+    """
+    if user_id is None:
+        try:
+            cache.incr(PERMISSION_CACHE_VERSION_KEY)
+        except ValueError:
+            # The version is not in the cache yet or was evicted.
+            cache.set(PERMISSION_CACHE_VERSION_KEY, 2, timeout=None)
+    else:
+        version = get_permission_cache_version()
+        cache.delete_many(
+            [get_permission_cache_key(user_id, name, version) for name in PERMISSION_SOURCES]
+        )
+
+
+def on_user_relation_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Handle changes to User.groups and User.user_permissions"""
+    if not action.startswith("post_"):
+        return
+    if isinstance(instance, User):
+        invalidate_permission_cache(instance.pk)
+    elif action == "post_clear" or not pk_set:
+        invalidate_permission_cache()
+    else:
+        # Group or permission is changed from reverse side, pk_set contains
+        # the affected users.
+        for user_id in pk_set:
+            invalidate_permission_cache(user_id)
+
+
+def on_group_permissions_changed(sender, action, **kwargs):
+    if action.startswith("post_"):
+        invalidate_permission_cache()
+
+
+def on_user_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields is None or "is_superuser" in update_fields:
+        invalidate_permission_cache(instance.pk)
+
+
+def on_user_deleted(sender, instance, **kwargs):
+    invalidate_permission_cache(instance.pk)
+
+
+def on_group_or_permission_changed(sender, **kwargs):
+    invalidate_permission_cache()
+
+
+def connect_signals() -> None:
+    m2m_changed.connect(on_user_relation_changed, sender=User.groups.through)
+    m2m_changed.connect(on_user_relation_changed, sender=User.user_permissions.through)
+    m2m_changed.connect(on_group_permissions_changed, sender=Group.permissions.through)
+    post_save.connect(on_user_saved, sender=User)
+    post_delete.connect(on_user_deleted, sender=User)
+    post_delete.connect(on_group_or_permission_changed, sender=Group)
+    post_save.connect(on_group_or_permission_changed, sender=Permission)
+    post_delete.connect(on_group_or_permission_changed, sender=Permission)
@@ -45,6 +45,7 @@ from tcms.testcases.models import TestCase, TestCaseCategory, TestCaseStatus
 from tcms.testcases.views import get_selected_testcases
 from tcms.testplans.models import TestCasePlan, TestPlan
 from tcms.testruns import signals as run_watchers
+from tcms.testruns.completion import mark_runs_dirty
 from tcms.testruns.models import TestCaseRun, TestCaseRunStatus, TestRun
 
 # Arguments: instances, kwargs
@@ -235,16 +236,7 @@ def _generate_tags_response(request: HttpRequest, objs: QuerySet, template: str)
         # plans, cases and runs are not necessary. But, they are needed by the
         # tags table for a single plan or case.
         if not isinstance(single_obj, TestRun):
-            tags = tags.extra(
-                select={
-                    "num_plans": "SELECT COUNT(*) FROM test_plan_tags "
-                    "WHERE test_tags.tag_id = test_plan_tags.tag_id",
-                    "num_cases": "SELECT COUNT(*) FROM test_case_tags "
-                    "WHERE test_tags.tag_id = test_case_tags.tag_id",
-                    "num_runs": "SELECT COUNT(*) FROM test_run_tags "
-                    "WHERE test_tags.tag_id = test_run_tags.tag_id",
-                }
-            )
+            tags = TestTag.subtotal().attach(tags.all())
         else:
             tags = tags.all()
         return render(request, template, context={"tags": tags, "object": single_obj})
@@ -478,7 +470,7 @@ class PatchTestCaseRunStatusForm(PatchTestCaseRunBaseForm):
         super().__init__(*args, **kwargs)
         f = self.fields["case_run"]
         f.queryset = TestCaseRun.objects.select_related("case_run_status", "tested_by").only(
-            "close_date", "tested_by__username", "case_run_status__name"
+            "run", "close_date", "tested_by__username", "case_run_status__name"
         )
         f = self.fields["new_value"]
         new_status = self.data.get("new_value")
@@ -563,6 +555,7 @@ class PatchTestCaseRunsView(ModelPatchBaseView):
             if tested_by_changed:
                 changed_fields.append("tested_by")
             TestCaseRun.objects.bulk_update(changed, changed_fields)
+            mark_runs_dirty({case_run.run_id for case_run in changed})
             self._record_log_actions(log_actions_info)
 
 
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from django.apps import AppConfig as DjangoAppConfig
+from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 
 
@@ -8,3 +9,22 @@ class AppConfig(DjangoAppConfig):
     label = "tcms_core"
     name = "tcms.core"
     verbose_name = _("Core App")
+
+    def ready(self):
+        if settings.XMLRPC_CONDITIONAL_RESPONSE or settings.COUNT_CACHE_TIMEOUT:
+            from django.db.backends.signals import connection_created
+
+            from tcms.core.data_versions import install_data_version_tracker
+
+            connection_created.connect(install_data_version_tracker)
+            install_data_version_tracker()
+        if settings.DB_CONNECTION_STATS:
+            from django.db.backends.signals import connection_created
+
+            from tcms.core.db_connections import on_connection_created
+
+            connection_created.connect(on_connection_created)
+        if settings.FRAGMENT_CACHE_TIMEOUT:
+            from tcms.core.fragment_cache import connect_signals
+
+            connect_signals()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+"""Track data versions of apps
+
+A data version is a number kept in the default cache for each app, which
+changes whenever data of the app's models is changed. It allows to know
+whether data might be changed without querying the data itself, for example
+to answer a conditional request.
+
+Changes are detected by wrapping the SQL execution of database connections,
+so that changes made by ``QuerySet.update``, bulk operations and raw SQL are
+all caught besides changes made by saving models. The version is changed once
+the transaction is committed.
+
+Note that, the default cache must be shared by all processes serving Nitrate,
+otherwise a process could not know the changes made by others.
+"""
+
+import re
+import time
+from typing import Optional
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connections, transaction
+
+__all__ = (
+    "get_data_versions",
+    "bump_data_version",
+    "install_data_version_tracker",
+)
+
+DATA_VERSION_KEY = "tcms.data_version.{}"
+
+# Match the table changed by an INSERT, UPDATE or DELETE statement.
+re_write_statement = re.compile(
+    r"^\s*(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+[`\"]?(\w+)", re.IGNORECASE
+)
+
+_table_app_labels: Optional[dict[str, str]] = None
+
+
+def _initial_version() -> int:
+    # Never reuse a version seen before, even if the version is evicted from
+    # cache.
+    return time.time_ns()
+
+
+def get_data_versions(app_labels: list[str]) -> dict[str, int]:
+    """Get data versions of apps
+
+    :param app_labels: list of app labels.
+    :return: mapping from app label to the data version.
+    :rtype: dict[str, int]
+    """
+    keys = {DATA_VERSION_KEY.format(label): label for label in app_labels}
+    versions = cache.get_many(keys.keys())
+    missing = {key: _initial_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def bump_data_version(app_label: str) -> None:
+    key = DATA_VERSION_KEY.format(app_label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), timeout=None)
+
+
+def get_table_app_label(table_name: str) -> Optional[str]:
+    global _table_app_labels
+    if _table_app_labels is None:
+        _table_app_labels = {
+            model._meta.db_table: model._meta.app_label
+            for model in apps.get_models(include_auto_created=True)
+        }
+    return _table_app_labels.get(table_name)
+
+
+class DataVersionBump:
+    """Callback to bump data version of an app on commit"""
+
+    def __init__(self, app_label: str):
+        self.app_label = app_label
+
+    def __call__(self):
+        bump_data_version(self.app_label)
+
+
+def track_data_version(execute, sql, params, many, context):
+    result = execute(sql, params, many, context)
+
+    match = re_write_statement.match(sql) if isinstance(sql, str) else None
+    if match is None:
+        return result
+    app_label = get_table_app_label(match.group(1))
+    if app_label is None:
+        return result
+
+    connection = context["connection"]
+    if not connection.in_atomic_block:
+        bump_data_version(app_label)
+        return result
+    # Bump once per transaction.
+    for _, func, *_ in connection.run_on_commit:
+        if isinstance(func, DataVersionBump) and func.app_label == app_label:
+            break
+    else:
+        transaction.on_commit(DataVersionBump(app_label), using=connection.alias)
+    return result
+
+
+def install_data_version_tracker(sender=None, connection=None, **kwargs):
+    """Install the tracker to a database connection
+
+    This is a handler of signal ``connection_created``. If connection is not
+    specified, the tracker is installed to all connections.
+    """
+    targets = [connection] if connection is not None else connections.all()
+    for conn in targets:
+        if track_data_version not in conn.execute_wrappers:
+            conn.execute_wrappers.append(track_data_version)
@@ -1,14 +1,37 @@
 # -*- coding: utf-8 -*-
 
-from collections.abc import Iterator
+import hashlib
+import json
+import re
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+from collections.abc import Iterator, Sequence
 from typing import Any, Callable, Iterable, Optional, Union
 
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import Count, IntegerField, Model, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+
+from tcms.core.data_versions import get_data_versions, get_table_app_label
 from tcms.core.tcms_router import connection
 
 __all__ = (
     "SQLExecution",
+    "cached_count",
+    "compute_sortkeys",
+    "estimate_count",
     "get_groupby_result",
+    "reorder_sortkeys",
+    "update_sortkeys",
+    "GroupByMatrix",
     "GroupByResult",
+    "Subtotal",
+    "SubtotalCounter",
     "workaround_single_value_for_in_clause",
 )
 
@@ -43,6 +66,19 @@ class SQLExecution:
     :param bool with_field_name: whether the generated rows are mappings from
         field name to value, otherwise a row is just a simple tuple returned
         from underlying DBAPI ``fetchone``.
+    :param bool stream: whether to stream the rows from database server. In
+        stream mode, a server-side cursor is used if the database backend
+        supports it, and rows are fetched in batches by ``fetchmany``, so that
+        a large result set is never loaded into memory at once. With MySQL,
+        the rows must be consumed before issuing another query. The cursor is
+        closed once all rows are fetched. If the rows may not be consumed
+        completely, use the object as a context manager or call ``close``
+        explicitly, so that the server-side cursor is released.
+    :param int batch_size: number of rows fetched per ``fetchmany`` call in
+        stream mode.
+    :param bool named_row: whether the generated rows are named tuples, whose
+        values can be accessed by field name as attributes as well as by
+        index. This takes precedence over ``with_field_name``.
     """
 
     def __init__(
@@ -50,40 +86,93 @@ class SQLExecution:
         sql: str,
         params: Optional[Union[list[Any], tuple[Any]]] = None,
         with_field_name: bool = True,
+        stream: bool = False,
+        batch_size: int = 1000,
+        named_row: bool = False,
     ):
         """Initialize and execute SQL query"""
-        self.cursor = connection.reader_cursor
+        if stream:
+            self.cursor = connection.streaming_reader_cursor
+        else:
+            self.cursor = connection.reader_cursor
         if params is None:
             self.cursor.execute(sql)
         else:
             self.cursor.execute(sql, params)
-        self.field_names = [field[0] for field in self.cursor.description]
-
-        self._with_field_name = with_field_name
-        if with_field_name:
+        # A server-side cursor could have no description until the first
+        # fetch. Field names are set again once rows are fetched.
+        self.field_names = self._get_field_names()
+
+        self._stream = stream
+        self._batch_size = batch_size
+        self._with_field_name = with_field_name and not named_row
+        if named_row:
+            self.rows = self._named_rows
+        elif with_field_name:
             self.rows = self._rows_with_field_name
         else:
             self.rows = self._raw_rows
 
+    def _get_field_names(self) -> list[str]:
+        if self.cursor.description is None:
+            return []
+        return [field[0] for field in self.cursor.description]
+
+    def _fetch_rows(self) -> Iterator[tuple]:
+        if not self._stream:
+            while 1:
+                row = self.cursor.fetchone()
+                if row is None:
+                    break
+                yield row
+            return
+
+        try:
+            while 1:
+                rows = self.cursor.fetchmany(self._batch_size)
+                if not rows:
+                    break
+                if not self.field_names:
+                    self.field_names = self._get_field_names()
+                yield from rows
+        finally:
+            # Release the server-side cursor as soon as possible.
+            self.cursor.close()
+
     @property
     def _rows_with_field_name(self):
-        while 1:
-            row = self.cursor.fetchone()
-            if row is None:
-                break
+        for row in self._fetch_rows():
             yield dict(zip(self.field_names, row))
 
     @property
     def _raw_rows(self):
-        while 1:
-            row = self.cursor.fetchone()
-            if row is None:
-                break
-            yield row
+        return self._fetch_rows()
+
+    @property
+    def _named_rows(self):
+        row_class = None
+        for row in self._fetch_rows():
+            if row_class is None:
+                row_class = namedtuple("Row", self.field_names, rename=True)
+            yield row_class._make(row)
+
+    def close(self) -> None:
+        """Close the underlying cursor"""
+        self.cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     @property
     def scalar(self):
-        row = next(self.rows)
+        try:
+            row = next(self.rows)
+        finally:
+            # Other rows, if any, are not fetched anymore.
+            self.close()
         if self._with_field_name:
             for _, value in row.items():
                 return value
@@ -277,6 +366,163 @@ class GroupByResult:
         return count
 
 
+class GroupByMatrix:
+    """Multiple levels GROUP BY result backed by arrays
+
+    This is the replacement of nested ``GroupByResult`` for building report
+    data from rows of a ``GROUP BY`` query with multiple fields. Each level
+    stores keys in a list with a mapping from key to the index. The deepest
+    level stores subtotals in an integer array, and other levels store the
+    nested levels in a list. Totals are calculated once when they are
+    accessed at the first time, rather than on every insertion.
+
+    It supports the read APIs of ``GroupByResult``, for example ``total``,
+    ``<key>_percent``, ``leaf_values_count`` and ``iteritems``, so that it
+    works with existing report templates.
+
+    Example, rows ``(build_id, status_name, count)`` are fed like::
+
+        matrix = GroupByMatrix.from_rows(rows)
+        matrix[build_id].total
+        matrix[build_id].PASSED_percent
+
+    :param int levels: the number of levels, that is the number of GROUP BY
+        fields.
+    """
+
+    def __init__(self, levels: int = 1):
+        if levels < 1:
+            raise ValueError("GroupByMatrix must have one level at least.")
+        self._levels = levels
+        self._index: dict[Any, int] = {}
+        self._keys: list[Any] = []
+        self._values: Union[array, list[GroupByMatrix]] = array("q") if levels == 1 else []
+        self._total: Optional[int] = None
+        self._leaf_values_count: dict[bool, int] = {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[Any]], levels: Optional[int] = None):
+        """Create a matrix from rows by a single pass
+
+        :param rows: rows of the GROUP BY query. Every row consists of the
+            values of the GROUP BY fields followed by the subtotal.
+        :type rows: iterable[sequence]
+        :param levels: the number of GROUP BY fields. If omitted, it is
+            determined by the first row. An empty matrix with one level is
+            returned if there is no row.
+        :type levels: int or None
+        :return: the matrix.
+        :rtype: GroupByMatrix
+        """
+        matrix = None if levels is None else cls(levels)
+        for row in rows:
+            if matrix is None:
+                matrix = cls(len(row) - 1)
+            matrix.add(row[:-1], row[-1])
+        return cls() if matrix is None else matrix
+
+    def _locate(self, key: Any) -> int:
+        """Get the index of a key and add it if it does not exist yet"""
+        idx = self._index.get(key)
+        if idx is None:
+            idx = self._index[key] = len(self._keys)
+            self._keys.append(key)
+            if self._levels == 1:
+                self._values.append(0)
+            else:
+                self._values.append(GroupByMatrix(self._levels - 1))
+        return idx
+
+    def add(self, keys: Sequence[Any], value: int) -> None:
+        """Add a subtotal to the path of keys
+
+        Subtotals added to the same path are summed.
+
+        :param keys: a key for each level from top to bottom.
+        :type keys: sequence
+        :param int value: the subtotal.
+        """
+        if len(keys) != self._levels:
+            raise ValueError(f"Expect {self._levels} keys, but got {len(keys)}.")
+        node = self
+        for key in keys[:-1]:
+            node._total = None
+            node._leaf_values_count.clear()
+            node = node._values[node._locate(key)]
+        node._total = None
+        node._leaf_values_count.clear()
+        node._values[node._locate(keys[-1])] += value
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __getitem__(self, key):
+        idx = self._index.get(key)
+        if idx is None:
+            raise KeyError(f"Unknown key {key} inside the group by result.")
+        return self._values[idx]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __str__(self):
+        return str(dict(self.iteritems()))
+
+    def __repr__(self):
+        return repr(dict(self.iteritems()))
+
+    def get(self, key, default=None):
+        idx = self._index.get(key)
+        return default if idx is None else self._values[idx]
+
+    def keys(self):
+        return list(self._keys)
+
+    def iteritems(self):
+        return zip(self._keys, self._values)
+
+    @property
+    def empty(self) -> bool:
+        return len(self._keys) == 0
+
+    @property
+    def total(self) -> int:
+        if self._total is None:
+            if self._levels == 1:
+                self._total = sum(self._values)
+            else:
+                self._total = sum(child.total for child in self._values)
+        return self._total
+
+    def __getattr__(self, name: str) -> Union[int, float]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name.endswith("_percent"):
+            key = name[: -len("_percent")]
+            if key in self._index:
+                total = self.total
+                if total == 0:
+                    return 0.0
+                value = self[key]
+                subtotal = value if self._levels == 1 else value.total
+                return round(subtotal * 100.0 / total, 1)
+        return 0
+
+    def leaf_values_count(self, value_in_row: bool = False, refresh: bool = False) -> int:
+        """Calculate the total number of leaf values under this level
+
+        Same as ``GroupByResult.leaf_values_count``. The result is cached until
+        new subtotal is added.
+        """
+        if refresh or value_in_row not in self._leaf_values_count:
+            if self._levels == 1:
+                count = (1 if self._keys else 0) if value_in_row else len(self._keys)
+            else:
+                count = sum(child.leaf_values_count(value_in_row) for child in self._values)
+            self._leaf_values_count[value_in_row] = count
+        return self._leaf_values_count[value_in_row]
+
+
 # TODO: enhance method get_groupby_result to support multiple fields in GROUP
 # BY clause.
 
@@ -290,6 +536,7 @@ def get_groupby_result(
     value_name: Optional[str] = None,
     with_rollup: bool = False,
     rollup_name: Optional[str] = None,
+    stream: bool = False,
 ):
     """Get mapping between GROUP BY field and total count
 
@@ -321,6 +568,8 @@ def get_groupby_result(
         a raw SQL. Default to ``False``.
     :param str rollup_name: name associated with ROLLUP field. Default to
         ``TOTAL``.
+    :param bool stream: whether to stream the rows from database server. Refer
+        to :class:`SQLExecution`.
     :return: mapping between GROUP BY field and the total count.
     :rtype: dict
     """
@@ -341,7 +590,7 @@ def get_groupby_result(
         _rollup_name = "TOTAL" if rollup_name is None else rollup_name
 
     def _rows_generator() -> Iterator:
-        sql_executor = SQLExecution(sql, params)
+        sql_executor = SQLExecution(sql, params, stream=stream)
         for row in sql_executor.rows:
             key, value = row[_key_name], row[_value_name]
             if with_rollup:
@@ -388,3 +637,355 @@ class CaseRunStatusGroupByResult(GroupByResult):
             return self.failure_count * 100.0 / self.total
         else:
             return 0.0
+
+
+class SubtotalCounter:
+    """Count rows of a model which refer to objects by a foreign key
+
+    For example, the number of cases of each plan is defined as
+    ``SubtotalCounter("testcases.TestCasePlan", "plan")``.
+
+    :param model: the model whose rows are counted. It could be the model class
+        or a label in format ``app_label.ModelName``, which is useful when the
+        model cannot be imported because of circular import.
+    :type model: str or type[Model]
+    :param str group_by: name of the foreign key field referring to the objects.
+    """
+
+    def __init__(self, model: Union[str, type[Model]], group_by: str):
+        self._model = model
+        self.group_by = group_by
+
+    @property
+    def model(self) -> type[Model]:
+        if isinstance(self._model, str):
+            self._model = apps.get_model(self._model)
+        return self._model
+
+    def count(self, object_ids: Iterable[int]) -> dict[int, int]:
+        """Count with one GROUP BY query for the given objects
+
+        :param object_ids: the object ids.
+        :type object_ids: iterable[int]
+        :return: mapping from object id to the count. Objects which have no
+            related rows are not included.
+        :rtype: dict[int, int]
+        """
+        qs = (
+            self.model.objects.filter(**{f"{self.group_by}__in": list(object_ids)})
+            .order_by()
+            .values(self.group_by)
+            .annotate(count=Count("pk"))
+            .values_list(self.group_by, "count")
+        )
+        return dict(qs)
+
+    def as_subquery(self) -> Coalesce:
+        """Express this counter as a correlated subquery for annotation
+
+        This is only necessary when the objects have to be ordered by the count.
+        """
+        subquery = (
+            self.model.objects.filter(**{self.group_by: OuterRef("pk")})
+            .order_by()
+            .values(self.group_by)
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return Coalesce(Subquery(subquery, output_field=IntegerField()), 0)
+
+
+class Subtotal:
+    """A set of named counters computed for a page of objects
+
+    Rather than a correlated subquery evaluated for each row of a result, each
+    counter is computed by one ``GROUP BY`` query against the ids of the objects
+    of a page and the count is set to each object as an attribute named by the
+    counter name.
+
+    Example::
+
+        subtotal = Subtotal(runs_count=SubtotalCounter("testruns.TestRun", "plan"))
+        plans = subtotal.attach(TestPlan.objects.all()[:20])
+        plans[0].runs_count
+
+    :param counters: mapping from attribute name to the counter.
+    """
+
+    def __init__(self, **counters: SubtotalCounter):
+        self.counters = counters
+
+    def annotate(self, queryset: QuerySet, names: Optional[Iterable[str]] = None) -> QuerySet:
+        """Annotate counters to a queryset as correlated subqueries
+
+        This is only necessary when the queryset has to be ordered by counters.
+        Use :meth:`attach` to get counters of objects to display.
+
+        :param queryset: the queryset to annotate.
+        :type queryset: QuerySet
+        :param names: names of the counters to annotate, which could be the field
+            names passed to ``order_by`` directly. Names which are not a counter
+            are ignored. If omitted, all counters are annotated.
+        :type names: iterable[str]
+        :return: the annotated queryset.
+        :rtype: QuerySet
+        """
+        annotations = {}
+        for name in self.counters if names is None else names:
+            name = name.lstrip("-")
+            if name in self.counters and name not in queryset.query.annotations:
+                annotations[name] = self.counters[name].as_subquery()
+        return queryset.annotate(**annotations) if annotations else queryset
+
+    def attach(self, objects: Iterable[Model]) -> list[Model]:
+        """Compute the counters and set them to each object
+
+        :param objects: the objects to set counters. If a queryset is passed,
+            counters already annotated to it are not computed again.
+        :type objects: iterable[Model]
+        :return: list of the objects.
+        :rtype: list[Model]
+        """
+        annotated = objects.query.annotations if isinstance(objects, QuerySet) else {}
+        objects = list(objects)
+        object_ids = [obj.pk for obj in objects]
+        for name, counter in self.counters.items():
+            if name in annotated:
+                continue
+            subtotal = counter.count(object_ids) if object_ids else {}
+            for obj in objects:
+                setattr(obj, name, subtotal.get(obj.pk, 0))
+        return objects
+
+
+COUNT_CACHE_KEY = "tcms.count.{}"
+
+re_identifier = re.compile(r"\w+")
+
+
+def estimate_count(queryset: QuerySet) -> Optional[int]:
+    """Get the number of rows of a queryset estimated by the query planner
+
+    This is only supported by PostgreSQL. The estimate could be far from the
+    exact number, so it is only used to avoid counting a large result.
+
+    :param queryset: the queryset to estimate.
+    :type queryset: QuerySet
+    :return: the estimated number of rows, or None if the database does not
+        support it.
+    :rtype: int or None
+    """
+    conn = connections[queryset.db]
+    if conn.vendor != "postgresql":
+        return None
+    try:
+        sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+    except EmptyResultSet:
+        return 0
+    with conn.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def cached_count(queryset: QuerySet) -> int:
+    """Count a queryset and cache the count until data of the apps it reads is changed
+
+    The count is cached in the default cache with a key made from the SQL
+    query and the data versions of the apps whose tables appear in the query,
+    hence paging through a search result does not count again. Refer to
+    :mod:`tcms.core.data_versions`.
+
+    Caching is enabled by setting ``COUNT_CACHE_TIMEOUT``. If
+    ``COUNT_ESTIMATE_THRESHOLD`` is set and the database supports it, the
+    number of rows estimated by the query planner is returned instead when
+    it is not less than the threshold.
+
+    :param queryset: the queryset to count.
+    :type queryset: QuerySet
+    :return: the number of rows.
+    :rtype: int
+    """
+    threshold = settings.COUNT_ESTIMATE_THRESHOLD
+    if threshold > 0:
+        estimated = estimate_count(queryset)
+        if estimated is not None and estimated >= threshold:
+            return estimated
+
+    timeout = settings.COUNT_CACHE_TIMEOUT
+    if not timeout:
+        return queryset.count()
+
+    if not queryset.query.distinct_fields:
+        # Ordering does not change the count. Same as what QuerySet.count does.
+        queryset = queryset.order_by()
+    try:
+        sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+    except EmptyResultSet:
+        return 0
+
+    app_labels = sorted(
+        {
+            label
+            for label in map(get_table_app_label, re_identifier.findall(sql))
+            if label is not None
+        }
+    )
+    versions = get_data_versions(app_labels)
+    criteria = f"{queryset.db}:{sql}:{params!r}:{sorted(versions.items())!r}"
+    key = COUNT_CACHE_KEY.format(hashlib.md5(criteria.encode()).hexdigest())  # nosec
+
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout=timeout)
+    return count
+
+
+SORTKEY_STEP = 10
+SORTKEY_BATCH_SIZE = 500
+
+
+def _longest_increasing_positions(keys: Sequence[Optional[int]]) -> list[int]:
+    """Find positions of the longest strictly increasing subsequence of keys
+
+    None is never part of the subsequence.
+    """
+    # tails[i] is the position of the smallest tail of increasing subsequences
+    # of length i + 1.
+    tails: list[int] = []
+    tail_keys: list[int] = []
+    prev: list[Optional[int]] = [None] * len(keys)
+    for pos, key in enumerate(keys):
+        if key is None:
+            continue
+        i = bisect_left(tail_keys, key)
+        if i == len(tails):
+            tails.append(pos)
+            tail_keys.append(key)
+        else:
+            tails[i] = pos
+            tail_keys[i] = key
+        prev[pos] = tails[i - 1] if i > 0 else None
+
+    positions = []
+    pos = tails[-1] if tails else None
+    while pos is not None:
+        positions.append(pos)
+        pos = prev[pos]
+    positions.reverse()
+    return positions
+
+
+def compute_sortkeys(sortkeys: Sequence[Optional[int]], step: int = SORTKEY_STEP) -> list[int]:
+    """Compute sort keys for items in a new order
+
+    Sort keys have gaps between each other. Items which keep the order
+    relative to each other keep their sort keys, and only the moved items get
+    new sort keys fitting in the gaps. For example, moving the last item to
+    the beginning::
+
+        >>> compute_sortkeys([30, 10, 20])
+        [5, 10, 20]
+
+    When a gap is not large enough, all items are numbered again by the step.
+
+    :param sortkeys: the current sort keys of items in the new order. A sort
+        key could be None.
+    :type sortkeys: list[int or None]
+    :param int step: the step between sort keys of items numbered newly.
+    :return: the new sort keys of the items.
+    :rtype: list[int]
+    """
+    new_sortkeys: list[int] = list(sortkeys)  # type: ignore
+    anchors = [-1] + _longest_increasing_positions(sortkeys) + [len(sortkeys)]
+    for low_pos, high_pos in zip(anchors, anchors[1:]):
+        moved = high_pos - low_pos - 1
+        if moved == 0:
+            continue
+        low = new_sortkeys[low_pos] if low_pos >= 0 else 0
+        if high_pos == len(sortkeys):
+            gap = step
+        else:
+            gap = (new_sortkeys[high_pos] - low) // (moved + 1)
+            if gap < 1:
+                return [(pos + 1) * step for pos in range(len(sortkeys))]
+        for n in range(1, moved + 1):
+            new_sortkeys[low_pos + n] = low + n * gap
+    return new_sortkeys
+
+
+def reorder_sortkeys(
+    queryset: QuerySet,
+    ordered_keys: Sequence[Any],
+    key_field: str = "pk",
+    sortkey_field: str = "sortkey",
+    step: int = SORTKEY_STEP,
+) -> int:
+    """Reorder rows with gap based sort keys
+
+    The current sort keys are read by one query and only the changed sort keys
+    are written by :func:`update_sortkeys`. Refer to :func:`compute_sortkeys`.
+
+    Example::
+
+        reorder_sortkeys(TestCasePlan.objects.filter(plan=plan), case_ids, key_field="case")
+
+    :param queryset: the rows to reorder.
+    :type queryset: QuerySet
+    :param ordered_keys: values of ``key_field`` in the new order. A value
+        which is not in the queryset is ignored.
+    :param str key_field: name of the field to identify rows by
+        ``ordered_keys``. Defaults to the primary key.
+    :param str sortkey_field: name of the sort key field.
+    :param int step: the step between sort keys of rows numbered newly.
+    :return: the number of rows whose sort key is changed.
+    :rtype: int
+    """
+    if key_field == "pk":
+        key_field = queryset.model._meta.pk.name
+    rows = {
+        key: (pk, sortkey)
+        for pk, key, sortkey in queryset.filter(**{f"{key_field}__in": ordered_keys})
+        .order_by()
+        .values_list("pk", key_field, sortkey_field)
+    }
+    ordered_rows = []
+    for key in dict.fromkeys(ordered_keys):
+        if key in rows:
+            ordered_rows.append(rows[key])
+
+    new_sortkeys = compute_sortkeys([sortkey for _, sortkey in ordered_rows], step)
+    return update_sortkeys(
+        queryset.model,
+        {
+            pk: new_sortkey
+            for (pk, sortkey), new_sortkey in zip(ordered_rows, new_sortkeys)
+            if sortkey != new_sortkey
+        },
+        sortkey_field=sortkey_field,
+    )
+
+
+def update_sortkeys(
+    model: type[Model], sortkeys: dict[Any, int], sortkey_field: str = "sortkey"
+) -> int:
+    """Write sort keys of rows
+
+    Sort keys are written by one ``UPDATE ... CASE WHEN`` statement per batch
+    of ``SORTKEY_BATCH_SIZE`` rows.
+
+    :param model: the model class.
+    :type model: type[Model]
+    :param sortkeys: mapping from primary key to the new sort key.
+    :type sortkeys: dict[int, int]
+    :param str sortkey_field: name of the sort key field.
+    :return: the number of rows written.
+    :rtype: int
+    """
+    if not sortkeys:
+        return 0
+    objs = [model(pk=pk, **{sortkey_field: sortkey}) for pk, sortkey in sortkeys.items()]
+    return model.objects.bulk_update(objs, [sortkey_field], batch_size=SORTKEY_BATCH_SIZE)
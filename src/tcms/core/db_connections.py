@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""Manage database connections out of requests
+
+Django reuses a connection for ``CONN_MAX_AGE`` seconds and checks whether it
+is still usable when ``CONN_HEALTH_CHECKS`` is set, but only around requests.
+Tasks run in threads by :class:`tcms.core.task.Task` call
+:func:`prepare_connections` before and :func:`release_connections` after
+each task to apply the same rules, so that a connection is reused by the
+next task run in the same thread, and closed once it is obsolete or broken.
+
+When ``DB_CONNECTION_STATS`` is set, the numbers of connections opened, and
+reused and closed by tasks are counted in the default cache for each
+database alias, which could be shown by command ``dbconnectionstats``.
+"""
+
+from collections.abc import Iterable
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+__all__ = (
+    "CONNECTION_EVENTS",
+    "get_connection_stats",
+    "prepare_connections",
+    "record_connection_event",
+    "release_connections",
+)
+
+CONNECTION_STATS_KEY = "tcms.db_connection_stats.{}.{}"
+
+#: Names of the counted events of connections.
+CONNECTION_EVENTS = ("opened", "reused", "closed")
+
+
+def record_connection_event(alias: str, event: str) -> None:
+    """Count an event of connections of a database
+
+    Nothing is counted if ``DB_CONNECTION_STATS`` is not set.
+
+    :param str alias: the database alias.
+    :param str event: one of :data:`CONNECTION_EVENTS`.
+    """
+    if not settings.DB_CONNECTION_STATS:
+        return
+    key = CONNECTION_STATS_KEY.format(alias, event)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def on_connection_created(sender, connection, **kwargs):
+    record_connection_event(connection.alias, "opened")
+
+
+def get_connection_stats(aliases: Optional[Iterable[str]] = None) -> dict[str, dict[str, int]]:
+    """Get the numbers of events of connections
+
+    :param aliases: the database aliases. Defaults to all databases.
+    :type aliases: iterable[str] or None
+    :return: mapping from database alias to a mapping from event name to the
+        number.
+    :rtype: dict[str, dict]
+    """
+    aliases = list(settings.DATABASES if aliases is None else aliases)
+    keys = {
+        CONNECTION_STATS_KEY.format(alias, event): (alias, event)
+        for alias in aliases
+        for event in CONNECTION_EVENTS
+    }
+    counts = cache.get_many(keys.keys())
+    stats = {alias: dict.fromkeys(CONNECTION_EVENTS, 0) for alias in aliases}
+    for key, count in counts.items():
+        alias, event = keys[key]
+        stats[alias][event] = count
+    return stats
+
+
+def release_connections() -> None:
+    """Close connections of current thread if they are obsolete or unusable
+
+    It does what Django does at the end of each request. A connection is kept
+    to be reused if ``CONN_MAX_AGE`` is not expired and it is usable.
+    """
+    for conn in connections.all(initialized_only=True):
+        if conn.connection is None:
+            continue
+        conn.close_if_unusable_or_obsolete()
+        if conn.connection is None:
+            record_connection_event(conn.alias, "closed")
+
+
+def prepare_connections() -> None:
+    """Prepare connections of current thread to run a task
+
+    Connections left by the previous task run in the same thread are released
+    by :func:`release_connections`, and the others are counted as reused.
+    """
+    release_connections()
+    for conn in connections.all(initialized_only=True):
+        if conn.connection is not None:
+            record_connection_event(conn.alias, "reused")
@@ -1,25 +1,35 @@
 # -*- coding: utf-8 -*-
+import gzip
 import hashlib
 import logging
-import os
-import time
-import urllib.parse
+import re
+from collections.abc import Iterator
 from http import HTTPStatus
+from typing import BinaryIO, Optional
 
 from django.conf import settings
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.core.files.uploadedfile import UploadedFile
-from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_vary_headers
 from django.utils.decorators import method_decorator
-from django.utils.encoding import smart_str
+from django.utils.http import content_disposition_header, quote_etag
 from django.views import generic
 from django.views.decorators.csrf import csrf_protect
 from django.views.decorators.http import require_GET, require_POST
 
+from tcms.core.storage import find_attachment_storage, get_attachment_storage
 from tcms.core.views import prompt
-from tcms.management.models import TestAttachment, TestAttachmentData
+from tcms.management.models import TestAttachment
 from tcms.testcases.models import TestCase, TestCaseAttachment
 from tcms.testplans.models import TestPlan, TestPlanAttachment
 
@@ -79,10 +89,6 @@ class UploadFileView(PermissionRequiredMixin, generic.View):
         except UnicodeEncodeError:
             return prompt.alert(request, "Upload File name is not legal.")
 
-        # Create the upload directory when it's not exist
-        if not os.path.exists(settings.FILE_UPLOAD_DIR):
-            os.mkdir(settings.FILE_UPLOAD_DIR)
-
         checksum = calculate_checksum(upload_file)
         attachment = TestAttachment.objects.filter(checksum=checksum).first()
 
@@ -96,20 +102,14 @@ class UploadFileView(PermissionRequiredMixin, generic.View):
                     f"been uploaded previously.",
                 )
 
-        stored_name = "{}-{}-{}".format(request.user.username, time.time(), uploaded_filename)
         attachment = TestAttachment(
             submitter_id=request.user.id,
             description=request.POST.get("description", None),
             file_name=uploaded_filename,
-            stored_name=stored_name,
             mime_type=upload_file.content_type,
             checksum=checksum,
         )
-
-        with open(attachment.stored_filename, "wb+") as f:
-            for chunk in upload_file.chunks():
-                f.write(chunk)
-
+        get_attachment_storage().save(attachment, upload_file)
         attachment.save()
 
         rel_kwargs["attachment"] = attachment
@@ -117,41 +117,146 @@ class UploadFileView(PermissionRequiredMixin, generic.View):
         return HttpResponseRedirect(redirect_url)
 
 
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range_header(range_header: str, size: int) -> Optional[tuple[int, int]]:
+    """Parse the value of request header Range
+
+    Only single byte range is supported.
+
+    :param str range_header: the value of header Range.
+    :param int size: size of the whole content.
+    :return: a tuple of the first and the last byte positions. None is
+        returned if the range is not a single byte range, that means the
+        whole content should be sent.
+    :rtype: tuple[int, int] or None
+    :raises ValueError: if the range is not satisfiable.
+    """
+    match = RANGE_RE.match(range_header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # A suffix range, e.g. bytes=-500 means the last 500 bytes.
+        suffix_length = int(last)
+        if suffix_length == 0 or size == 0:
+            raise ValueError(f"Range {range_header} is not satisfiable.")
+        return max(size - suffix_length, 0), size - 1
+    first = int(first)
+    last = size - 1 if not last else min(int(last), size - 1)
+    if first > last:
+        raise ValueError(f"Range {range_header} is not satisfiable.")
+    return first, last
+
+
+def iter_file(
+    f: BinaryIO, offset: int = 0, length: Optional[int] = None, block_size: int = 65536
+) -> Iterator[bytes]:
+    """Read file content chunk by chunk and close it finally"""
+    try:
+        if offset:
+            f.seek(offset)
+        while length is None or length > 0:
+            data = f.read(block_size if length is None else min(block_size, length))
+            if not data:
+                break
+            if length is not None:
+                length -= len(data)
+            yield data
+    finally:
+        f.close()
+
+
+def iter_decompressed_file(f: BinaryIO, block_size: int = 65536) -> Iterator[bytes]:
+    """Decompress gzip file content chunk by chunk and close the file finally
+
+    :class:`gzip.GzipFile` does not close the file object passed to it, hence
+    the file is closed here.
+    """
+    try:
+        yield from iter_file(gzip.GzipFile(fileobj=f, mode="rb"), block_size=block_size)
+    finally:
+        f.close()
+
+
 @require_GET
 def check_file(request, file_id):
-    """Download attachment file"""
-    attachment = get_object_or_404(TestAttachment, pk=file_id)
-
-    attachment_data = TestAttachmentData.objects.filter(attachment__attachment_id=file_id).first()
+    """Download attachment file
 
-    # First try to read file content from database.
-    if attachment_data:
-        # File content is not written into TestAttachmentData in upload_file,
-        # this code path is dead now. Think about if file content should be
-        # written into database in the future.
-        contents = attachment_data.contents
+    Content is streamed chunk by chunk. The checksum is used as the ETag to
+    support conditional GET, and a single byte range can be requested by
+    header Range. Content compressed in storage is sent as is if client
+    accepts gzip encoding, otherwise it is decompressed on the fly.
+    """
+    attachment = get_object_or_404(TestAttachment, pk=file_id)
+    storage = find_attachment_storage(attachment)
+
+    if not storage.exists(attachment):
+        raise Http404(f"Attachment file {attachment.file_name} does not exist.")
+
+    compressed = storage.is_compressed(attachment)
+    send_compressed = compressed and "gzip" in request.headers.get("Accept-Encoding", "")
+    etag = quote_etag(f"{attachment.checksum}-gzip" if send_compressed else attachment.checksum)
+
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        return response
+
+    try:
+        f = storage.open(attachment)
+        f.seek(0, 2)
+        size = f.tell()
+        f.seek(0)
+    except IOError:
+        msg = "Cannot read attachment file from server."
+        log.exception(msg)
+        return prompt.alert(request, msg)
+
+    content_type = str(attachment.mime_type)
+    content_disposition = content_disposition_header(True, attachment.file_name)
+
+    if compressed and not send_compressed:
+        response = StreamingHttpResponse(iter_decompressed_file(f), content_type=content_type)
+        response["Content-Disposition"] = content_disposition
     else:
-        # File was not written into database, read it from configured file
-        # system.
-        stored_file_name = os.path.join(
-            settings.FILE_UPLOAD_DIR,
-            urllib.parse.unquote(attachment.stored_name or attachment.file_name),
-        ).replace("\\", "/")
+        byte_range = None
+        range_header = request.headers.get("Range")
+        if_range = request.headers.get("If-Range")
+        if range_header and not compressed and (not if_range or if_range == etag):
+            try:
+                byte_range = parse_range_header(range_header, size)
+            except ValueError:
+                f.close()
+                response = HttpResponse(status=HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                response["Content-Range"] = f"bytes */{size}"
+                return response
+
+        if byte_range is None:
+            response = FileResponse(
+                f, as_attachment=True, filename=attachment.file_name, content_type=content_type
+            )
+        else:
+            first, last = byte_range
+            response = StreamingHttpResponse(
+                iter_file(f, offset=first, length=last - first + 1),
+                status=HTTPStatus.PARTIAL_CONTENT,
+                content_type=content_type,
+            )
+            response["Content-Length"] = str(last - first + 1)
+            response["Content-Range"] = f"bytes {first}-{last}/{size}"
+            response["Content-Disposition"] = content_disposition
 
-        if not os.path.exists(stored_file_name):
-            raise Http404(f"Attachment file {stored_file_name} does not exist.")
+        if send_compressed:
+            response["Content-Encoding"] = "gzip"
+        else:
+            response["Accept-Ranges"] = "bytes"
 
-        try:
-            with open(stored_file_name, "rb") as f:
-                contents = f.read()
-        except IOError:
-            msg = "Cannot read attachment file from server."
-            log.exception(msg)
-            return prompt.alert(request, msg)
-
-    response = HttpResponse(contents, content_type=str(attachment.mime_type))
-    file_name = smart_str(attachment.file_name)
-    response["Content-Disposition"] = f'attachment; filename="{file_name}"'
+    if compressed:
+        patch_vary_headers(response, ("Accept-Encoding",))
+    response["ETag"] = etag
     return response
 
 
@@ -214,8 +319,9 @@ def delete_file(request):
 
         attachment = rel.attachment
         msg = f"Attachment {attachment.file_name} is removed from plan {plan_id} successfully."
+        storage = find_attachment_storage(attachment)
         attachment.delete()
-        os.unlink(attachment.stored_filename)
+        storage.delete(attachment)
 
         return JsonResponse({"message": msg})
 
@@ -234,8 +340,9 @@ def delete_file(request):
 
         attachment = rel.attachment
         msg = f"Attachment {attachment.file_name} is removed from case {case_id} successfully."
+        storage = find_attachment_storage(attachment)
         attachment.delete()
-        os.unlink(attachment.stored_filename)
+        storage.delete(attachment)
 
         return JsonResponse({"message": msg})
 
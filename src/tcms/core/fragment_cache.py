@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+"""Cache template fragments of plan, case and run pages
+
+A fragment is cached by template tag ``fragment_cache`` from library
+``fragment_tags``, whose key is made of the fragment name, the versions of the
+objects the fragment renders and other values the fragment varies on::
+
+    {% load fragment_tags %}
+    {% fragment_cache "run.tags" test_run perms.testruns.delete_testruntag %}
+      ...
+    {% endfragment_cache %}
+
+An object version is a number kept in the default cache for each object,
+which is changed once the transaction is committed whenever the object or its
+related objects listed in :data:`VERSIONED_RELATIONS` are saved or deleted.
+A cached fragment is never invalidated explicitly, it is just not used any
+more once the version changes, and expires after ``FRAGMENT_CACHE_TIMEOUT``.
+
+The numbers of hits and misses of each fragment are counted in the default
+cache as well, which could be shown by command ``fragmentcachestats``.
+
+Note that, the default cache must be shared by all processes serving Nitrate,
+otherwise a process could not know the changes made by others.
+"""
+
+import hashlib
+import time
+from collections.abc import Callable, Iterable
+from typing import Any, Optional
+
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+
+__all__ = (
+    "FRAGMENTS",
+    "get_object_versions",
+    "bump_object_version",
+    "make_fragment_key",
+    "record_fragment_access",
+    "get_fragment_cache_stats",
+    "connect_signals",
+)
+
+OBJECT_VERSION_KEY = "tcms.object_version.{}.{}"
+FRAGMENT_KEY = "tcms.fragment.{}.{}"
+FRAGMENT_STATS_KEY = "tcms.fragment_stats.{}.{}"
+
+#: Names of the cached fragments.
+FRAGMENTS = (
+    "plan.document",
+    "case.text",
+    "run.tags",
+)
+
+#: Models whose changes change the version of a related object, in the form
+#: of model label to a function returning the label and primary key of that
+#: object from an instance.
+VERSIONED_RELATIONS: dict[str, Callable[[models.Model], tuple[str, Any]]] = {
+    "testplans.testplan": lambda obj: ("testplans.testplan", obj.pk),
+    "testplans.testplantext": lambda obj: ("testplans.testplan", obj.plan_id),
+    "testplans.testplantag": lambda obj: ("testplans.testplan", obj.plan_id),
+    "testcases.testcase": lambda obj: ("testcases.testcase", obj.pk),
+    "testcases.testcasetext": lambda obj: ("testcases.testcase", obj.case_id),
+    "testcases.testcasetag": lambda obj: ("testcases.testcase", obj.case_id),
+    "testruns.testrun": lambda obj: ("testruns.testrun", obj.pk),
+    "testruns.testruntag": lambda obj: ("testruns.testrun", obj.run_id),
+}
+
+
+def _initial_version() -> int:
+    # Never reuse a version seen before, even if the version is evicted from
+    # cache.
+    return time.time_ns()
+
+
+def _object_version_key(obj: models.Model) -> str:
+    return OBJECT_VERSION_KEY.format(obj._meta.label_lower, obj.pk)
+
+
+def get_object_versions(objs: Iterable[models.Model]) -> list[int]:
+    """Get versions of objects
+
+    :param objs: model instances.
+    :type objs: iterable[Model]
+    :return: list of versions in the same order as the objects.
+    :rtype: list[int]
+    """
+    keys = [_object_version_key(obj) for obj in objs]
+    versions = cache.get_many(keys)
+    missing = {key: _initial_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_object_version(label: str, pk: Any) -> None:
+    """Change version of an object
+
+    :param str label: the lowercased model label, e.g. ``testruns.testrun``.
+    :param pk: the object's primary key.
+    """
+    key = OBJECT_VERSION_KEY.format(label, pk)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), timeout=None)
+
+
+class ObjectVersionBump:
+    """Callback to bump version of an object on commit"""
+
+    def __init__(self, label: str, pk: Any):
+        self.label = label
+        self.pk = pk
+
+    def __call__(self):
+        bump_object_version(self.label, self.pk)
+
+
+def make_fragment_key(name: str, vary_on: Iterable[Any]) -> str:
+    """Make the cache key of a fragment
+
+    :param str name: the fragment name.
+    :param vary_on: values the fragment varies on. A model instance is
+        represented by its label, primary key and version.
+    :return: the cache key.
+    :rtype: str
+    """
+    vary_on = list(vary_on)
+    instances = [value for value in vary_on if isinstance(value, models.Model)]
+    versions = iter(get_object_versions(instances))
+    parts = [
+        f"{value._meta.label_lower}:{value.pk}:{next(versions)}"
+        if isinstance(value, models.Model)
+        else str(value)
+        for value in vary_on
+    ]
+    digest = hashlib.md5("|".join(parts).encode()).hexdigest()  # nosec
+    return FRAGMENT_KEY.format(name, digest)
+
+
+def record_fragment_access(name: str, hit: bool) -> None:
+    """Count a hit or miss of a fragment"""
+    key = FRAGMENT_STATS_KEY.format(name, "hits" if hit else "misses")
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_fragment_cache_stats(
+    names: Optional[Iterable[str]] = None,
+) -> dict[str, dict[str, float]]:
+    """Get the numbers of hits and misses of fragments
+
+    :param names: the fragment names. Defaults to :data:`FRAGMENTS`.
+    :type names: iterable[str] or None
+    :return: mapping from fragment name to a mapping with keys ``hits``,
+        ``misses`` and ``hit_rate``.
+    :rtype: dict[str, dict]
+    """
+    names = list(FRAGMENTS if names is None else names)
+    keys = {
+        FRAGMENT_STATS_KEY.format(name, kind): (name, kind)
+        for name in names
+        for kind in ("hits", "misses")
+    }
+    counts = cache.get_many(keys.keys())
+    stats = {name: {"hits": 0, "misses": 0} for name in names}
+    for key, count in counts.items():
+        name, kind = keys[key]
+        stats[name][kind] = count
+    for item in stats.values():
+        total = item["hits"] + item["misses"]
+        item["hit_rate"] = item["hits"] / total if total else 0.0
+    return stats
+
+
+def on_versioned_object_changed(sender, instance, using=None, **kwargs):
+    get_related = VERSIONED_RELATIONS.get(sender._meta.label_lower)
+    if get_related is None:
+        return
+    label, pk = get_related(instance)
+    if pk is None:
+        return
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        bump_object_version(label, pk)
+        return
+    # Bump once per transaction.
+    for _, func, *_ in connection.run_on_commit:
+        if isinstance(func, ObjectVersionBump) and (func.label, func.pk) == (label, pk):
+            return
+    transaction.on_commit(ObjectVersionBump(label, pk), using=using)
+
+
+def connect_signals() -> None:
+    from django.apps import apps
+
+    for label in VERSIONED_RELATIONS:
+        model = apps.get_model(label)
+        post_save.connect(on_versioned_object_changed, sender=model)
+        post_delete.connect(on_versioned_object_changed, sender=model)
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tcms.testruns.archive import ARCHIVE_BATCH_SIZE, archive_case_runs, is_archive_enabled
+
+
+class Command(BaseCommand):
+    help = (
+        "Move case runs of runs stopped more than CASE_RUN_ARCHIVE_AGE days ago "
+        "into the archive table. It could be stopped at any time and run again "
+        "to continue."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ARCHIVE_BATCH_SIZE,
+            help="The number of case runs moved in one transaction. Defaults to %(default)s.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Stop after moving this number of batches. Defaults to move all.",
+        )
+
+    def handle(self, *args, **options):
+        if not is_archive_enabled():
+            raise CommandError("Archival is disabled. Set CASE_RUN_ARCHIVE_AGE to enable it.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive number.")
+        stopped_before = datetime.now() - timedelta(days=settings.CASE_RUN_ARCHIVE_AGE)
+        count = archive_case_runs(
+            stopped_before,
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+        )
+        self.stdout.write(f"Archived {count} case runs of runs stopped before {stopped_before}.")
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tcms.core.db_connections import get_connection_stats
+
+
+class Command(BaseCommand):
+    help = "Show the numbers of database connections opened, and reused and closed by tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "aliases",
+            nargs="*",
+            choices=list(settings.DATABASES),
+            metavar="alias",
+            help="Database aliases. Defaults to all databases.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DB_CONNECTION_STATS:
+            self.stderr.write("DB_CONNECTION_STATS is not set, nothing is counted.")
+        stats = get_connection_stats(options["aliases"] or None)
+        self.stdout.write(f"{'Database':<20} {'Opened':>10} {'Reused':>10} {'Closed':>10}")
+        for alias, item in stats.items():
+            self.stdout.write(
+                f"{alias:<20} {item['opened']:>10} {item['reused']:>10} {item['closed']:>10}"
+            )
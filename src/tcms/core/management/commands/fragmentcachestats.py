@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+from django.core.management.base import BaseCommand
+
+from tcms.core.fragment_cache import FRAGMENTS, get_fragment_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show hits and misses of cached template fragments."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "names",
+            nargs="*",
+            choices=FRAGMENTS,
+            metavar="name",
+            help="Fragment names. Defaults to all fragments.",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_fragment_cache_stats(options["names"] or None)
+        self.stdout.write(f"{'Fragment':<20} {'Hits':>10} {'Misses':>10} {'Hit rate':>10}")
+        for name, item in stats.items():
+            self.stdout.write(
+                f"{name:<20} {item['hits']:>10} {item['misses']:>10} {item['hit_rate']:>10.1%}"
+            )
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+import sys
+from typing import NamedTuple
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_MODULES = ["tcms.urls"]
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str, package: str = "tcms") -> list[ImportTime]:
+    """Parse the output of python -X importtime
+
+    :param str output: the output written to stderr.
+    :param str package: only return modules inside this package.
+    :return: list of import times of modules.
+    """
+    result: dict[str, ImportTime] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        module = parts[2].strip()
+        if module != package and not module.startswith(f"{package}."):
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            # The header line
+            continue
+        # A module is reported twice if its parent package is imported
+        # during importing it.
+        if module in result:
+            prev = result[module]
+            self_us += prev.self_us
+            cumulative_us = max(cumulative_us, prev.cumulative_us)
+        result[module] = ImportTime(module, self_us, cumulative_us)
+    return list(result.values())
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the slowest imports of modules in the tcms package. Django is set up "
+        "in a new Python process with -X importtime and then the given modules are "
+        "imported."
+    )
+    # Checks import the URL configuration, which is what to profile.
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "modules",
+            nargs="*",
+            metavar="MODULE",
+            help=f"Modules to import after Django is set up. Defaults to {DEFAULT_MODULES}.",
+        )
+        parser.add_argument(
+            "-n",
+            "--limit",
+            type=int,
+            default=20,
+            help="Number of the slowest imports to report. Defaults to 20.",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=["self", "cumulative"],
+            default="cumulative",
+            help="Sort by the time spent in module itself or including the "
+            "imports it triggers. Defaults to cumulative.",
+        )
+
+    def handle(self, *args, **options):
+        modules = options["modules"] or DEFAULT_MODULES
+        code = "; ".join(
+            ["import django", "django.setup()"] + [f"import {name}" for name in modules]
+        )
+        env = os.environ.copy()
+        env.pop("PYTHONIMPORTTIME", None)
+        # Import the same tcms and settings as the current process.
+        env["PYTHONPATH"] = os.pathsep.join(path for path in sys.path if path)
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            error = [
+                line for line in proc.stderr.splitlines() if not line.startswith("import time:")
+            ]
+            raise CommandError(f"Failed to import modules: {''.join(error[-1:])}")
+
+        import_times = parse_importtime(proc.stderr)
+        sort_key = "self_us" if options["sort"] == "self" else "cumulative_us"
+        import_times.sort(key=lambda item: getattr(item, sort_key), reverse=True)
+
+        self.stdout.write(f"{'self [ms]':>10} {'cumulative [ms]':>16}  module")
+        for item in import_times[: options["limit"]]:
+            self.stdout.write(
+                f"{item.self_us / 1000:>10.1f} {item.cumulative_us / 1000:>16.1f}  {item.module}"
+            )
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tcms.core.retention import (
+    PURGE_BATCH_SIZE,
+    RETENTION_POLICIES,
+    get_expired_records,
+    get_retention_days,
+    purge_expired_records,
+)
+
+
+class Command(BaseCommand):
+    help = "Delete logs and removed comments older than the days set in RETENTION_DAYS."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "labels",
+            nargs="*",
+            choices=list(RETENTION_POLICIES),
+            metavar="label",
+            help="Labels of models to purge. Defaults to all of "
+            f"{', '.join(RETENTION_POLICIES)}.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=PURGE_BATCH_SIZE,
+            help="The number of rows deleted in one transaction. Defaults to %(default)s.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to sleep between batches.",
+        )
+        parser.add_argument(
+            "--archive",
+            metavar="FILE",
+            help="Append the rows to this file in JSON Lines format before deleting them.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only show the number of rows to delete.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive number.")
+        archive = None
+        if options["archive"] and not options["dry_run"]:
+            archive = open(options["archive"], "a", encoding="utf-8")
+        try:
+            for label in options["labels"] or RETENTION_POLICIES:
+                self.purge(label, archive, options)
+        finally:
+            if archive is not None:
+                archive.close()
+
+    def purge(self, label, archive, options):
+        days = get_retention_days(label)
+        if not days:
+            self.stdout.write(f"{label}: kept forever.")
+            return
+        expired_before = datetime.now() - timedelta(days=days)
+        if options["dry_run"]:
+            count = get_expired_records(label, expired_before).count()
+            self.stdout.write(f"{label}: {count} rows created before {expired_before} to delete.")
+            return
+        count = purge_expired_records(
+            label,
+            expired_before,
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+            archive=archive,
+            progress=lambda deleted: self.stdout.write(f"{label}: {deleted} rows deleted..."),
+        )
+        self.stdout.write(f"{label}: {count} rows created before {expired_before} deleted.")
@@ -9,7 +9,6 @@ from django.db import models
 from .base import TCMSContentTypeBaseModel  # noqa
 
 from tcms.logs.views import TCMSLog
-from tcms.testruns import signals as run_watchers  # noqa
 from tcms.xmlrpc.serializer import XMLRPCSerializer
 
 from .base import UrlMixin
@@ -34,12 +33,15 @@ class TCMSActionModel(models.Model, UrlMixin):
         s = XMLRPCSerializer(queryset=cls.objects.filter(**query).order_by("pk"))
         return s.serialize_queryset()
 
-    def serialize(self):
+    def serialize(self, fields=None):
         """
         Convert the model for XMLPRC
+
+        Arguments:
+        - fields: names of fields to be serialized. All by default.
         """
         s = XMLRPCSerializer(model=self)
-        return s.serialize_model()
+        return s.serialize_model(fields=fields)
 
     def log(self):
         log = TCMSLog(model=self)
@@ -4,19 +4,6 @@ class RawSQL:
     Record the Raw SQL for operate the database directly.
     """
 
-    # Following SQL use for count case and run in plan
-    num_cases = (
-        "SELECT COUNT(*) FROM test_case_plans WHERE test_case_plans.plan_id = test_plans.plan_id"
-    )
-
-    num_runs = "SELECT COUNT(*) FROM test_runs WHERE test_runs.plan_id = test_plans.plan_id"
-
-    num_child_plans = (
-        "SELECT COUNT(*) "
-        "FROM test_plans AS ch_plans "
-        "WHERE ch_plans.parent_id = test_plans.plan_id"
-    )
-
     num_case_issues = (
         "SELECT COUNT(*) FROM issue_tracker_issues "
         "WHERE issue_tracker_issues.case_id = test_cases.case_id"
@@ -48,10 +35,6 @@ FROM
 WHERE table1.run_id = table2.run_id AND table1.run_id = test_runs.run_id
 """
 
-    total_num_caseruns = (
-        "SELECT COUNT(*) FROM test_case_runs WHERE test_case_runs.run_id = test_runs.run_id"
-    )
-
     failed_case_run_percent = """\
 SELECT ROUND(no_idle_count / total_count * 100, 0)
 FROM
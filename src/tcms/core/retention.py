@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+"""Purge old rows of logs and removed comments
+
+Tables of field change logs, XML-RPC call logs and comments grow without
+bound. ``RETENTION_DAYS`` sets the days to keep the rows of each model listed
+in :data:`RETENTION_POLICIES`, and command ``purgeoldrecords`` deletes the
+older rows.
+
+Rows are deleted in small batches in the order of primary key, and each batch
+is a separate short transaction deleting rows by primary key, so that the
+tables are never locked for long and other requests could go on between
+batches. An optional pause between batches throttles the load further.
+Before deleting, rows could be written into a file in JSON Lines format.
+"""
+
+import logging
+import time
+from collections import namedtuple
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import IO, Any, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.core import serializers
+from django.db import transaction
+from django.db.models import QuerySet
+
+__all__ = (
+    "RETENTION_POLICIES",
+    "RetentionPolicy",
+    "get_expired_records",
+    "purge_expired_records",
+)
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = 500
+
+#: How rows of a model expire.
+#:
+#: * ``date_field``: name of the field of the time a row is created.
+#: * ``filters``: extra conditions a row must match to be purged.
+RetentionPolicy = namedtuple("RetentionPolicy", "date_field, filters")
+
+#: Models whose old rows could be purged, in the form of model label to policy.
+RETENTION_POLICIES: dict[str, RetentionPolicy] = {
+    "logs.TCMSLogModel": RetentionPolicy("date", {}),
+    "xmlrpc.XmlRpcLog": RetentionPolicy("dt_inserted", {}),
+    # Comments deleted from pages are just flagged as removed.
+    "django_comments.Comment": RetentionPolicy("submit_date", {"is_removed": True}),
+}
+
+
+def get_retention_days(label: str) -> int:
+    """Get days to keep rows of a model from ``RETENTION_DAYS``
+
+    :param str label: the model label.
+    :return: the days, or 0 if rows are kept forever.
+    :rtype: int
+    """
+    return settings.RETENTION_DAYS.get(label) or 0
+
+
+def get_expired_records(label: str, expired_before: datetime) -> QuerySet:
+    """Get rows of a model which could be purged
+
+    Only rows whose primary key is less than that of the first row created
+    since ``expired_before`` are included, so that the rows are found by
+    walking the primary key index from the beginning rather than scanning the
+    whole table.
+
+    :param str label: the model label in :data:`RETENTION_POLICIES`.
+    :param expired_before: rows created before this time expire.
+    :type expired_before: datetime
+    :return: a queryset of the expired rows ordered by primary key.
+    :rtype: QuerySet
+    """
+    policy = RETENTION_POLICIES[label]
+    model = apps.get_model(label)
+    expired = model.objects.filter(
+        **{f"{policy.date_field}__lt": expired_before}, **policy.filters
+    ).order_by("pk")
+    first_kept_pk = (
+        model.objects.filter(**{f"{policy.date_field}__gte": expired_before})
+        .order_by("pk")
+        .values_list("pk", flat=True)
+        .first()
+    )
+    if first_kept_pk is not None:
+        expired = expired.filter(pk__lt=first_kept_pk)
+    return expired
+
+
+def purge_expired_records(
+    label: str,
+    expired_before: Optional[datetime] = None,
+    batch_size: int = PURGE_BATCH_SIZE,
+    pause: float = 0,
+    archive: Optional[IO[str]] = None,
+    progress: Optional[Callable[[int], Any]] = None,
+) -> int:
+    """Delete expired rows of a model in batches
+
+    :param str label: the model label in :data:`RETENTION_POLICIES`.
+    :param expired_before: rows created before this time are deleted.
+        Defaults to the days set in ``RETENTION_DAYS`` ago. If omitted and no
+        days are set for the model, nothing is deleted.
+    :type expired_before: datetime or None
+    :param int batch_size: the number of rows deleted in one transaction.
+    :param float pause: seconds to sleep between batches.
+    :param archive: if set, the rows are written into it in JSON Lines format
+        before they are deleted.
+    :type archive: file-like object or None
+    :param progress: if set, it is called with the number of rows deleted so
+        far after each batch.
+    :type progress: callable or None
+    :return: the number of deleted rows.
+    :rtype: int
+    """
+    if expired_before is None:
+        days = get_retention_days(label)
+        if not days:
+            # Rows are kept forever.
+            return 0
+        expired_before = datetime.now() - timedelta(days=days)
+    expired = get_expired_records(label, expired_before)
+    deleted = 0
+    last_pk = None
+    while True:
+        batch = expired if last_pk is None else expired.filter(pk__gt=last_pk)
+        pks = list(batch.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            break
+        last_pk = pks[-1]
+        with transaction.atomic():
+            rows = expired.model.objects.filter(pk__in=pks)
+            if archive is not None:
+                archive.write(serializers.serialize("jsonl", rows))
+            rows.delete()
+        deleted += len(pks)
+        logger.info("Purged %d rows of %s created before %s", deleted, label, expired_before)
+        if progress is not None:
+            progress(deleted)
+        if pause:
+            time.sleep(pause)
+    return deleted
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+import contextlib
+import enum
+import gzip
+import io
+import os
+import tempfile
+import urllib.parse
+from typing import BinaryIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+
+from tcms.management.models import (
+    TestAttachment,
+    TestAttachmentData,
+    attachment_stored_filename,
+)
+
+# Content of these types is compressed already. Compressing them again is
+# just a waste of CPU.
+INCOMPRESSIBLE_MIME_TYPES = (
+    "image/",
+    "audio/",
+    "video/",
+    "application/gzip",
+    "application/x-gzip",
+    "application/zip",
+    "application/x-bzip2",
+    "application/x-xz",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+)
+
+GZIP_SUFFIX = ".gz"
+
+
+@enum.unique
+class AttachmentStorageType(enum.Enum):
+    """Type names of attachment storage"""
+
+    FILESYSTEM = "FILESYSTEM"
+    DATABASE = "DATABASE"
+
+
+class AttachmentStorage:
+    """Interface of attachment storage backends"""
+
+    def save(self, attachment: TestAttachment, uploaded_file: UploadedFile) -> None:
+        """Store the content of an uploaded file
+
+        Implementation is responsible for setting ``stored_name`` of the
+        attachment if it is required to locate the content later. The
+        attachment is saved by implementation only if the content has to
+        refer to it.
+        """
+        raise NotImplementedError
+
+    def exists(self, attachment: TestAttachment) -> bool:
+        raise NotImplementedError
+
+    def open(self, attachment: TestAttachment) -> BinaryIO:
+        """Open the stored content for reading in binary mode
+
+        If the content is compressed, the returned file object reads the
+        compressed data. Caller is responsible for closing it.
+        """
+        raise NotImplementedError
+
+    def is_compressed(self, attachment: TestAttachment) -> bool:
+        return False
+
+    def delete(self, attachment: TestAttachment) -> None:
+        raise NotImplementedError
+
+
+class FileSystemStorage(AttachmentStorage):
+    """Store attachment in FILE_UPLOAD_DIR by the content checksum
+
+    Files are sharded into subdirectories by the first characters of the
+    checksum, e.g. ``ab/cd/abcd0123...``, so that the same content is stored
+    once and no directory grows too large. Attachments uploaded before are
+    still located by their original stored name.
+    """
+
+    def __init__(self, compress: bool = False):
+        self.compress = compress
+
+    @staticmethod
+    def get_stored_name(checksum: str, compressed: bool = False) -> str:
+        stored_name = f"{checksum[:2]}/{checksum[2:4]}/{checksum}"
+        return stored_name + GZIP_SUFFIX if compressed else stored_name
+
+    def should_compress(self, mime_type: str) -> bool:
+        return self.compress and not (mime_type or "").startswith(INCOMPRESSIBLE_MIME_TYPES)
+
+    def path(self, attachment: TestAttachment) -> str:
+        return attachment_stored_filename(
+            urllib.parse.unquote(attachment.stored_name or attachment.file_name)
+        )
+
+    def save(self, attachment: TestAttachment, uploaded_file: UploadedFile) -> None:
+        compressed = self.should_compress(attachment.mime_type)
+        attachment.stored_name = self.get_stored_name(attachment.checksum, compressed)
+        filename = self.path(attachment)
+        if os.path.exists(filename):
+            # Same content is stored already.
+            return
+
+        dir_name = os.path.dirname(filename)
+        os.makedirs(dir_name, exist_ok=True)
+
+        # Write into a temporary file in the same directory and then rename
+        # it, so that a partial written file is never seen by others.
+        fd, tmp_filename = tempfile.mkstemp(dir=dir_name, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                out = gzip.GzipFile(fileobj=f, mode="wb") if compressed else f
+                with out:
+                    for chunk in uploaded_file.chunks():
+                        out.write(chunk)
+            os.replace(tmp_filename, filename)
+        except Exception:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_filename)
+            raise
+
+    def exists(self, attachment: TestAttachment) -> bool:
+        return os.path.exists(self.path(attachment))
+
+    def open(self, attachment: TestAttachment) -> BinaryIO:
+        return open(self.path(attachment), "rb")
+
+    def is_compressed(self, attachment: TestAttachment) -> bool:
+        return bool(attachment.stored_name) and attachment.stored_name.endswith(GZIP_SUFFIX)
+
+    def delete(self, attachment: TestAttachment) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path(attachment))
+
+
+class DatabaseStorage(AttachmentStorage):
+    """Store attachment content in table test_attachment_data"""
+
+    def save(self, attachment: TestAttachment, uploaded_file: UploadedFile) -> None:
+        if attachment.pk is None:
+            attachment.save()
+        with io.BytesIO() as buf:
+            for chunk in uploaded_file.chunks():
+                buf.write(chunk)
+            TestAttachmentData.objects.create(attachment=attachment, contents=buf.getvalue())
+
+    def exists(self, attachment: TestAttachment) -> bool:
+        return TestAttachmentData.objects.filter(attachment=attachment).exists()
+
+    def open(self, attachment: TestAttachment) -> BinaryIO:
+        contents = (
+            TestAttachmentData.objects.filter(attachment=attachment)
+            .values_list("contents", flat=True)
+            .first()
+        )
+        if contents is None:
+            raise FileNotFoundError(f"Content of attachment {attachment.pk} does not exist.")
+        return io.BytesIO(bytes(contents))
+
+    def delete(self, attachment: TestAttachment) -> None:
+        # Content could be deleted already along with the attachment.
+        TestAttachmentData.objects.filter(attachment_id=attachment.pk).delete()
+
+
+def get_attachment_storage() -> AttachmentStorage:
+    """Get the storage configured by setting ATTACHMENT_STORAGE for new uploads"""
+    storage_type = settings.ATTACHMENT_STORAGE
+    if storage_type == AttachmentStorageType.DATABASE.value:
+        return DatabaseStorage()
+    if storage_type == AttachmentStorageType.FILESYSTEM.value:
+        return FileSystemStorage(compress=settings.ATTACHMENT_COMPRESSION)
+    raise ValueError(f"Unknown attachment storage type {storage_type}")
+
+
+def find_attachment_storage(attachment: TestAttachment) -> AttachmentStorage:
+    """Find out the storage where an existing attachment is stored in
+
+    Content stored in database takes precedence, which is the same as the
+    way attachments were found before.
+    """
+    if TestAttachmentData.objects.filter(attachment=attachment).exists():
+        return DatabaseStorage()
+    return FileSystemStorage()
@@ -3,9 +3,13 @@
 import enum
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 from django.conf import settings
 
+from tcms.core.db_connections import prepare_connections, release_connections
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +26,41 @@ if settings.ASYNC_TASK not in [item.value for item in AsyncTask]:  # pragma: no
     raise ValueError(f"Unknown async task type {settings.ASYNC_TASK}")
 
 
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the pool of threads to run tasks in THREADING mode
+
+    The pool has at most ``ASYNC_TASK_THREADS`` threads, hence the number of
+    database connections opened by tasks is limited as well.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ASYNC_TASK_THREADS, thread_name_prefix="nitrate-task"
+            )
+        return _executor
+
+
+def run_in_thread(target, *args, **kwargs) -> None:
+    """Run a task in a thread of the pool
+
+    Connections left by the previous task in the same thread are reused if
+    they are not obsolete, and connections are released after the task as
+    what Django does around requests.
+    """
+    prepare_connections()
+    try:
+        target(*args, **kwargs)
+    except Exception:
+        logger.exception("Failed to run task %s.", target)
+    finally:
+        release_connections()
+
+
 class Task:
     """Proxy of an asynchronous task"""
 
@@ -41,9 +80,7 @@ class Task:
         if settings.ASYNC_TASK == AsyncTask.DISABLED.value:
             return self.target(*args, **kwargs)
         elif settings.ASYNC_TASK == AsyncTask.THREADING.value:
-            thread = threading.Thread(target=self.target, args=args, kwargs=kwargs)
-            thread.daemon = True
-            thread.start()
+            get_executor().submit(run_in_thread, self.target, *args, **kwargs)
         elif settings.ASYNC_TASK == AsyncTask.CELERY.value:
             return self.target.delay(*args, **kwargs)
         else:
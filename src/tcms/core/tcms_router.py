@@ -38,8 +38,32 @@ class RAWRouter(RWRouter):
     def _get_writer(self):
         return connections[self.db_for_write(None)].cursor()
 
+    def _get_streaming_reader(self):
+        """Get a cursor which does not load the whole result set at once
+
+        PostgreSQL uses a named server-side cursor. MySQL uses an unbuffered
+        cursor, with which the rows must be consumed before issuing another
+        query through the same connection. Other backends use a normal cursor.
+        """
+        conn = connections[self.db_for_read(None)]
+        if conn.vendor == "mysql":
+            from django.db.backends.mysql.base import CursorWrapper
+            from MySQLdb.cursors import SSCursor
+
+            conn.ensure_connection()
+            conn.validate_thread_sharing()
+            with conn.wrap_database_errors:
+                cursor = CursorWrapper(conn.connection.cursor(SSCursor))
+            # Wrapped as what Django does for its own cursors, so that the
+            # queries go through execute wrappers and are logged in debug.
+            if conn.queries_logged:
+                return conn.make_debug_cursor(cursor)
+            return conn.make_cursor(cursor)
+        return conn.chunked_cursor()
+
     reader_cursor = property(fget=_get_reader)
     writer_cursor = property(fget=_get_writer)
+    streaming_reader_cursor = property(fget=_get_streaming_reader)
 
 
 connection = RAWRouter()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+
+from tcms.core.fragment_cache import (
+    FRAGMENTS,
+    make_fragment_key,
+    record_fragment_access,
+)
+
+register = template.Library()
+
+
+class FragmentCacheNode(template.Node):
+    def __init__(self, nodelist, name, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+
+    def render(self, context):
+        timeout = settings.FRAGMENT_CACHE_TIMEOUT
+        if not timeout:
+            return self.nodelist.render(context)
+        key = make_fragment_key(self.name, [var.resolve(context) for var in self.vary_on])
+        value = cache.get(key)
+        record_fragment_access(self.name, value is not None)
+        if value is None:
+            value = self.nodelist.render(context)
+            cache.set(key, value, timeout)
+        return value
+
+
+@register.tag("fragment_cache")
+def do_fragment_cache(parser, token):
+    """Cache the enclosed fragment
+
+    Usage::
+
+        {% fragment_cache "name" [var1 [var2 ...]] %}
+          ...
+        {% endfragment_cache %}
+
+    The name must be one of ``tcms.core.fragment_cache.FRAGMENTS``. The
+    fragment is cached for each combination of the variables. If a variable
+    is a model instance, the fragment is cached for each version of it.
+    """
+    nodelist = parser.parse(("endfragment_cache",))
+    parser.delete_first_token()
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"{bits[0]!r} tag requires at least one argument.")
+    name = bits[1]
+    if name[0] not in "\"'" or name[0] != name[-1] or name[1:-1] not in FRAGMENTS:
+        raise template.TemplateSyntaxError(
+            f"{bits[0]!r} tag requires a quoted fragment name in {', '.join(FRAGMENTS)}."
+        )
+    return FragmentCacheNode(nodelist, name[1:-1], [parser.compile_filter(bit) for bit in bits[2:]])
@@ -9,6 +9,8 @@ from django.apps import apps
 from django.db.models import QuerySet
 from django.http import HttpRequest, QueryDict
 
+from tcms.core.db import Subtotal, cached_count
+
 SECONDS_PER_DAY: int = 24 * 60 * 60
 SECONDS_PER_HOUR: int = 60 * 60
 SECONDS_PER_MINUTE: int = 60
@@ -157,11 +159,20 @@ class DataTableResult:
         queryset: QuerySet,
         column_names: list[str],
         default_order_key: str = "pk",
+        subtotal: Optional[Subtotal] = None,
     ):
+        """Initialize
+
+        :param subtotal: optional subtotal counters which are computed for the
+            objects of the requested page only. A counter is annotated to the
+            queryset only when the result is ordered by it.
+        :type subtotal: Subtotal or None
+        """
         self.queryset = queryset
         self.request_data = request_data
         self.column_names = column_names
         self._default_order_key = default_order_key
+        self._subtotal = subtotal
 
     def _iter_sorting_columns(self):
         number_of_sorting_cols = int(self.request_data.get("iSortingCols", 0))
@@ -186,6 +197,8 @@ class DataTableResult:
             for col_name, direction in sorting_columns
         ]
         if order_fields:
+            if self._subtotal is not None:
+                self.queryset = self._subtotal.annotate(self.queryset, order_fields)
             self.queryset = self.queryset.order_by(*order_fields)
         else:
             # If no order key is specified, sort by pk by default.
@@ -200,11 +213,14 @@ class DataTableResult:
         self.queryset = self.queryset[display_start:display_end]
 
     def get_response_data(self) -> dict[str, Any]:
-        total_records = total_display_records = self.queryset.count()
+        total_records = total_display_records = cached_count(self.queryset)
 
         self._sort_result()
         self._paginate_result()
 
+        if self._subtotal is not None:
+            self.queryset = self._subtotal.attach(self.queryset)
+
         return {
             "sEcho": int(self.request_data.get("sEcho", 0)),
             "iTotalRecords": total_records,
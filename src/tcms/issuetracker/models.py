@@ -2,6 +2,7 @@
 
 import configparser
 import enum
+import functools
 import logging
 import os
 import re
@@ -25,6 +26,16 @@ TOKEN_EXPIRATION_DATE_FORMAT = [
 ]
 
 
+@functools.lru_cache(maxsize=128)
+def compile_issue_key_regex(validate_regex: str) -> re.Pattern:
+    """Compile the regular expression validating issue keys of a tracker
+
+    Compiled expressions are cached by the expression itself, so a changed
+    ``IssueTracker.validate_regex`` takes effect immediately.
+    """
+    return re.compile(validate_regex)
+
+
 def parse_token_expiration_date(value):
     for fmt in TOKEN_EXPIRATION_DATE_FORMAT:
         try:
@@ -681,7 +692,7 @@ class Issue(TCMSActionModel):
         """Validate issue"""
         super().clean()
 
-        issue_key_re = re.compile(self.tracker.validate_regex)
+        issue_key_re = compile_issue_key_regex(self.tracker.validate_regex)
         if not issue_key_re.match(self.issue_key):
             raise ValidationError({"issue_key": f"Issue key {self.issue_key} is in wrong format."})
 
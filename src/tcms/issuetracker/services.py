@@ -4,9 +4,17 @@ import importlib
 import io
 import logging
 import urllib.parse
+from collections.abc import Iterable
 
-from tcms.issuetracker.models import Issue, IssueTracker, ProductIssueTrackerRelationship
-from tcms.issuetracker.task import bugzilla_external_track
+from django.core.exceptions import ValidationError
+
+from tcms.issuetracker.models import (
+    Issue,
+    IssueTracker,
+    ProductIssueTrackerRelationship,
+    compile_issue_key_regex,
+)
+from tcms.issuetracker.task import bugzilla_external_track, bugzilla_external_track_many
 
 log = logging.getLogger(__name__)
 
@@ -78,6 +86,20 @@ class IssueTrackerService:
         """
         log.info("This is default behavior of add_external_tracker which does nothing.")
 
+    def link_external_trackers(self, issues: list[Issue]) -> None:
+        """Add case links to external trackers of issues
+
+        By default, :meth:`link_external_tracker` is called for each issue.
+        Subclass could override this method to link all the issues in one
+        batch, e.g. by one background task.
+
+        :param issues: list of issues whose relative case ID will be added to
+            the issue's external tracker.
+        :type issues: list[:class:`Issue <tcms.issuetracker.models.Issue>`]
+        """
+        for issue in issues:
+            self.link_external_tracker(issue)
+
     def make_issue_report_url(self, case_run):
         """Make issue report URL
 
@@ -143,6 +165,76 @@ class IssueTrackerService:
             self.link_external_tracker(issue)
         return issue
 
+    def add_issues(
+        self,
+        issues: Iterable[Issue],
+        add_case_to_issue: bool = False,
+        skip_existing: bool = False,
+    ) -> list[Issue]:
+        """Add new issues in bulk
+
+        Unlike :meth:`add_issue`, issues are not validated by
+        ``Issue.full_clean``. Issue keys are validated by the tracker's
+        regular expression and existing issues are checked by one query, then
+        all issues are inserted by one ``bulk_create``. Hence, the cases and
+        case runs set to issues must exist.
+
+        :param issues: the unsaved issues to add. Tracker is set to this
+            tracker.
+        :type issues: iterable[:class:`Issue <tcms.issuetracker.models.Issue>`]
+        :param bool add_case_to_issue: whether to link cases to issue tracker's
+            external tracker. Defaults to not link. All issues are linked by
+            :meth:`link_external_trackers` at once.
+        :param bool skip_existing: whether to skip issues which are added to
+            the case already. Defaults to raise ``ValidationError``.
+        :return: the newly created issues.
+        :rtype: list[:class:`Issue <tcms.issuetracker.models.Issue>`]
+        :raises ValidationError: if an issue key is in wrong format, or an
+            issue is added to the case already.
+        """
+        tracker = self.tracker_model
+        issue_key_re = compile_issue_key_regex(tracker.validate_regex)
+        key_length = Issue._meta.get_field("issue_key").max_length
+
+        new_issues: dict[tuple[str, int], Issue] = {}
+        duplicates: list[tuple[str, int]] = []
+        for issue in issues:
+            if len(issue.issue_key) > key_length or not issue_key_re.match(issue.issue_key):
+                raise ValidationError(
+                    {"issue_key": f"Issue key {issue.issue_key} is in wrong format."}
+                )
+            issue.tracker = tracker
+            key = (issue.issue_key, issue.case_id)
+            if key in new_issues:
+                duplicates.append(key)
+            else:
+                new_issues[key] = issue
+        if not new_issues:
+            return []
+
+        # Issue is unique in a case.
+        existing_issues = Issue.objects.filter(
+            tracker=tracker,
+            issue_key__in={issue_key for issue_key, _ in new_issues},
+            case__in={case_id for _, case_id in new_issues},
+        ).values_list("issue_key", "case")
+        duplicates.extend(key for key in existing_issues if key in new_issues)
+
+        if duplicates and not skip_existing:
+            raise ValidationError(
+                [
+                    f"Issue {issue_key} is already added to case {case_id}."
+                    for issue_key, case_id in duplicates
+                ]
+            )
+        for key in duplicates:
+            new_issues.pop(key, None)
+
+        created = Issue.objects.bulk_create(new_issues.values())
+        if created and tracker.allow_add_case_to_issue and add_case_to_issue:
+            self.link_external_trackers(created)
+        return created
+
     def format_issue_report_content(self, build_name, case_text):
         """Format issue report content with a set of information
 
@@ -383,7 +475,15 @@ class RHBugzilla(IssueTrackerService):
             self.tracker_model.api_url,
             self.tracker_model.credential,
             issue.issue_key,
-            issue.case.pk,
+            issue.case_id,
+        )
+
+    def link_external_trackers(self, issues: list[Issue]) -> None:
+        """Link cases to issues' external trackers by one background task"""
+        bugzilla_external_track_many(
+            self.tracker_model.api_url,
+            self.tracker_model.credential,
+            [(issue.issue_key, issue.case_id) for issue in issues],
         )
 
 
@@ -8,14 +8,11 @@ from tcms.core.task import Task
 logger = logging.getLogger(__name__)
 
 
-@Task
-def bugzilla_external_track(
+def _bugzilla_add_external_trackers(
     tracker_api_url: str,
     tracker_credential: dict[str, str],
-    issue_key: str,
-    case_id: int,
-):
-    """Link issue to a bug's external tracker"""
+    issues: list[tuple[str, int]],
+) -> None:
     try:
         import bugzilla
     except ModuleNotFoundError:
@@ -27,12 +24,41 @@ def bugzilla_external_track(
             user=tracker_credential["username"],
             password=tracker_credential["password"],
         )
-        bz.add_external_tracker(
-            int(issue_key),
-            case_id,
-            # Note that, this description should be updated if it is changed in
-            # remote Bugzilla service.
-            ext_type_description="Nitrate Test Case",
-        )
     except Exception as e:
         warnings.warn(f"{e.__class__.__name__}: {e}")
+        return
+    for issue_key, case_id in issues:
+        try:
+            bz.add_external_tracker(
+                int(issue_key),
+                case_id,
+                # Note that, this description should be updated if it is changed in
+                # remote Bugzilla service.
+                ext_type_description="Nitrate Test Case",
+            )
+        except Exception as e:
+            warnings.warn(f"{e.__class__.__name__}: {e}")
+
+
+@Task
+def bugzilla_external_track(
+    tracker_api_url: str,
+    tracker_credential: dict[str, str],
+    issue_key: str,
+    case_id: int,
+):
+    """Link issue to a bug's external tracker"""
+    _bugzilla_add_external_trackers(tracker_api_url, tracker_credential, [(issue_key, case_id)])
+
+
+@Task
+def bugzilla_external_track_many(
+    tracker_api_url: str,
+    tracker_credential: dict[str, str],
+    issues: list[tuple[str, int]],
+):
+    """Link issues to bugs' external trackers with one login to Bugzilla
+
+    :param issues: list of pairs of issue key and case id.
+    """
+    _bugzilla_add_external_trackers(tracker_api_url, tracker_credential, issues)
@@ -7,6 +7,7 @@ from django.conf import settings
 from django.core.cache import cache
 from django.db import models
 
+from tcms.core.db import Subtotal, SubtotalCounter
 from tcms.core.models import TCMSActionModel
 from tcms.core.models.fields import NitrateBooleanField
 from tcms.core.utils import calc_percent
@@ -74,12 +75,12 @@ class Product(TCMSActionModel):
         return self.name
 
     @classmethod
-    def to_xmlrpc(cls, query=None):
+    def to_xmlrpc(cls, query=None, fields=None):
         from tcms.xmlrpc.serializer import ProductXMLRPCSerializer
 
         _query = query or {}
         qs = cls.objects.filter(**_query).order_by("pk")
-        s = ProductXMLRPCSerializer(model_class=cls, queryset=qs)
+        s = ProductXMLRPCSerializer(model_class=cls, queryset=qs, fields=fields)
         return s.serialize_queryset()
 
     def save(self, *args, **kwargs):
@@ -242,12 +243,12 @@ class TestBuild(TCMSActionModel):
         verbose_name_plural = "builds"
 
     @classmethod
-    def to_xmlrpc(cls, query=None):
+    def to_xmlrpc(cls, query=None, fields=None):
         from tcms.xmlrpc.serializer import TestBuildXMLRPCSerializer
 
         _query = query or {}
         qs = cls.objects.filter(**_query).order_by("pk")
-        s = TestBuildXMLRPCSerializer(model_class=cls, queryset=qs)
+        s = TestBuildXMLRPCSerializer(model_class=cls, queryset=qs, fields=fields)
         return s.serialize_queryset()
 
     @classmethod
@@ -398,6 +399,15 @@ class TestTag(TCMSActionModel):
 
         return string_to_list(string)
 
+    @classmethod
+    def subtotal(cls) -> Subtotal:
+        """Get the subtotal of plans, cases and runs each tag is added to"""
+        return Subtotal(
+            num_plans=SubtotalCounter("testplans.TestPlanTag", "tag"),
+            num_cases=SubtotalCounter("testcases.TestCaseTag", "tag"),
+            num_runs=SubtotalCounter("testruns.TestRunTag", "tag"),
+        )
+
     @classmethod
     def get_or_create_many_by_name(cls, names):
         tags = []
@@ -17,15 +17,27 @@ class NewThread(threading.Thread):
 
 
 class PushSignalToPlugins:
+    """Push signals to the plugins listed in setting SIGNAL_PLUGINS
+
+    The plugin modules are imported when a signal is pushed at the first time.
+    """
+
     def __init__(self):
-        self.plugins = []
+        self._plugins = None
+        self._lock = threading.Lock()
+
+    @property
+    def plugins(self):
+        if self._plugins is None:
+            with self._lock:
+                if self._plugins is None:
+                    self._plugins = self.import_plugins()
+        return self._plugins
 
     def import_plugins(self):
         if not hasattr(settings, "SIGNAL_PLUGINS") or not settings.SIGNAL_PLUGINS:
-            return
-
-        for p in settings.SIGNAL_PLUGINS:
-            self.plugins.append(import_module(p))
+            return []
+        return [import_module(p) for p in settings.SIGNAL_PLUGINS]
 
     def push(self, model, instance, signal):
         for p in self.plugins:
@@ -34,4 +46,3 @@ class PushSignalToPlugins:
 
 # Create the PushSignalToPlugins instance
 pstp = PushSignalToPlugins()
-pstp.import_plugins()
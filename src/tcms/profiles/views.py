@@ -67,8 +67,6 @@ def recent(request, username):
         .only("name", "is_active", "type__name", "product__name")
     )
 
-    plans = TestPlan.apply_subtotal(plans, runs_count=True)
-
     runs = (
         TestRun.search({"people": request.user, "is_active": True, "status": "running"})
         .only("summary", "start_date")
@@ -90,7 +88,7 @@ def recent(request, username):
             "test_plans_count": plans_count,
             "test_plans_disable_count": disabled_plans_count,
             "test_runs_count": runs.count(),
-            "last_15_test_plans": plans[:15],
+            "last_15_test_plans": TestPlan.attach_subtotal(plans[:15], runs_count=True),
             "last_15_test_runs": first_15_runs,
         },
     )
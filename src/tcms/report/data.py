@@ -9,6 +9,7 @@ from django.contrib.auth.models import User
 from django.db.models import Count
 
 from tcms.core.db import (
+    GroupByMatrix,
     GroupByResult,
     SQLExecution,
     get_groupby_result,
@@ -18,6 +19,7 @@ from tcms.management.models import Priority, TestBuild, TestTag
 from tcms.report import sqls
 from tcms.testcases.models import TestCase
 from tcms.testplans.models import TestPlan
+from tcms.testruns.archive import get_case_run_models, read_through_archive
 from tcms.testruns.models import TestCaseRun, TestCaseRunStatus, TestRun
 
 __all__ = (
@@ -76,16 +78,15 @@ def subtotal_case_runs(
     filter_: Optional[dict[str, Any]] = None, by: Optional[str] = None
 ) -> GroupByResult:
     group_by = by or "case_run_status"
-    if filter_:
-        qs = TestCaseRun.objects.filter(**filter_)
-    else:
-        qs = TestCaseRun.objects.all()
-    return GroupByResult(
-        (
-            (item[group_by], item["subtotal"])
-            for item in qs.values(group_by).annotate(subtotal=Count("pk"))
-        )
-    )
+    result = GroupByResult()
+    for model in get_case_run_models():
+        if filter_:
+            qs = model.objects.filter(**filter_)
+        else:
+            qs = model.objects.all()
+        for item in qs.values(group_by).annotate(subtotal=Count("pk")):
+            result[item[group_by]] = result.get(item[group_by], 0) + item["subtotal"]
+    return result
 
 
 def subtotal_case_run_status(
@@ -242,7 +243,7 @@ class CustomReportData:
             "joins": "\n".join(_joins),
             "where": " AND ".join(map(str, _where_conditions)),
         }
-        return sql, where_params
+        return read_through_archive(sql), where_params
 
     # especially when filter builds with component.
     def _get_builds(self):
@@ -280,14 +281,8 @@ class CustomReportData:
     def status_matrix(self):
         """Case run status matrix used to render progress bar"""
         sql, params = self._prepare_sql(sqls.custom_builds_case_runs_subtotal_by_status)
-        rows = SQLExecution(sql, params, with_field_name=False).rows
-
-        builds = GroupByResult()
-        for build_id, case_run_status_id, total_count in rows:
-            status_subtotal = builds.setdefault(build_id, GroupByResult())
-            status_subtotal[case_run_status_id] = total_count
-
-        return builds
+        with SQLExecution(sql, params, with_field_name=False, stream=True) as sql_executor:
+            return GroupByMatrix.from_rows(sql_executor.rows, levels=2)
 
 
 class CustomDetailsReportData(CustomReportData):
@@ -313,22 +308,25 @@ class CustomDetailsReportData(CustomReportData):
         return builds.select_related("product").only("product__id", "name")
 
     def generate_status_matrix(self, build_ids):
-        matrix_dataset = {}
-        status_total_line = GroupByResult()
-
-        rows = (
-            TestCaseRun.objects.filter(run__build__in=build_ids)
-            .values("run__plan", "run", "case_run_status")
-            .annotate(subtotal=Count("pk"))
-            .order_by("run__plan", "run", "case_run_status")
-            .values_list("run__plan", "run", "case_run_status", "subtotal")
+        status_matrix = GroupByMatrix(levels=3)
+        status_total_line = GroupByMatrix()
+
+        rows = list(
+            chain.from_iterable(
+                model.objects.filter(run__build__in=build_ids)
+                .values("run__plan", "run", "case_run_status")
+                .annotate(subtotal=Count("pk"))
+                .order_by("run__plan", "run", "case_run_status")
+                .values_list("run__plan", "run", "case_run_status", "subtotal")
+                for model in get_case_run_models()
+            )
         )
 
-        plan_ids = run_ids = case_run_status_ids = []
+        plan_ids, run_ids, case_run_status_ids = set(), set(), set()
         for plan_id, run_id, case_run_status_id, _ in rows:
-            plan_ids.append(plan_id)
-            run_ids.append(run_id)
-            case_run_status_ids.append(case_run_status_id)
+            plan_ids.add(plan_id)
+            run_ids.add(run_id)
+            case_run_status_ids.add(case_run_status_id)
 
         plans = {
             plan.pk: plan for plan in TestPlan.objects.filter(pk__in=plan_ids).only("pk", "name")
@@ -341,20 +339,13 @@ class CustomDetailsReportData(CustomReportData):
             ).values_list("pk", "name")
         }
 
-        for row in rows:
-            plan_id, run_id, case_run_status_id, status_count = row
-
-            plan_node = matrix_dataset.setdefault(plans[plan_id], {})
-            run_node = plan_node.setdefault(runs[run_id], GroupByResult())
-
+        for plan_id, run_id, case_run_status_id, status_count in rows:
             status_name = case_run_status_names[case_run_status_id]
-            run_node[status_name] = status_count
-
+            status_matrix.add((plans[plan_id], runs[run_id], status_name), status_count)
             # calculate the last total line
-            status_total_line[status_name] = (
-                status_total_line.setdefault(status_name, 0) + status_count
-            )
+            status_total_line.add((status_name,), status_count)
 
+        matrix_dataset = {plan: dict(runs.iteritems()) for plan, runs in status_matrix.iteritems()}
         # Add total line to final data set
         matrix_dataset[None] = status_total_line
         return matrix_dataset
@@ -395,7 +386,7 @@ class TestingReportBaseData:
 
     def _prepare_sql(self, form, sql):
         where_clause, params = self._report_criteria(form)
-        return sql.format(where_clause), params
+        return read_through_archive(sql.format(where_clause)), params
 
     # ## Report data generation ###
 
@@ -543,15 +534,8 @@ class TestingReportByCaseRunTesterData(TestingReportBaseData):
 
     def status_matrix(self, form):
         sql, params = self._prepare_sql(form, sqls.by_case_run_tester_status_matrix)
-        sql_executor = SQLExecution(sql, params, with_field_name=False)
-        status_matrix = GroupByResult({})
-        rows = sql_executor.rows
-
-        for tested_by_id, name, total_count in rows:
-            status_subtotal = status_matrix.setdefault(tested_by_id, GroupByResult({}))
-            status_subtotal[name] = total_count
-
-        return status_matrix
+        with SQLExecution(sql, params, with_field_name=False, stream=True) as sql_executor:
+            return GroupByMatrix.from_rows(sql_executor.rows, levels=2)
 
     def runs_subtotal(self, form):
         sql, params = self._prepare_sql(form, sqls.by_case_run_tester_runs_subtotal)
@@ -559,29 +543,13 @@ class TestingReportByCaseRunTesterData(TestingReportBaseData):
 
     def status_matrix_groupby_builds(self, form):
         sql, params = self._prepare_sql(form, sqls.by_case_run_tester_status_matrix_groupby_build)
-        sql_executor = SQLExecution(sql, params, with_field_name=False)
-
-        builds = GroupByResult({})
-
-        for build_id, tested_by_id, name, total_count in sql_executor.rows:
-            tested_by_ids = builds.setdefault(build_id, GroupByResult({}))
-            status_subtotal = tested_by_ids.setdefault(tested_by_id, GroupByResult({}))
-            status_subtotal[name] = total_count
-
-        return builds
+        with SQLExecution(sql, params, with_field_name=False, stream=True) as sql_executor:
+            return GroupByMatrix.from_rows(sql_executor.rows, levels=3)
 
     def runs_subtotal_groupby_builds(self, form):
         sql, params = self._prepare_sql(form, sqls.by_case_run_tester_runs_subtotal_groupby_build)
-        sql_executor = SQLExecution(sql, params, with_field_name=False)
-        rows = sql_executor.rows
-
-        builds = GroupByResult({})
-
-        for build_id, tested_by_id, total_count in rows:
-            tested_by_ids = builds.setdefault(build_id, GroupByResult({}))
-            tested_by_ids[tested_by_id] = total_count
-
-        return builds
+        with SQLExecution(sql, params, with_field_name=False, stream=True) as sql_executor:
+            return GroupByMatrix.from_rows(sql_executor.rows, levels=2)
 
 
 class TestingReportByCasePriorityData(TestingReportBaseData):
@@ -624,18 +592,14 @@ class TestingReportByCasePriorityData(TestingReportBaseData):
 
     def status_matrix(self, form):
         sql, params = self._prepare_sql(form, sqls.by_case_priority_subtotal)
-        sql_executor = SQLExecution(sql, params, with_field_name=False)
-        rows = sql_executor.rows
-
-        builds = GroupByResult()
-
-        for build_id, priority_id, priority_value, name, total_count in rows:
-            priorities = builds.setdefault(build_id, GroupByResult())
-            priority = Priority(pk=priority_id, value=priority_value)
-            status_subtotal = priorities.setdefault(priority, GroupByResult())
-            status_subtotal[name] = total_count
-
-        return builds
+        with SQLExecution(sql, params, with_field_name=False, stream=True) as sql_executor:
+            return GroupByMatrix.from_rows(
+                (
+                    (build_id, Priority(pk=priority_id, value=priority_value), name, total_count)
+                    for build_id, priority_id, priority_value, name, total_count in sql_executor.rows
+                ),
+                levels=3,
+            )
 
 
 class TestingReportByPlanTagsData(TestingReportBaseData):
@@ -676,15 +640,8 @@ class TestingReportByPlanTagsData(TestingReportBaseData):
 
     def passed_failed_case_runs_subtotal(self, form):
         sql, params = self._prepare_sql(form, sqls.by_plan_tags_passed_failed_case_runs_subtotal)
-        sql_executor = SQLExecution(sql, params, with_field_name=False)
-        rows = sql_executor.rows
-        tags = GroupByResult()
-
-        for tag_id, name, total_count in rows:
-            status_subtotal = tags.setdefault(tag_id, GroupByResult())
-            status_subtotal[name] = total_count
-
-        return tags
+        with SQLExecution(sql, params, with_field_name=False, stream=True) as sql_executor:
+            return GroupByMatrix.from_rows(sql_executor.rows, levels=2)
 
     def get_tags_names(self, tag_ids):
         """Get tags names from status matrix"""
@@ -771,32 +728,37 @@ class TestingReportByPlanTagsDetailData(TestingReportByPlanTagsData):
 
     def status_matrix(self, form):
         sql, params = self._prepare_sql(form, sqls.by_plan_tags_detail_status_matrix)
-        rows = SQLExecution(sql, params, with_field_name=False).rows
-
-        status_matrix = GroupByResult()
-
-        for row in rows:
-            (
-                tag_id,
-                build_id,
-                build_name,
-                plan_id,
-                plan_name,
-                run_id,
-                run_summary,
-                status_name,
-                total_count,
-            ) = row
-
-            builds = status_matrix.setdefault(tag_id, GroupByResult())
-            plans = builds.setdefault(TestBuild(pk=build_id, name=build_name), GroupByResult())
-            runs = plans.setdefault(TestPlan(pk=plan_id, name=plan_name), GroupByResult())
-            status_subtotal = runs.setdefault(
-                TestRun(pk=run_id, summary=run_summary), GroupByResult()
-            )
-            status_subtotal[status_name] = total_count
-
-        return status_matrix
+        sql_executor = SQLExecution(sql, params, with_field_name=False, stream=True)
+
+        # Model objects are created once for each distinct ID.
+        builds, plans, runs = {}, {}, {}
+
+        def _rows():
+            for row in sql_executor.rows:
+                (
+                    tag_id,
+                    build_id,
+                    build_name,
+                    plan_id,
+                    plan_name,
+                    run_id,
+                    run_summary,
+                    status_name,
+                    total_count,
+                ) = row
+                build = builds.get(build_id)
+                if build is None:
+                    build = builds[build_id] = TestBuild(pk=build_id, name=build_name)
+                plan = plans.get(plan_id)
+                if plan is None:
+                    plan = plans[plan_id] = TestPlan(pk=plan_id, name=plan_name)
+                run = runs.get(run_id)
+                if run is None:
+                    run = runs[run_id] = TestRun(pk=run_id, summary=run_summary)
+                yield tag_id, build, plan, run, status_name, total_count
+
+        with sql_executor:
+            return GroupByMatrix.from_rows(_rows(), levels=5)
 
     def case_runs_total(self, form):
         sql, params = self._prepare_sql(form, sqls.testing_report_case_runs_total)
@@ -870,11 +832,13 @@ class TestingReportByPlanBuildData(TestingReportBaseData):
                 "pk", "name"
             )
         }
-        status_matrix = GroupByResult()
-        for plan_id, status_name, total_count in rows:
-            status_subtotal = status_matrix.setdefault(plans[plan_id], GroupByResult())
-            status_subtotal[status_name] = total_count
-        return status_matrix
+        return GroupByMatrix.from_rows(
+            (
+                (plans[plan_id], status_name, total_count)
+                for plan_id, status_name, total_count in rows
+            ),
+            levels=2,
+        )
 
 
 class TestingReportByPlanBuildDetailData(TestingReportByPlanBuildData):
@@ -931,14 +895,13 @@ class TestingReportByPlanBuildDetailData(TestingReportByPlanBuildData):
 
     def status_matrix(self, form):
         sql, params = self._prepare_sql(form, sqls.by_plan_build_detail_status_matrix)
-        rows = SQLExecution(sql, params, with_field_name=False).rows
-        status_matrix = GroupByResult()
+        rows = list(SQLExecution(sql, params, with_field_name=False).rows)
 
-        plan_ids = build_ids = run_ids = []
+        plan_ids, build_ids, run_ids = set(), set(), set()
         for plan_id, build_id, run_id, status_name, _ in rows:
-            plan_ids.append(plan_id)
-            build_ids.append(build_id)
-            run_ids.append(run_id)
+            plan_ids.add(plan_id)
+            build_ids.add(build_id)
+            run_ids.add(run_id)
 
         plans = {
             plan.pk: plan for plan in TestPlan.objects.filter(pk__in=plan_ids).only("pk", "name")
@@ -949,14 +912,13 @@ class TestingReportByPlanBuildDetailData(TestingReportByPlanBuildData):
         }
         runs = {run.pk: run for run in TestRun.objects.filter(pk__in=run_ids).only("pk", "summary")}
 
-        for row in rows:
-            plan_id, build_id, run_id, status_name, total_count = row
-            builds = status_matrix.setdefault(plans[plan_id], GroupByResult())
-            runs = builds.setdefault(test_builds[build_id], GroupByResult())
-            status_subtotal = runs.setdefault(runs[run_id], GroupByResult())
-            status_subtotal[status_name] = total_count
-
-        return status_matrix
+        return GroupByMatrix.from_rows(
+            (
+                (plans[plan_id], test_builds[build_id], runs[run_id], status_name, total_count)
+                for plan_id, build_id, run_id, status_name, total_count in rows
+            ),
+            levels=4,
+        )
 
 
 class TestingReportCaseRunsData:
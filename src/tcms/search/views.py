@@ -15,7 +15,6 @@ from django.shortcuts import render
 from django.template.loader import get_template
 from django.views.decorators.http import require_GET
 
-from tcms.core.raw_sql import RawSQL
 from tcms.core.utils import DataTableResult
 from tcms.management.models import Priority, Product
 from tcms.search.forms import CaseForm, PlanForm, RunForm
@@ -25,7 +24,7 @@ from tcms.testcases.models import TestCase
 from tcms.testplans.models import TestPlan, TestPlanType
 from tcms.testruns.models import TestRun
 
-SearchInfo = namedtuple("SearchInfo", ["column_names", "template_file"])
+SearchInfo = namedtuple("SearchInfo", ["column_names", "template_file", "subtotal"])
 
 
 @require_GET
@@ -61,7 +60,6 @@ def advance_search(request, tmpl="search/advanced_search.html"):
         case_form.cleaned_data,
         target,
     )
-    results = order_targets(results, data)
     queries = fmt_queries(*[f.cleaned_data for f in all_forms])
     queries["Target"] = target
 
@@ -81,6 +79,7 @@ def advance_search(request, tmpl="search/advanced_search.html"):
                 "",
             ],
             template_file="plan/common/json_plans.txt",
+            subtotal=TestPlan.subtotal(cases_count=True, runs_count=True, children_count=True),
         ),
         "case": SearchInfo(
             column_names=[
@@ -97,6 +96,7 @@ def advance_search(request, tmpl="search/advanced_search.html"):
                 "create_date",
             ],
             template_file="case/common/json_cases.txt",
+            subtotal=None,
         ),
         "run": SearchInfo(
             column_names=[
@@ -113,12 +113,24 @@ def advance_search(request, tmpl="search/advanced_search.html"):
                 "completed",
             ],
             template_file="run/common/json_runs.txt",
+            subtotal=TestRun.subtotal(cases_count=True),
         ),
     }
 
     search_info = search_infos[target]
 
-    dt = DataTableResult(request.GET, results, search_info.column_names, default_order_key="-pk")
+    if search_info.subtotal is not None:
+        # Ordering by counters requires them in SQL.
+        results = search_info.subtotal.annotate(results, [data.get("order_by", "")])
+    results = order_targets(results, data)
+
+    dt = DataTableResult(
+        request.GET,
+        results,
+        search_info.column_names,
+        default_order_key="-pk",
+        subtotal=search_info.subtotal,
+    )
     response_data = dt.get_response_data()
 
     if target == "run":
@@ -197,7 +209,6 @@ def sum_orm_queries(
             runs = runs.filter(case_run__case__in=cases).distinct()
         if plans is not None:
             runs = runs.filter(plan__in=plans).distinct()
-        runs = runs.extra(select={"cases_count": RawSQL.total_num_caseruns})  # nosec
         return runs.select_related(
             "manager", "default_tester", "build__product", "product_version"
         ).only(
@@ -220,18 +231,14 @@ def sum_orm_queries(
             plans = plans.filter(case__in=cases).distinct()
         if runs is not None:
             plans = plans.filter(run__in=runs).distinct()
-        return (
-            TestPlan.apply_subtotal(plans, cases_count=True, runs_count=True)
-            .select_related("author", "owner", "type", "product")
-            .only(
-                "pk",
-                "name",
-                "is_active",
-                "author__username",
-                "owner__username",
-                "product__name",
-                "type__name",
-            )
+        return plans.select_related("author", "owner", "type", "product").only(
+            "pk",
+            "name",
+            "is_active",
+            "author__username",
+            "owner__username",
+            "product__name",
+            "type__name",
         )
 
     if target == "case":
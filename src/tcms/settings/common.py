@@ -32,6 +32,11 @@ DATABASES = {
         "PASSWORD": "",
         "HOST": "",
         "PORT": "",
+        # Seconds to reuse a connection by requests and tasks run in THREADING
+        # mode. 0 closes it at the end of each request or task.
+        "CONN_MAX_AGE": 0,
+        # Check whether a reused connection is still usable before using it.
+        "CONN_HEALTH_CHECKS": False,
     },
     # Enable these settings for slave databases
     # First slave DB for reading
@@ -229,6 +234,50 @@ XMLRPC_METHODS = {
 
 XMLRPC_TEMPLATE = "xmlrpc.html"
 
+# Compress XML-RPC and JSON-RPC responses with gzip or deflate if client
+# accepts either of them.
+XMLRPC_RESPONSE_COMPRESSION = True
+
+# Set ETag to responses of get* and filter* RPC methods and return 304 if data
+# is not changed since the ETag was issued. Refer to the documentation before
+# enabling it, which requires a default cache shared by all processes.
+XMLRPC_CONDITIONAL_RESPONSE = False
+
+# Seconds to cache counts of search results. 0 disables it.
+COUNT_CACHE_TIMEOUT = 0
+# Use the estimated number of rows of a search result if it is not less than
+# this threshold. 0 disables it. Only supported by PostgreSQL.
+COUNT_ESTIMATE_THRESHOLD = 0
+
+# Seconds to cache template fragments of plan, case and run pages in the
+# default cache. 0 disables it.
+FRAGMENT_CACHE_TIMEOUT = 0
+
+# Seconds to keep a Server-Sent Events stream open to push the progress of a
+# run to its page, after which the browser reconnects. Each open stream
+# occupies a worker thread. 0 disables it, and the run page refreshes the
+# progress by itself after changing case runs.
+RUN_PROGRESS_STREAM_TIMEOUT = 0
+# Seconds to check the published progress of a run in a stream.
+RUN_PROGRESS_POLL_INTERVAL = 1
+
+# Days after a run is stopped to move its case runs into the archive table by
+# command archivecaseruns. Reports and statistics read the archived case runs
+# as well only if it is set. 0 disables it.
+CASE_RUN_ARCHIVE_AGE = 0
+
+# Count the database connections opened, and reused and closed by tasks in the
+# default cache, which are shown by command dbconnectionstats.
+DB_CONNECTION_STATS = False
+
+# Days to keep rows of logs and removed comments, which are deleted by command
+# purgeoldrecords. 0 keeps the rows forever.
+RETENTION_DAYS = {
+    "logs.TCMSLogModel": 0,
+    "xmlrpc.XmlRpcLog": 0,
+    "django_comments.Comment": 0,
+}
+
 # Cache backend
 CACHES = {
     "default": {
@@ -236,13 +285,19 @@ CACHES = {
     }
 }
 
+# Seconds to cache user permissions in the default cache. Cached permissions
+# are invalidated when groups or permissions are changed. Note that, if the
+# default cache is not shared between processes, e.g. LocMemCache, changes
+# take effect in other processes after this timeout.
+PERMISSION_CACHE_TIMEOUT = 300
+
 SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
 
 # Needed by django.core.context_processors.debug:
 # See http://docs.djangoproject.com/en/dev/ref/templates/api/#django-core-context-processors-debug
 INTERNAL_IPS = ("127.0.0.1",)
 
-AUTHENTICATION_BACKENDS = ("django.contrib.auth.backends.ModelBackend",)
+AUTHENTICATION_BACKENDS = ("tcms.auth.backends.CachedModelBackend",)
 
 # Config for enabled authentication backend set in AUTHENTICATION_BACKENDS
 ENABLED_AUTH_BACKENDS = {
@@ -342,6 +397,8 @@ EMAILS_FOR_DEBUG = []
 
 # Values: DISABLED, THREADING, CELERY
 ASYNC_TASK = "DISABLED"
+# The maximum number of threads to run tasks in THREADING mode.
+ASYNC_TASK_THREADS = 4
 
 CELERY_BROKER_URL = "redis://"
 # Celery worker settings
@@ -378,6 +435,16 @@ FOOTER_LINKS = ()
 # FILE_UPLOAD_DIR = path.join(MEDIA_DIR, 'uploads').replace('\\','/'),
 FILE_UPLOAD_DIR = "/var/nitrate/uploads"
 
+# Where the content of newly uploaded attachment is stored.
+# Values: FILESYSTEM, DATABASE
+# FILESYSTEM stores files under FILE_UPLOAD_DIR named by the content checksum.
+# DATABASE stores content in table test_attachment_data.
+ATTACHMENT_STORAGE = "FILESYSTEM"
+
+# Compress attachment files with gzip when storing them in file system. Files
+# which are compressed already, e.g. images and archives, are not compressed.
+ATTACHMENT_COMPRESSION = False
+
 #
 # Authentication backend settings
 #
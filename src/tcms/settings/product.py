@@ -18,6 +18,11 @@ DATABASES = {
         "PASSWORD": environ.get("NITRATE_DB_PASSWORD", "nitrate"),
         "HOST": environ.get("NITRATE_DB_HOST", ""),
         "PORT": environ.get("NITRATE_DB_PORT", ""),
+        # Seconds to reuse a connection. 0 closes it at the end of each
+        # request or task.
+        "CONN_MAX_AGE": int(environ.get("NITRATE_DB_CONN_MAX_AGE", "0")),
+        # Check whether a reused connection is still usable before using it.
+        "CONN_HEALTH_CHECKS": environ.get("NITRATE_DB_CONN_HEALTH_CHECKS", "1") == "1",
     },
 }
 
@@ -29,7 +34,7 @@ if not SECRET_KEY:
         "unique secret key to the Django's SECRET_KEY"
     )
 
-AUTHENTICATION_BACKENDS = ("django.contrib.auth.backends.ModelBackend",)
+AUTHENTICATION_BACKENDS = ("tcms.auth.backends.CachedModelBackend",)
 
 TEMPLATES[0].update(
     {
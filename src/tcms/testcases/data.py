@@ -5,12 +5,13 @@ from operator import itemgetter
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count
 from django_comments.models import Comment
 
 from tcms.logs.models import TCMSLogModel
 from tcms.management.models import Component
-from tcms.testcases import sqls
-from tcms.testcases.models import NoneText, TestCase, TestCaseStatus, TestCaseTag, TestCaseText
+from tcms.testcases.models import NoneText, TestCase, TestCaseStatus, TestCaseTag
+from tcms.testruns.archive import get_case_run_models
 from tcms.testruns.models import TestCaseRun
 
 
@@ -69,6 +70,55 @@ class TestCaseRunViewDataMixin:
         return comments.values("user__email", "submit_date", "comment", "pk", "user__pk")
 
 
+def get_case_run_history_summary(case_id):
+    """Summarize case runs of a case by plan
+
+    The case runs are counted by plan and status with one GROUP BY query
+    rather than loading them all. The archived case runs are counted as well
+    if archival is enabled.
+
+    :param int case_id: the case id.
+    :return: list of mappings ordered by plan id. Each of them has keys
+        ``plan_id``, ``plan_name``, ``case_runs_count`` and
+        ``status_counts``, which is a list of tuples of status name and the
+        number of case runs in that status.
+    :rtype: list[dict]
+    """
+    subtotal = {}
+    for model in get_case_run_models():
+        rows = (
+            model.objects.filter(case=case_id)
+            .values(
+                "run__plan",
+                "run__plan__name",
+                "case_run_status__sortkey",
+                "case_run_status__name",
+            )
+            .annotate(count=Count("pk"))
+            .order_by()
+        )
+        for row in rows.iterator():
+            key = itemgetter(
+                "run__plan", "run__plan__name", "case_run_status__sortkey", "case_run_status__name"
+            )(row)
+            subtotal[key] = subtotal.get(key, 0) + row["count"]
+
+    summary = []
+    for (plan_id, plan_name), group in groupby(
+        sorted(subtotal.items()), key=lambda item: item[0][:2]
+    ):
+        status_counts = [(status_name, count) for (_, _, _, status_name), count in group]
+        summary.append(
+            {
+                "plan_id": plan_id,
+                "plan_name": plan_name,
+                "case_runs_count": sum(count for _, count in status_counts),
+                "status_counts": status_counts,
+            }
+        )
+    return summary
+
+
 def get_exported_cases_and_related_data(plan_pks=None, case_pks=None):
     case_status = [
         TestCaseStatus.name_to_id("PROPOSED"),
@@ -119,14 +169,8 @@ def get_exported_cases_and_related_data(plan_pks=None, case_pks=None):
     }
 
     # cases' text
-    if plan_pks is not None:
-        sql = sqls.CASES_TEXT_BY_PLANS.format(", ".join(["%s"] * len(plan_pks)))
-        case_texts = TestCaseText.objects.raw(sql, plan_pks)
-    elif case_pks is not None:
-        sql = sqls.TC_EXPORT_ALL_CASE_TEXTS.format(", ".join(["%s"] * len(case_pks)))
-        case_texts = TestCaseText.objects.raw(sql, case_pks)
-
-    case_texts = {text.case_id: text for text in case_texts}
+    cases = list(cases)
+    case_texts = TestCase.get_latest_texts([case.pk for case in cases])
 
     # cases' tags
     if plan_pks is not None:
@@ -501,7 +501,12 @@ class CaseRunIssueForm(BaseAddIssueForm):
 
         case_runs: list[TestCaseRun] = self.cleaned_data["case_run"]
 
+        # Check once for each run, since case runs are usually in the same run.
+        checked_runs = set()
         for case_run in case_runs:
+            if case_run.run_id in checked_runs:
+                continue
+            checked_runs.add(case_run.run_id)
             is_tracker_relative = case_run.run.get_issue_trackers().filter(pk=tracker.pk).exists()
             if not is_tracker_relative:
                 raise forms.ValidationError(
@@ -0,0 +1,52 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def set_latest_text(apps, schema_editor):
+    TestCase = apps.get_model("testcases", "TestCase")
+    TestCaseText = apps.get_model("testcases", "TestCaseText")
+
+    latest_versions = (
+        TestCaseText.objects.values("case")
+        .annotate(latest_version=Max("case_text_version"))
+        .order_by()
+        .values_list("case", "latest_version")
+    )
+    for case_id, latest_version in latest_versions.iterator():
+        text_id = (
+            TestCaseText.objects.filter(case=case_id, case_text_version=latest_version)
+            .values_list("pk", flat=True)
+            .first()
+        )
+        TestCase.objects.filter(pk=case_id).update(
+            current_text=text_id, current_text_version=latest_version
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("testcases", "0012_set_bigautofield"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="testcase",
+            name="current_text",
+            field=models.ForeignKey(
+                blank=True,
+                db_column="latest_text_id",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="latest_of_case",
+                to="testcases.testcasetext",
+            ),
+        ),
+        migrations.AddField(
+            model_name="testcase",
+            name="current_text_version",
+            field=models.IntegerField(db_column="latest_text_version", default=0),
+        ),
+        migrations.RunPython(set_latest_text, migrations.RunPython.noop),
+    ]
@@ -8,9 +8,10 @@ from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
-from django.db.models import Max, QuerySet
+from django.db.models import QuerySet
 from django.db.models.aggregates import Count
 from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
 from django.urls import reverse
 from django.utils.encoding import smart_str
 from html2text import html2text
@@ -159,6 +160,18 @@ class TestCase(TCMSActionModel):
         "management.TestTag", related_name="cases", through="testcases.TestCaseTag"
     )
 
+    # Pointer to the latest text and its version, which are maintained when
+    # a new text is added. Refer to signal handler update_case_latest_text.
+    current_text = models.ForeignKey(
+        "testcases.TestCaseText",
+        db_column="latest_text_id",
+        blank=True,
+        null=True,
+        related_name="latest_of_case",
+        on_delete=models.SET_NULL,
+    )
+    current_text_version = models.IntegerField(db_column="latest_text_version", default=0)
+
     # Auto-generated attributes from back-references:
     # 'texts' : list of TestCaseTexts (from TestCaseTexts.case)
     class Meta:
@@ -168,15 +181,24 @@ class TestCase(TCMSActionModel):
         return self.summary
 
     @classmethod
-    def to_xmlrpc(cls, query=None):
+    def to_xmlrpc(cls, query=None, fields=None):
         from tcms.xmlrpc.serializer import TestCaseXMLRPCSerializer
         from tcms.xmlrpc.utils import distinct_filter
 
         _query = query or {}
         qs = distinct_filter(TestCase, _query).order_by("pk")
-        s = TestCaseXMLRPCSerializer(model_class=cls, queryset=qs)
+        s = TestCaseXMLRPCSerializer(model_class=cls, queryset=qs, fields=fields)
         return s.serialize_queryset()
 
+    def serialize(self, fields=None):
+        from tcms.xmlrpc.serializer import XMLRPCSerializer
+
+        # The pointer to the latest text is internal and not exposed.
+        s = XMLRPCSerializer(model=self)
+        return s.serialize_model(
+            exclude_fields=("current_text", "current_text_version"), fields=fields
+        )
+
     @classmethod
     def create(cls, author, values, plans=None):
         """
@@ -498,6 +520,8 @@ class TestCase(TCMSActionModel):
                 setup_checksum=setup_checksum or new_setup_checksum,
                 breakdown_checksum=breakdown_checksum or new_breakdown_checksum,
             )
+            self.current_text = latest_text
+            self.current_text_version = latest_text.case_text_version
         else:
             latest_text = self.latest_text()
 
@@ -552,35 +576,66 @@ class TestCase(TCMSActionModel):
         return self.latest_text()
 
     def latest_text(self, text_required=True):
-        text = self.text
+        text = TestCaseText.objects.filter(latest_of_case=self.pk)
         if not text_required:
             text = text.defer("action", "effect", "setup", "breakdown")
-        qs = text.order_by("-case_text_version")[0:1]
-        return NoneText if len(qs) == 0 else qs[0]
+        return text.first() or NoneText
 
     def latest_text_version(self):
-        result = self.text.order_by("case", "case_text_version").aggregate(
-            latest_version=Max("case_text_version")
+        latest_version = (
+            TestCase.objects.filter(pk=self.pk)
+            .values_list("current_text_version", flat=True)
+            .first()
         )
-        latest_version = result["latest_version"]
         return 0 if latest_version is None else latest_version
 
     def text_exist(self):
         return self.text.exists()
 
     def text_checksum(self):
-        qs = self.text.order_by("-case_text_version").only(
-            "action_checksum", "effect_checksum", "setup_checksum", "breakdown_checksum"
-        )[0:1]
-        if len(qs) == 0:
-            return None, None, None, None
-        else:
-            text = qs[0]
-            return (
-                text.action_checksum,
-                text.effect_checksum,
-                text.setup_checksum,
-                text.breakdown_checksum,
+        checksums = (
+            TestCaseText.objects.filter(latest_of_case=self.pk)
+            .values_list(
+                "action_checksum", "effect_checksum", "setup_checksum", "breakdown_checksum"
+            )
+            .first()
+        )
+        return (None, None, None, None) if checksums is None else checksums
+
+    @classmethod
+    def get_latest_texts(
+        cls, case_ids: list[int], text_required: bool = True
+    ) -> dict[int, "TestCaseText"]:
+        """Get the latest text of many cases by one query
+
+        :param case_ids: list of case ids.
+        :type case_ids: list[int]
+        :param bool text_required: whether to load the text content. Only the
+            version and checksums are loaded if set to False.
+        :return: mapping from case id to the latest text. Cases which do not
+            have text yet are not included.
+        :rtype: dict[int, TestCaseText]
+        """
+        texts = TestCaseText.objects.filter(latest_of_case__in=case_ids)
+        if not text_required:
+            texts = texts.defer("action", "effect", "setup", "breakdown")
+        return {text.case_id: text for text in texts}
+
+    @classmethod
+    def sync_latest_text(cls, case_ids: list[int]) -> None:
+        """Point the latest text of cases to their texts with the max version"""
+        latest_texts = (
+            TestCaseText.objects.filter(case__in=case_ids)
+            .order_by("case", "-case_text_version")
+            .values_list("case", "pk", "case_text_version")
+        )
+        pointers = {}
+        for case_id, text_id, version in latest_texts:
+            pointers.setdefault(case_id, (text_id, version))
+        for case_id in case_ids:
+            text_id, version = pointers.get(case_id, (None, 0))
+            cls.objects.filter(pk=case_id).update(
+                current_text=text_id, current_text_version=version
             )
 
     def mail(self, template, subject, context={}, to=[], request=None):
@@ -1039,6 +1094,26 @@ class TestCaseEmailSettings(models.Model):
         self.add_cc(self.filter_new_emails(origin_emails, email_addrs))
 
 
+@receiver(post_save, sender=TestCaseText)
+def update_case_latest_text(sender, instance, created=False, **kwargs):
+    if created:
+        # Conditional update ensures the pointer is not moved to an older text.
+        TestCase.objects.filter(
+            pk=instance.case_id, current_text_version__lt=instance.case_text_version
+        ).update(current_text=instance.pk, current_text_version=instance.case_text_version)
+    else:
+        # The version of an existing text could be changed. That is rare.
+        TestCase.sync_latest_text([instance.case_id])
+
+
+@receiver(post_delete, sender=TestCaseText)
+def reset_case_latest_text(sender, instance, **kwargs):
+    if TestCase.objects.filter(
+        pk=instance.case_id, current_text_version=instance.case_text_version
+    ).exists():
+        TestCase.sync_latest_text([instance.case_id])
+
+
 def _listen():
     """signals listen"""
 
@@ -12,6 +12,7 @@ from django.contrib.auth.decorators import permission_required
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.core.paginator import Paginator
 from django.db.models import Count, QuerySet
 from django.http import (
     Http404,
@@ -29,8 +30,7 @@ from django.views.generic.base import TemplateView, View
 from django.views.generic.edit import FormView
 from django_comments.models import Comment
 
-from tcms.core.db import SQLExecution
-from tcms.core.raw_sql import RawSQL
+from tcms.core.db import SQLExecution, cached_count
 from tcms.core.responses import JsonResponseBadRequest
 from tcms.core.utils import DataTableResult, form_error_messages_to_list
 from tcms.core.views import prompt
@@ -59,6 +59,7 @@ from tcms.testcases.forms import (
 from tcms.testcases.models import TestCase, TestCaseComponent, TestCasePlan, TestCaseStatus
 from tcms.testplans.forms import SearchPlanForm
 from tcms.testplans.models import TestPlan
+from tcms.testruns.archive import find_case_run, union_case_runs
 from tcms.testruns.models import TestCaseRun, TestCaseRunStatus
 
 logger = logging.getLogger(__name__)
@@ -445,7 +446,7 @@ def all(request, template_name="case/all.html"):
     search_form = build_cases_search_form(request.POST, request.session, populate=True, plan=tp)
     tcs = query_testcases(request.POST, tp, search_form)
     tcs = sort_queried_testcases(request, tcs)
-    total_cases_count = tcs.count()
+    total_cases_count = cached_count(tcs)
 
     # Initial the case ids
     selected_case_ids = get_selected_cases_ids(request)
@@ -556,7 +557,7 @@ def search_cases(request):
             "sub_module": "cases",
             "object_list": cases[0:20],
             "search_form": search_form,
-            "total_count": cases.count(),
+            "total_count": cached_count(cases),
         }
         return render(request, "case/all.html", context=context_data)
 
@@ -616,9 +617,14 @@ class TestCaseReviewPaneView(SimpleTestCaseView):
 
 
 class TestCaseCaseRunListPaneView(TemplateView):
-    """Display case runs list when expand a plan from case page"""
+    """Display case runs list when expand a plan from case page
+
+    Case runs are paginated and the newest ones are shown first. Pass
+    ``page`` in the query string to get other pages.
+    """
 
     template_name = "case/get_case_runs_by_plan.html"
+    paginate_by = 50
 
     # FIXME: what permission here?
     def get(self, request, case_id):
@@ -631,23 +637,25 @@ class TestCaseCaseRunListPaneView(TemplateView):
         return super(this_cls, self).get(request, case_id)
 
     def get_case_runs(self):
-        qs = TestCaseRun.objects.filter(case=self.case_id, run__plan=self.plan_id)
-        qs = qs.values(
-            "pk",
-            "case_id",
-            "run_id",
-            "case_text_version",
-            "close_date",
-            "sortkey",
-            "tested_by__username",
-            "assignee__username",
-            "run__plan_id",
-            "run__summary",
-            "case__category__name",
-            "case__priority__value",
-            "case_run_status__name",
-        ).order_by("pk")
-        return qs
+        # Archived case runs are listed as well.
+        qs = union_case_runs(
+            lambda model: model.objects.filter(case=self.case_id, run__plan=self.plan_id).values(
+                "pk",
+                "case_id",
+                "run_id",
+                "case_text_version",
+                "close_date",
+                "sortkey",
+                "tested_by__username",
+                "assignee__username",
+                "run__plan_id",
+                "run__summary",
+                "case__category__name",
+                "case__priority__value",
+                "case_run_status__name",
+            )
+        )
+        return qs.order_by("-pk")
 
     def get_comments_count(self, caserun_ids):
         ct = ContentType.objects.get_for_model(TestCaseRun)
@@ -668,7 +676,9 @@ class TestCaseCaseRunListPaneView(TemplateView):
         this_cls = TestCaseCaseRunListPaneView
         data = super(this_cls, self).get_context_data(**kwargs)
 
-        case_runs = self.get_case_runs()
+        paginator = Paginator(self.get_case_runs(), self.paginate_by)
+        page = paginator.get_page(self.request.GET.get("page"))
+        case_runs = list(page)
 
         # Get the number of each caserun's comments, and put the count into
         # comments query result.
@@ -679,7 +689,10 @@ class TestCaseCaseRunListPaneView(TemplateView):
 
         data.update(
             {
+                "case_id": self.case_id,
+                "plan_id": self.plan_id,
                 "case_runs": case_runs,
+                "page_obj": page,
             }
         )
         return data
@@ -712,9 +725,9 @@ class TestCaseSimpleCaseRunView(TemplateView, data.TestCaseRunViewDataMixin):
         this_cls = TestCaseSimpleCaseRunView
         data = super(this_cls, self).get_context_data(**kwargs)
 
-        case_run = get_object_or_404(
-            TestCaseRun.objects.only("notes"), case=self.case_id, pk=self.case_run_id
-        )
+        case_run = find_case_run(case=self.case_id, pk=self.case_run_id)
+        if case_run is None:
+            raise Http404(f"Case run {self.case_run_id} does not exist.")
         logs = self.get_caserun_logs(case_run)
         comments = self.get_caserun_comments(case_run)
 
@@ -830,40 +843,24 @@ def get(request, case_id, template_name="case/get.html"):
     else:
         tp = None
 
-    # Get the test case runs
-    tcrs = tc.case_run.select_related(
-        "run",
-        "tested_by",
-        "assignee",
-        "case__category",
-        "case__priority",
-        "case_run_status",
-    ).all()
-    tcrs = tcrs.extra(  # nosec
-        select={
-            "num_issue": RawSQL.num_case_run_issues,
-        }
-    ).order_by("run__plan")
-    runs_ordered_by_plan = itertools.groupby(tcrs, attrgetter("run.plan"))
-    # FIXME: Just don't know why Django template does not evaluate a generator,
-    # and had to evaluate the groupby generator manually like below.
-    runs_ordered_by_plan = [(k, list(v)) for k, v in runs_ordered_by_plan]
-    case_run_plans = [k for k, v in runs_ordered_by_plan]
+    # Summarize case runs by plan. Case runs of a plan are loaded page by page
+    # by TestCaseCaseRunListPaneView when the plan is expanded.
+    case_run_plans = data.get_case_run_history_summary(tc.pk)
     # Get the specific test case run
     if request.GET.get("case_run_id"):
-        tcr = tcrs.get(pk=request.GET["case_run_id"])
+        tcr = get_object_or_404(
+            tc.case_run.select_related(
+                "run",
+                "tested_by",
+                "assignee",
+                "case__category",
+                "case__priority",
+                "case_run_status",
+            ),
+            pk=request.GET["case_run_id"],
+        )
     else:
         tcr = None
-    case_run_plan_id = request.GET.get("case_run_plan_id", None)
-    if case_run_plan_id:
-        for item in runs_ordered_by_plan:
-            if item[0].pk == int(case_run_plan_id):
-                case_runs_by_plan = item[1]
-                break
-            else:
-                continue
-    else:
-        case_runs_by_plan = None
 
     # Get the case texts
     tc_text = tc.get_text_with_version(request.GET.get("case_text_version"))
@@ -888,9 +885,8 @@ def get(request, case_id, template_name="case/get.html"):
         "test_case": tc,
         "test_plan": tp,
         "test_plans": tps,
-        "test_case_runs": tcrs,
         "case_run_plans": case_run_plans,
-        "test_case_runs_by_plan": case_runs_by_plan,
+        "case_runs_count": sum(item["case_runs_count"] for item in case_run_plans),
         "test_case_run": tcr,
         "test_case_text": tc_text,
         "test_case_status": TestCaseStatus.objects.all(),
@@ -917,8 +913,8 @@ def printable(request, template_name="case/printable.html"):
 
     repeat = len(case_pks)
     params_sql = ",".join(itertools.repeat("%s", repeat))
-    sql = sqls.TC_PRINTABLE_CASE_TEXTS % (params_sql, params_sql)
-    tcs = SQLExecution(sql, case_pks * 2).rows
+    sql = sqls.TC_PRINTABLE_CASE_TEXTS % params_sql
+    tcs = SQLExecution(sql, case_pks).rows
 
     context_data = {
         "test_cases": tcs,
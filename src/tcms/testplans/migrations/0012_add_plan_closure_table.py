@@ -0,0 +1,70 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_closure(apps, schema_editor):
+    """Build closure rows for existing plans from their parent links"""
+    TestPlan = apps.get_model("testplans", "TestPlan")
+    TestPlanClosure = apps.get_model("testplans", "TestPlanClosure")
+
+    parents = dict(TestPlan.objects.values_list("pk", "parent"))
+    links = []
+    for plan_id in parents:
+        ancestor_id, depth, visited = plan_id, 0, set()
+        while ancestor_id is not None and ancestor_id not in visited:
+            visited.add(ancestor_id)
+            links.append(
+                TestPlanClosure(ancestor_id=ancestor_id, descendant_id=plan_id, depth=depth)
+            )
+            ancestor_id, depth = parents.get(ancestor_id), depth + 1
+    TestPlanClosure.objects.bulk_create(links, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("testplans", "0011_remove_auto_now_add_from_plan_text_model"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TestPlanClosure",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("depth", models.PositiveIntegerField()),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="descendant_links",
+                        to="testplans.testplan",
+                    ),
+                ),
+                (
+                    "descendant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ancestor_links",
+                        to="testplans.testplan",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "test_plan_closure",
+                "indexes": [
+                    models.Index(
+                        fields=["descendant", "depth"], name="test_plan_c_descend_8a6d77_idx"
+                    )
+                ],
+                "unique_together": {("ancestor", "descendant")},
+            },
+        ),
+        migrations.RunPython(build_closure, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from datetime import datetime
-from textwrap import dedent
-from typing import Any, Optional, Union
+from typing import Any, Iterable, Optional, Union
 
 from django.conf import settings
 from django.contrib.auth.models import User
@@ -16,9 +15,8 @@ from django.urls import reverse
 from django.utils import timezone
 from uuslug import slugify
 
+from tcms.core.db import Subtotal, SubtotalCounter
 from tcms.core.models import TCMSActionModel
-from tcms.core.raw_sql import RawSQL
-from tcms.core.tcms_router import connection
 from tcms.core.utils import checksum
 from tcms.management.models import TCMSEnvGroup, TestAttachment, TestTag, Version
 from tcms.testcases.models import TestCase, TestCaseCategory, TestCasePlan, TestCaseStatus
@@ -91,13 +89,13 @@ class TestPlan(TCMSActionModel):
         return self.name
 
     @classmethod
-    def to_xmlrpc(cls, query=None):
+    def to_xmlrpc(cls, query=None, fields=None):
         from tcms.xmlrpc.serializer import TestPlanXMLRPCSerializer
         from tcms.xmlrpc.utils import distinct_filter
 
         _query = query or {}
         qs = distinct_filter(TestPlan, _query).order_by("pk")
-        s = TestPlanXMLRPCSerializer(model_class=cls, queryset=qs)
+        s = TestPlanXMLRPCSerializer(model_class=cls, queryset=qs, fields=fields)
         return s.serialize_queryset()
 
     @classmethod
@@ -122,23 +120,48 @@ class TestPlan(TCMSActionModel):
         return cls.objects.filter(*filter_args, **new_query).distinct()
 
     @classmethod
-    def apply_subtotal(
+    def subtotal(
         cls,
-        queryset: QuerySet,
         cases_count: bool = False,
         runs_count: bool = False,
         children_count: bool = False,
-    ) -> QuerySet:
-        select = {}
+    ) -> Subtotal:
+        """Get the subtotal of selected counters of plans"""
+        counters = {}
         if cases_count:
-            select["cases_count"] = RawSQL.num_cases
+            counters["cases_count"] = SubtotalCounter(TestCasePlan, "plan")
         if runs_count:
-            select["runs_count"] = RawSQL.num_runs
+            counters["runs_count"] = SubtotalCounter("testruns.TestRun", "plan")
         if children_count:
-            select["children_count"] = RawSQL.num_child_plans
-        if select:
-            queryset = queryset.extra(select=select)  # nosec
-        return queryset
+            counters["children_count"] = SubtotalCounter(cls, "parent")
+        return Subtotal(**counters)
+
+    @classmethod
+    def apply_subtotal(
+        cls,
+        queryset: QuerySet,
+        cases_count: bool = False,
+        runs_count: bool = False,
+        children_count: bool = False,
+    ) -> QuerySet:
+        """Annotate counters to plans in SQL
+
+        This is only necessary when plans are ordered by the counters. Use
+        :meth:`attach_subtotal` to get counters of a page of plans.
+        """
+        subtotal = cls.subtotal(cases_count, runs_count, children_count)
+        return subtotal.annotate(queryset)
+
+    @classmethod
+    def attach_subtotal(
+        cls,
+        plans: Iterable["TestPlan"],
+        cases_count: bool = False,
+        runs_count: bool = False,
+        children_count: bool = False,
+    ) -> list["TestPlan"]:
+        """Compute counters of plans and set them to each plan"""
+        return cls.subtotal(cases_count, runs_count, children_count).attach(plans)
 
     def latest_text(self):
         return self.text.select_related("author").order_by("-plan_text_version").first()
@@ -491,57 +514,42 @@ class TestPlan(TCMSActionModel):
         self.add_case(tc, sortkey=sortkey)
 
     def get_descendant_ids(self, direct: bool = False) -> list[int]:
-        if direct:
-            sql = dedent(
-                """
-                WITH RECURSIVE sub_tree AS (
-                    SELECT plan_id, 0 as depth FROM test_plans WHERE plan_id = %s
-                    UNION ALL
-                    SELECT tp.plan_id, depth + 1 FROM test_plans AS tp, sub_tree AS st
-                    WHERE tp.parent_id = st.plan_id
-                )
-                SELECT plan_id FROM sub_tree WHERE depth = 1;
-            """
-            )
-        else:
-            sql = dedent(
-                """
-                WITH RECURSIVE sub_tree AS (
-                    SELECT plan_id, 0 as depth FROM test_plans WHERE plan_id = %s
-                    UNION ALL
-                    SELECT tp.plan_id, depth + 1 FROM test_plans AS tp, sub_tree AS st
-                    WHERE tp.parent_id = st.plan_id
-                )
-                SELECT plan_id FROM sub_tree WHERE depth > 0;
-            """
-            )
-        with connection.reader_cursor as cursor:
-            cursor.execute(sql, [self.pk])
-            return [row[0] for row in cursor.fetchall()]
+        """Get descendant plan ids from the plan closure table
+
+        :param bool direct: only return the direct children if set.
+        :return: list of descendant plan ids.
+        :rtype: list[int]
+        """
+        qs = TestPlanClosure.objects.filter(ancestor=self.pk)
+        qs = qs.filter(depth=1) if direct else qs.filter(depth__gt=0)
+        return list(qs.values_list("descendant", flat=True))
 
     def get_descendants(self):
         descendant_ids = self.get_descendant_ids()
         return TestPlan.objects.filter(pk__in=descendant_ids)
 
     def get_ancestor_ids(self) -> list[int]:
-        sql_ancestors = dedent(
-            """
-            WITH RECURSIVE sub_tree AS (
-                SELECT plan_id, parent_id FROM test_plans
-                WHERE plan_id = %s
-                UNION ALL
-                SELECT tp.plan_id, tp.parent_id
-                FROM test_plans AS tp, sub_tree AS st
-                WHERE st.parent_id = tp.plan_id
-            )
-            SELECT * FROM sub_tree;
-        """
+        """Get ancestor plan ids from the nearest one to the root"""
+        return list(
+            TestPlanClosure.objects.filter(descendant=self.pk, depth__gt=0)
+            .order_by("depth")
+            .values_list("ancestor", flat=True)
         )
-        with connection.reader_cursor as cursor:
-            cursor.execute(sql_ancestors, [self.pk])
-            result = [row[0] for row in cursor.fetchall()]
-            result.remove(self.pk)
-            return result
+
+    def get_family_plan_ids(self) -> list[int]:
+        """Get ids of plans in the same tree path, that are ancestors, this plan and descendants"""
+        return self.get_ancestor_ids() + [self.pk] + self.get_descendant_ids()
+
+    def get_family_cases(self) -> QuerySet:
+        """Get cases added to this plan or any descendant plan"""
+        return TestCase.objects.filter(
+            plan__in=TestPlanClosure.objects.filter(ancestor=self.pk).values("descendant")
+        ).distinct()
+
+    def is_descendant_of(self, plan_id: int) -> bool:
+        return TestPlanClosure.objects.filter(
+            ancestor=plan_id, descendant=self.pk, depth__gt=0
+        ).exists()
 
     def get_ancestors(self) -> QuerySet:
         ancestor_ids = self.get_ancestor_ids()
@@ -579,6 +587,111 @@ class TestPlanText(TCMSActionModel):
         unique_together = ("plan", "plan_text_version")
 
 
+class TestPlanClosure(models.Model):
+    """Closure table of the plan hierarchy
+
+    Every plan has a row pointing to itself with depth 0, and a row for each
+    of its ancestors with the distance between them as the depth. The rows
+    are maintained by the signal handlers of ``TestPlan`` whenever a plan is
+    created, deleted or its parent is changed.
+    """
+
+    ancestor = models.ForeignKey(
+        TestPlan, related_name="descendant_links", on_delete=models.CASCADE
+    )
+    descendant = models.ForeignKey(
+        TestPlan, related_name="ancestor_links", on_delete=models.CASCADE
+    )
+    depth = models.PositiveIntegerField()
+
+    class Meta:
+        db_table = "test_plan_closure"
+        unique_together = ("ancestor", "descendant")
+        indexes = [models.Index(fields=["descendant", "depth"])]
+
+    @classmethod
+    def add_node(cls, plan_id: int, parent_id: Optional[int]) -> None:
+        """Add closure rows for a new plan which has no descendant yet"""
+        links = [cls(ancestor_id=plan_id, descendant_id=plan_id, depth=0)]
+        if parent_id is not None:
+            links.extend(
+                cls(ancestor_id=ancestor_id, descendant_id=plan_id, depth=depth + 1)
+                for ancestor_id, depth in cls.objects.filter(descendant=parent_id).values_list(
+                    "ancestor", "depth"
+                )
+            )
+        cls.objects.bulk_create(links)
+
+    @classmethod
+    def detach_subtree(cls, plan_id: int) -> None:
+        """Detach a plan and its descendants from the plan's ancestors"""
+        subtree_ids = cls.objects.filter(ancestor=plan_id).values_list("descendant", flat=True)
+        ancestor_ids = cls.objects.filter(descendant=plan_id, depth__gt=0).values_list(
+            "ancestor", flat=True
+        )
+        cls.objects.filter(
+            descendant__in=list(subtree_ids), ancestor__in=list(ancestor_ids)
+        ).delete()
+
+    @classmethod
+    def move_subtree(cls, plan_id: int, new_parent_id: Optional[int]) -> None:
+        """Move a plan with all of its descendants under a new parent
+
+        :param int plan_id: the plan to move.
+        :param new_parent_id: the new parent plan id. If ``None``, the plan
+            becomes a root plan.
+        :type new_parent_id: int or None
+        :raises ValueError: if the new parent is the plan itself or one of
+            its descendants.
+        """
+        subtree = list(cls.objects.filter(ancestor=plan_id).values_list("descendant", "depth"))
+        if not subtree:
+            # The plan is not in the closure table yet
+            cls.add_node(plan_id, new_parent_id)
+            return
+        if new_parent_id is not None and new_parent_id in {item[0] for item in subtree}:
+            raise ValueError(
+                f"Plan {new_parent_id} cannot be the parent of plan {plan_id} "
+                f"because it is plan {plan_id} itself or one of its descendants."
+            )
+        cls.detach_subtree(plan_id)
+        if new_parent_id is None:
+            return
+        ancestors = cls.objects.filter(descendant=new_parent_id).values_list("ancestor", "depth")
+        cls.objects.bulk_create(
+            cls(
+                ancestor_id=ancestor_id,
+                descendant_id=descendant_id,
+                depth=ancestor_depth + descendant_depth + 1,
+            )
+            for ancestor_id, ancestor_depth in ancestors
+            for descendant_id, descendant_depth in subtree
+        )
+
+    @classmethod
+    def sync_parent(cls, plan_id: int, parent_id: Optional[int]) -> None:
+        """Update closure rows if the recorded parent differs from the given one"""
+        recorded = dict(
+            cls.objects.filter(descendant=plan_id, depth__lte=1).values_list("depth", "ancestor")
+        )
+        if 0 not in recorded or recorded.get(1) != parent_id:
+            cls.move_subtree(plan_id, parent_id)
+
+    @classmethod
+    def rebuild(cls) -> None:
+        """Rebuild the whole closure table from the plans' parent links"""
+        cls.objects.all().delete()
+        parents = dict(TestPlan.objects.values_list("pk", "parent"))
+        links = []
+        for plan_id in parents:
+            ancestor_id, depth, visited = plan_id, 0, set()
+            while ancestor_id is not None and ancestor_id not in visited:
+                visited.add(ancestor_id)
+                links.append(cls(ancestor_id=ancestor_id, descendant_id=plan_id, depth=depth))
+                ancestor_id, depth = parents.get(ancestor_id), depth + 1
+        cls.objects.bulk_create(links, batch_size=1000)
+
+
 class TestPlanAttachment(models.Model):
     attachment = models.ForeignKey("management.TestAttachment", on_delete=models.CASCADE)
     plan = models.ForeignKey(TestPlan, on_delete=models.CASCADE)
@@ -634,6 +747,22 @@ def set_email_settings_to_new_plan(sender, **kwargs):
         TestPlanEmailSettings.objects.create(plan=kwargs["instance"])
 
 
+@receiver(post_save, sender=TestPlan)
+def update_plan_closure(sender, instance, created=False, update_fields=None, **kwargs):
+    if created:
+        TestPlanClosure.add_node(instance.pk, instance.parent_id)
+    elif update_fields is None or "parent" in update_fields:
+        TestPlanClosure.sync_parent(instance.pk, instance.parent_id)
+
+
+@receiver(pre_delete, sender=TestPlan)
+def detach_plan_closure(sender, instance, **kwargs):
+    # Children's parent is set to NULL without sending signals, so detach the
+    # whole subtree in advance. The rows linking the deleted plan are removed
+    # by the cascade deletion.
+    TestPlanClosure.detach_subtree(instance.pk)
+
+
 if register_model:  # type: ignore
     register_model(TestPlan)
     register_model(TestPlanText)
@@ -31,7 +31,7 @@ from django.views.generic import View
 from django.views.generic.base import TemplateView
 from uuslug import slugify
 
-from tcms.core.db import SQLExecution
+from tcms.core.db import SQLExecution, cached_count, reorder_sortkeys
 from tcms.core.models import TCMSLog
 from tcms.core.responses import JsonResponseBadRequest, JsonResponseNotFound
 from tcms.core.utils import DataTableResult, checksum
@@ -50,7 +50,7 @@ from tcms.testplans.forms import (
     PlanComponentForm,
     SearchPlanForm,
 )
-from tcms.testplans.models import TestPlan, TestPlanComponent
+from tcms.testplans.models import TestPlan, TestPlanClosure, TestPlanComponent
 from tcms.testruns.models import TestCaseRun, TestRun
 
 MODULE_NAME = "testplans"
@@ -179,13 +179,6 @@ class SimplePlansFilterView(TemplateView):
                 .order_by("-create_date")
             )
 
-            plans = TestPlan.apply_subtotal(
-                plans,
-                cases_count=True,
-                runs_count=True,
-                children_count=True,
-            )
-
         return search_form, plans
 
     def get_context_data(self, **kwargs):
@@ -210,8 +203,13 @@ class SearchPlansView(SimplePlansFilterView):
             {
                 "module": MODULE_NAME,
                 "sub_module": self.SUB_MODULE_NAME,
-                "object_list": context["plans"][0:20],
-                "plans_count": context["plans"].count(),
+                "object_list": TestPlan.attach_subtotal(
+                    context["plans"][0:20],
+                    cases_count=True,
+                    runs_count=True,
+                    children_count=True,
+                ),
+                "plans_count": cached_count(context["plans"]),
             }
         )
         return context
@@ -236,7 +234,12 @@ class SearchPlansPagesView(SimplePlansFilterView):
 
     def get(self, request, *args, **kwargs):
         _, plans = self.filter_plans()
-        dt = DataTableResult(request.GET, plans, self.column_names)
+        dt = DataTableResult(
+            request.GET,
+            plans,
+            self.column_names,
+            subtotal=TestPlan.subtotal(cases_count=True, runs_count=True),
+        )
         data = dt.get_response_data()
         resp_data = get_template(self.template_name).render(data, request)
         return JsonResponse(json.loads(resp_data))
@@ -361,6 +364,13 @@ def edit(request, plan_id, template_name="plan/edit.html"):
         else:
             form.populate()
 
+        if form.is_valid():
+            parent = form.cleaned_data["parent"]
+            if parent and (parent.pk == tp.pk or parent.is_descendant_of(tp.pk)):
+                form.add_error(
+                    "parent", f"Plan {parent.pk} is this plan itself or one of its descendants."
+                )
+
         # FIXME: Error handle
         if form.is_valid():
             if form.cleaned_data.get("upload_plan_text"):
@@ -627,21 +637,13 @@ class ReorderCasesView(View):
     http_method_names = ["post"]
 
     def post(self, request, plan_id):
-        # Current we should rewrite all of cases belong to the plan.
-        # Because the cases sortkey in database is chaos,
-        # Most of them are None.
-
         if "case" not in request.POST:
             return JsonResponseBadRequest({"message": "At least one case is required to re-order."})
 
-        plan = get_object_or_404(TestPlan, pk=int(plan_id))
+        plan = get_object_or_404(TestPlan.objects.only("pk"), pk=int(plan_id))
 
         case_ids = [int(id) for id in request.POST.getlist("case")]
-        cases = TestCase.objects.filter(pk__in=case_ids).only("pk")
-
-        for case in cases:
-            new_sort_key = (case_ids.index(case.pk) + 1) * 10
-            TestCasePlan.objects.filter(plan=plan, case=case).update(sortkey=new_sort_key)
+        reorder_sortkeys(TestCasePlan.objects.filter(plan=plan), case_ids, key_field="case")
 
         return JsonResponse({})
 
@@ -897,8 +899,7 @@ def construct_plans_treeview(request, plan_id):
     """Construct a plan's tree view"""
     plan = get_object_or_404(TestPlan, pk=plan_id)
 
-    tree_plan_ids = plan.get_ancestor_ids() + plan.get_descendant_ids()
-    tree_plan_ids.append(plan.pk)
+    tree_plan_ids = plan.get_family_plan_ids()
 
     plans = (
         TestPlan.objects.filter(pk__in=tree_plan_ids)
@@ -906,7 +907,7 @@ def construct_plans_treeview(request, plan_id):
         .order_by("parent_id", "pk")
     )
 
-    plans = TestPlan.apply_subtotal(plans, cases_count=True, runs_count=True, children_count=True)
+    plans = TestPlan.attach_subtotal(plans, cases_count=True, runs_count=True, children_count=True)
 
     return render(
         request,
@@ -940,6 +941,10 @@ def treeview_add_child_plans(request: HttpRequest, plan_id: int):
             return JsonResponseBadRequest(
                 {"message": f"Child plan {child_plan_id} does not exist."}
             )
+        if child_plan.pk == plan.pk:
+            return JsonResponseBadRequest(
+                {"message": f"Plan {child_plan_id} cannot be a child of itself."}
+            )
         if child_plan.pk in ancestor_ids:
             return JsonResponseBadRequest(
                 {"message": f"Plan {child_plan_id} is an ancestor of " f"plan {plan_id} already."}
@@ -973,6 +978,8 @@ def treeview_remove_child_plans(request, plan_id: int):
 
     if ids_to_remove:
         TestPlan.objects.filter(pk__in=ids_to_remove).update(parent=None)
+        for child_plan_id in ids_to_remove:
+            TestPlanClosure.move_subtree(child_plan_id, None)
 
     return JsonResponse(
         {
@@ -1018,8 +1025,7 @@ class PlanTreeChangeParentView(PermissionRequiredMixin, View):
                 {"message": f"The parent plan id {parent_id} does not exist."}
             )
 
-        descendant_ids = plan.get_descendant_ids()
-        if parent_id in descendant_ids:
+        if parent_id == plan.pk or new_parent.is_descendant_of(plan.pk):
             return JsonResponseBadRequest(
                 {
                     "message": f"The parent plan {parent_id} is a descendant of plan {plan.pk} already."
@@ -57,17 +57,17 @@ def manage_case_run_issues(request, run_id):
                 )
 
             try:
-                for case_run in case_runs:
-                    service.add_issue(
-                        issue_key,
-                        case_run.case,
-                        case_run=case_run,
-                        add_case_to_issue=link_et,
-                    )
+                service.add_issues(
+                    [
+                        Issue(issue_key=issue_key, case_id=case_run.case_id, case_run=case_run)
+                        for case_run in case_runs
+                    ],
+                    add_case_to_issue=link_et,
+                )
             except ValidationError as e:
                 logger.exception(
-                    "Failed to add issue to case run %s. Error reported: %s",
-                    form.case_run.pk,
+                    "Failed to add issue %s to case runs. Error reported: %s",
+                    issue_key,
                     str(e),
                 )
                 return JsonResponseBadRequest({"message": str(e)})
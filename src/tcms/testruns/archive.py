@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+
+"""Archive case runs of runs stopped long ago
+
+Table ``test_case_runs`` keeps growing, and queries over it, e.g. the reports
+and run statistics, pay for the whole history. When ``CASE_RUN_ARCHIVE_AGE``
+is set, command ``archivecaseruns`` moves case runs of runs stopped more than
+that number of days ago into table ``test_case_runs_archive``, which has the
+same columns as ``test_case_runs``. Case runs are moved in batches and each
+batch is committed in its own transaction, so the archival could be stopped
+at any time and resumed by running the command again.
+
+Case runs associated with issues or attachments are kept in
+``test_case_runs``, so that those associations are not lost. The archived
+case runs keep their ids, hence comments and links of them are still found by
+the id.
+
+Queries reading case runs read the archived case runs as well, only when
+``CASE_RUN_ARCHIVE_AGE`` is set:
+
+* statistics of case runs status by :func:`tcms.testruns.data.stats_case_runs_status`.
+* subtotals of case runs by :func:`tcms.report.data.subtotal_case_runs`.
+* the raw SQL of reports, which is passed to :func:`read_through_archive`.
+* case runs of the run page and the run report by :func:`list_case_runs`.
+* case run history of the case page, which is summarized from both tables and
+  listed by :func:`union_case_runs`.
+* a case run shown in the case page by :func:`find_case_run`.
+* case runs cloned into a new run.
+* the completion status of runs by
+  :func:`tcms.testruns.completion.update_runs_completion_status`.
+* XML-RPC ``TestCaseRun.filter``, ``TestCaseRun.filter_count``,
+  ``TestRun.get_test_case_runs`` and ``TestRun.get_test_cases``.
+
+The archived case runs are read-only. They are listed in the run page, but
+could not be selected or changed.
+"""
+
+import logging
+import re
+from collections.abc import Callable, Sequence
+from datetime import datetime, timedelta
+from operator import attrgetter
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.exceptions import FieldError
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.db.models import QuerySet
+
+from tcms.testruns.models import TestCaseRun, TestCaseRunArchive
+
+__all__ = (
+    "archive_case_runs",
+    "find_case_run",
+    "get_archivable_case_runs",
+    "get_case_run_models",
+    "is_archive_enabled",
+    "list_case_runs",
+    "read_through_archive",
+    "union_case_runs",
+)
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BATCH_SIZE = 1000
+
+# Table references of test_case_runs in FROM and JOIN clauses.
+case_runs_table_re = re.compile(
+    r"\b(FROM|JOIN)\s+{}\b(?![.\w])".format(TestCaseRun._meta.db_table), re.IGNORECASE
+)
+
+
+def is_archive_enabled() -> bool:
+    """Check whether case runs are archived"""
+    return bool(settings.CASE_RUN_ARCHIVE_AGE)
+
+
+def get_case_run_models() -> list[type[models.Model]]:
+    """Get models to read case runs in bulk
+
+    :return: :class:`TestCaseRun`, and :class:`TestCaseRunArchive` if
+        archival is enabled.
+    :rtype: list
+    """
+    if is_archive_enabled():
+        return [TestCaseRun, TestCaseRunArchive]
+    return [TestCaseRun]
+
+
+def _build_querysets(build: Callable[[type[models.Model]], QuerySet]) -> list[QuerySet]:
+    querysets = []
+    for model in get_case_run_models():
+        try:
+            querysets.append(build(model))
+        except FieldError:
+            if model is TestCaseRun:
+                raise
+            # Archived case runs have no relationship like issues and
+            # comments, so they never match criteria over them.
+    return querysets
+
+
+def _sort_value(value: Any) -> tuple:
+    if isinstance(value, models.Model):
+        value = value.pk
+    # None is less than any other value.
+    return value is not None, value
+
+
+def list_case_runs(
+    build: Callable[[type[models.Model]], QuerySet], order_by: Sequence[str] = ("pk",)
+) -> list[models.Model]:
+    """List case runs and the archived case runs
+
+    :param build: a function building the queryset of case runs from the
+        model, which is :class:`TestCaseRun` or :class:`TestCaseRunArchive`.
+    :type build: callable
+    :param order_by: fields to order the case runs, e.g. ``case__summary``.
+        A field prefixed with ``-`` is in descending order.
+    :type order_by: sequence[str]
+    :return: list of :class:`TestCaseRun` and :class:`TestCaseRunArchive`
+        objects. The archived ones could be told by ``is_archived``.
+    :rtype: list
+    """
+    querysets = _build_querysets(build)
+    if len(querysets) == 1:
+        return list(querysets[0].order_by(*order_by))
+    case_runs = [case_run for queryset in querysets for case_run in queryset]
+    # Stable sort by the fields from the last one.
+    for field in reversed(order_by):
+        get_value = attrgetter(field.lstrip("-").replace("__", "."))
+        case_runs.sort(
+            key=lambda case_run: _sort_value(get_value(case_run)),
+            reverse=field.startswith("-"),
+        )
+    return case_runs
+
+
+def union_case_runs(build: Callable[[type[models.Model]], QuerySet]) -> QuerySet:
+    """Combine the case runs and the archived case runs by UNION ALL
+
+    :param build: a function building the queryset of case runs from the
+        model. The querysets built must select the same values, e.g. by
+        ``values``, in order to be combined.
+    :type build: callable
+    :return: the combined queryset, which could be ordered and sliced.
+    :rtype: QuerySet
+    """
+    querysets = _build_querysets(build)
+    if len(querysets) == 1:
+        return querysets[0]
+    return querysets[0].union(*querysets[1:], all=True)
+
+
+def find_case_run(**criteria) -> Optional[models.Model]:
+    """Find a case run which might be archived
+
+    :param criteria: the criteria to filter the case run.
+    :return: the :class:`TestCaseRun` or :class:`TestCaseRunArchive` object,
+        or None if not found.
+    """
+    for model in get_case_run_models():
+        case_run = model.objects.filter(**criteria).first()
+        if case_run is not None:
+            return case_run
+    return None
+
+
+def get_archivable_case_runs(stopped_before: datetime) -> QuerySet:
+    """Get case runs which could be archived
+
+    :param stopped_before: case runs of runs stopped before this time could be
+        archived.
+    :type stopped_before: datetime
+    :return: a queryset of the case runs ordered by id. Case runs with issues
+        or attachments are excluded.
+    :rtype: QuerySet
+    """
+    return TestCaseRun.objects.filter(
+        run__stop_date__lt=stopped_before,
+        issues__isnull=True,
+        case_run_attachment__isnull=True,
+    ).order_by("pk")
+
+
+def _column_names() -> str:
+    return ", ".join(field.column for field in TestCaseRun._meta.concrete_fields)
+
+
+def _archive_batch(stopped_before: datetime, batch_size: int, using: str) -> int:
+    with transaction.atomic(using=using):
+        case_run_ids = list(
+            get_archivable_case_runs(stopped_before)
+            .using(using)
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not case_run_ids:
+            return 0
+        columns = _column_names()
+        table = TestCaseRun._meta.db_table
+        in_clause = ", ".join(["%s"] * len(case_run_ids))
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {TestCaseRunArchive._meta.db_table} ({columns}) "
+                f"SELECT {columns} FROM {table} WHERE case_run_id IN ({in_clause})",
+                case_run_ids,
+            )
+            # Deleted without signals and cascades, since the case runs are
+            # just moved.
+            delete_sql = f"DELETE FROM {table} WHERE case_run_id IN ({in_clause})"  # nosec
+            cursor.execute(delete_sql, case_run_ids)
+    return len(case_run_ids)
+
+
+def archive_case_runs(
+    stopped_before: Optional[datetime] = None,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+    using: str = DEFAULT_DB_ALIAS,
+) -> int:
+    """Move case runs of runs stopped long ago into the archive table
+
+    :param stopped_before: case runs of runs stopped before this time are
+        archived. Defaults to ``CASE_RUN_ARCHIVE_AGE`` days ago.
+    :type stopped_before: datetime or None
+    :param int batch_size: the number of case runs moved in one transaction.
+    :param max_batches: if set, stop after moving this number of batches. The
+        rest could be archived by calling this function again.
+    :type max_batches: int or None
+    :param str using: the database alias.
+    :return: the number of archived case runs.
+    :rtype: int
+    """
+    if stopped_before is None:
+        stopped_before = datetime.now() - timedelta(days=settings.CASE_RUN_ARCHIVE_AGE)
+    archived = batches = 0
+    while max_batches is None or batches < max_batches:
+        count = _archive_batch(stopped_before, batch_size, using)
+        if not count:
+            break
+        archived += count
+        batches += 1
+        logger.info("Archived %d case runs of runs stopped before %s", archived, stopped_before)
+    return archived
+
+
+def read_through_archive(sql: str) -> str:
+    """Make raw SQL read the archived case runs as well
+
+    Table ``test_case_runs`` referenced in FROM and JOIN clauses is replaced
+    with a derived table of both ``test_case_runs`` and
+    ``test_case_runs_archive`` named ``test_case_runs``, hence the table must
+    not be aliased in the SQL. Nothing is changed if archival is disabled.
+
+    :param str sql: the SQL.
+    :return: the SQL reading the archived case runs.
+    :rtype: str
+    """
+    if not is_archive_enabled():
+        return sql
+    table = TestCaseRun._meta.db_table
+    columns = _column_names()
+    derived_table = (
+        f"(SELECT {columns} FROM {table} "
+        f"UNION ALL SELECT {columns} FROM {TestCaseRunArchive._meta.db_table}) {table}"
+    )
+    return case_runs_table_re.sub(lambda m: f"{m.group(1)} {derived_table}", sql)
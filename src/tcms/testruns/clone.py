@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+
+"""Clone test runs in bulk
+
+Case runs, environment values, CCs and tags of a run are copied by chunked
+``bulk_create`` rather than creating objects one by one, so that no signal is
+sent for each case run. The completion status of each new run is recomputed
+once at transaction commit.
+
+Cloning multiple runs could be run as a background task by
+:func:`start_clone_runs`, whose progress is kept in the default cache and
+could be read by :func:`get_clone_progress`. Since the progress must be seen
+by every process serving the requests and running the task, runs are cloned
+synchronously if the default cache is local to a process.
+"""
+
+import logging
+import uuid
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from tcms.core.task import Task
+from tcms.testruns.archive import union_case_runs
+from tcms.testruns.completion import mark_runs_dirty
+from tcms.testruns.models import (
+    TCMSEnvRunValueMap,
+    TestCaseRun,
+    TestCaseRunStatus,
+    TestRun,
+    TestRunCC,
+    TestRunTag,
+)
+
+logger = logging.getLogger(__name__)
+
+CLONE_BATCH_SIZE = 1000
+CLONE_PROGRESS_KEY = "tcms.run_clone.{}"
+# Keep the progress for one day after the last update.
+CLONE_PROGRESS_TIMEOUT = 24 * 3600
+# Cache backends whose data cannot be seen by other processes.
+PROCESS_LOCAL_CACHES = (DummyCache, LocMemCache)
+
+
+def bulk_add_case_runs(
+    run: TestRun, case_runs: Iterable[TestCaseRun], batch_size: int = CLONE_BATCH_SIZE
+) -> int:
+    """Add case runs to a run in bulk
+
+    Case runs are created by ``bulk_create`` in chunks of ``batch_size``. The
+    run's completion status is recomputed once at transaction commit.
+
+    :param run: the run to add case runs.
+    :type run: TestRun
+    :param case_runs: the unsaved case runs. Run and the run's environment
+        are set to each of them. If build or status is not set, the run's
+        build and status IDLE are set.
+    :type case_runs: iterable[TestCaseRun]
+    :param int batch_size: the number of case runs created by one statement.
+    :return: the number of created case runs.
+    :rtype: int
+    """
+    idle_status_id = TestCaseRunStatus.name_to_id("IDLE")
+    count = 0
+    batch: list[TestCaseRun] = []
+
+    def flush():
+        nonlocal count
+        TestCaseRun.objects.bulk_create(batch)
+        count += len(batch)
+        batch.clear()
+
+    for case_run in case_runs:
+        case_run.run = run
+        case_run.environment_id = run.environment_id
+        if case_run.build_id is None:
+            case_run.build_id = run.build_id
+        if case_run.case_run_status_id is None:
+            case_run.case_run_status_id = idle_status_id
+        batch.append(case_run)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    mark_runs_dirty([run.pk])
+    return count
+
+
+class RunCloner:
+    """Clone runs with the same clone settings
+
+    :param int build_id: the build of the new runs and case runs.
+    :param product_version_id: if set, the product version of the new runs.
+        Otherwise, the product version of the original run is used.
+    :type product_version_id: int or None
+    :param manager_id: if set, the manager of the new runs. Otherwise, the
+        manager of the original run is used.
+    :type manager_id: int or None
+    :param default_tester_id: if set, the default tester of the new runs.
+        Otherwise, the default tester of the original run is used.
+    :type default_tester_id: int or None
+    :param bool update_case_text: whether to use the newest case text.
+    :param bool clone_cc: whether to clone the CC list.
+    :param bool clone_tag: whether to clone the tags.
+    :param int batch_size: the number of case runs created by one statement.
+    """
+
+    def __init__(
+        self,
+        build_id: int,
+        product_version_id: Optional[int] = None,
+        manager_id: Optional[int] = None,
+        default_tester_id: Optional[int] = None,
+        update_case_text: bool = False,
+        clone_cc: bool = False,
+        clone_tag: bool = False,
+        batch_size: int = CLONE_BATCH_SIZE,
+    ):
+        self.build_id = build_id
+        self.product_version_id = product_version_id
+        self.manager_id = manager_id
+        self.default_tester_id = default_tester_id
+        self.update_case_text = update_case_text
+        self.clone_cc = clone_cc
+        self.clone_tag = clone_tag
+        self.batch_size = batch_size
+
+    def clone(self, run: TestRun) -> TestRun:
+        """Clone a run
+
+        :param run: the run to clone.
+        :type run: TestRun
+        :return: the new run.
+        :rtype: TestRun
+        """
+        new_run = TestRun.objects.create(
+            product_version_id=self.product_version_id or run.product_version_id,
+            plan_text_version=run.plan_text_version,
+            summary=run.summary,
+            notes=run.notes,
+            estimated_time=run.estimated_time,
+            plan_id=run.plan_id,
+            build_id=self.build_id,
+            manager_id=self.manager_id or run.manager_id,
+            default_tester_id=self.default_tester_id or run.default_tester_id,
+        )
+
+        bulk_add_case_runs(new_run, self._iter_case_runs(run, new_run), self.batch_size)
+
+        TCMSEnvRunValueMap.objects.bulk_create(
+            TCMSEnvRunValueMap(run=new_run, value_id=value_id)
+            for value_id in set(run.env_value.values_list("pk", flat=True))
+        )
+        if self.clone_cc:
+            TestRunCC.objects.bulk_create(
+                TestRunCC(run=new_run, user_id=user_id)
+                for user_id in set(run.cc_list.values_list("user", flat=True))
+            )
+        if self.clone_tag:
+            TestRunTag.objects.bulk_create(
+                TestRunTag(run=new_run, tag_id=tag_id)
+                for tag_id in set(run.tags.values_list("tag", flat=True))
+            )
+        return new_run
+
+    def _iter_case_runs(self, run: TestRun, new_run: TestRun) -> Iterable[TestCaseRun]:
+        rows = (
+            union_case_runs(
+                lambda model: model.objects.filter(run=run).values_list(
+                    "case_run_id",
+                    "case",
+                    "assignee",
+                    "case_text_version",
+                    "notes",
+                    "sortkey",
+                    "case__default_tester",
+                    "case__current_text_version",
+                )
+            )
+            .order_by("case_run_id")
+            .iterator(chunk_size=self.batch_size)
+        )
+        for (
+            _,
+            case_id,
+            assignee_id,
+            case_text_version,
+            notes,
+            sortkey,
+            case_default_tester_id,
+            current_text_version,
+        ) in rows:
+            if self.update_case_text and current_text_version:
+                case_text_version = current_text_version
+            yield TestCaseRun(
+                case_id=case_id,
+                assignee_id=assignee_id or case_default_tester_id or new_run.default_tester_id,
+                case_text_version=case_text_version or current_text_version,
+                build_id=self.build_id,
+                notes=notes,
+                sortkey=sortkey,
+            )
+
+
+def get_clone_progress(job_id: str) -> Optional[dict[str, Any]]:
+    """Get the progress of cloning runs
+
+    :param str job_id: the job id returned from :func:`start_clone_runs`.
+    :return: the progress, or None if the job does not exist. The progress
+        is a mapping with keys ``total``, the number of runs to clone,
+        ``cloned_run_ids``, ids of the new runs, ``finished`` and ``error``.
+    :rtype: dict or None
+    """
+    return cache.get(CLONE_PROGRESS_KEY.format(job_id))
+
+
+def is_clone_progress_shared() -> bool:
+    """Check whether the progress of cloning runs is seen by all processes"""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], PROCESS_LOCAL_CACHES)
+
+
+def _set_clone_progress(job_id: str, progress: dict[str, Any]) -> None:
+    cache.set(CLONE_PROGRESS_KEY.format(job_id), progress, timeout=CLONE_PROGRESS_TIMEOUT)
+
+
+def clone_runs(run_ids: list[int], job_id: Optional[str] = None, **options) -> list[int]:
+    """Clone runs in one transaction
+
+    :param run_ids: ids of the runs to clone.
+    :type run_ids: list[int]
+    :param job_id: if set, the progress is updated after each run is cloned.
+    :type job_id: str or None
+    :param options: the clone settings passed to :class:`RunCloner`.
+    :return: ids of the new runs.
+    :rtype: list[int]
+    """
+    cloner = RunCloner(**options)
+    progress = {"total": len(run_ids), "cloned_run_ids": [], "finished": False, "error": None}
+    try:
+        with transaction.atomic():
+            for run in TestRun.objects.filter(pk__in=run_ids).order_by("pk"):
+                progress["cloned_run_ids"].append(cloner.clone(run).pk)
+                if job_id:
+                    _set_clone_progress(job_id, progress)
+    except Exception as e:
+        logger.exception("Failed to clone runs %r", run_ids)
+        progress.update(cloned_run_ids=[], error=str(e))
+        raise
+    finally:
+        progress["finished"] = True
+        if job_id:
+            _set_clone_progress(job_id, progress)
+    return progress["cloned_run_ids"]
+
+
+@Task
+def clone_runs_task(job_id: str, run_ids: list[int], options: dict[str, Any]) -> None:
+    """Clone runs as a background task"""
+    clone_runs(run_ids, job_id=job_id, **options)
+
+
+def start_clone_runs(run_ids: list[int], **options) -> str:
+    """Start to clone runs as a background task
+
+    Whether the task is run in background depends on ``ASYNC_TASK``. If the
+    progress is not shared by processes, the runs are cloned synchronously
+    instead, since the progress could be lost by the process serving the
+    progress page. The task could be finished already when this function
+    returns.
+
+    :param run_ids: ids of the runs to clone.
+    :type run_ids: list[int]
+    :param options: the clone settings passed to :class:`RunCloner`.
+    :return: the job id to get the progress.
+    :rtype: str
+    """
+    job_id = uuid.uuid4().hex
+    _set_clone_progress(
+        job_id, {"total": len(run_ids), "cloned_run_ids": [], "finished": False, "error": None}
+    )
+    if is_clone_progress_shared():
+        clone_runs_task(job_id, list(run_ids), options)
+    else:
+        clone_runs(list(run_ids), job_id=job_id, **options)
+    return job_id
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+"""Coordinate the recomputation of runs' completion status
+
+Adding, removing or updating case runs changes the completion status of the
+runs, that is whether a run with ``auto_update_run_status`` enabled is
+finished. Rather than recomputing a run's status after each case run is
+changed, runs are marked dirty by :func:`mark_runs_dirty` and recomputed at
+transaction commit. All dirty runs are recomputed together by one aggregate
+query, and only the ``stop_date`` is updated. The progress of the dirty runs
+is published to run pages by :mod:`tcms.testruns.progress` at the same time.
+
+When there is no transaction open, the runs are recomputed immediately.
+"""
+
+import threading
+from collections.abc import Iterable
+from datetime import datetime
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, Q
+
+from tcms.testruns.archive import is_archive_enabled
+from tcms.testruns.models import TestCaseRunArchive, TestCaseRunStatus, TestRun
+from tcms.testruns.progress import publish_runs_progress
+
+__all__ = (
+    "mark_runs_dirty",
+    "update_runs_completion_status",
+)
+
+_local = threading.local()
+
+
+def _get_dirty_run_ids(using: str) -> set[int]:
+    dirty = getattr(_local, "dirty", None)
+    if dirty is None:
+        dirty = _local.dirty = {}
+    return dirty.setdefault(using, set())
+
+
+def update_runs_completion_status(run_ids: Iterable[int], using: str = DEFAULT_DB_ALIAS) -> None:
+    """Recompute the completion status of runs
+
+    A run with ``auto_update_run_status`` enabled is finished if it has case
+    runs and all of them are complete. The ``stop_date`` of a finished run is
+    set to now, otherwise it is cleared. Archived case runs are counted as
+    well if archival is enabled.
+
+    :param run_ids: ids of the runs to recompute. Runs with
+        ``auto_update_run_status`` disabled are skipped.
+    :type run_ids: iterable[int]
+    :param str using: the database alias.
+    """
+    run_ids = list(run_ids)
+    if not run_ids:
+        return
+    complete_status_ids = TestCaseRunStatus.completed_status_ids()
+    rows = (
+        TestRun.objects.using(using)
+        .filter(pk__in=run_ids, auto_update_run_status=True)
+        .annotate(
+            total=Count("case_run"),
+            completed=Count(
+                "case_run", filter=Q(case_run__case_run_status__in=complete_status_ids)
+            ),
+        )
+        .values_list("pk", "total", "completed")
+    )
+    counts = {run_id: [total, completed] for run_id, total, completed in rows}
+    if counts and is_archive_enabled():
+        # Counted by another query, since joining both tables multiplies rows.
+        archived_rows = (
+            TestCaseRunArchive.objects.using(using)
+            .filter(run__in=list(counts))
+            .values("run")
+            .annotate(
+                total=Count("pk"),
+                completed=Count("pk", filter=Q(case_run_status__in=complete_status_ids)),
+            )
+            .values_list("run", "total", "completed")
+        )
+        for run_id, total, completed in archived_rows:
+            counts[run_id][0] += total
+            counts[run_id][1] += completed
+    finished, unfinished = [], []
+    for run_id, (total, completed) in counts.items():
+        (finished if total and total == completed else unfinished).append(run_id)
+    runs = TestRun.objects.using(using)
+    if finished:
+        runs.filter(pk__in=finished).update(stop_date=datetime.now())
+    if unfinished:
+        runs.filter(pk__in=unfinished, stop_date__isnull=False).update(stop_date=None)
+
+
+def _flush(using: str) -> None:
+    dirty = _get_dirty_run_ids(using)
+    if dirty:
+        run_ids = list(dirty)
+        dirty.clear()
+        update_runs_completion_status(run_ids, using=using)
+        publish_runs_progress(run_ids)
+
+
+def mark_runs_dirty(run_ids: Iterable[int], using: str = DEFAULT_DB_ALIAS) -> None:
+    """Mark runs to recompute their completion status at transaction commit
+
+    Runs marked in a transaction are recomputed together once the transaction
+    is committed. Runs marked in a transaction rolled back are left dirty and
+    recomputed at the next commit, which is harmless since the status is
+    always recomputed from the data in the database.
+
+    :param run_ids: ids of the runs.
+    :type run_ids: iterable[int]
+    :param str using: the database alias.
+    """
+    dirty = _get_dirty_run_ids(using)
+    dirty.update(run_ids)
+    # The first callback run at commit recomputes all the dirty runs, and the
+    # others do nothing. A callback is registered for each call since those
+    # registered in a rolled back transaction are discarded.
+    transaction.on_commit(lambda: _flush(using), using=using)
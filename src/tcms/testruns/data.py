@@ -1,13 +1,16 @@
 # -*- coding: utf-8 -*-
 
-from itertools import groupby
+from itertools import chain, groupby
 from operator import itemgetter
 
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.db.models import Count, F, QuerySet
+from django_comments.models import Comment
 
 from tcms.core.db import CaseRunStatusGroupByResult
-from tcms.testruns.models import TestCaseRun, TestCaseRunStatus
+from tcms.testruns.archive import get_case_run_models, is_archive_enabled
+from tcms.testruns.models import TestCaseRun, TestCaseRunArchive, TestCaseRunStatus
 
 
 def stats_case_runs_status(run_ids: list[int]) -> dict[int, CaseRunStatusGroupByResult]:
@@ -16,13 +19,17 @@ def stats_case_runs_status(run_ids: list[int]) -> dict[int, CaseRunStatusGroupBy
     :param list[int] run_ids: id of test run from where to get statistics
     :return: the statistics including the number of each status mapping,
         total number of case runs, complete percent, and failure percent.
+        Archived case runs are counted as well if archival is enabled.
     :rtype: dict[int, CaseRunStatusGroupByResult]
     """
-    result = (
-        TestCaseRun.objects.filter(run__in=run_ids)
-        .values("run_id", status_name=F("case_run_status__name"))
-        .annotate(count=Count("pk"))
-        .order_by("run_id", "status_name")
+    result = list(
+        chain.from_iterable(
+            model.objects.filter(run__in=run_ids)
+            .values("run_id", status_name=F("case_run_status__name"))
+            .annotate(count=Count("pk"))
+            .order_by("run_id", "status_name")
+            for model in get_case_run_models()
+        )
     )
 
     # Example of final result: {
@@ -39,7 +46,10 @@ def stats_case_runs_status(run_ids: list[int]) -> dict[int, CaseRunStatusGroupBy
         for groupby_result in result:
             run_id = groupby_result["run_id"]
             status_subtotal = subtotal.setdefault(run_id, CaseRunStatusGroupByResult())
-            status_subtotal[groupby_result["status_name"]] = groupby_result["count"]
+            status_name = groupby_result["status_name"]
+            status_subtotal[status_name] = (
+                status_subtotal.get(status_name, 0) + groupby_result["count"]
+            )
     else:
         subtotal = {run_id: CaseRunStatusGroupByResult() for run_id in run_ids}
 
@@ -61,6 +71,8 @@ class TestCaseRunDataMixin:
     def get_caseruns_comments(self, run_pk):
         """Get case runs' comments
 
+        Comments of the archived case runs are included if archival is enabled.
+
         :param int run_pk: run's pk whose comments will be retrieved.
         :return: the mapping between case run id and comments
         :rtype: dict
@@ -86,7 +98,30 @@ class TestCaseRunDataMixin:
             .order_by("pk")
         )
 
-        return {
+        comments = {
             case_run_id: list(comments)
             for case_run_id, comments in groupby(qs, itemgetter("case_run_id"))
         }
+
+        if is_archive_enabled():
+            # Comments are still associated with the archived case runs by
+            # the content type of TestCaseRun and their ids.
+            archived_case_run_ids = TestCaseRunArchive.objects.filter(run=run_pk).values_list(
+                "pk", flat=True
+            )
+            archived_comments = (
+                Comment.objects.filter(
+                    content_type=ContentType.objects.get_for_model(TestCaseRun),
+                    object_pk__in=[str(pk) for pk in archived_case_run_ids],
+                    site=settings.SITE_ID,
+                    is_public=True,
+                    is_removed=False,
+                )
+                .values("object_pk", "submit_date", "comment", "user_name")
+                .order_by("pk")
+            )
+            for item in archived_comments:
+                case_run_id = int(item.pop("object_pk"))
+                comments.setdefault(case_run_id, []).append({"case_run_id": case_run_id, **item})
+
+        return comments
@@ -0,0 +1,85 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("management", "0011_set_bigautofield"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("testcases", "0013_add_latest_text_pointer"),
+        ("testruns", "0009_set_bigautofield"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TestCaseRunArchive",
+            fields=[
+                ("case_run_id", models.IntegerField(primary_key=True, serialize=False)),
+                ("case_text_version", models.IntegerField()),
+                ("running_date", models.DateTimeField(blank=True, null=True)),
+                ("close_date", models.DateTimeField(blank=True, null=True)),
+                ("notes", models.TextField(blank=True, null=True)),
+                ("sortkey", models.IntegerField(blank=True, null=True)),
+                ("environment_id", models.IntegerField(default=0)),
+                (
+                    "assignee",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "build",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="management.testbuild",
+                    ),
+                ),
+                (
+                    "case",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_case_runs",
+                        to="testcases.testcase",
+                    ),
+                ),
+                (
+                    "case_run_status",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="testruns.testcaserunstatus",
+                    ),
+                ),
+                (
+                    "run",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_case_runs",
+                        to="testruns.testrun",
+                    ),
+                ),
+                (
+                    "tested_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "test_case_runs_archive",
+            },
+        ),
+    ]
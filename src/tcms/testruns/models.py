@@ -6,12 +6,14 @@ from typing import Any, Optional
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericRelation
+from django.core.exceptions import FieldError
 from django.db import models
 from django.db.models import Count, Q, QuerySet
 from django.db.models.signals import post_delete, post_save, pre_save
 from django.urls import reverse
 from django_comments.models import Comment
 
+from tcms.core.db import Subtotal, SubtotalCounter
 from tcms.core.models import TCMSActionModel
 from tcms.core.models.fields import DurationField
 from tcms.core.tcms_router import connection
@@ -78,15 +80,26 @@ class TestRun(TCMSActionModel):
         return self.summary
 
     @classmethod
-    def to_xmlrpc(cls, query=None):
+    def to_xmlrpc(cls, query=None, fields=None):
         from tcms.xmlrpc.serializer import TestRunXMLRPCSerializer
         from tcms.xmlrpc.utils import distinct_filter
 
         _query = query or {}
         qs = distinct_filter(TestRun, _query).order_by("pk")
-        s = TestRunXMLRPCSerializer(model_class=cls, queryset=qs)
+        s = TestRunXMLRPCSerializer(model_class=cls, queryset=qs, fields=fields)
         return s.serialize_queryset()
 
+    @classmethod
+    def subtotal(cls, cases_count: bool = False) -> Subtotal:
+        """Get the subtotal of selected counters of runs
+
+        :param bool cases_count: count the case runs of each run.
+        """
+        counters = {}
+        if cases_count:
+            counters["cases_count"] = SubtotalCounter("testruns.TestCaseRun", "run")
+        return Subtotal(**counters)
+
     @classmethod
     def search(cls, query: dict) -> QuerySet:
         conditions = []
@@ -190,7 +203,7 @@ class TestRun(TCMSActionModel):
     ):
         _case_text_version = case_text_version
         if not _case_text_version:
-            _case_text_version = case.latest_text(text_required=False).case_text_version
+            _case_text_version = case.latest_text_version()
 
         _assignee = (
             assignee
@@ -230,11 +243,7 @@ class TestRun(TCMSActionModel):
         return TCMSEnvRunValueMap.objects.get_or_create(run=self, value=env_value)
 
     def remove_tag(self, tag: TestTag) -> None:
-        cursor = connection.writer_cursor
-        cursor.execute(
-            "DELETE from test_run_tags WHERE run_id = %s AND tag_id = %s",
-            (self.pk, tag.pk),
-        )
+        TestRunTag.objects.filter(run=self, tag=tag).delete()
 
     def remove_cc(self, user):
         cursor = connection.writer_cursor
@@ -417,6 +426,9 @@ class TestCaseRun(TCMSActionModel):
     links = GenericRelation(LinkReference, object_id_field="object_pk")
     comments = GenericRelation(Comment, object_id_field="object_pk")
 
+    # Whether it is read from the archive. See also tcms.testruns.archive.
+    is_archived = False
+
     class Meta:
         db_table = "test_case_runs"
         unique_together = ("case", "run", "case_text_version")
@@ -425,13 +437,24 @@ class TestCaseRun(TCMSActionModel):
         return f"{self.pk}: {self.case_id}"
 
     @classmethod
-    def to_xmlrpc(cls, query={}):
+    def to_xmlrpc(cls, query={}, fields=None):
+        from tcms.testruns.archive import get_case_run_models
         from tcms.xmlrpc.serializer import TestCaseRunXMLRPCSerializer
         from tcms.xmlrpc.utils import distinct_filter
 
-        qs = distinct_filter(TestCaseRun, query).order_by("pk")
-        s = TestCaseRunXMLRPCSerializer(model_class=cls, queryset=qs)
-        return s.serialize_queryset()
+        result = []
+        for model in get_case_run_models():
+            try:
+                qs = distinct_filter(model, query).order_by("pk")
+            except FieldError:
+                if model is TestCaseRun:
+                    raise
+                # Archived case runs have no relationship like issues and
+                # comments, so they never match criteria over them.
+                continue
+            s = TestCaseRunXMLRPCSerializer(model_class=model, queryset=qs, fields=fields)
+            result.extend(s.serialize_queryset())
+        return result
 
     @staticmethod
     def mail_scene(
@@ -564,12 +587,46 @@ class TestCaseRun(TCMSActionModel):
         return (prev, next)
 
     def latest_text(self):
-        try:
-            return TestCaseText.objects.filter(case__case_id=self.case_id).order_by(
-                "-case_text_version"
-            )[0]
-        except IndexError:
-            return NoneText
+        return TestCaseText.objects.filter(latest_of_case=self.case_id).first() or NoneText
+
+
+class TestCaseRunArchive(models.Model):
+    """Case runs moved out of ``test_case_runs`` by archival
+
+    It has the same columns as :class:`TestCaseRun` and the archived case runs
+    keep their ids. See also :mod:`tcms.testruns.archive`.
+    """
+
+    case_run_id = models.IntegerField(primary_key=True)
+    case_text_version = models.IntegerField()
+    running_date = models.DateTimeField(null=True, blank=True)
+    close_date = models.DateTimeField(null=True, blank=True)
+    notes = models.TextField(null=True, blank=True)
+    sortkey = models.IntegerField(null=True, blank=True)
+    environment_id = models.IntegerField(default=0)
+
+    assignee = models.ForeignKey(
+        "auth.User", blank=True, null=True, related_name="+", on_delete=models.SET_NULL
+    )
+    tested_by = models.ForeignKey(
+        "auth.User", blank=True, null=True, related_name="+", on_delete=models.SET_NULL
+    )
+    run = models.ForeignKey(TestRun, related_name="archived_case_runs", on_delete=models.CASCADE)
+    case = models.ForeignKey(
+        "testcases.TestCase", related_name="archived_case_runs", on_delete=models.CASCADE
+    )
+    case_run_status = models.ForeignKey(
+        TestCaseRunStatus, related_name="+", on_delete=models.CASCADE
+    )
+    build = models.ForeignKey("management.TestBuild", related_name="+", on_delete=models.CASCADE)
+
+    is_archived = True
+
+    class Meta:
+        db_table = "test_case_runs_archive"
+
+    def __str__(self):
+        return f"{self.pk}: {self.case_id}"
 
 
 class TestRunTag(models.Model):
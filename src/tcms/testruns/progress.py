@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+"""Push the progress of runs to run pages by Server-Sent Events
+
+When case runs of a run are added, removed or their status is changed, the
+run is marked dirty by :func:`tcms.testruns.completion.mark_runs_dirty`. At
+transaction commit, :func:`publish_runs_progress` computes the progress of all
+the dirty runs once and publishes a snapshot of each run into the default
+cache, including the difference from the previous snapshot.
+
+Run pages watch the progress through :func:`iter_progress_events`, which only
+reads the snapshot from the cache, so that the number of watchers does not
+add load to the database.
+
+Note that, the default cache must be shared by all processes serving Nitrate,
+otherwise watchers could not get the progress published by other processes.
+"""
+
+import json
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from tcms.issuetracker.models import Issue
+from tcms.testruns.data import stats_case_runs_status
+
+__all__ = (
+    "get_run_progress",
+    "publish_runs_progress",
+    "iter_progress_events",
+)
+
+RUN_PROGRESS_KEY = "tcms.run_progress.{}"
+# Seconds to keep a snapshot after the last change.
+RUN_PROGRESS_TIMEOUT = 24 * 3600
+# Send a comment periodically to keep the connection open through proxies.
+KEEPALIVE_INTERVAL = 15
+
+
+def get_run_progress(run_id: int) -> Optional[dict[str, Any]]:
+    """Get the last published progress of a run
+
+    :param int run_id: the run id.
+    :return: the progress, or None if no progress is published. The progress
+        is a mapping with keys ``id``, which increases with each publish,
+        ``statuses``, mapping from status name to the number of case runs,
+        ``delta``, the changes of ``statuses`` since the previous publish,
+        ``total``, ``complete_percent``, ``failure_percent_in_complete`` and
+        ``issues_count``.
+    :rtype: dict or None
+    """
+    return cache.get(RUN_PROGRESS_KEY.format(run_id))
+
+
+def publish_runs_progress(run_ids: Iterable[int]) -> None:
+    """Compute and publish the progress of runs
+
+    Nothing is done if ``RUN_PROGRESS_STREAM_TIMEOUT`` is 0.
+
+    :param run_ids: ids of the runs.
+    :type run_ids: iterable[int]
+    """
+    if not settings.RUN_PROGRESS_STREAM_TIMEOUT:
+        return
+    run_ids = list(run_ids)
+    if not run_ids:
+        return
+    stats = stats_case_runs_status(run_ids)
+    issues_counts = dict(
+        Issue.objects.filter(case_run__run__in=run_ids)
+        .values("case_run__run")
+        .annotate(count=Count("issue_key", distinct=True))
+        .order_by("case_run__run")
+        .values_list("case_run__run", "count")
+    )
+    keys = {RUN_PROGRESS_KEY.format(run_id): run_id for run_id in run_ids}
+    previous = cache.get_many(keys.keys())
+    progress_id = time.time_ns()
+
+    published = {}
+    for key, run_id in keys.items():
+        status_stats = stats.get(run_id)
+        if status_stats is None:
+            # The run has no case run.
+            status_stats = stats_case_runs_status([run_id])[run_id]
+        statuses = dict(status_stats)
+        last_statuses = previous[key]["statuses"] if key in previous else {}
+        published[key] = {
+            "id": progress_id,
+            "statuses": statuses,
+            "delta": {
+                name: count - last_statuses.get(name, 0)
+                for name, count in statuses.items()
+                if count != last_statuses.get(name, 0)
+            },
+            "total": status_stats.total,
+            "complete_percent": status_stats.complete_percent,
+            "failure_percent_in_complete": status_stats.failure_percent_in_complete,
+            "issues_count": issues_counts.get(run_id, 0),
+        }
+    cache.set_many(published, timeout=RUN_PROGRESS_TIMEOUT)
+
+
+def format_event(progress: dict[str, Any]) -> str:
+    return f"id: {progress['id']}\nevent: progress\ndata: {json.dumps(progress)}\n\n"
+
+
+def iter_progress_events(
+    run_id: int,
+    last_event_id: Optional[str] = None,
+    timeout: Optional[float] = None,
+    poll_interval: Optional[float] = None,
+) -> Iterator[str]:
+    """Generate Server-Sent Events of a run's progress
+
+    Each time a new progress is published, an event ``progress`` is sent whose
+    data is the progress returned from :func:`get_run_progress` in JSON.
+
+    :param int run_id: the run id.
+    :param last_event_id: the id of the last event the client received. If
+        omitted, the progress published already is not sent since the client
+        has the current progress from the page.
+    :type last_event_id: str or None
+    :param timeout: seconds to stop generating events, after which client
+        reconnects. Defaults to ``RUN_PROGRESS_STREAM_TIMEOUT``.
+    :type timeout: float or None
+    :param poll_interval: seconds to check the published progress. Defaults
+        to ``RUN_PROGRESS_POLL_INTERVAL``.
+    :type poll_interval: float or None
+    :return: an iterator of events.
+    """
+    if timeout is None:
+        timeout = settings.RUN_PROGRESS_STREAM_TIMEOUT
+    if poll_interval is None:
+        poll_interval = settings.RUN_PROGRESS_POLL_INTERVAL
+
+    # Let client wait for the poll interval before reconnecting.
+    yield f"retry: {int(poll_interval * 1000)}\n\n"
+
+    progress = get_run_progress(run_id)
+    if last_event_id is None:
+        sent_id = progress["id"] if progress else None
+    else:
+        sent_id = int(last_event_id) if last_event_id.isdigit() else None
+
+    started = last_sent = time.monotonic()
+    while True:
+        if progress is not None and progress["id"] != sent_id:
+            sent_id = progress["id"]
+            last_sent = time.monotonic()
+            yield format_event(progress)
+        elif time.monotonic() - last_sent >= KEEPALIVE_INTERVAL:
+            last_sent = time.monotonic()
+            yield ": keepalive\n\n"
+        if time.monotonic() - started >= timeout:
+            break
+        time.sleep(poll_interval)
+        progress = get_run_progress(run_id)
@@ -29,23 +29,22 @@ def mail_notify_on_test_run_creation_or_update(sender, **kwargs):
 
 
 def post_case_run_saved(sender, *args, **kwargs):
-    instance = kwargs["instance"]
     if kwargs.get("created"):
-        tr = instance.run
-        tr.update_completion_status(is_auto_updated=True)
+        from tcms.testruns.completion import mark_runs_dirty
+
+        mark_runs_dirty([kwargs["instance"].run_id], using=kwargs["using"])
 
 
 def post_case_run_deleted(sender, **kwargs):
-    instance = kwargs["instance"]
-    tr = instance.run
-    tr.update_completion_status(is_auto_updated=True)
+    from tcms.testruns.completion import mark_runs_dirty
+
+    mark_runs_dirty([kwargs["instance"].run_id], using=kwargs["using"])
 
 
 def post_update_handler(sender, **kwargs):
-    instances = kwargs["instances"]
-    instance = instances[0]
-    tr = instance.run
-    tr.update_completion_status(is_auto_updated=True)
+    from tcms.testruns.completion import mark_runs_dirty
+
+    mark_runs_dirty({instance.run_id for instance in kwargs["instances"]})
 
 
 def pre_save_clean(sender, **kwargs):
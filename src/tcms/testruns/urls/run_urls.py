@@ -42,4 +42,5 @@ urlpatterns = [
         views.RunStatisticsView.as_view(),
         name="run-statistics",
     ),
+    path("<int:run_id>/progress/", views.progress_stream, name="run-progress-stream"),
 ]
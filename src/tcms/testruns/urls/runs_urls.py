@@ -7,6 +7,7 @@ from .. import views
 urlpatterns = [
     path("", views.search_runs, name="runs-all"),
     path("clone/", views.clone, name="runs-clone"),
+    path("clone/<str:job_id>/", views.clone_progress, name="runs-clone-progress"),
     path(
         "env_value/add/",
         views.AddEnvValueToRunView.as_view(),
@@ -9,6 +9,7 @@ import operator
 import time
 import urllib
 from operator import attrgetter, itemgetter
+from typing import Any
 
 from django.conf import settings
 from django.contrib.auth.decorators import permission_required
@@ -16,9 +17,14 @@ from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import transaction
 from django.db.models import Count, Q, QuerySet
-from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, render
 from django.template.loader import get_template
 from django.urls import reverse
@@ -30,9 +36,8 @@ from django.views.generic.base import TemplateView, View
 from django_comments.models import Comment
 
 from tcms.comments.models import add_comment
-from tcms.core.raw_sql import RawSQL
+from tcms.core.db import cached_count, reorder_sortkeys
 from tcms.core.responses import JsonResponseBadRequest
-from tcms.core.tcms_router import connection
 from tcms.core.utils import (
     DataTableResult,
     clean_request,
@@ -43,9 +48,11 @@ from tcms.core.views import prompt
 from tcms.issuetracker.models import Issue, IssueTracker
 from tcms.issuetracker.services import find_service
 from tcms.management.models import Priority, TCMSEnvGroup, TestTag
-from tcms.testcases.models import TestCase, TestCasePlan, TestCaseStatus
+from tcms.testcases.models import NoneText, TestCase, TestCasePlan, TestCaseStatus
 from tcms.testcases.views import get_selected_testcases
 from tcms.testplans.models import TestPlan
+from tcms.testruns.archive import list_case_runs
+from tcms.testruns.clone import bulk_add_case_runs, get_clone_progress, start_clone_runs
 from tcms.testruns.data import TestCaseRunDataMixin, stats_case_runs_status
 from tcms.testruns.forms import (
     ChangeRunEnvValueForm,
@@ -60,6 +67,7 @@ from tcms.testruns.forms import (
 )
 from tcms.testruns.helpers.serializer import TCR2File
 from tcms.testruns.models import TCMSEnvRunValueMap, TestCaseRun, TestCaseRunStatus, TestRun
+from tcms.testruns.progress import iter_progress_events
 
 MODULE_NAME = "testruns"
 
@@ -93,7 +101,7 @@ def new(request, template_name="run/new.html"):
     # FIXME: optimize this query, only get necessary columns, not all fields
     # are necessary
     tp = TestPlan.objects.select_related().get(plan_id=plan_id)
-    tcrs = TestCaseRun.objects.filter(case_run_id__in=request.POST.getlist("case_run_id"))
+    case_run_ids = request.POST.getlist("case_run_id")
 
     num_unconfirmed_cases = tcs.exclude(case_status=confirm_status).count()
     estimated_time = datetime.timedelta(seconds=0)
@@ -146,45 +154,50 @@ def new(request, template_name="run/new.html"):
             except ObjectDoesNotExist:
                 assignee_tester = None
 
-            loop = 1
+            def new_case_run(case, sortkey, assignee_id=None, case_run_status_id=None):
+                return TestCaseRun(
+                    case=case,
+                    assignee_id=assignee_id or case.default_tester_id or tr.default_tester_id,
+                    case_run_status_id=case_run_status_id,
+                    case_text_version=case.current_text_version,
+                    sortkey=sortkey,
+                )
+
+            new_case_runs = []
 
             # not reserve assignee and status, assignee will default set to
             # default_tester
             if not keep_assign and not keep_status:
-                for case in form.cleaned_data["case"]:
-                    try:
-                        tcp = TestCasePlan.objects.get(plan=tp, case=case)
-                        sortkey = tcp.sortkey
-                    except ObjectDoesNotExist:
-                        sortkey = loop * 10
-
-                    tr.add_case_run(case=case, sortkey=sortkey, assignee=assignee_tester)
-                    loop += 1
-
-            # Add case to the run
-            for tcr in tcrs:
-                if keep_status and keep_assign:
-                    tr.add_case_run(
-                        case=tcr.case,
-                        assignee=tcr.assignee,
-                        case_run_status=tcr.case_run_status,
-                        sortkey=tcr.sortkey or loop * 10,
+                cases = form.cleaned_data["case"]
+                sortkeys = dict(
+                    TestCasePlan.objects.filter(plan=tp, case__in=cases).values_list(
+                        "case", "sortkey"
                     )
-                    loop += 1
-                elif keep_status and not keep_assign:
-                    tr.add_case_run(
-                        case=tcr.case,
-                        case_run_status=tcr.case_run_status,
-                        sortkey=tcr.sortkey or loop * 10,
+                )
+                for loop, case in enumerate(cases, 1):
+                    new_case_runs.append(
+                        new_case_run(
+                            case,
+                            sortkeys[case.pk] if case.pk in sortkeys else loop * 10,
+                            assignee_id=assignee_tester and assignee_tester.pk,
+                        )
                     )
-                    loop += 1
-                elif keep_assign and not keep_status:
-                    tr.add_case_run(
-                        case=tcr.case,
-                        assignee=tcr.assignee,
-                        sortkey=tcr.sortkey or loop * 10,
+            else:
+                # Add case to the run
+                tcrs = list_case_runs(
+                    lambda model: model.objects.filter(pk__in=case_run_ids).select_related("case")
+                )
+                for loop, tcr in enumerate(tcrs, 1):
+                    new_case_runs.append(
+                        new_case_run(
+                            tcr.case,
+                            tcr.sortkey or loop * 10,
+                            assignee_id=tcr.assignee_id if keep_assign else None,
+                            case_run_status_id=tcr.case_run_status_id if keep_status else None,
+                        )
                     )
-                    loop += 1
+
+            bulk_add_case_runs(tr, new_case_runs)
 
             # Write the values into tcms_env_run_value_map table
             env_property_id_set = set(request.POST.getlist("env_property_id"))
@@ -332,7 +345,6 @@ def search_runs(request):
                 "stop_date",
                 "product_version__value",
             )
-            .extra(select={"cases_count": RawSQL.total_num_caseruns})
         )
 
     column_names = [
@@ -349,7 +361,13 @@ def search_runs(request):
         "completed",
     ]
 
-    dt = DataTableResult(request.GET, runs, column_names, default_order_key="-pk")
+    dt = DataTableResult(
+        request.GET,
+        runs,
+        column_names,
+        default_order_key="-pk",
+        subtotal=TestRun.subtotal(cases_count=True),
+    )
     response_data = dt.get_response_data()
     calculate_associated_data(response_data["querySet"])
 
@@ -365,7 +383,7 @@ def search_runs(request):
                 "sub_module": "runs",
                 "object_list": response_data["querySet"],
                 "search_form": search_form,
-                "total_count": runs.count(),
+                "total_count": cached_count(runs),
             },
         )
 
@@ -550,30 +568,32 @@ def open_run_get_case_runs(request, run):
 
     This is an internal method. Do not call this directly.
     """
-    tcrs = run.case_run.select_related("run", "case", "case__priority", "case__category")
-    tcrs = tcrs.only(
-        "run__run_id",
-        "run__plan",
-        "case_run_status",
-        "assignee",
-        "tested_by",
-        "case_text_version",
-        "sortkey",
-        "case__summary",
-        "case__is_automated_proposed",
-        "case__is_automated",
-        "case__priority",
-        "case__category__name",
-    )
-    # Continue to search the case runs with conditions
-    # 4. case runs preparing for render case runs table
-    tcrs = tcrs.filter(**clean_request(request))
+
+    def build_case_runs(model):
+        tcrs = model.objects.filter(run=run).select_related(
+            "run", "case", "case__priority", "case__category"
+        )
+        tcrs = tcrs.only(
+            "run__run_id",
+            "run__plan",
+            "case_run_status",
+            "assignee",
+            "tested_by",
+            "case_text_version",
+            "sortkey",
+            "case__summary",
+            "case__is_automated_proposed",
+            "case__is_automated",
+            "case__priority",
+            "case__category__name",
+        )
+        # Continue to search the case runs with conditions
+        # 4. case runs preparing for render case runs table
+        return tcrs.filter(**clean_request(request))
+
     order_by = request.GET.get("order_by")
-    if order_by:
-        tcrs = tcrs.order_by(order_by)
-    else:
-        tcrs = tcrs.order_by("sortkey", "pk")
-    return tcrs
+    # Archived case runs are listed as well.
+    return list_case_runs(build_case_runs, [order_by] if order_by else ["sortkey", "pk"])
 
 
 def open_run_get_comments_subtotal(case_run_ids):
@@ -621,6 +641,26 @@ class RunStatisticsView(TemplateView):
         return data
 
 
+@require_GET
+def progress_stream(request, run_id):
+    """Push the progress of a run by Server-Sent Events
+
+    The stream is open for ``RUN_PROGRESS_STREAM_TIMEOUT`` seconds, after
+    which the browser reconnects with the id of the last received event.
+    """
+    if not settings.RUN_PROGRESS_STREAM_TIMEOUT:
+        raise Http404("Run progress stream is disabled.")
+    get_object_or_404(TestRun.objects.only("pk"), pk=run_id)
+    response = StreamingHttpResponse(
+        iter_progress_events(run_id, request.headers.get("Last-Event-ID")),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # Disable the response buffering of nginx.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 @require_GET
 def get(request, run_id, template_name="run/get.html"):
     """Display testrun's detail"""
@@ -790,8 +830,8 @@ class TestRunReportView(TemplateView, TestCaseRunDataMixin):
         """
         run_id = int(self.kwargs["run_id"])
         run = TestRun.objects.select_related("manager", "plan").get(pk=run_id)
-        case_runs = (
-            TestCaseRun.objects.filter(run=run)
+        case_runs = list_case_runs(
+            lambda model: model.objects.filter(run=run)
             .select_related("case_run_status", "case", "tested_by", "case__category")
             .only(
                 "close_date",
@@ -879,7 +919,10 @@ def new_run_with_caseruns(request, run_id, template_name="run/clone.html"):
     tr = get_object_or_404(TestRun, run_id=run_id)
 
     if request.POST.get("case_run"):
-        tcrs = tr.case_run.filter(pk__in=request.POST.getlist("case_run"))
+        case_run_ids = request.POST.getlist("case_run")
+        tcrs = list_case_runs(
+            lambda model: model.objects.filter(run=tr, pk__in=case_run_ids).select_related("case")
+        )
     else:
         tcrs = []
 
@@ -936,7 +979,7 @@ def clone(request, template_name="run/clone.html"):
     # Generate the clone run page for one run
     if trs.count() == 1 and not req_data.get("submit"):
         tr = trs[0]
-        tcrs = tr.case_run.all()
+        tcrs = list_case_runs(lambda model: model.objects.filter(run=tr).select_related("case"))
         form = RunCloneForm(
             initial={
                 "summary": tr.summary,
@@ -967,69 +1010,23 @@ def clone(request, template_name="run/clone.html"):
         form = MulitpleRunsCloneForm(request.POST)
         form.populate(trs=trs, product_id=request.POST.get("product"))
         if form.is_valid():
-            for tr in trs:
-                n_tr = TestRun.objects.create(
-                    product_version=form.cleaned_data["product_version"],
-                    plan_text_version=tr.plan_text_version,
-                    summary=tr.summary,
-                    notes=tr.notes,
-                    estimated_time=tr.estimated_time,
-                    plan=tr.plan,
-                    build=form.cleaned_data["build"],
-                    manager=(
-                        form.cleaned_data["update_manager"]
-                        and form.cleaned_data["manager"]
-                        or tr.manager
-                    ),
-                    default_tester=(
-                        form.cleaned_data["update_default_tester"]
-                        and form.cleaned_data["default_tester"]
-                        or tr.default_tester
-                    ),
-                )
-
-                for tcr in tr.case_run.all():
-                    if form.cleaned_data["update_case_text"]:
-                        text_versions = list(tcr.get_text_versions())
-                        if text_versions:
-                            case_text_version = text_versions[-1]
-                        else:
-                            case_text_version = tcr.case_text_version
-                    else:
-                        case_text_version = tcr.case_text_version
-
-                    n_tr.add_case_run(
-                        case=tcr.case,
-                        assignee=tcr.assignee,
-                        case_text_version=case_text_version,
-                        build=form.cleaned_data["build"],
-                        notes=tcr.notes,
-                        sortkey=tcr.sortkey,
-                    )
-
-                for env_value in tr.env_value.all():
-                    n_tr.add_env_value(env_value)
-
-                if form.cleaned_data["clone_cc"]:
-                    for cc in tr.cc.all():
-                        n_tr.add_cc(user=cc)
-
-                if form.cleaned_data["clone_tag"]:
-                    for tag in tr.tag.all():
-                        n_tr.add_tag(tag=tag)
-
-            if len(trs) == 1:
-                return HttpResponseRedirect(reverse("run-get", args=[n_tr.pk]))
-
-            params = {
-                "product": form.cleaned_data["product"].pk,
-                "product_version": form.cleaned_data["product_version"].pk,
-                "build": form.cleaned_data["build"].pk,
-            }
-
-            return HttpResponseRedirect(
-                "{}?{}".format(reverse("runs-all"), urllib.parse.urlencode(params, True))
+            data = form.cleaned_data
+            manager = data["update_manager"] and data["manager"]
+            default_tester = data["update_default_tester"] and data["default_tester"]
+            job_id = start_clone_runs(
+                list(trs.values_list("pk", flat=True)),
+                build_id=data["build"].pk,
+                product_version_id=data["product_version"] and data["product_version"].pk,
+                manager_id=manager.pk if manager else None,
+                default_tester_id=default_tester.pk if default_tester else None,
+                update_case_text=data["update_case_text"],
+                clone_cc=data["clone_cc"],
+                clone_tag=data["clone_tag"],
             )
+            progress = get_clone_progress(job_id)
+            if progress and progress["finished"]:
+                return HttpResponseRedirect(get_cloned_runs_url(progress))
+            return HttpResponseRedirect(reverse("runs-clone-progress", args=[job_id]))
     else:
         form = MulitpleRunsCloneForm(
             initial={
@@ -1055,13 +1052,47 @@ def clone(request, template_name="run/clone.html"):
     return render(request, template_name, context=context_data)
 
 
+def get_cloned_runs_url(progress: dict[str, Any]) -> str:
+    """Get the URL to show the runs cloned by a finished clone job"""
+    run_ids = progress["cloned_run_ids"]
+    if len(run_ids) == 1:
+        return reverse("run-get", args=[run_ids[0]])
+    params = {}
+    run = TestRun.objects.filter(pk__in=run_ids).select_related("build").first()
+    if run is not None:
+        params = {
+            "product": run.build.product_id,
+            "product_version": run.product_version_id,
+            "build": run.build_id,
+        }
+    return "{}?{}".format(reverse("runs-all"), urllib.parse.urlencode(params, True))
+
+
+@require_GET
+def clone_progress(request, job_id, template_name="run/clone_progress.html"):
+    """Show the progress of cloning runs
+
+    The page is refreshed until all runs are cloned, then it is redirected to
+    the cloned runs.
+    """
+    progress = get_clone_progress(job_id)
+    if progress is None:
+        raise Http404(f"Clone job {job_id} does not exist.")
+    if progress["finished"] and not progress["error"]:
+        return HttpResponseRedirect(get_cloned_runs_url(progress))
+    context_data = {
+        "module": MODULE_NAME,
+        "sub_module": "runs",
+        "progress": progress,
+        "cloned_count": len(progress["cloned_run_ids"]),
+    }
+    return render(request, template_name, context=context_data)
+
+
 @require_POST
 def order_case(request, run_id):
     """Resort case with new order"""
-    # Current we should rewrite all of cases belong to the plan.
-    # Because the cases sortkey in database is chaos,
-    # Most of them are None.
-    get_object_or_404(TestRun, run_id=run_id)
+    run = get_object_or_404(TestRun.objects.only("pk"), run_id=run_id)
 
     if "case_run" not in request.POST:
         return prompt.info(
@@ -1070,26 +1101,8 @@ def order_case(request, run_id):
             reverse("run-get", args=[run_id]),
         )
 
-    case_run_ids = request.POST.getlist("case_run")
-    sql = "UPDATE test_case_runs SET sortkey = %s WHERE test_case_runs.case_run_id = %s"
-    # sort key begin with 10, end with length*10, step 10.
-    # e.g.
-    # case_run_ids = [10334, 10294, 10315, 10443]
-    #                      |      |      |      |
-    #          sort key -> 10     20     30     40
-    # then zip case_run_ids and new_sort_keys to pairs
-    # e.g.
-    #    sort_key, case_run_id
-    #         (10, 10334)
-    #         (20, 10294)
-    #         (30, 10315)
-    #         (40, 10443)
-    new_sort_keys = range(10, (len(case_run_ids) + 1) * 10, 10)
-    key_id_pairs = zip(new_sort_keys, (int(pk) for pk in case_run_ids))
-    with transaction.atomic():
-        for key_id_pair in key_id_pairs:
-            cursor = connection.writer_cursor
-            cursor.execute(sql, key_id_pair)
+    case_run_ids = [int(pk) for pk in request.POST.getlist("case_run")]
+    reorder_sortkeys(run.case_run.all(), case_run_ids)
 
     return HttpResponseRedirect(reverse("run-get", args=[run_id]))
 
@@ -1281,11 +1294,12 @@ def update_case_run_text(request, run_id):
     else:
         tcrs = tr.case_run.all()
 
-    tcrs = tcrs.filter(case_run_status__name="IDLE")
+    tcrs = list(tcrs.filter(case_run_status__name="IDLE").select_related("case"))
+    latest_texts = TestCase.get_latest_texts([tcr.case_id for tcr in tcrs], text_required=False)
 
     updated_tcrs = []
     for tcr in tcrs:
-        lctv = tcr.latest_text().case_text_version
+        lctv = latest_texts.get(tcr.case_id, NoneText).case_text_version
         if tcr.case_text_version != lctv:
             updated_tcrs.append(f"{tcr.case.summary}: {tcr.case_text_version} -> {lctv}")
             tcr.case_text_version = lctv
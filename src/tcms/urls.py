@@ -5,13 +5,24 @@ from django.contrib import admin
 from django.urls import include, path
 from django.views.i18n import JavaScriptCatalog
 
-# XML RPC handler
-from kobo.django.xmlrpc.views import XMLRPCHandlerFactory
-
 from tcms.core import ajax as tcms_core_ajax
 from tcms.testruns import views as testruns_views
+from tcms.xmlrpc.dispatcher import XMLRPCHandlerFactory
+from tcms.xmlrpc.handlers import (
+    get_jsonrpc_method,
+    get_xmlrpc_method,
+    is_jsonrpc_fault,
+    is_xmlrpc_fault,
+    rpc_response,
+)
+from tcms.xmlrpc.jsonrpc import JSONRPCHandlerFactory
 
-xmlrpc_handler = XMLRPCHandlerFactory("TCMS_XML_RPC")
+xmlrpc_handler = rpc_response(get_xmlrpc_method, is_xmlrpc_fault)(
+    XMLRPCHandlerFactory("TCMS_XML_RPC")
+)
+jsonrpc_handler = rpc_response(get_jsonrpc_method, is_jsonrpc_fault)(
+    JSONRPCHandlerFactory("TCMS_XML_RPC")
+)
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -33,6 +44,7 @@ urlpatterns = [
     path("advance-search/", include("tcms.search.urls")),
     path("report/", include("tcms.report.urls")),
     path("xmlrpc/", xmlrpc_handler),
+    path("jsonrpc/", jsonrpc_handler, name="jsonrpc"),
     path("tinymce/", include("tinymce.urls")),
     # Using admin js without admin permission
     # refer: https://docs.djangoproject.com/en/1.6/topics/i18n/translation/#module-django.views.i18n
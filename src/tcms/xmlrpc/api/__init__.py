@@ -1,13 +1,4 @@
 # -*- coding: utf-8 -*-
 
-from .auth import *  # NOQA
-from .build import *  # NOQA
-from .env import *  # NOQA
-from .product import *  # NOQA
-from .tag import *  # NOQA
-from .testcase import *  # NOQA
-from .testcaseplan import *  # NOQA
-from .testcaserun import *  # NOQA
-from .testrun import *  # NOQA
-from .user import *  # NOQA
-from .version import *  # NOQA
+# API modules are imported when they are called at the first time. Refer to
+# tcms.xmlrpc.dispatcher.
@@ -79,18 +79,21 @@ def create(request, values):
 
 
 @log_call(namespace=__xmlrpc_namespace__)
-def get(request, build_id):
+def get(request, build_id, fields=None):
     """Used to load an existing build from the database.
 
     :param int build_id: the build ID.
+    :param list fields: optional, names of fields to return. All fields are
+        returned by default.
     :return: A blessed Build object hash
     :rtype: list
 
     Example::
 
         Build.get(1234)
+        Build.get(1234, ['name', 'product_id'])
     """
-    return TestBuild.objects.get(build_id=build_id).serialize()
+    return TestBuild.objects.get(build_id=build_id).serialize(fields=fields)
 
 
 @log_call(namespace=__xmlrpc_namespace__)
@@ -104,7 +104,7 @@ def check_product(request, name):
 
 
 @log_call(namespace=__xmlrpc_namespace__)
-def filter(request, query):
+def filter(request, query, fields=None):
     """Performs a search and returns the resulting list of products.
 
     :param dict query: a mapping containing following criteria.
@@ -114,6 +114,8 @@ def filter(request, query):
         * classification: ForeignKey: :class:`Classification`.
         * description: (str) description.
 
+    :param list fields: optional, names of fields to return in each found
+        product. All fields are returned by default.
     :return: a mapping representing a :class:`Product`.
     :rtype: dict
 
@@ -121,8 +123,10 @@ def filter(request, query):
 
         # Get all of product named 'product name'
         Product.filter({'name': 'product name'})
+        # Get only the ID and name of all products
+        Product.filter({}, ['id', 'name'])
     """
-    return Product.to_xmlrpc(query)
+    return Product.to_xmlrpc(query, fields=fields)
 
 
 @log_call(namespace=__xmlrpc_namespace__)
@@ -205,18 +209,21 @@ def filter_versions(request, query):
 
 
 @log_call(namespace=__xmlrpc_namespace__)
-def get(request, id):
+def get(request, id, fields=None):
     """Used to load an existing product from the database.
 
     :param int id: product ID.
+    :param list fields: optional, names of fields to return. All fields are
+        returned by default.
     :return: a mapping representing found product.
     :rtype: :class:`Product`.
 
     Example::
 
         Product.get(61)
+        Product.get(61, ['name'])
     """
-    return Product.objects.get(id=int(id)).serialize()
+    return Product.objects.get(id=int(id)).serialize(fields=fields)
 
 
 @log_call(namespace=__xmlrpc_namespace__)
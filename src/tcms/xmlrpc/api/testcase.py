@@ -4,11 +4,13 @@ import itertools
 
 from django.contrib.auth.decorators import permission_required
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 from django.forms import EmailField
 
 import tcms.comments.models
 from tcms.core.utils import form_error_messages_to_list, timedelta2int
 from tcms.issuetracker.models import Issue, IssueTracker
+from tcms.issuetracker.services import find_service
 from tcms.management.models import TestTag
 from tcms.testcases.forms import CaseIssueForm
 from tcms.testcases.models import TestCase, TestCasePlan
@@ -220,6 +222,9 @@ def add_to_run(request, case_ids, run_ids):
 def attach_issue(request, values):
     """Add one or more issues to the selected test cases.
 
+    Issues are added in one transaction. An issue already added to the case
+    is skipped.
+
     :param dict values: mapping or list of mappings containing these bug
         information.
 
@@ -253,18 +258,26 @@ def attach_issue(request, values):
     if isinstance(values, dict):
         values = [values]
 
+    # tracker id -> (tracker, issues)
+    new_issues: dict[int, tuple[IssueTracker, list[Issue]]] = {}
     for value in values:
         form = CaseIssueForm(value)
-        if form.is_valid():
-            case = form.cleaned_data["case"]
-            case.add_issue(
-                form.cleaned_data["issue_key"],
-                form.cleaned_data["tracker"],
+        if not form.is_valid():
+            raise ValueError(form_error_messages_to_list(form))
+        tracker = form.cleaned_data["tracker"]
+        _, issues = new_issues.setdefault(tracker.pk, (tracker, []))
+        issues.append(
+            Issue(
+                issue_key=form.cleaned_data["issue_key"],
+                case=form.cleaned_data["case"],
                 summary=form.cleaned_data["summary"],
                 description=form.cleaned_data["description"],
             )
-        else:
-            raise ValueError(form_error_messages_to_list(form))
+        )
+
+    with transaction.atomic():
+        for tracker, issues in new_issues.values():
+            find_service(tracker).add_issues(issues, skip_existing=True)
 
 
 @log_call(namespace=__xmlrpc_namespace__)
@@ -491,7 +504,7 @@ def detach_issue(request, case_ids, issue_keys):
 
 
 @log_call(namespace=__xmlrpc_namespace__)
-def filter(request, query):
+def filter(request, query, fields=None):
     """Performs a search and returns the resulting list of test cases.
 
     :param dict query: a mapping containing these criteria.
@@ -514,6 +527,8 @@ def filter(request, query):
         * is_automated: 1: Only show current 0: show not current
         * script: (str)
 
+    :param list fields: optional, names of fields to return in each found test
+        case. All fields are returned by default.
     :return: list of mappings of found :class:`TestCase`.
     :rtype: list
 
@@ -531,13 +546,15 @@ def filter(request, query):
         TestCase.filter({'plan__author__username': 'xkuang'})
         # Get cases with ID 12345, 23456, 34567 - Here is only support array so far.
         TestCase.filter({'case_id__in': [12345, 23456, 34567]})
+        # Get only the summary and status of cases belong to the plan 1
+        TestCase.filter({'plan__plan_id': 1}, ['case_id', 'summary', 'case_status'])
     """
     if query.get("estimated_time"):
         query["estimated_time"] = timedelta2int(
             pre_process_estimated_time(query.get("estimated_time"))
         )
     deprecate_critetion_attachment(query)
-    return TestCase.to_xmlrpc(query)
+    return TestCase.to_xmlrpc(query, fields=fields)
 
 
 @log_call(namespace=__xmlrpc_namespace__)
@@ -561,32 +578,35 @@ def filter_count(request, values={}):
 
 
 @log_call(namespace=__xmlrpc_namespace__)
-def get(request, case_id):
+def get(request, case_id, fields=None):
     """Used to load an existing test case from the database.
 
     :param case_id: case ID.
     :type case_id: int or str
+    :param list fields: optional, names of fields to return. All fields are
+        returned by default.
     :return: a mappings representing found test case.
     :rtype: dict
 
     Example::
 
         TestCase.get(1)
+        TestCase.get(1, ['summary', 'text'])
     """
     tc = TestCase.objects.get(case_id=case_id)
 
-    tc_latest_text = tc.latest_text().serialize()
-
-    response = tc.serialize()
-    response["text"] = tc_latest_text
-    # get the xmlrpc tags
-    tag_ids = tc.tag.values_list("id", flat=True)
-    query = {"id__in": tag_ids}
-    tags = TestTag.to_xmlrpc(query)
-    # cut 'id' attribute off, only leave 'name' here
-    tags_without_id = [tag["name"] for tag in tags]
-    # replace tag_id list in the serialize return data
-    response["tag"] = tags_without_id
+    response = tc.serialize(fields=fields)
+    if fields is None or "text" in fields:
+        response["text"] = tc.latest_text().serialize()
+    if fields is None or "tag" in fields:
+        # get the xmlrpc tags
+        tag_ids = tc.tag.values_list("id", flat=True)
+        query = {"id__in": tag_ids}
+        tags = TestTag.to_xmlrpc(query)
+        # cut 'id' attribute off, only leave 'name' here
+        tags_without_id = [tag["name"] for tag in tags]
+        # replace tag_id list in the serialize return data
+        response["tag"] = tags_without_id
     return response
 
 
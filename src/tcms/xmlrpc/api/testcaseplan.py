@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+from tcms.core.db import update_sortkeys
 from tcms.testcases.models import TestCase, TestCasePlan
 from tcms.testplans.models import TestPlan
 from tcms.xmlrpc.decorators import log_call
@@ -49,7 +50,7 @@ def update(request, case_id, plan_id, sortkey):
     tcp = TestCasePlan.objects.get(plan=tp, case=tc)
 
     if isinstance(sortkey, int):
+        update_sortkeys(TestCasePlan, {tcp.pk: sortkey})
         tcp.sortkey = sortkey
-        tcp.save(update_fields=["sortkey"])
 
     return XMLRPCSerializer(model=tcp).serialize_model()
@@ -1,14 +1,28 @@
 # -*- coding: utf-8 -*-
 
+import re
+from datetime import datetime
+from typing import Any, Optional
+
+from django.conf import settings
 from django.contrib.auth.decorators import permission_required
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldError, PermissionDenied, ValidationError
+from django.core.validators import URLValidator
+from django.db import transaction
+from django_comments.models import Comment
 
 import tcms.comments.models
+from tcms.comments.forms import COMMENT_MAX_LENGTH
 from tcms.core.utils import form_error_messages_to_list
-from tcms.issuetracker.models import Issue
+from tcms.issuetracker.models import Issue, IssueTracker
 from tcms.issuetracker.services import find_service
 from tcms.linkreference.models import LinkReference, create_link
+from tcms.logs.models import TCMSLogModel
 from tcms.testcases.forms import CaseRunIssueForm
-from tcms.testruns.models import TestCaseRun, TestCaseRunStatus
+from tcms.testruns.archive import is_archive_enabled
+from tcms.testruns.completion import mark_runs_dirty
+from tcms.testruns.models import TestCaseRun, TestCaseRunArchive, TestCaseRunStatus
 from tcms.xmlrpc.decorators import log_call
 from tcms.xmlrpc.serializer import XMLRPCSerializer
 from tcms.xmlrpc.utils import distinct_count, pre_process_ids
@@ -35,6 +49,7 @@ __all__ = (
     "get_logs",
     "lookup_status_name_by_id",
     "lookup_status_id_by_name",
+    "report_results",
     "update",
 )
 
@@ -96,6 +111,9 @@ def add_comment(request, case_run_ids, comment):
 def attach_issue(request, values):
     """Add one or more issues to the selected test cases.
 
+    Issues are added in one transaction. Nothing is added if any of them is
+    invalid or is added to the case already.
+
     :param dict values: a mapping containing these data to create a test run.
 
         * issue_key: (str) **Required** the issue key.
@@ -132,24 +150,28 @@ def attach_issue(request, values):
             values,
         ]
 
+    # tracker id -> (tracker, issues)
+    new_issues: dict[int, tuple[IssueTracker, list[Issue]]] = {}
     for value in values:
         form = CaseRunIssueForm(value)
-        if form.is_valid():
-            service = find_service(form.cleaned_data["tracker"])
-            issue_key = form.cleaned_data["issue_key"]
-            summary = form.cleaned_data["summary"]
-            description = form.cleaned_data["description"]
-            case_runs = form.cleaned_data["case_run"]
-            for case_run in case_runs:
-                service.add_issue(
-                    issue_key,
-                    case_run.case,
-                    case_run=case_run,
-                    summary=summary,
-                    description=description,
-                )
-        else:
+        if not form.is_valid():
             raise ValueError(form_error_messages_to_list(form))
+        tracker = form.cleaned_data["tracker"]
+        _, issues = new_issues.setdefault(tracker.pk, (tracker, []))
+        issues.extend(
+            Issue(
+                issue_key=form.cleaned_data["issue_key"],
+                case_id=case_run.case_id,
+                case_run=case_run,
+                summary=form.cleaned_data["summary"],
+                description=form.cleaned_data["description"],
+            )
+            for case_run in form.cleaned_data["case_run"]
+        )
+
+    with transaction.atomic():
+        for tracker, issues in new_issues.values():
+            find_service(tracker).add_issues(issues)
 
 
 @log_call(namespace=__xmlrpc_namespace__)
@@ -259,7 +281,7 @@ def detach_issue(request, case_run_ids, issue_keys):
 
 
 @log_call(namespace=__xmlrpc_namespace__)
-def filter(request, values={}):
+def filter(request, values={}, fields=None):
     """Performs a search and returns the resulting list of test cases.
 
     :param dict values: a mapping containing these criteria.
@@ -275,6 +297,8 @@ def filter(request, values={}):
         * running_date: Datetime
         * close_date: Datetime
 
+    :param list fields: optional, names of fields to return in each found case
+        run. All fields are returned by default.
     :return: a list of found :class:`TestCaseRun`.
     :rtype: list[dict]
 
@@ -282,8 +306,10 @@ def filter(request, values={}):
 
         # Get all case runs contain 'TCMS' in case summary
         TestCaseRun.filter({'case__summary__icontain': 'TCMS'})
+        # Get only the status of case runs of run 1
+        TestCaseRun.filter({'run': 1}, ['case_run_id', 'case_run_status'])
     """
-    return TestCaseRun.to_xmlrpc(values)
+    return TestCaseRun.to_xmlrpc(values, fields=fields)
 
 
 @log_call(namespace=__xmlrpc_namespace__)
@@ -298,24 +324,33 @@ def filter_count(request, values={}):
     .. seealso::
        See example in :class:`TestCaseRun.filter <tcms.xmlrpc.api.testcaserun.filter>`.
     """
-    from tcms.testruns.models import TestCaseRun
-
-    return distinct_count(TestCaseRun, values)
+    count = distinct_count(TestCaseRun, values)
+    if is_archive_enabled():
+        try:
+            count += distinct_count(TestCaseRunArchive, values)
+        except FieldError:
+            # Archived case runs have no relationship like issues and
+            # comments, so they never match criteria over them.
+            pass
+    return count
 
 
 @log_call(namespace=__xmlrpc_namespace__)
-def get(request, case_run_id):
+def get(request, case_run_id, fields=None):
     """Used to load an existing test case-run from the database.
 
     :param int case_run_id: case run ID.
+    :param list fields: optional, names of fields to return. All fields are
+        returned by default.
     :return: a mapping representing found :class:`TestCaseRun`.
     :rtype: dict
 
     Example::
 
         TestCaseRun.get(1)
+        TestCaseRun.get(1, ['case_run_status', 'case_run_status_id'])
     """
-    return gcr.pre_process_tcr(case_run_id=case_run_id).serialize()
+    return gcr.pre_process_tcr(case_run_id=case_run_id).serialize(fields=fields)
 
 
 @log_call(namespace=__xmlrpc_namespace__)
@@ -570,6 +605,8 @@ def update(request, case_run_ids, values):
             data["sortkey"] = form.cleaned_data["sortkey"]
 
         tcrs.update(**data)
+        if "case_run_status" in data:
+            mark_runs_dirty(tcrs.order_by().values_list("run", flat=True).distinct())
 
     else:
         raise ValueError(forms.errors_to_list(form))
@@ -613,3 +650,323 @@ def get_logs(request, case_run_id):
     links = LinkReference.get_from(test_case_run)
     s = XMLRPCSerializer(links)
     return s.serialize_queryset()
+
+
+class CaseRunResults:
+    """Validate and apply results of case runs in batch
+
+    Everything required to validate the results, that is the case runs, case
+    run statuses and issue trackers, is queried once. Then, the valid results
+    are applied in a transaction with one bulk update per group of changed
+    fields and one bulk insert for each of logs, issues, comments and links.
+    """
+
+    def __init__(self, request, results: list[dict[str, Any]]):
+        self.request = request
+        self.results = results
+        self.update_time = datetime.now()
+        self.errors: dict[int, str] = {}
+
+        case_run_ids = {
+            result["case_run_id"]
+            for result in results
+            if isinstance(result, dict) and isinstance(result.get("case_run_id"), int)
+        }
+        self.case_runs = (
+            TestCaseRun.objects.select_related("case_run_status", "tested_by")
+            .only(
+                "case",
+                "run",
+                "notes",
+                "close_date",
+                "case_run_status__name",
+                "tested_by__username",
+            )
+            .in_bulk(case_run_ids)
+        )
+
+        self.statuses: dict[Any, TestCaseRunStatus] = {}
+        for status in TestCaseRunStatus.objects.only("name"):
+            self.statuses[status.pk] = status
+            self.statuses[status.name] = status
+
+        self.trackers = {
+            tracker.pk: (tracker, re.compile(tracker.validate_regex))
+            for tracker in IssueTracker.objects.only("pk", "validate_regex")
+        }
+        self.url_validator = URLValidator()
+
+    def validate(self, result: Any) -> Optional[str]:
+        """Validate a result
+
+        :return: the error message if the result is invalid, otherwise None.
+        """
+        if not isinstance(result, dict):
+            return "Result must be a mapping."
+        # Values are checked before being looked up, since unhashable ones
+        # cannot be looked up in a mapping.
+        case_run_id = result.get("case_run_id")
+        if not isinstance(case_run_id, int) or case_run_id not in self.case_runs:
+            return f"Test case run {case_run_id} does not exist."
+        status = result.get("status")
+        if status is not None and (
+            not isinstance(status, (int, str)) or status not in self.statuses
+        ):
+            return f'Test case run status "{status}" does not exist.'
+        notes = result.get("notes")
+        if notes is not None and not isinstance(notes, str):
+            return "Notes must be a string."
+        comment = result.get("comment")
+        if comment is not None:
+            if not isinstance(comment, str):
+                return "Comment must be a string."
+            if len(comment) > COMMENT_MAX_LENGTH:
+                return f"Comment has more than {COMMENT_MAX_LENGTH} characters."
+        issues = result.get("issues") or []
+        if not isinstance(issues, list):
+            return "Issues must be a list."
+        for issue in issues:
+            error = self._validate_issue(issue)
+            if error:
+                return error
+        links = result.get("logs") or []
+        if not isinstance(links, list):
+            return "Log links must be a list."
+        for link in links:
+            error = self._validate_link(link)
+            if error:
+                return error
+        return None
+
+    def _validate_issue(self, issue: Any) -> Optional[str]:
+        if not isinstance(issue, dict):
+            return "Issue must be a mapping with issue_key and tracker."
+        tracker = issue.get("tracker")
+        if not isinstance(tracker, int) or tracker not in self.trackers:
+            return f"Issue tracker {tracker} does not exist."
+        issue_key = issue.get("issue_key")
+        _, validate_regex = self.trackers[tracker]
+        if (
+            not isinstance(issue_key, str)
+            or len(issue_key) > 50
+            or not validate_regex.match(issue_key)
+        ):
+            return f"Issue key {issue_key} is in wrong format."
+        return None
+
+    def _validate_link(self, link: Any) -> Optional[str]:
+        if not isinstance(link, dict):
+            return "Log link must be a mapping with name and url."
+        name = link.get("name", "")
+        if not isinstance(name, str) or len(name) > 64:
+            return "Log link name must be a string of 64 characters at most."
+        try:
+            self.url_validator(link.get("url"))
+        except ValidationError:
+            return f"Log link URL {link.get('url')} is not valid."
+        return None
+
+    def apply(self) -> list[dict[str, Any]]:
+        valid_results = []
+        report = []
+        for result in self.results:
+            error = self.validate(result)
+            case_run_id = result.get("case_run_id") if isinstance(result, dict) else None
+            if error:
+                report.append({"case_run_id": case_run_id, "ok": False, "error": error})
+            else:
+                valid_results.append(result)
+                report.append({"case_run_id": case_run_id, "ok": True})
+
+        if any(result.get("issues") for result in valid_results) and not (
+            self.request.user.has_perm("issuetracker.add_issue")
+        ):
+            raise PermissionDenied("Permission denied to add issues.")
+
+        with transaction.atomic():
+            self._update_case_runs(valid_results)
+            self._add_issues(valid_results)
+            self._add_comments(valid_results)
+            self._add_links(valid_results)
+
+        return report
+
+    def _new_log(self, case_run, field, original_value, new_value) -> TCMSLogModel:
+        return TCMSLogModel(
+            content_type=self.content_type,
+            object_pk=case_run.pk,
+            site_id=settings.SITE_ID,
+            who=self.request.user,
+            field=field,
+            original_value=str(original_value or ""),
+            new_value=str(new_value),
+        )
+
+    @property
+    def content_type(self) -> ContentType:
+        return ContentType.objects.get_for_model(TestCaseRun)
+
+    def _update_case_runs(self, results) -> None:
+        request_user = self.request.user
+        # Group case runs by the changed fields, so that a bulk update does
+        # not rewrite fields which are not changed.
+        changed: dict[tuple[str, ...], list[TestCaseRun]] = {}
+        logs = []
+
+        for result in results:
+            case_run = self.case_runs[result["case_run_id"]]
+            fields = []
+
+            status = result.get("status")
+            if status is not None:
+                new_status = self.statuses[status]
+                if case_run.case_run_status_id != new_status.pk:
+                    logs.append(
+                        self._new_log(
+                            case_run,
+                            "case_run_status",
+                            case_run.case_run_status.name,
+                            new_status.name,
+                        )
+                    )
+                    logs.append(
+                        self._new_log(case_run, "close_date", case_run.close_date, self.update_time)
+                    )
+                    case_run.case_run_status = new_status
+                    case_run.close_date = self.update_time
+                    fields += ["case_run_status", "close_date"]
+                    if case_run.tested_by_id != request_user.pk:
+                        logs.append(
+                            self._new_log(
+                                case_run, "tested_by", case_run.tested_by, request_user.username
+                            )
+                        )
+                        case_run.tested_by = request_user
+                        fields.append("tested_by")
+
+            notes = result.get("notes")
+            if notes is not None and notes != (case_run.notes or ""):
+                logs.append(self._new_log(case_run, "notes", case_run.notes, notes))
+                case_run.notes = notes
+                fields.append("notes")
+
+            if fields:
+                changed.setdefault(tuple(fields), []).append(case_run)
+
+        for fields, case_runs in changed.items():
+            TestCaseRun.objects.bulk_update(case_runs, fields)
+        # Progress and completion status of runs change with the status.
+        run_ids = {
+            case_run.run_id
+            for fields, case_runs in changed.items()
+            if "case_run_status" in fields
+            for case_run in case_runs
+        }
+        if run_ids:
+            mark_runs_dirty(run_ids)
+        if logs:
+            TCMSLogModel.objects.bulk_create(logs)
+
+    def _add_issues(self, results) -> None:
+        new_issues = {}
+        for result in results:
+            case_run = self.case_runs[result["case_run_id"]]
+            for issue in result.get("issues") or []:
+                key = (issue["tracker"], issue["issue_key"], case_run.case_id)
+                if key not in new_issues:
+                    new_issues[key] = Issue(
+                        issue_key=issue["issue_key"],
+                        tracker_id=issue["tracker"],
+                        case_id=case_run.case_id,
+                        case_run_id=case_run.pk,
+                        summary=issue.get("summary"),
+                        description=issue.get("description"),
+                    )
+        if not new_issues:
+            return
+
+        # An issue is unique in a case, skip those added already.
+        existing_issues = Issue.objects.filter(
+            case__in={case_id for _, _, case_id in new_issues},
+            issue_key__in={issue_key for _, issue_key, _ in new_issues},
+        ).values_list("tracker_id", "issue_key", "case_id")
+        for key in existing_issues:
+            new_issues.pop(key, None)
+        Issue.objects.bulk_create(new_issues.values())
+
+    def _add_comments(self, results) -> None:
+        user = self.request.user
+        comments = [
+            Comment(
+                content_type=self.content_type,
+                object_pk=str(result["case_run_id"]),
+                site_id=settings.SITE_ID,
+                user=user,
+                user_name=user.get_full_name() or user.username,
+                user_email=user.email,
+                comment=result["comment"],
+                submit_date=self.update_time,
+                ip_address=self.request.META.get("REMOTE_ADDR"),
+            )
+            for result in results
+            if result.get("comment")
+        ]
+        if comments:
+            Comment.objects.bulk_create(comments)
+
+    def _add_links(self, results) -> None:
+        links = [
+            LinkReference(
+                content_type=self.content_type,
+                object_pk=result["case_run_id"],
+                site_id=settings.SITE_ID,
+                name=link.get("name", ""),
+                url=link["url"],
+            )
+            for result in results
+            for link in result.get("logs") or []
+        ]
+        if links:
+            LinkReference.objects.bulk_create(links)
+
+
+@log_call(namespace=__xmlrpc_namespace__)
+@permission_required("testruns.change_testcaserun", raise_exception=True)
+def report_results(request, results):
+    """Report results of case runs in batch
+
+    Unlike :meth:`TestCaseRun.update <tcms.xmlrpc.api.testcaserun.update>`,
+    each result could update a case run in a different way. Invalid results
+    are skipped and reported back, and the others are applied together.
+
+    :param list results: list of mappings, each of them is the result of a
+        case run containing these data.
+
+        * case_run_id: (int) **Required** the case run ID.
+        * status: (int or str) optional case run status ID or name.
+        * notes: (str) optional notes to set.
+        * issues: (list) optional issues to add. Each of them is a mapping
+          containing ``issue_key`` and ``tracker`` ID, and optional
+          ``summary`` and ``description``. Permission to add issue is
+          required to add issues.
+        * comment: (str) optional comment to add.
+        * logs: (list) optional log links to add. Each of them is a mapping
+          containing ``name`` and ``url``.
+
+    :return: list of mappings in the same order of the results. Each of them
+        contains ``case_run_id`` and ``ok`` which indicates whether the result
+        is applied. If not, ``error`` tells the reason.
+    :rtype: list[dict]
+
+    Example::
+
+        TestCaseRun.report_results([
+            {'case_run_id': 1, 'status': 'PASSED',
+             'logs': [{'name': 'console', 'url': 'http://ci/job/1/console'}]},
+            {'case_run_id': 2, 'status': 'FAILED', 'comment': 'Timeout',
+             'issues': [{'issue_key': '1000', 'tracker': 1}]},
+        ])
+    """
+    if not isinstance(results, list):
+        raise TypeError("Argument results must be a list.")
+    return CaseRunResults(request, results).apply()
@@ -5,7 +5,7 @@ from django.core.exceptions import ObjectDoesNotExist
 
 from tcms.management.models import Component, Product, TestTag
 from tcms.testplans.importer import clean_xml_file
-from tcms.testplans.models import TCMSEnvPlanMap, TestPlan, TestPlanType
+from tcms.testplans.models import TCMSEnvPlanMap, TestPlan, TestPlanClosure, TestPlanType
 from tcms.xmlrpc.decorators import log_call
 from tcms.xmlrpc.utils import deprecate_critetion_attachment, distinct_count, pre_process_ids
 
@@ -196,7 +196,7 @@ def create(request, values):
 
 
 @log_call(namespace=__xmlrpc_namespace__)
-def filter(request, values={}):
+def filter(request, values={}, fields=None):
     """Performs a search and returns the resulting list of test plans.
 
     :param dict values: a mapping containing these criteira.
@@ -214,6 +214,8 @@ def filter(request, values={}):
         * text: ForeignKey: Test Plan Text
         * type: ForeignKey: Test Plan Type
 
+    :param list fields: optional, names of fields to return in each found test
+        plan. All fields are returned by default.
     :return: list of mappings of found :class:`TestPlan`.
     :rtype: list[dict]
 
@@ -227,9 +229,11 @@ def filter(request, values={}):
         TestPlan.filter({'author__username__startswith': 'x'})
         # Get plans contain the case ID 1, 2, 3
         TestPlan.filter({'case__case_id__in': [1, 2, 3]})
+        # Get only the name of plans of product 1
+        TestPlan.filter({'product': 1}, ['plan_id', 'name'])
     """
     deprecate_critetion_attachment(values)
-    return TestPlan.to_xmlrpc(values)
+    return TestPlan.to_xmlrpc(values, fields=fields)
 
 
 @log_call(namespace=__xmlrpc_namespace__)
@@ -247,32 +251,45 @@ def filter_count(request, values={}):
 
 
 @log_call(namespace=__xmlrpc_namespace__)
-def get(request, plan_id):
+def get(request, plan_id, fields=None):
     """Used to load an existing test plan from the database.
 
     :param int plan_id: plan ID.
+    :param list fields: optional, names of fields to return. All fields are
+        returned by default.
     :return: a mapping of found :class:`TestPlan`.
     :rtype: dict
 
     Example::
 
         TestPlan.get(1)
+        TestPlan.get(1, ['name', 'tag'])
     """
     tp = TestPlan.objects.get(plan_id=plan_id)
-    response = tp.serialize()
-
-    # This is for backward-compatibility. Actually, this is not a good way to
-    # add this extra field. But, now that's it.
-    response["default_product_version"] = response["product_version"]
-
-    # get the xmlrpc tags
-    tag_ids = tp.tag.values_list("id", flat=True)
-    query = {"id__in": tag_ids}
-    tags = TestTag.to_xmlrpc(query)
-    # cut 'id' attribute off, only leave 'name' here
-    tags_without_id = [tag["name"] for tag in tags]
-    # replace tag_id list in the serialize return data
-    response["tag"] = tags_without_id
+    if fields is None:
+        response = tp.serialize()
+    else:
+        serialize_fields = set(fields)
+        if "default_product_version" in serialize_fields:
+            serialize_fields.add("product_version")
+        response = tp.serialize(fields=serialize_fields)
+
+    if fields is None or "default_product_version" in fields:
+        # This is for backward-compatibility. Actually, this is not a good way to
+        # add this extra field. But, now that's it.
+        response["default_product_version"] = response["product_version"]
+        if fields is not None and "product_version" not in fields:
+            del response["product_version"]
+
+    if fields is None or "tag" in fields:
+        # get the xmlrpc tags
+        tag_ids = tp.tag.values_list("id", flat=True)
+        query = {"id__in": tag_ids}
+        tags = TestTag.to_xmlrpc(query)
+        # cut 'id' attribute off, only leave 'name' here
+        tags_without_id = [tag["name"] for tag in tags]
+        # replace tag_id list in the serialize return data
+        response["tag"] = tags_without_id
     return response
 
 
@@ -660,13 +677,24 @@ def update(request, plan_ids, values):
             _values["owner"] = form.cleaned_data["owner"]
 
         if form.cleaned_data["parent"]:
-            _values["parent"] = form.cleaned_data["parent"]
+            parent = form.cleaned_data["parent"]
+            for plan_id in plan_ids:
+                if parent.pk == plan_id or parent.is_descendant_of(plan_id):
+                    raise ValueError(
+                        f"Plan {parent.pk} cannot be the parent of plan {plan_id} "
+                        f"because it is plan {plan_id} itself or one of its descendants."
+                    )
+            _values["parent"] = parent
 
         if not (values.get("is_active") is None):
             _values["is_active"] = form.cleaned_data["is_active"]
 
         tps.update(**_values)
 
+        if "parent" in _values:
+            for plan_id in tps.values_list("pk", flat=True):
+                TestPlanClosure.move_subtree(plan_id, _values["parent"].pk)
+
         # requested to update environment group for selected test plans
         if form.cleaned_data["env_group"]:
             # prepare the list of new objects to be inserted into DB
@@ -9,6 +9,7 @@ from kobo.django.xmlrpc.decorators import user_passes_test
 from tcms.issuetracker.models import Issue
 from tcms.management.models import TCMSEnvValue, TestTag
 from tcms.testcases.models import TestCase
+from tcms.testruns.archive import get_case_run_models
 from tcms.testruns.models import TestCaseRun, TestRun
 from tcms.xmlrpc.decorators import log_call
 from tcms.xmlrpc.utils import distinct_count, pre_process_estimated_time, pre_process_ids
@@ -277,7 +278,7 @@ def env_value(request, action, run_ids, env_value_ids):
 
 
 @log_call(namespace=__xmlrpc_namespace__)
-def filter(request, values={}):
+def filter(request, values={}, fields=None):
     """Performs a search and returns the resulting list of test runs.
 
     :param dict values: a mapping containing these criteria.
@@ -294,6 +295,8 @@ def filter(request, values={}):
         * tag: ForeignKey: Tag
         * product_version: ForeignKey: Version
 
+    :param list fields: optional, names of fields to return in each found test
+        run. All fields are returned by default.
     :return: list of mappings of found :class:`TestRun`.
     :rtype: list
 
@@ -307,8 +310,10 @@ def filter(request, values={}):
         TestRun.filter({'manager__username__startswith': 'x'})
         # Get runs contain the case ID 1, 2, 3
         TestRun.filter({'case_run__case__case_id__in': [1, 2, 3]})
+        # Get only the summary of runs of plan 1
+        TestRun.filter({'plan': 1}, ['run_id', 'summary'])
     """
-    return TestRun.to_xmlrpc(values)
+    return TestRun.to_xmlrpc(values, fields=fields)
 
 
 @log_call(namespace=__xmlrpc_namespace__)
@@ -327,30 +332,34 @@ def filter_count(request, values={}):
 
 
 @log_call(namespace=__xmlrpc_namespace__)
-def get(request, run_id):
+def get(request, run_id, fields=None):
     """Used to load an existing test run from the database.
 
     :param int run_id: test run ID.
+    :param list fields: optional, names of fields to return. All fields are
+        returned by default.
     :return: a mapping representing found :class:`TestRun`.
     :rtype: dict
 
     Example::
 
         TestRun.get(1)
+        TestRun.get(1, ['summary', 'tag'])
     """
     try:
         tr = TestRun.objects.get(run_id=run_id)
     except TestRun.DoesNotExist as error:
         return error
-    response = tr.serialize()
-    # get the xmlrpc tags
-    tag_ids = tr.tag.values_list("id", flat=True)
-    query = {"id__in": tag_ids}
-    tags = TestTag.to_xmlrpc(query)
-    # cut 'id' attribute off, only leave 'name' here
-    tags_without_id = [tag["name"] for tag in tags]
-    # replace tag_id list in the serialize return data
-    response["tag"] = tags_without_id
+    response = tr.serialize(fields=fields)
+    if fields is None or "tag" in fields:
+        # get the xmlrpc tags
+        tag_ids = tr.tag.values_list("id", flat=True)
+        query = {"id__in": tag_ids}
+        tags = TestTag.to_xmlrpc(query)
+        # cut 'id' attribute off, only leave 'name' here
+        tags_without_id = [tag["name"] for tag in tags]
+        # replace tag_id list in the serialize return data
+        response["tag"] = tags_without_id
     return response
 
 
@@ -455,7 +464,8 @@ def get_test_case_runs(request, run_id):
     """Get the list of cases that this run is linked to.
 
     :param int run_id: run ID.
-    :return: a list of mappings of found :class:`TestCaseRun`.
+    :return: a list of mappings of found :class:`TestCaseRun`, including the
+        archived ones.
     :rtype: list[dict]
 
     Example::
@@ -478,10 +488,15 @@ def get_test_cases(request, run_id):
 
         TestRun.get_test_cases(1)
     """
-    tcs_serializer = TestCase.to_xmlrpc(query={"case_run__run_id": run_id})
-
-    qs = TestCaseRun.objects.filter(run_id=run_id).values("case", "pk", "case_run_status__name")
-    extra_info = {row["case"]: row for row in qs.iterator()}
+    # Cases of the archived case runs are included as well.
+    extra_info = {
+        row["case"]: row
+        for model in get_case_run_models()
+        for row in model.objects.filter(run_id=run_id)
+        .values("case", "pk", "case_run_status__name")
+        .iterator()
+    }
+    tcs_serializer = TestCase.to_xmlrpc(query={"pk__in": list(extra_info)})
 
     for case in tcs_serializer:
         info = extra_info[case["case_id"]]
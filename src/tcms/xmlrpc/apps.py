@@ -1,14 +1,10 @@
 # -*- coding: utf-8 -*-
 
-import os
-
 from django.apps import AppConfig as DjangoAppConfig
 from django.utils.translation import gettext_lazy as _
 
 from tcms.xmlrpc.filters import autowrap_xmlrpc_apis
 
-xmlrpc_module_path = os.path.dirname(__file__)
-
 
 class AppConfig(DjangoAppConfig):
     name = "tcms.xmlrpc"
@@ -16,4 +12,4 @@ class AppConfig(DjangoAppConfig):
     verbose_name = _("Nitrate XMLRPC APIs")
 
     def ready(self):
-        autowrap_xmlrpc_apis(xmlrpc_module_path, __package__)
+        autowrap_xmlrpc_apis()
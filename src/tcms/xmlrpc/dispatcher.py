@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+"""XML-RPC handler resolving API methods lazily
+
+This is a replacement of ``kobo.django.xmlrpc.views.XMLRPCHandlerFactory``.
+The kobo one imports every module listed in setting ``XMLRPC_METHODS`` when
+handler is created, and the kobo views module creates handlers for all keys
+of the setting on import. Here, the module of a method is not imported until
+the method is called for the first time, so that neither process startup nor
+the URL configuration loading pays for modules not in use.
+"""
+
+import threading
+from collections import defaultdict
+from importlib import import_module
+from typing import Any, Callable, Optional
+
+import django.db
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpRequest, HttpResponse
+from django.template import loader
+from kobo.django.xmlrpc.dispatcher import DjangoXMLRPCDispatcher
+
+__all__ = ("LazyXMLRPCDispatcher", "XMLRPCHandlerFactory")
+
+
+class LazyXMLRPCDispatcher(DjangoXMLRPCDispatcher):
+    """Dispatcher registering methods of a module on the first call
+
+    :param methods: the methods to register, which has same format as the
+        value of setting ``XMLRPC_METHODS``.
+    :type methods: list[tuple]
+    """
+
+    def __init__(self, methods, allow_none=True, encoding=None):
+        super().__init__(allow_none, encoding)
+        self._lock = threading.Lock()
+        # Mapping from the first part of method name to the methods paths
+        # and names to be registered.
+        self._pending: dict[str, list[tuple[str, str]]] = defaultdict(list)
+        for path, name in methods:
+            if callable(path):
+                self.register_function(path, name)
+            else:
+                self._pending[name.split(".")[0]].append((path, name))
+
+    def _register(self, path: str, name: str) -> None:
+        try:
+            module = import_module(path)
+        except ImportError:
+            if path.count(".") == 0:
+                raise ImproperlyConfigured(
+                    f"Error registering XML-RPC method: '{path}' must be "
+                    f"one of (function, 'module' or 'module.function')"
+                )
+        else:
+            self.register_module(module, name)
+            return
+
+        module_name, func_name = path.rsplit(".", 1)
+        try:
+            func = getattr(import_module(module_name), func_name)
+        except (ImportError, AttributeError) as e:
+            raise ImproperlyConfigured(f"Error registering XML-RPC method '{path}': {e}")
+        self.register_function(func, name)
+
+    def load(self, method: Optional[str] = None) -> None:
+        """Register the pending methods
+
+        :param str method: register the methods in the same namespace as this
+            method. If omitted, all pending methods are registered.
+        """
+        if not self._pending:
+            return
+        with self._lock:
+            if method is None:
+                namespaces = list(self._pending)
+            else:
+                namespaces = [method.split(".")[0]]
+            for namespace in namespaces:
+                for path, name in self._pending.get(namespace, ()):
+                    self._register(path, name)
+                # Remove them after registered, so that other threads never
+                # see methods neither pending nor registered.
+                self._pending.pop(namespace, None)
+
+    def get_function(self, method: str) -> Optional[Callable]:
+        self.load(method)
+        return self.funcs.get(method)
+
+    def _dispatch(self, method: str, params: Any) -> Any:
+        self.load(method)
+        return super()._dispatch(method, params)
+
+    def system_listMethods(self) -> list[str]:
+        self.load()
+        return super().system_listMethods()
+
+    def system_methodSignature(self, method_name: str) -> str:
+        self.load(method_name)
+        return super().system_methodSignature(method_name)
+
+    def system_methodHelp(self, method_name: str) -> str:
+        self.load(method_name)
+        return super().system_methodHelp(method_name)
+
+
+class XMLRPCHandlerFactory:
+    """Handle XML-RPC requests with methods of a key of ``XMLRPC_METHODS``
+
+    :param str name: the key of setting ``XMLRPC_METHODS`` to get the methods.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        # xml-rpc must be excluded from CSRF processing
+        self.csrf_exempt = True
+        self.xmlrpc_dispatcher = LazyXMLRPCDispatcher(
+            settings.XMLRPC_METHODS[name], allow_none=True, encoding=None
+        )
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        return self.xmlrpc_handler(request)
+
+    def xmlrpc_handler(self, request: HttpRequest) -> HttpResponse:
+        if settings.DEBUG:
+            # clear queries to stop django allocating more and more memory
+            django.db.reset_queries()
+
+        if request.method == "POST":
+            return HttpResponse(
+                self.xmlrpc_dispatcher._marshaled_dispatch(request), content_type="text/xml"
+            )
+
+        dispatcher = self.xmlrpc_dispatcher
+        method_list = [
+            {
+                "name": method,
+                "signature": dispatcher.system_methodSignature(method),
+                "help": dispatcher.system_methodHelp(method).split("\n"),
+            }
+            for method in dispatcher.system_listMethods()
+        ]
+        context = {
+            "title": f"XML-RPC interface ({self.name})",
+            "method_list": method_list,
+        }
+        template = loader.get_template(settings.XMLRPC_TEMPLATE)
+        return HttpResponse(template.render(context, request))
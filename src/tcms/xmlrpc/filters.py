@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
-import os
+import importlib.abc
+import importlib.machinery
 import sys
 import traceback
 from functools import wraps
@@ -29,9 +30,12 @@ def _get_enable_apis():
     return apis
 
 
-def _wrap_exceptions(module_name):
-    """Load api list and wrap them with decorators"""
-    module = __import__(module_name, {}, {}, [""])
+def _wrap_exceptions(module):
+    """Wrap the api functions listed in module's __all__ with decorators"""
+    if getattr(module, "_xmlrpc_apis_wrapped", False):
+        return
+    module._xmlrpc_apis_wrapped = True
+
     funcs = getattr(module, "__all__", None)
     if not funcs:
         return
@@ -41,44 +45,68 @@ def _wrap_exceptions(module_name):
         if callable(func):
             for api_filter in XMLRPC_API_FILTERS:
                 func = api_filter(func)
-            setattr(sys.modules[module.__name__], func.__name__, func)
+            setattr(module, func.__name__, func)
 
 
-def autowrap_xmlrpc_apis(path, package):
-    """Auto load xmlrpc api, based on directory structure and XMLRPC_METHODS
-    setting.
+class _APIModuleLoader(importlib.abc.Loader):
+    """Wrap the api functions once the module is executed"""
 
-    It will load modules that were listed in XMLRPC_METHODS, and get __all__
-    attribute of each module to collect api functions.
+    def __init__(self, loader):
+        self.loader = loader
 
-    Then wrap the apis with decorators in order(appearance order in
-    __filters__) and replace them.
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
 
-    Everything is done when import tcms.xmlrpc.* or tcms.xmlrpc automatically.
+    def exec_module(self, module):
+        self.loader.exec_module(module)
+        _wrap_exceptions(module)
 
-    If you want to add new decorators, please append it in this module and
-    insert it into __filters__.
+    def __getattr__(self, name):
+        # Delegate get_source, get_code, etc.
+        return getattr(self.loader, name)
+
+
+class APIModuleFinder(importlib.abc.MetaPathFinder):
+    """Find the api modules and make them wrapped on import
+
+    :param api_modules: names of modules to wrap.
+    :type api_modules: list[str]
     """
-    enable_apis = _get_enable_apis()
-    for dir_path, dir_names, file_names in os.walk(path):
-        rel_path = os.path.relpath(dir_path, path)
-        if rel_path == ".":
-            rel_pkg = ""
-        else:
-            rel_pkg = ".%s" % ".".join(rel_path.split(os.sep))
 
-        for file_name in file_names:
-            root, ext = os.path.splitext(file_name)
+    def __init__(self, api_modules):
+        self.api_modules = set(api_modules)
 
-            # Skip __init__ and anything that's not .py
-            # FIXME maybe .pyc in prod env.
-            if ext != ".py" or root == "__init__":
-                continue
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in self.api_modules:
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path, target)
+        if spec is not None and spec.loader is not None:
+            spec.loader = _APIModuleLoader(spec.loader)
+        return spec
 
-            module_name = "%s%s.%s" % (package, rel_pkg, root)
 
-            if module_name in enable_apis:
-                _wrap_exceptions(module_name)
+def autowrap_xmlrpc_apis():
+    """Auto wrap xmlrpc api modules listed in XMLRPC_METHODS setting.
+
+    Each module's __all__ attribute is got to collect api functions.
+
+    Then the apis are wrapped with decorators in order(appearance order in
+    __filters__) and replaced.
+
+    The modules are not imported here. The wrapping is done when the module
+    is imported at the first time, e.g. when an api is called in the first
+    time. Modules imported already are wrapped immediately.
+
+    If you want to add new decorators, please append it in this module and
+    insert it into __filters__.
+    """
+    enable_apis = _get_enable_apis()
+    if not any(isinstance(finder, APIModuleFinder) for finder in sys.meta_path):
+        sys.meta_path.insert(0, APIModuleFinder(enable_apis))
+    for module_name in enable_apis:
+        module = sys.modules.get(module_name)
+        if module is not None:
+            _wrap_exceptions(module)
 
 
 def _format_message(msg):
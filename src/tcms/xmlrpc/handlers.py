@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+"""Compression and conditional responses of the RPC handlers
+
+Responses are compressed with gzip or deflate according to the encodings
+accepted by client.
+
+Calls to the read-only methods, whose names start with ``get`` or ``filter``,
+get an ETag, which is computed from the request body and the data versions of
+apps the methods read data from. If the ETag matches the ``If-None-Match``
+header, the method is not called at all and 304 is returned. Faults get no
+ETag, so that only a successful result is answered with 304. This is enabled
+by setting ``XMLRPC_CONDITIONAL_RESPONSE``.
+"""
+
+import hashlib
+import json
+import re
+import xmlrpc.client
+import zlib
+from functools import wraps
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from django.utils.text import compress_string
+
+from tcms.core.data_versions import get_data_versions
+
+__all__ = (
+    "get_jsonrpc_method",
+    "get_xmlrpc_method",
+    "is_jsonrpc_fault",
+    "is_xmlrpc_fault",
+    "rpc_response",
+)
+
+# Responses shorter than this are not compressed, which is same as
+# django.middleware.gzip.GZipMiddleware.
+MIN_COMPRESS_LENGTH = 200
+
+READONLY_METHOD_PREFIXES = ("get", "filter")
+
+# Apps whose data is read by the read-only methods of each namespace. Users
+# are not tracked, since every login changes them.
+NAMESPACE_DATA_APPS: dict[str, tuple[str, ...]] = {
+    "Build": ("management", "testruns", "testcases"),
+    "Env": ("management",),
+    "Product": ("management", "testcases", "testplans", "testruns"),
+    "Tag": ("management",),
+    "TestCase": ("testcases", "management", "testplans", "testruns", "issuetracker", "logs"),
+    "TestCasePlan": ("testcases", "testplans"),
+    "TestCaseRun": (
+        "testruns",
+        "testcases",
+        "management",
+        "issuetracker",
+        "linkreference",
+        "logs",
+    ),
+    "TestPlan": ("testplans", "testcases", "testruns", "management", "logs"),
+    "TestRun": ("testruns", "testcases", "testplans", "management", "issuetracker", "logs"),
+    "Version": (),
+}
+
+re_accept_encoding = re.compile(r"^\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*$")
+re_xmlrpc_fault = re.compile(rb"^\s*(?:<\?xml[^>]*\?>)?\s*<methodResponse>\s*<fault>")
+
+
+def get_accepted_encoding(request: HttpRequest) -> Optional[str]:
+    """Choose the compression from header Accept-Encoding
+
+    :return: gzip or deflate. If neither is accepted, None is returned.
+    """
+    accepted = {}
+    for item in request.META.get("HTTP_ACCEPT_ENCODING", "").split(","):
+        match = re_accept_encoding.match(item)
+        if match is None:
+            continue
+        encoding, q = match.groups()
+        try:
+            accepted[encoding.lower()] = float(q) if q else 1.0
+        except ValueError:
+            continue
+    for encoding in ("gzip", "deflate"):
+        if accepted.get(encoding, 0) > 0:
+            return encoding
+    return None
+
+
+def compress_response(request: HttpRequest, response: HttpResponse) -> HttpResponse:
+    patch_vary_headers(response, ("Accept-Encoding",))
+    if (
+        response.streaming
+        or response.has_header("Content-Encoding")
+        or len(response.content) < MIN_COMPRESS_LENGTH
+    ):
+        return response
+    encoding = get_accepted_encoding(request)
+    if encoding is None:
+        return response
+    if encoding == "gzip":
+        compressed = compress_string(response.content)
+    else:
+        compressed = zlib.compress(response.content)
+    if len(compressed) >= len(response.content):
+        return response
+    response.content = compressed
+    response["Content-Length"] = str(len(compressed))
+    response["Content-Encoding"] = encoding
+    return response
+
+
+def get_xmlrpc_method(request: HttpRequest) -> Optional[str]:
+    try:
+        _, method = xmlrpc.client.loads(request.body)
+    except Exception:
+        return None
+    return method
+
+
+def get_jsonrpc_method(request: HttpRequest) -> Optional[str]:
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return None
+    # Batch request is not handled.
+    if isinstance(payload, dict) and isinstance(payload.get("method"), str):
+        return payload["method"]
+    return None
+
+
+def is_xmlrpc_fault(response: HttpResponse) -> bool:
+    return re_xmlrpc_fault.match(response.content) is not None
+
+
+def is_jsonrpc_fault(response: HttpResponse) -> bool:
+    # The JSON-RPC handler always puts the error right after the version.
+    return response.content.startswith(b'{"jsonrpc":"2.0","error":')
+
+
+def get_etag(request: HttpRequest, method: Optional[str]) -> Optional[str]:
+    """Compute the ETag of a call to a read-only method
+
+    :return: the ETag. None is returned if the method is not read-only.
+    """
+    if not method or method.count(".") != 1:
+        return None
+    namespace, name = method.split(".")
+    if namespace not in NAMESPACE_DATA_APPS or not name.startswith(READONLY_METHOD_PREFIXES):
+        return None
+    versions = get_data_versions(NAMESPACE_DATA_APPS[namespace])
+    h = hashlib.md5(request.body)  # nosec
+    user_id = request.user.pk if request.user.is_authenticated else ""
+    h.update(f"{user_id}:{sorted(versions.items())}".encode())
+    return f'W/"{h.hexdigest()}"'
+
+
+def rpc_response(
+    get_method: Callable[[HttpRequest], Optional[str]],
+    is_fault: Callable[[HttpResponse], bool],
+):
+    """Decorate an RPC handler to compress and make conditional responses
+
+    :param get_method: a function to get the called method name from request.
+    :param is_fault: a function to check whether a response is a fault.
+    """
+
+    def decorator(handler):
+        @wraps(handler)
+        def _handler(request: HttpRequest) -> HttpResponse:
+            etag = None
+            if request.method == "POST" and settings.XMLRPC_CONDITIONAL_RESPONSE:
+                etag = get_etag(request, get_method(request))
+                if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+                if etag and if_none_match and etag in parse_etags(if_none_match):
+                    response = HttpResponseNotModified()
+                    response["ETag"] = etag
+                    patch_vary_headers(response, ("Accept-Encoding",))
+                    return response
+
+            response = handler(request)
+            if etag and response.status_code == 200 and not is_fault(response):
+                response["ETag"] = etag
+            if settings.XMLRPC_RESPONSE_COMPRESSION:
+                response = compress_response(request, response)
+            return response
+
+        # RPC is excluded from CSRF protection.
+        _handler.csrf_exempt = True
+        return _handler
+
+    return decorator
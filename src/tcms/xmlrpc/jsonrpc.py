@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+"""JSON-RPC 2.0 interface
+
+The same methods registered to the XML-RPC interface are exposed via JSON-RPC.
+Methods are registered from setting ``XMLRPC_METHODS`` in the same way as the
+XML-RPC handler does, so they are wrapped by ``wrap_exceptions`` and
+``log_call`` as they are in XML-RPC.
+
+The response is serialized by orjson if it is installed, otherwise by the
+standard json module. Values of datetime and timedelta are converted in the
+same way as the XML-RPC serializer does.
+
+Refer to https://www.jsonrpc.org/specification
+"""
+
+import json
+import sys
+from datetime import date, datetime, timedelta
+from typing import Any, Optional, Union
+from xmlrpc.client import Fault
+
+import django.db
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed
+
+from tcms.xmlrpc.dispatcher import XMLRPCHandlerFactory
+from tcms.xmlrpc.serializer import datetime_to_str, timedelta_to_str
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+__all__ = ("JSONRPCHandlerFactory", "dumps", "loads")
+
+JSONRPC_VERSION = "2.0"
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+
+JSON_CONTENT_TYPE = "application/json"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return datetime_to_str(value)
+    if isinstance(value, timedelta):
+        return timedelta_to_str(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        # Some serializers encode names in UTF-8 for XML-RPC.
+        return value.decode("utf-8")
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    loads = orjson.loads
+    JSONDecodeError = orjson.JSONDecodeError
+
+else:
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=_default, separators=(",", ":")).encode("utf-8")
+
+    loads = json.loads
+    JSONDecodeError = json.JSONDecodeError  # type: ignore
+
+
+def _error(code: int, message: str, request_id: Any = None) -> dict[str, Any]:
+    return {
+        "jsonrpc": JSONRPC_VERSION,
+        "error": {"code": code, "message": message},
+        "id": request_id,
+    }
+
+
+class JSONRPCHandlerFactory(XMLRPCHandlerFactory):
+    """Handle JSON-RPC requests with methods registered for an XML-RPC handler
+
+    :param str name: the key of setting ``XMLRPC_METHODS`` to get the methods.
+    """
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        return self.jsonrpc_handler(request)
+
+    def jsonrpc_handler(self, request: HttpRequest) -> HttpResponse:
+        if request.method != "POST":
+            return HttpResponseNotAllowed(["POST"])
+
+        if settings.DEBUG:
+            django.db.reset_queries()
+
+        try:
+            payload = loads(request.body)
+        except (JSONDecodeError, UnicodeDecodeError) as e:
+            return self._response(_error(PARSE_ERROR, f"Parse error: {e}"))
+
+        if isinstance(payload, list):
+            if not payload:
+                return self._response(_error(INVALID_REQUEST, "Empty batch request"))
+            responses = [
+                response
+                for response in (self.handle_call(request, call) for call in payload)
+                if response is not None
+            ]
+            return self._response(responses or None)
+
+        return self._response(self.handle_call(request, payload))
+
+    @staticmethod
+    def _response(content: Optional[Union[dict, list]]) -> HttpResponse:
+        if content is None:
+            # All calls are notifications.
+            return HttpResponse(status=204)
+        return HttpResponse(dumps(content), content_type=JSON_CONTENT_TYPE)
+
+    def handle_call(self, request: HttpRequest, call: Any) -> Optional[dict[str, Any]]:
+        """Handle a single call
+
+        :return: the response object, or None if the call is a notification.
+        """
+        if not isinstance(call, dict):
+            return _error(INVALID_REQUEST, "Invalid request")
+
+        request_id = call.get("id")
+        method = call.get("method")
+        params = call.get("params", [])
+        if (
+            call.get("jsonrpc") != JSONRPC_VERSION
+            or not isinstance(method, str)
+            or not isinstance(params, (list, dict))
+        ):
+            return _error(INVALID_REQUEST, "Invalid request", request_id)
+
+        result = self.dispatch(request, method, params)
+        if "id" not in call:
+            return None
+        if "error" in result:
+            result["id"] = request_id
+            return result
+        return {"jsonrpc": JSONRPC_VERSION, "result": result["result"], "id": request_id}
+
+    def dispatch(
+        self, request: HttpRequest, method: str, params: Union[list, dict]
+    ) -> dict[str, Any]:
+        func = self.xmlrpc_dispatcher.get_function(method)
+        if func is None:
+            return _error(METHOD_NOT_FOUND, f'Method "{method}" is not supported')
+        try:
+            if isinstance(params, dict):
+                result = func(request, **params)
+            else:
+                result = func(request, *params)
+        except Fault as fault:
+            message = fault.faultString
+            if isinstance(message, list):
+                message = "\n".join(message)
+            return _error(fault.faultCode, message)
+        except Exception:
+            exc_info = sys.exc_info()[1]
+            return _error(INTERNAL_ERROR, f"{exc_info.__class__.__name__}: {exc_info}")
+        return {"result": result}
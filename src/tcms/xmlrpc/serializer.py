@@ -81,10 +81,16 @@ class XMLRPCSerializer:
 
         raise TypeError("QuerySet(list) or Models(dictionary) is required")
 
-    def serialize_model(self):
+    def serialize_model(self, exclude_fields=(), fields=None):
         """
         Check the fields of models and convert the data
 
+        Arguments:
+        - exclude_fields: names of fields not to be serialized.
+        - fields: names of fields to be serialized. The name of a foreign key
+          field and the name with suffix _id can be specified separately. If
+          omitted, all fields are serialized.
+
         Returns: Dictionary
         """
         if not hasattr(self.model, "__dict__"):
@@ -92,6 +98,13 @@ class XMLRPCSerializer:
         response = {}
         opts = self.model._meta
         for field in opts.local_fields:
+            if field.name in exclude_fields:
+                continue
+            if fields is not None and field.name not in fields:
+                if isinstance(field, ForeignKey) and field.attname in fields:
+                    # Only the id is requested. Avoid querying related object.
+                    response[field.attname] = getattr(self.model, field.attname)
+                continue
             # for a django model, retrieving a foreignkey field
             # will fail when the field value isn't set
             try:
@@ -110,7 +123,11 @@ class XMLRPCSerializer:
                     response[fk_id] = getattr(self.model, fk_id)
                     value = str(value)
             response[field.name] = value
+            if fields is not None and field.attname not in fields:
+                response.pop(field.attname, None)
         for field in opts.local_many_to_many:
+            if fields is not None and field.name not in fields:
+                continue
             value = getattr(self.model, field.name)
             value = value.values_list("pk", flat=True)
             response[field.name] = list(value)
@@ -140,6 +157,11 @@ class QuerySetBasedXMLRPCSerializer(XMLRPCSerializer):
 
     An unknown issue is that the primary key must appear in the
     values_fields_mapping. If doesn't, error would happen.
+
+    Argument fields is a list of serialized field names to project the result.
+    Only the columns and ManyToManyFields required by them are queried. Names
+    which are not serialized are ignored, but ValueError is raised if none of
+    them is serialized. If omitted, all fields are serialized.
     """
 
     # Define the mapping relationship of names from ORM side to XMLRPC output
@@ -152,7 +174,7 @@ class QuerySetBasedXMLRPCSerializer(XMLRPCSerializer):
     # result beside valid fields in database.
     extra_fields: dict[str, dict[str, str]] = {}
 
-    def __init__(self, model_class, queryset):
+    def __init__(self, model_class, queryset, fields=None):
         if model_class is None:
             raise ValueError("model_class should not be None")
         if queryset is None:
@@ -160,6 +182,24 @@ class QuerySetBasedXMLRPCSerializer(XMLRPCSerializer):
 
         self.model_class = model_class
         self.queryset = queryset
+        self.fields = None if fields is None else frozenset(fields)
+
+    def _get_required_fields(self):
+        """Return serialized field names required by the requested fields
+
+        Besides the requested fields, original fields of the requested aliases
+        are required as well.
+        """
+        if self.fields is None:
+            return None
+        required = set(self.fields)
+        for original_name, alias in self.get_extra_fields().get("alias", {}).items():
+            if alias in self.fields:
+                required.add(original_name)
+        return required
+
+    def _is_required(self, name, required_fields):
+        return required_fields is None or name in required_fields
 
     def get_extra_fields(self):
         """Get definition of extra fields mappings
@@ -197,10 +237,19 @@ class QuerySetBasedXMLRPCSerializer(XMLRPCSerializer):
 
         """
         values_fields_mapping = self._get_values_fields_mapping()
+        required_fields = self._get_required_fields()
         if values_fields_mapping:
-            return values_fields_mapping.keys()
+            return [
+                orm_name
+                for orm_name, (serialize_name, _) in values_fields_mapping.items()
+                if self._is_required(serialize_name, required_fields)
+            ]
         else:
-            return [field.name for field in self.model_class._meta.fields]
+            return [
+                field.name
+                for field in self.model_class._meta.fields
+                if self._is_required(field.name, required_fields)
+            ]
 
     def _get_m2m_fields(self):
         """Return names of fields with type ManyToManyField in ORM side
@@ -216,9 +265,11 @@ class QuerySetBasedXMLRPCSerializer(XMLRPCSerializer):
         :rtype: list
         """
         if hasattr(self.__class__, "m2m_fields"):
-            return self.__class__.m2m_fields
+            m2m_fields = self.__class__.m2m_fields
         else:
-            return tuple(field.name for field in self.model_class._meta.many_to_many)
+            m2m_fields = tuple(field.name for field in self.model_class._meta.many_to_many)
+        required_fields = self._get_required_fields()
+        return tuple(name for name in m2m_fields if self._is_required(name, required_fields))
 
     # TODO: how to deal with the situation that is primary key does not appear
     # in values fields, although such thing could not happen.
@@ -328,10 +379,25 @@ class QuerySetBasedXMLRPCSerializer(XMLRPCSerializer):
           ManyToManyField should be retrieved from database and attached to
           each serialized data object.
         """
-        qs = self.queryset.values(*self._get_values_fields())
+        values_fields = list(self._get_values_fields())
         primary_key_field = self._get_primary_key_field()
         values_fields_mapping = self._get_values_fields_mapping()
         m2m_fields = self._get_m2m_fields()
+        if not values_fields and not m2m_fields:
+            # Otherwise, every column would be selected by values().
+            raise ValueError(
+                "None of the requested fields is known: {}".format(", ".join(sorted(self.fields)))
+            )
+        if m2m_fields and primary_key_field not in values_fields:
+            # Required to attach the related objects.
+            values_fields.append(primary_key_field)
+        qs = self.queryset.values(*values_fields)
+        if values_fields_mapping:
+            values_fields_mapping = {
+                orm_name: serialize_info
+                for orm_name, serialize_info in values_fields_mapping.items()
+                if orm_name in values_fields
+            }
         m2m_not_queried = True
         serialize_result = []
 
@@ -371,6 +437,13 @@ class QuerySetBasedXMLRPCSerializer(XMLRPCSerializer):
             # according to requirement.
             self._handle_extra_fields(new_serialized_data)
 
+            if self.fields is not None:
+                new_serialized_data = {
+                    name: value
+                    for name, value in new_serialized_data.items()
+                    if name in self.fields
+                }
+
             serialize_result.append(new_serialized_data)
 
         return serialize_result
@@ -4,6 +4,7 @@ from typing import Any, Optional
 
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
 
 from tcms.management.models import Classification, Priority, Product, TestBuild, Version
 from tcms.testcases.models import TestCase, TestCaseCategory, TestCaseStatus
@@ -13,6 +14,12 @@ from tcms.testruns.models import TestCaseRunStatus, TestRun
 TESTER_PASSWORD = "password"
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Avoid using cached data, e.g. permissions, from previous tests"""
+    cache.clear()
+
+
 @pytest.fixture
 def tester(django_user_model):
     user = django_user_model.objects.create(username="tester", email="tester@example.com")
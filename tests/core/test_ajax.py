@@ -262,6 +262,12 @@ class TestChangeCaseRunStatus(BaseCaseRun):
                 ).exists()
             )
 
+    @patch("tcms.core.ajax.mark_runs_dirty")
+    def test_mark_runs_dirty(self, mark_runs_dirty):
+        resp = self.client.patch(self.url, data=self.request_data, content_type="application/json")
+        self.assert200(resp)
+        mark_runs_dirty.assert_called_once_with({self.test_run.pk})
+
     def test_no_case_runs_to_update(self):
         data = self.request_data.copy()
         result = TestCaseRun.objects.aggregate(max_pk=Max("pk"))
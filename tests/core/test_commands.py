@@ -1,12 +1,16 @@
 # -*- coding: utf-8 -*-
 
+import subprocess
+from io import StringIO
 from unittest.mock import patch
 
+import pytest
 from django import test
 from django.contrib.auth.models import Group
-from django.core.management import call_command
+from django.core.management import CommandError, call_command
 
 from tcms.core.management.commands import setdefaultperms
+from tcms.core.management.commands.importtime import ImportTime, parse_importtime
 
 
 class TestSetDefaultPerms(test.TestCase):
@@ -39,3 +43,60 @@ class TestSetDefaultPerms(test.TestCase):
 
         for codename in ["add_user", "delete_user"]:
             self.assertNotIn(codename, added_codenames)
+
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   django.utils
+import time:       500 |       1500 |     tcms.core.utils
+import time:       300 |        300 |       tcms.xmlrpc
+import time:       200 |        500 |     tcms.xmlrpc.api
+import time:       900 |       1400 |   tcms.xmlrpc.api.testcase
+import time:        50 |       3000 | tcms
+"""
+
+
+def test_parse_importtime():
+    assert [
+        ImportTime("tcms.core.utils", 500, 1500),
+        ImportTime("tcms.xmlrpc", 300, 300),
+        ImportTime("tcms.xmlrpc.api", 200, 500),
+        ImportTime("tcms.xmlrpc.api.testcase", 900, 1400),
+        ImportTime("tcms", 50, 3000),
+    ] == parse_importtime(IMPORTTIME_OUTPUT)
+
+
+def test_parse_importtime_merges_duplicates():
+    output = (
+        "import time:         1 |        600 | tcms.xmlrpc.api.testcase\n"
+        "import time:       400 |        500 | tcms.xmlrpc.api.testcase\n"
+    )
+    assert [ImportTime("tcms.xmlrpc.api.testcase", 401, 600)] == parse_importtime(output)
+
+
+@pytest.mark.parametrize(
+    "args,expected",
+    [
+        [["-n", "2"], ["tcms", "tcms.core.utils"]],
+        [["-n", "2", "--sort", "self"], ["tcms.xmlrpc.api.testcase", "tcms.core.utils"]],
+    ],
+)
+@patch("subprocess.run")
+def test_importtime(run, args, expected):
+    run.return_value = subprocess.CompletedProcess([], 0, "", IMPORTTIME_OUTPUT)
+    out = StringIO()
+    call_command("importtime", "tcms.xmlrpc.api.testcase", *args, stdout=out)
+
+    code = run.call_args[0][0][-1]
+    assert code.endswith("import tcms.xmlrpc.api.testcase")
+    lines = out.getvalue().splitlines()[1:]
+    assert expected == [line.split()[-1] for line in lines]
+
+
+@patch("subprocess.run")
+def test_importtime_fails(run):
+    run.return_value = subprocess.CompletedProcess(
+        [], 1, "", "import time: 1 | 1 | x\nModuleNotFoundError: No module named 'xxx'\n"
+    )
+    with pytest.raises(CommandError, match="No module named"):
+        call_command("importtime", "xxx")
@@ -2,6 +2,7 @@
 import logging
 import smtplib
 import sys
+import threading
 import unittest
 from datetime import timedelta
 from typing import Optional, Type, Union
@@ -16,9 +17,9 @@ from django.core import mail
 from django.http import QueryDict
 
 from tcms.core import responses
-from tcms.core.db import CaseRunStatusGroupByResult, GroupByResult
+from tcms.core.db import CaseRunStatusGroupByResult, GroupByMatrix, GroupByResult
 from tcms.core.mailto import mail_notify, mailto
-from tcms.core.task import AsyncTask, Task
+from tcms.core.task import AsyncTask, Task, get_executor, run_in_thread
 from tcms.core.utils import (
     calc_percent,
     clean_request,
@@ -363,6 +364,67 @@ def test_groupbyresult_percent_property(
             GroupByResult(initial_data, total_name=total_name).python_percent  # noqa
 
 
+class GroupByMatrixTest(unittest.TestCase):
+    """Test GroupByMatrix"""
+
+    def setUp(self):
+        self.matrix = GroupByMatrix.from_rows(
+            [
+                ("build_1", "run_1", "PASSED", 1),
+                ("build_1", "run_1", "FAILED", 3),
+                ("build_1", "run_2", "PASSED", 2),
+                ("build_2", "run_3", "ERROR", 4),
+            ]
+        )
+
+    def test_dict_like(self):
+        self.assertEqual(["build_1", "build_2"], self.matrix.keys())
+        self.assertIn("build_1", self.matrix)
+        self.assertNotIn("build_3", self.matrix)
+        self.assertEqual(2, len(self.matrix))
+        self.assertIsNone(self.matrix.get("build_3"))
+        self.assertEqual(3, self.matrix["build_1"]["run_1"]["FAILED"])
+        with self.assertRaisesRegex(KeyError, "Unknown key"):
+            self.matrix["build_3"]
+        self.assertEqual(
+            [("PASSED", 1), ("FAILED", 3)], list(self.matrix["build_1"]["run_1"].iteritems())
+        )
+
+    def test_total(self):
+        self.assertEqual(10, self.matrix.total)
+        self.assertEqual(6, self.matrix["build_1"].total)
+        self.assertEqual(4, self.matrix["build_1"]["run_1"].total)
+
+        self.matrix.add(("build_1", "run_1", "PASSED"), 2)
+        self.assertEqual(12, self.matrix.total)
+        self.assertEqual(3, self.matrix["build_1"]["run_1"]["PASSED"])
+        self.assertEqual(6, self.matrix["build_1"]["run_1"].total)
+
+    def test_percent(self):
+        self.assertEqual(60.0, self.matrix.build_1_percent)
+        self.assertEqual(25.0, self.matrix["build_1"]["run_1"].PASSED_percent)
+        self.assertEqual(0, self.matrix["build_1"]["run_1"].WAIVED_percent)
+        self.assertEqual(0, self.matrix["build_1"]["run_1"].WAIVED)
+
+    def test_leaf_values_count(self):
+        self.assertEqual(4, self.matrix.leaf_values_count())
+        self.assertEqual(3, self.matrix.leaf_values_count(value_in_row=True))
+        self.assertEqual(2, self.matrix["build_1"].leaf_values_count(value_in_row=True))
+
+        self.matrix.add(("build_2", "run_4", "PASSED"), 1)
+        self.assertEqual(4, self.matrix.leaf_values_count(value_in_row=True))
+
+    def test_empty(self):
+        matrix = GroupByMatrix.from_rows([])
+        self.assertTrue(matrix.empty)
+        self.assertEqual(0, matrix.total)
+        self.assertEqual(0, matrix.PASSED_percent)
+
+    def test_wrong_number_of_keys(self):
+        with self.assertRaisesRegex(ValueError, "Expect 3 keys"):
+            self.matrix.add(("build_1", "run_1"), 1)
+
+
 class GroupByResultLevelTest(unittest.TestCase):
     def setUp(self):
         self.levels_groupby_result = GroupByResult(
@@ -556,18 +618,35 @@ class TestAsyncTask(unittest.TestCase):
             task(1, a=2)
             func.assert_called_once_with(1, a=2)
 
-    @patch("threading.Thread")
-    def test_uses_threading(self, Thread):
+    @patch("tcms.core.task.get_executor")
+    def test_uses_threading(self, get_executor):
         with patch.object(settings, "ASYNC_TASK", new=AsyncTask.THREADING.value):
             func = Mock()
             task = Task(func)
             task(1, a=2)
             func.assert_not_called()
 
-            Thread.assert_called_once_with(target=func, args=(1,), kwargs={"a": 2})
-            thread = Thread.return_value
-            self.assertTrue(thread.daemon)
-            thread.start.assert_called_once()
+            get_executor.return_value.submit.assert_called_once_with(run_in_thread, func, 1, a=2)
+
+    @patch("tcms.core.task.release_connections")
+    @patch("tcms.core.task.prepare_connections")
+    def test_release_connections_in_thread(self, prepare_connections, release_connections):
+        func = Mock(side_effect=ValueError("error"))
+        with self.assertLogs("tcms.core.task", level="ERROR"):
+            run_in_thread(func, 1, a=2)
+        func.assert_called_once_with(1, a=2)
+        prepare_connections.assert_called_once()
+        release_connections.assert_called_once()
+
+    def test_run_in_thread_pool(self):
+        with patch.object(settings, "ASYNC_TASK", new=AsyncTask.THREADING.value):
+            with patch.object(settings, "ASYNC_TASK_THREADS", new=2):
+                with patch("tcms.core.task._executor", new=None):
+                    done = threading.Event()
+                    Task(done.set)()
+                    self.assertTrue(done.wait(5))
+                    self.assertEqual(2, get_executor()._max_workers)
+                    get_executor().shutdown()
 
     @patch("celery.shared_task")
     def test_uses_celery(self, shared_task):
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from django.db import connection
+
+from tcms.core.data_versions import (
+    bump_data_version,
+    get_data_versions,
+    get_table_app_label,
+    install_data_version_tracker,
+    track_data_version,
+)
+from tcms.management.models import Priority
+from tests import factories as f
+
+
+@pytest.fixture
+def data_version_tracker():
+    install_data_version_tracker()
+    yield
+    connection.execute_wrappers.remove(track_data_version)
+
+
+def test_get_initial_versions():
+    versions = get_data_versions(["testcases", "testruns"])
+    assert ["testcases", "testruns"] == sorted(versions)
+    assert versions == get_data_versions(["testcases", "testruns"])
+
+
+def test_bump_data_version():
+    version = get_data_versions(["testcases"])["testcases"]
+    bump_data_version("testcases")
+    assert version + 1 == get_data_versions(["testcases"])["testcases"]
+
+
+def test_bump_missing_data_version():
+    bump_data_version("testruns")
+    assert "testruns" in get_data_versions(["testruns"])
+
+
+@pytest.mark.parametrize(
+    "table,expected",
+    [
+        ["test_cases", "testcases"],
+        ["test_case_runs", "testruns"],
+        ["test_run_cc", "testruns"],
+        ["xxx", None],
+    ],
+)
+def test_get_table_app_label(table, expected):
+    assert expected == get_table_app_label(table)
+
+
+@pytest.mark.django_db
+def test_bump_on_commit(django_capture_on_commit_callbacks, data_version_tracker):
+    versions = get_data_versions(["management", "testplans"])
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        f.ProductFactory()
+        f.ProductFactory()
+        Priority.objects.update(is_active=True)
+    # Bumped once for each app although multiple tables are changed.
+    labels = [callback.app_label for callback in callbacks]
+    assert "management" in labels
+    assert len(set(labels)) == len(labels)
+    assert versions == get_data_versions(["management", "testplans"])
+
+    for callback in callbacks:
+        callback()
+    new_versions = get_data_versions(["management", "testplans"])
+    assert versions["management"] + 1 == new_versions["management"]
+    assert versions["testplans"] == new_versions["testplans"]
+
+
+@pytest.mark.django_db
+def test_reads_do_not_bump(django_capture_on_commit_callbacks, data_version_tracker):
+    with django_capture_on_commit_callbacks() as callbacks:
+        list(Priority.objects.all())
+    assert [] == callbacks
@@ -2,9 +2,23 @@ import operator
 from typing import Optional, Union
 
 import pytest
+from django.db import DatabaseError, connection
+from django.test import override_settings
 
-from tcms.core.db import SQLExecution, get_groupby_result
+from tcms.core.data_versions import install_data_version_tracker, track_data_version
+from tcms.core.db import (
+    SQLExecution,
+    Subtotal,
+    SubtotalCounter,
+    cached_count,
+    compute_sortkeys,
+    estimate_count,
+    get_groupby_result,
+    reorder_sortkeys,
+)
 from tcms.management.models import Priority
+from tcms.testcases.models import TestCasePlan
+from tcms.testplans.models import TestPlan
 from tests import factories as f
 
 
@@ -55,6 +69,66 @@ def test_execute_sql(
     assert expected_scalar == exec_result.scalar
 
 
+@pytest.mark.parametrize("batch_size", [1, 2, 100])
+@pytest.mark.parametrize(
+    "with_field_name,named_row,expected_result",
+    [
+        [True, False, [{"summary": "case 1"}, {"summary": "case 2"}, {"summary": "case 3"}]],
+        [False, False, [("case 1",), ("case 2",), ("case 3",)]],
+        [False, True, [("case 1",), ("case 2",), ("case 3",)]],
+    ],
+)
+@pytest.mark.django_db()
+def test_execute_sql_in_stream_mode(
+    batch_size: int,
+    with_field_name: bool,
+    named_row: bool,
+    expected_result: list,
+):
+    for i in range(1, 4):
+        f.TestCaseFactory(summary=f"case {i}")
+
+    exec_result = SQLExecution(
+        "SELECT summary FROM test_cases ORDER BY summary",
+        with_field_name=with_field_name,
+        stream=True,
+        batch_size=batch_size,
+        named_row=named_row,
+    )
+    rows = list(exec_result.rows)
+    assert expected_result == rows
+    assert ["summary"] == exec_result.field_names
+    if named_row:
+        assert ["case 1", "case 2", "case 3"] == [row.summary for row in rows]
+
+
+@pytest.mark.django_db()
+def test_close_cursor_if_rows_are_not_consumed():
+    for i in range(1, 4):
+        f.TestCaseFactory(summary=f"case {i}")
+
+    sql = "SELECT summary FROM test_cases ORDER BY summary"
+    with SQLExecution(sql, with_field_name=False, stream=True, batch_size=1) as exec_result:
+        assert ("case 1",) == next(exec_result.rows)
+    with pytest.raises(DatabaseError):
+        exec_result.cursor.fetchone()
+
+    exec_result = SQLExecution(sql, stream=True, batch_size=1)
+    assert "case 1" == exec_result.scalar
+    with pytest.raises(DatabaseError):
+        exec_result.cursor.fetchone()
+
+
+@pytest.mark.django_db()
+def test_execute_sql_with_named_row():
+    f.TestCaseFactory(summary="case 1", script="echo hello")
+
+    exec_result = SQLExecution("SELECT summary, script FROM test_cases", named_row=True)
+    row = next(exec_result.rows)
+    assert ("case 1", "echo hello") == (row.summary, row.script)
+    assert "case 1" == SQLExecution("SELECT summary FROM test_cases", named_row=True).scalar
+
+
 @pytest.mark.parametrize(
     "sql,params,key_name,value_name,expected_result",
     [
@@ -128,3 +202,141 @@ def test_get_groupby_result(
     p3_cnt = result.get("P3", 0)
     total = result.total
     assert expected_result == (p1_cnt, p2_cnt, p3_cnt, total)
+
+
+@pytest.mark.django_db()
+def test_subtotal_attach(tester):
+    plan_1 = f.TestPlanFactory(author=tester)
+    plan_2 = f.TestPlanFactory(author=tester, parent=plan_1)
+    plan_3 = f.TestPlanFactory(author=tester)
+    f.TestCaseFactory(plan=[plan_1, plan_2], author=tester)
+    f.TestCaseFactory(plan=[plan_1], author=tester)
+
+    subtotal = Subtotal(
+        cases_count=SubtotalCounter("testcases.TestCasePlan", "plan"),
+        children_count=SubtotalCounter(TestPlan, "parent"),
+    )
+    plans = subtotal.attach(TestPlan.objects.filter(pk__in=[plan_1.pk, plan_2.pk, plan_3.pk]))
+
+    result = {plan.pk: (plan.cases_count, plan.children_count) for plan in plans}
+    assert {plan_1.pk: (2, 1), plan_2.pk: (1, 0), plan_3.pk: (0, 0)} == result
+
+
+@pytest.mark.django_db()
+def test_subtotal_annotate_for_ordering(tester):
+    plan_1 = f.TestPlanFactory(author=tester)
+    plan_2 = f.TestPlanFactory(author=tester)
+    f.TestCaseFactory(plan=[plan_1, plan_2], author=tester)
+    f.TestCaseFactory(plan=[plan_2], author=tester)
+
+    subtotal = Subtotal(cases_count=SubtotalCounter("testcases.TestCasePlan", "plan"))
+    qs = subtotal.annotate(TestPlan.objects.all(), ["-cases_count", "pk"]).order_by("-cases_count")
+
+    assert "cases_count" in qs.query.annotations
+    assert [plan_2.pk, plan_1.pk] == [plan.pk for plan in subtotal.attach(qs)]
+
+
+@pytest.fixture
+def data_version_tracker():
+    install_data_version_tracker()
+    yield
+    connection.execute_wrappers.remove(track_data_version)
+
+
+@pytest.mark.django_db()
+def test_cached_count_is_disabled(django_assert_num_queries):
+    f.ProductFactory.create_batch(2)
+    qs = TestPlan.objects.all()
+    with django_assert_num_queries(2):
+        assert 0 == cached_count(qs)
+        assert 0 == cached_count(qs)
+
+
+@override_settings(COUNT_CACHE_TIMEOUT=60)
+@pytest.mark.django_db()
+def test_cached_count(django_assert_num_queries, data_version_tracker):
+    plan = f.TestPlanFactory()
+    qs = TestPlan.objects.filter(name=plan.name).order_by("-pk")
+
+    with django_assert_num_queries(1):
+        assert 1 == cached_count(qs)
+        # Ordering does not make a different count
+        assert 1 == cached_count(qs.order_by("pk"))
+
+    # Different criteria
+    with django_assert_num_queries(1):
+        assert 0 == cached_count(TestPlan.objects.filter(name="xxx"))
+
+
+@override_settings(COUNT_CACHE_TIMEOUT=60)
+@pytest.mark.django_db()
+def test_cached_count_after_data_change(
+    django_assert_num_queries, django_capture_on_commit_callbacks, data_version_tracker
+):
+    product = f.ProductFactory()
+    qs = TestPlan.objects.filter(product=product)
+    assert 0 == cached_count(qs)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        f.TestPlanFactory(product=product)
+
+    with django_assert_num_queries(1):
+        assert 1 == cached_count(qs)
+
+
+@override_settings(COUNT_CACHE_TIMEOUT=60)
+@pytest.mark.django_db()
+def test_cached_count_of_empty_result(django_assert_num_queries):
+    with django_assert_num_queries(0):
+        assert 0 == cached_count(TestPlan.objects.filter(pk__in=[]))
+
+
+@override_settings(COUNT_ESTIMATE_THRESHOLD=1)
+@pytest.mark.django_db()
+def test_estimate_count_is_not_supported(django_assert_num_queries):
+    f.TestPlanFactory()
+    assert estimate_count(TestPlan.objects.all()) is None
+    with django_assert_num_queries(1):
+        assert 1 == cached_count(TestPlan.objects.all())
+
+
+@pytest.mark.parametrize(
+    "sortkeys,expected",
+    [
+        [[], []],
+        [[10, 20, 30], [10, 20, 30]],
+        # Move the last one to the beginning
+        [[30, 10, 20], [5, 10, 20]],
+        # Move the first one to the end
+        [[20, 30, 10], [20, 30, 40]],
+        [[10, 30, 20, 40], [10, 15, 20, 40]],
+        [[None, None], [10, 20]],
+        [[20, 10, None], [5, 10, 20]],
+        # No gap to put the moved one
+        [[2, 1, 2], [10, 20, 30]],
+        [[1, 1], [10, 20]],
+    ],
+)
+def test_compute_sortkeys(sortkeys, expected):
+    assert expected == compute_sortkeys(sortkeys)
+
+
+@pytest.mark.django_db()
+def test_reorder_sortkeys(django_assert_num_queries):
+    plan = f.TestPlanFactory()
+    cases = f.TestCaseFactory.create_batch(4)
+    for i, case in enumerate(cases):
+        TestCasePlan.objects.create(plan=plan, case=case, sortkey=(i + 1) * 10)
+    case_ids = [case.pk for case in cases]
+
+    # Move the last case to the beginning. The case not in the plan is ignored.
+    new_order = [case_ids[3], case_ids[0], case_ids[1], case_ids[2], 0]
+    with django_assert_num_queries(2):
+        changed = reorder_sortkeys(
+            TestCasePlan.objects.filter(plan=plan), new_order, key_field="case"
+        )
+
+    assert 1 == changed
+    assert case_ids[3:] + case_ids[:3] == list(
+        TestCasePlan.objects.filter(plan=plan).order_by("sortkey").values_list("case", flat=True)
+    )
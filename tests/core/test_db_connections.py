@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from tcms.core.db_connections import (
+    get_connection_stats,
+    on_connection_created,
+    prepare_connections,
+    record_connection_event,
+    release_connections,
+)
+
+
+@pytest.fixture
+def connection_stats(settings):
+    settings.DB_CONNECTION_STATS = True
+
+
+def test_not_count_if_disabled(settings):
+    settings.DB_CONNECTION_STATS = False
+    record_connection_event("default", "opened")
+    assert {"opened": 0, "reused": 0, "closed": 0} == get_connection_stats(["default"])["default"]
+
+
+def test_count_connection_events(connection_stats):
+    on_connection_created(sender=None, connection=connection)
+    on_connection_created(sender=None, connection=connection)
+    record_connection_event("default", "closed")
+    assert {"opened": 2, "reused": 0, "closed": 1} == get_connection_stats(["default"])["default"]
+
+
+@pytest.mark.django_db
+def test_release_obsolete_connections(connection_stats):
+    connection.ensure_connection()
+    with patch.object(connection, "close_if_unusable_or_obsolete") as close:
+        close.side_effect = lambda: setattr(connection, "connection", None)
+        with patch.object(connection, "connection", new=object()):
+            release_connections()
+            close.assert_called_once()
+            assert connection.connection is None
+    assert 1 == get_connection_stats(["default"])["default"]["closed"]
+
+
+@pytest.mark.django_db
+def test_reuse_usable_connections(connection_stats):
+    connection.ensure_connection()
+    with patch.object(connection, "close_if_unusable_or_obsolete") as close:
+        prepare_connections()
+        close.assert_called_once()
+    stats = get_connection_stats(["default"])["default"]
+    assert 1 == stats["reused"]
+    assert 0 == stats["closed"]
+
+
+def test_dbconnectionstats_command(connection_stats):
+    record_connection_event("default", "opened")
+    out = StringIO()
+    call_command("dbconnectionstats", "default", stdout=out)
+    assert out.getvalue().splitlines()[1].split() == ["default", "1", "0", "0"]
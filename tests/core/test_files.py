@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 
+import gzip
+import io
 import os
 import shutil
 import tempfile
+import unittest
 from datetime import datetime
 from http import HTTPStatus
 from typing import BinaryIO, Optional, Union
@@ -14,7 +17,7 @@ from django.http import HttpResponse
 from django.test import RequestFactory
 from django.urls import reverse
 
-from tcms.core.files import able_to_delete_attachment
+from tcms.core.files import able_to_delete_attachment, iter_decompressed_file
 from tcms.core.utils import checksum
 from tcms.management.models import TestAttachment
 from tcms.testcases.models import TestCase, TestCaseAttachment
@@ -162,6 +165,66 @@ class TestUploadFile(BasePlanCase):
             f"A file {filename} having same content has been uploaded previously",
         )
 
+    def test_store_file_by_checksum(self):
+        self._upload_attachment(self.upload_filename, self.upload_file_url, to_case=self.case_1)
+
+        attachment = TestAttachment.objects.get(file_name=os.path.basename(self.upload_filename))
+        expected_checksum = checksum(b"abc" * 100)
+        self.assertEqual(expected_checksum, attachment.checksum)
+        self.assertEqual(
+            f"{expected_checksum[:2]}/{expected_checksum[2:4]}/{expected_checksum}",
+            attachment.stored_name,
+        )
+        with open(os.path.join(self.working_dir, attachment.stored_name), "rb") as f:
+            self.assertEqual(b"abc" * 100, f.read())
+
+    @patch("tcms.core.storage.settings.ATTACHMENT_COMPRESSION", new=True)
+    def test_store_compressed_file(self):
+        self._upload_attachment(self.upload_filename, self.upload_file_url, to_case=self.case_1)
+
+        attachment = TestAttachment.objects.get(file_name=os.path.basename(self.upload_filename))
+        self.assertTrue(attachment.stored_name.endswith(".gz"))
+        with gzip.open(os.path.join(self.working_dir, attachment.stored_name), "rb") as f:
+            self.assertEqual(b"abc" * 100, f.read())
+
+        with patch("tcms.core.files.settings.FILE_UPLOAD_DIR", new=self.working_dir):
+            resp = self.client.get(reverse("check-file", args=[attachment.pk]))
+            self.assertEqual(b"abc" * 100, resp.getvalue())
+            self.assertNotIn("Content-Encoding", resp)
+
+            resp = self.client.get(
+                reverse("check-file", args=[attachment.pk]), HTTP_ACCEPT_ENCODING="gzip"
+            )
+            self.assertEqual("gzip", resp["Content-Encoding"])
+            self.assertEqual(b"abc" * 100, gzip.decompress(resp.getvalue()))
+
+    @patch("tcms.core.storage.settings.ATTACHMENT_STORAGE", new="DATABASE")
+    def test_store_file_in_database(self):
+        self._upload_attachment(self.upload_filename, self.upload_file_url, to_case=self.case_1)
+
+        attachment = TestAttachment.objects.get(file_name=os.path.basename(self.upload_filename))
+        self.assertIsNone(attachment.stored_name)
+        self.assertEqual(b"abc" * 100, bytes(attachment.testattachmentdata.contents))
+
+        resp = self.client.get(reverse("check-file", args=[attachment.pk]))
+        self.assertEqual(b"abc" * 100, resp.getvalue())
+
+
+class TestIterDecompressedFile(unittest.TestCase):
+    """Test iter_decompressed_file"""
+
+    def test_close_file(self):
+        f = io.BytesIO(gzip.compress(b"abc" * 100))
+        self.assertEqual(b"abc" * 100, b"".join(iter_decompressed_file(f, block_size=64)))
+        self.assertTrue(f.closed)
+
+    def test_close_file_if_stopped(self):
+        f = io.BytesIO(gzip.compress(b"abc" * 100))
+        chunks = iter_decompressed_file(f, block_size=64)
+        next(chunks)
+        chunks.close()
+        self.assertTrue(f.closed)
+
 
 class TestAbleToDeleteFile(BasePlanCase):
     @classmethod
@@ -407,21 +470,21 @@ class TestCheckFile(BasePlanCase):
             resp = self.client.get(reverse("check-file", args=[self.text_file.pk]))
         self.assertEqual("text/plain", resp["Content-Type"])
         self.assertEqual('attachment; filename="a.txt"', resp["Content-Disposition"])
-        self.assertEqual(self.text_file_content, resp.content.decode("utf-8"))
+        self.assertEqual(self.text_file_content, resp.getvalue().decode("utf-8"))
 
     def test_download_binary_file(self):
         with patch.object(settings, "FILE_UPLOAD_DIR", self.upload_dir):
             resp = self.client.get(reverse("check-file", args=[self.binary_file.pk]))
         self.assertEqual("application/x-binary", resp["Content-Type"])
         self.assertEqual('attachment; filename="b.txt"', resp["Content-Disposition"])
-        self.assertEqual(self.binary_file_content, resp.content)
+        self.assertEqual(self.binary_file_content, resp.getvalue())
 
     def test_use_original_filename_to_find_out_attachment(self):
         with patch.object(settings, "FILE_UPLOAD_DIR", self.upload_dir):
             resp = self.client.get(reverse("check-file", args=[self.logo_png.pk]))
         self.assertEqual("image/png", resp["Content-Type"])
         self.assertEqual('attachment; filename="logo.png"', resp["Content-Disposition"])
-        self.assertEqual(self.logo_png_content, resp.content)
+        self.assertEqual(self.logo_png_content, resp.getvalue())
 
     def test_attachment_file_is_deleted_yet(self):
         with patch.object(settings, "FILE_UPLOAD_DIR", self.upload_dir):
@@ -447,7 +510,32 @@ class TestCheckFile(BasePlanCase):
         # Error when read file content
         with patch.object(settings, "FILE_UPLOAD_DIR", self.upload_dir):
             with patch("builtins.open") as mock_open:
-                fh = mock_open.return_value.__enter__.return_value
-                fh.read.side_effect = IOError("io error")
+                fh = mock_open.return_value
+                fh.seek.side_effect = IOError("io error")
                 resp = self.client.get(url)
                 self.assertContains(resp, "Cannot read file")
+
+    def test_download_range(self):
+        url = reverse("check-file", args=[self.text_file.pk])
+        with patch.object(settings, "FILE_UPLOAD_DIR", self.upload_dir):
+            resp = self.client.get(url, HTTP_RANGE="bytes=6-")
+            self.assertEqual(HTTPStatus.PARTIAL_CONTENT, resp.status_code)
+            self.assertEqual("bytes 6-12/13", resp["Content-Range"])
+            self.assertEqual(b"Nitrate", resp.getvalue())
+
+            resp = self.client.get(url, HTTP_RANGE="bytes=-3")
+            self.assertEqual(b"ate", resp.getvalue())
+
+            resp = self.client.get(url, HTTP_RANGE="bytes=100-")
+            self.assertEqual(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, resp.status_code)
+            self.assertEqual("bytes */13", resp["Content-Range"])
+
+    def test_conditional_get(self):
+        url = reverse("check-file", args=[self.text_file.pk])
+        with patch.object(settings, "FILE_UPLOAD_DIR", self.upload_dir):
+            resp = self.client.get(url)
+            etag = resp["ETag"]
+            self.assertEqual(f'"{self.text_file.checksum}"', etag)
+
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(HTTPStatus.NOT_MODIFIED, resp.status_code)
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models.signals import post_delete, post_save
+from django.template import Context, Template, TemplateSyntaxError
+
+from tcms.core.fragment_cache import (
+    bump_object_version,
+    connect_signals,
+    get_fragment_cache_stats,
+    get_object_versions,
+    make_fragment_key,
+    on_versioned_object_changed,
+    record_fragment_access,
+)
+from tcms.testruns.models import TestRun
+from tests import factories as f
+
+
+@pytest.fixture
+def run(base_data):
+    run = f.TestRunFactory(plan=base_data.create_plan())
+    run.add_tag(f.TestTagFactory(name="tag1"))
+    return run
+
+
+@pytest.fixture
+def versioned_signals():
+    # Objects created before connecting signals do not register callbacks to
+    # bump versions in the test transaction.
+    from django.apps import apps
+
+    from tcms.core.fragment_cache import VERSIONED_RELATIONS
+
+    connect_signals()
+    yield
+    for label in VERSIONED_RELATIONS:
+        model = apps.get_model(label)
+        post_save.disconnect(on_versioned_object_changed, sender=model)
+        post_delete.disconnect(on_versioned_object_changed, sender=model)
+
+
+@pytest.mark.django_db
+def test_bump_object_version(run):
+    (version,) = get_object_versions([run])
+    assert [version] == get_object_versions([run])
+    bump_object_version("testruns.testrun", run.pk)
+    assert [version + 1] == get_object_versions([run])
+
+
+@pytest.mark.django_db
+def test_fragment_key_varies_on_versions_and_values(run):
+    key = make_fragment_key("run.tags", [run, True])
+    assert key == make_fragment_key("run.tags", [run, True])
+    assert key != make_fragment_key("run.tags", [run, False])
+    assert key != make_fragment_key("case.text", [run, True])
+
+    bump_object_version("testruns.testrun", run.pk)
+    assert key != make_fragment_key("run.tags", [run, True])
+
+
+@pytest.mark.django_db
+def test_bump_version_once_per_transaction(
+    run, versioned_signals, django_capture_on_commit_callbacks
+):
+    (version,) = get_object_versions([run])
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        run.add_tag(f.TestTagFactory(name="tag2"))
+        run.add_tag(f.TestTagFactory(name="tag3"))
+        assert [version] == get_object_versions([run])
+
+    assert 1 == len(callbacks)
+    assert [version + 1] == get_object_versions([run])
+
+
+@pytest.mark.django_db
+def test_bump_version_on_delete(run, versioned_signals, django_capture_on_commit_callbacks):
+    (version,) = get_object_versions([run])
+    with django_capture_on_commit_callbacks(execute=True):
+        run.tag.through.objects.filter(run=run).delete()
+    assert [version + 1] == get_object_versions([run])
+
+
+def render_tags(run, perm=True):
+    template = Template(
+        '{% load fragment_tags %}{% fragment_cache "run.tags" run perm %}'
+        "{% for tag in run.tag.all %}{{ tag.name }} {% endfor %}{{ perm }}"
+        "{% endfragment_cache %}"
+    )
+    return template.render(Context({"run": run, "perm": perm}))
+
+
+@pytest.mark.django_db
+def test_fragment_cache_disabled(run, settings, django_assert_num_queries):
+    settings.FRAGMENT_CACHE_TIMEOUT = 0
+    render_tags(run)
+    with django_assert_num_queries(1):
+        assert "tag1 True" == render_tags(run)
+
+
+@pytest.mark.django_db
+def test_serve_fragment_from_cache(run, settings, django_assert_num_queries):
+    settings.FRAGMENT_CACHE_TIMEOUT = 60
+    assert "tag1 True" == render_tags(run)
+    with django_assert_num_queries(0):
+        assert "tag1 True" == render_tags(TestRun(pk=run.pk))
+    assert "tag1 False" == render_tags(run, perm=False)
+
+    stats = get_fragment_cache_stats(["run.tags"])["run.tags"]
+    assert {"hits": 1, "misses": 2, "hit_rate": 1 / 3} == stats
+
+
+@pytest.mark.django_db
+def test_render_fragment_again_once_changed(
+    run, settings, versioned_signals, django_capture_on_commit_callbacks
+):
+    settings.FRAGMENT_CACHE_TIMEOUT = 60
+    render_tags(run)
+    with django_capture_on_commit_callbacks(execute=True):
+        run.add_tag(f.TestTagFactory(name="tag2"))
+    assert "tag1 tag2 True" == render_tags(run)
+
+
+@pytest.mark.django_db
+def test_render_fragment_again_once_tag_removed(
+    run, settings, versioned_signals, django_capture_on_commit_callbacks
+):
+    settings.FRAGMENT_CACHE_TIMEOUT = 60
+    assert "tag1 True" == render_tags(run)
+    with django_capture_on_commit_callbacks(execute=True):
+        run.remove_tag(run.tag.get(name="tag1"))
+    assert "True" == render_tags(run)
+
+
+@pytest.mark.parametrize(
+    "tag",
+    [
+        "{% fragment_cache %}",
+        "{% fragment_cache run %}",
+        '{% fragment_cache "unknown" run %}',
+    ],
+)
+def test_fragment_cache_invalid_arguments(tag):
+    with pytest.raises(TemplateSyntaxError):
+        Template("{% load fragment_tags %}" + tag + "{% endfragment_cache %}")
+
+
+def test_fragmentcachestats_command():
+    record_fragment_access("plan.document", True)
+    record_fragment_access("plan.document", False)
+    out = StringIO()
+    call_command("fragmentcachestats", "plan.document", "run.tags", stdout=out)
+    lines = out.getvalue().splitlines()
+    assert 3 == len(lines)
+    assert lines[1].split() == ["plan.document", "1", "1", "50.0%"]
+    assert lines[2].split() == ["run.tags", "0", "0", "0.0%"]
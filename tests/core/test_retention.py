@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+import json
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings as django_settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django_comments.models import Comment
+from kobo.django.xmlrpc.models import XmlRpcLog
+
+from tcms.core.retention import get_expired_records, purge_expired_records
+from tcms.logs.models import TCMSLogModel
+from tests import factories as f
+
+
+@pytest.fixture
+def retention_days(settings):
+    settings.RETENTION_DAYS = {
+        "logs.TCMSLogModel": 30,
+        "xmlrpc.XmlRpcLog": 30,
+        "django_comments.Comment": 30,
+    }
+
+
+@pytest.fixture
+def logs(tester):
+    plan = f.TestPlanFactory()
+    for i in range(5):
+        plan.log_action(tester, f"change {i}")
+    logs = list(TCMSLogModel.objects.order_by("pk"))
+    old_date = datetime.now() - timedelta(days=60)
+    TCMSLogModel.objects.filter(pk__in=[log.pk for log in logs[:3]]).update(date=old_date)
+    return logs
+
+
+def create_comment(user, days_ago, is_removed):
+    plan = f.TestPlanFactory()
+    return Comment.objects.create(
+        content_type=ContentType.objects.get_for_model(plan),
+        object_pk=str(plan.pk),
+        site_id=django_settings.SITE_ID,
+        user=user,
+        comment="comment",
+        submit_date=datetime.now() - timedelta(days=days_ago),
+        is_removed=is_removed,
+    )
+
+
+@pytest.mark.django_db
+def test_get_expired_records(logs):
+    expired = get_expired_records("logs.TCMSLogModel", datetime.now() - timedelta(days=30))
+    assert [log.pk for log in logs[:3]] == list(expired.values_list("pk", flat=True))
+
+
+@pytest.mark.django_db
+def test_not_get_records_created_after_first_kept_one(logs):
+    # The date of a log created later is earlier, e.g. due to clock change.
+    TCMSLogModel.objects.filter(pk=logs[-1].pk).update(date=datetime.now() - timedelta(days=60))
+    expired = get_expired_records("logs.TCMSLogModel", datetime.now() - timedelta(days=30))
+    assert [log.pk for log in logs[:3]] == list(expired.values_list("pk", flat=True))
+
+
+@pytest.mark.django_db
+def test_purge_in_batches(logs, retention_days):
+    progress = []
+    with patch("tcms.core.retention.time.sleep") as sleep:
+        deleted = purge_expired_records(
+            "logs.TCMSLogModel", batch_size=2, pause=0.5, progress=progress.append
+        )
+    assert 3 == deleted
+    assert [2, 3] == progress
+    assert 2 == sleep.call_count
+    assert [log.pk for log in logs[3:]] == list(
+        TCMSLogModel.objects.order_by("pk").values_list("pk", flat=True)
+    )
+
+
+@pytest.mark.django_db
+def test_keep_records_without_retention_days(logs, retention_days, settings):
+    settings.RETENTION_DAYS["logs.TCMSLogModel"] = 0
+    assert 0 == purge_expired_records("logs.TCMSLogModel")
+    del settings.RETENTION_DAYS["logs.TCMSLogModel"]
+    assert 0 == purge_expired_records("logs.TCMSLogModel")
+    assert len(logs) == TCMSLogModel.objects.count()
+
+
+@pytest.mark.django_db
+def test_archive_before_purging(logs, retention_days):
+    archive = StringIO()
+    purge_expired_records("logs.TCMSLogModel", archive=archive)
+    rows = [json.loads(line) for line in archive.getvalue().splitlines()]
+    assert [log.pk for log in logs[:3]] == [row["pk"] for row in rows]
+    assert "change 0" == rows[0]["fields"]["new_value"]
+
+
+@pytest.mark.django_db
+def test_purge_xmlrpc_logs(tester, retention_days):
+    old_log = XmlRpcLog.objects.create(user=tester, method="TestPlan.get")
+    XmlRpcLog.objects.filter(pk=old_log.pk).update(dt_inserted=datetime.now() - timedelta(days=60))
+    new_log = XmlRpcLog.objects.create(user=tester, method="TestPlan.get")
+
+    assert 1 == purge_expired_records("xmlrpc.XmlRpcLog")
+    assert [new_log.pk] == list(XmlRpcLog.objects.values_list("pk", flat=True))
+
+
+@pytest.mark.django_db
+def test_purge_removed_comments_only(tester, retention_days):
+    removed = create_comment(tester, 60, is_removed=True)
+    kept = [
+        create_comment(tester, 60, is_removed=False),
+        create_comment(tester, 1, is_removed=True),
+    ]
+
+    assert 1 == purge_expired_records("django_comments.Comment")
+    assert not Comment.objects.filter(pk=removed.pk).exists()
+    assert {comment.pk for comment in kept} == set(Comment.objects.values_list("pk", flat=True))
+
+
+@pytest.mark.django_db
+def test_purgeoldrecords_command(logs, retention_days, settings):
+    settings.RETENTION_DAYS["xmlrpc.XmlRpcLog"] = 0
+    out = StringIO()
+    call_command(
+        "purgeoldrecords", "logs.TCMSLogModel", "xmlrpc.XmlRpcLog", "--batch-size", "2", stdout=out
+    )
+    output = out.getvalue()
+    assert "logs.TCMSLogModel: 2 rows deleted..." in output
+    assert "logs.TCMSLogModel: 3 rows created before" in output
+    assert "xmlrpc.XmlRpcLog: kept forever." in output
+    assert 2 == TCMSLogModel.objects.count()
+
+
+@pytest.mark.django_db
+def test_purgeoldrecords_dry_run(logs, retention_days):
+    out = StringIO()
+    call_command("purgeoldrecords", "logs.TCMSLogModel", "--dry-run", stdout=out)
+    assert "logs.TCMSLogModel: 3 rows created before" in out.getvalue()
+    assert 5 == TCMSLogModel.objects.count()
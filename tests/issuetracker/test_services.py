@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from django import test
+from django.core.exceptions import ValidationError
 
 from tcms.issuetracker import services
+from tcms.issuetracker.models import Issue
 from tcms.issuetracker.services import IssueTrackerService
 from tests import BaseCaseRun
 from tests import factories as f
@@ -118,6 +120,64 @@ class TestBaseIssueTrackerService(BaseCaseRun):
         self.assert_url(expected_url, url)
 
 
+class TestAddIssues(BaseCaseRun):
+    """Test IssueTrackerService.add_issues"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.tracker = f.IssueTrackerFactory(validate_regex=r"^\d+$")
+        f.IssueFactory(issue_key="1", tracker=cls.tracker, case=cls.case_1)
+
+    def new_issues(self, issue_key, case_runs):
+        return [
+            Issue(issue_key=issue_key, case_id=case_run.case_id, case_run=case_run)
+            for case_run in case_runs
+        ]
+
+    def test_add_issues(self):
+        service = IssueTrackerService(self.tracker)
+        with self.assertNumQueries(2):
+            service.add_issues(self.new_issues("2", [self.case_run_1, self.case_run_2]))
+
+        issues = Issue.objects.filter(tracker=self.tracker, issue_key="2")
+        self.assertEqual(
+            {(self.case_1.pk, self.case_run_1.pk), (self.case_2.pk, self.case_run_2.pk)},
+            set(issues.values_list("case", "case_run")),
+        )
+
+    def test_invalid_issue_key(self):
+        service = IssueTrackerService(self.tracker)
+        with self.assertRaisesRegex(ValidationError, "Issue key xxx is in wrong format"):
+            service.add_issues(self.new_issues("xxx", [self.case_run_1]))
+
+    def test_refuse_existing_issue(self):
+        service = IssueTrackerService(self.tracker)
+        with self.assertRaisesRegex(ValidationError, f"already added to case {self.case_1.pk}"):
+            service.add_issues(self.new_issues("1", [self.case_run_1, self.case_run_2]))
+        self.assertFalse(Issue.objects.filter(case=self.case_2, issue_key="1").exists())
+
+    def test_skip_existing_issue(self):
+        service = IssueTrackerService(self.tracker)
+        issues = service.add_issues(
+            self.new_issues("1", [self.case_run_1, self.case_run_2]), skip_existing=True
+        )
+        self.assertEqual([self.case_2.pk], [issue.case_id for issue in issues])
+
+    def test_link_external_trackers_once(self):
+        self.tracker.allow_add_case_to_issue = True
+        service = services.RHBugzilla(self.tracker)
+        with patch.object(services, "bugzilla_external_track_many") as track:
+            service.add_issues(
+                self.new_issues("3", [self.case_run_1, self.case_run_2]), add_case_to_issue=True
+            )
+        track.assert_called_once_with(
+            self.tracker.api_url,
+            self.tracker.credential,
+            [("3", self.case_1.pk), ("3", self.case_2.pk)],
+        )
+
+
 class TestMakeIssueReportURLForBugzilla(BaseCaseRun):
     """Test the default behavior of Bugzilla to make issue report URL"""
 
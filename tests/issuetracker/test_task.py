@@ -1,9 +1,9 @@
 # -*- coding: utf-8 -*-
 
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, call, patch
 
-from tcms.issuetracker.task import bugzilla_external_track
+from tcms.issuetracker.task import bugzilla_external_track, bugzilla_external_track_many
 
 
 class TestBugzillaExternalTrack(unittest.TestCase):
@@ -30,3 +30,40 @@ class TestBugzillaExternalTrack(unittest.TestCase):
         Bugzilla.return_value.add_external_tracker.side_effect = ValueError
         bugzilla_external_track(self.api_url, self.credential, self.issue_key, self.case_id)
         warn.assert_called_once()
+
+
+class TestBugzillaExternalTrackMany(unittest.TestCase):
+    """Test task bugzilla_external_track_many"""
+
+    def setUp(self) -> None:
+        self.bugzilla = Mock()
+        patcher = patch.dict("sys.modules", bugzilla=self.bugzilla)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_login_once(self):
+        bugzilla_external_track_many(
+            "http://bz.localhost/", {"username": "a", "password": "b"}, [("1", 2), ("3", 4)]
+        )
+
+        self.bugzilla.Bugzilla.assert_called_once_with(
+            "http://bz.localhost/", user="a", password="b"
+        )
+        bz = self.bugzilla.Bugzilla.return_value
+        self.assertEqual(
+            [
+                call(1, 2, ext_type_description="Nitrate Test Case"),
+                call(3, 4, ext_type_description="Nitrate Test Case"),
+            ],
+            bz.add_external_tracker.call_args_list,
+        )
+
+    @patch("warnings.warn")
+    def test_continue_when_error_reported(self, warn):
+        bz = self.bugzilla.Bugzilla.return_value
+        bz.add_external_tracker.side_effect = [ValueError, None]
+        bugzilla_external_track_many(
+            "http://bz.localhost/", {"username": "a", "password": "b"}, [("1", 2), ("3", 4)]
+        )
+        warn.assert_called_once()
+        self.assertEqual(2, bz.add_external_tracker.call_count)
@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tcms.settings.devel")
+django.setup()
+
+from tests.perf.datagen import main  # noqa: E402
+
+main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+"""Measure benchmarks and compare them with the stored baselines
+
+A benchmark is measured in wall time, number of queries and peak memory
+allocated by Python. Wall time is the best of several rounds run after a
+warm up round. Queries and memory are measured in a separate round, since
+tracing memory allocation slows down the code.
+
+Baselines are stored in ``baselines.json`` beside this module with key
+``<database vendor>:<dataset preset>:<benchmark name>``. A measurement
+regresses if it exceeds ``baseline * ratio + slack`` of any metric.
+"""
+
+import gc
+import json
+import os
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BASELINES_FILE = Path(__file__).parent / "baselines.json"
+
+# metric name -> (ratio, slack)
+THRESHOLDS: dict[str, tuple[float, float]] = {
+    "queries": (1.0, 2),
+    "wall_time": (float(os.environ.get("NITRATE_BENCHMARK_TIME_RATIO", "1.5")), 0.05),
+    "peak_memory": (1.3, 512 * 1024),
+}
+
+
+@dataclass
+class Measurement:
+    wall_time: float
+    queries: int
+    peak_memory: int
+
+
+def measure(func: Callable[[], Any], rounds: int = 3) -> Measurement:
+    """Measure a benchmark
+
+    :param func: the benchmark to measure, which is called without arguments.
+    :param int rounds: number of rounds to measure wall time.
+    :return: the measurement.
+    :rtype: Measurement
+    """
+    func()  # warm up
+
+    wall_times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        wall_times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as ctx:
+            func()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(
+        wall_time=round(min(wall_times), 4), queries=len(ctx), peak_memory=peak_memory
+    )
+
+
+def baseline_key(dataset: str, name: str) -> str:
+    return f"{connection.vendor}:{dataset}:{name}"
+
+
+def load_baselines() -> dict[str, dict[str, Any]]:
+    if not BASELINES_FILE.exists():
+        return {}
+    return json.loads(BASELINES_FILE.read_text())
+
+
+def save_baseline(key: str, measurement: Measurement) -> None:
+    baselines = load_baselines()
+    baselines[key] = asdict(measurement)
+    BASELINES_FILE.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+
+def find_regressions(measurement: Measurement, baseline: Optional[dict[str, Any]]) -> list[str]:
+    """Compare a measurement with its baseline
+
+    :return: descriptions of the regressed metrics. Empty list is returned if
+        there is no regression or no baseline.
+    """
+    if not baseline:
+        return []
+    regressions = []
+    for metric, (ratio, slack) in THRESHOLDS.items():
+        if metric not in baseline:
+            continue
+        value = getattr(measurement, metric)
+        limit = baseline[metric] * ratio + slack
+        if value > limit:
+            regressions.append(f"{metric}: {value} > {limit} (baseline {baseline[metric]})")
+    return regressions
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+
+from tests.perf.datagen import PRESETS, generate_dataset
+
+BENCHMARK_ENABLED = os.environ.get("NITRATE_BENCHMARK") == "1"
+BENCHMARK_DATASET = os.environ.get("NITRATE_BENCHMARK_DATASET", "small")
+UPDATE_BASELINES = os.environ.get("NITRATE_BENCHMARK_UPDATE") == "1"
+
+
+@pytest.fixture(scope="session")
+def benchmark_dataset(django_db_setup, django_db_blocker):
+    """Generate the dataset once for all benchmarks
+
+    The dataset is kept in the test database until the end of session, hence
+    benchmarks should be run separately from the other tests.
+    """
+    with django_db_blocker.unblock():
+        yield generate_dataset(PRESETS[BENCHMARK_DATASET])
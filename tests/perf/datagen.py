@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+
+"""Generate a large synthetic dataset
+
+The dataset looks like products -> plans -> cases -> runs -> case runs, and
+case runs have comments, logs and issues. Objects in small numbers, e.g.
+products, plans and runs, are created by the factories. Cases, case runs and
+the objects attached to case runs are built by the factories or the models
+and inserted in bulk, so that a dataset with 1M case runs can be generated in
+reasonable time.
+
+Generate a dataset into the database configured by the settings module::
+
+    DJANGO_SETTINGS_MODULE=tcms.settings.devel python -m tests.perf --preset medium
+
+The dataset is generated from a seed, so the same dataset is generated for
+the same preset and seed in an empty database.
+"""
+
+import argparse
+import itertools
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django_comments.models import Comment
+
+from tcms.issuetracker.models import Issue
+from tcms.logs.models import TCMSLogModel
+from tcms.management.models import Priority
+from tcms.testcases.models import TestCase, TestCasePlan, TestCaseStatus
+from tcms.testruns.models import TestCaseRun, TestCaseRunStatus, TestRun
+from tests import factories as f
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Numbers of objects in a dataset
+
+    The ``*_ratio`` values are the probability of a case run to have a
+    comment, a log or an issue.
+    """
+
+    products: int
+    plans_per_product: int
+    cases_per_plan: int
+    runs_per_plan: int
+    users: int = 20
+    builds_per_product: int = 3
+    comment_ratio: float = 0.1
+    log_ratio: float = 0.5
+    issue_ratio: float = 0.05
+
+    @property
+    def plans(self) -> int:
+        return self.products * self.plans_per_product
+
+    @property
+    def cases(self) -> int:
+        return self.plans * self.cases_per_plan
+
+    @property
+    def runs(self) -> int:
+        return self.plans * self.runs_per_plan
+
+    @property
+    def case_runs(self) -> int:
+        return self.runs * self.cases_per_plan
+
+
+PRESETS: dict[str, DatasetSpec] = {
+    "tiny": DatasetSpec(
+        products=1, plans_per_product=2, cases_per_plan=5, runs_per_plan=2, users=3
+    ),
+    "small": DatasetSpec(products=2, plans_per_product=3, cases_per_plan=50, runs_per_plan=4),
+    "medium": DatasetSpec(products=5, plans_per_product=10, cases_per_plan=200, runs_per_plan=10),
+    # 1M case runs
+    "large": DatasetSpec(
+        products=10, plans_per_product=20, cases_per_plan=500, runs_per_plan=10, users=200
+    ),
+}
+
+
+@dataclass
+class Dataset:
+    """Objects generated for a dataset, which benchmarks operate on"""
+
+    spec: DatasetSpec
+    users: list[User] = field(default_factory=list)
+    product_ids: list[int] = field(default_factory=list)
+    plan_ids: list[int] = field(default_factory=list)
+    run_ids: list[int] = field(default_factory=list)
+    counts: dict[str, int] = field(default_factory=dict)
+
+
+class DatasetGenerator:
+    """Generate a dataset from the spec
+
+    :param spec: the spec of the dataset.
+    :type spec: DatasetSpec
+    :param int seed: the seed of the random generator.
+    :param int batch_size: number of objects inserted by one statement.
+    :param verbose: an optional callable to report the progress.
+    """
+
+    def __init__(self, spec: DatasetSpec, seed: int = 0, batch_size: int = 1000, verbose=None):
+        if not connection.features.can_return_rows_from_bulk_insert:
+            raise RuntimeError(
+                f"Database {connection.vendor} cannot return primary keys from bulk insert."
+            )
+        self.spec = spec
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.verbose = verbose or (lambda msg: None)
+        self.dataset = Dataset(spec)
+        self._issue_keys = itertools.count(1)
+        self._counts = {
+            "case_runs": 0,
+            "comments": 0,
+            "logs": 0,
+            "issues": 0,
+        }
+
+    def generate(self) -> Dataset:
+        spec = self.spec
+        self.users = f.UserFactory.create_batch(spec.users)
+        self.dataset.users = self.users
+        self.case_status = TestCaseStatus.objects.get(name="CONFIRMED")
+        self.priorities = list(Priority.objects.all())
+        self.case_run_statuses = list(TestCaseRunStatus.objects.all())
+        self.case_run_ct = ContentType.objects.get_for_model(TestCaseRun)
+        self.plan_type = f.TestPlanTypeFactory()
+        self.tracker = f.IssueTrackerFactory()
+
+        for i in range(spec.products):
+            with transaction.atomic():
+                self._generate_product()
+            self.verbose(f"Product {i + 1}/{spec.products} is generated: {self._counts}")
+
+        self.dataset.counts = dict(
+            self._counts,
+            products=len(self.dataset.product_ids),
+            plans=len(self.dataset.plan_ids),
+            cases=spec.cases,
+            runs=len(self.dataset.run_ids),
+        )
+        return self.dataset
+
+    def _choice_user(self) -> User:
+        return self.random.choice(self.users)
+
+    def _generate_product(self) -> None:
+        product = f.ProductFactory()
+        self.dataset.product_ids.append(product.pk)
+        f.ProductIssueTrackerRelationshipFactory(product=product, issue_tracker=self.tracker)
+        version = f.VersionFactory(product=product)
+        builds = f.TestBuildFactory.create_batch(self.spec.builds_per_product, product=product)
+        category = f.TestCaseCategoryFactory(product=product)
+
+        for _ in range(self.spec.plans_per_product):
+            plan = f.TestPlanFactory(
+                product=product,
+                product_version=version,
+                type=self.plan_type,
+                author=self._choice_user(),
+                owner=self._choice_user(),
+            )
+            plan.add_text(author=plan.author, plan_text=f"Document of plan {plan.name}")
+            self.dataset.plan_ids.append(plan.pk)
+            cases = self._generate_cases(plan, category)
+
+            for _ in range(self.spec.runs_per_plan):
+                run = f.TestRunFactory(
+                    plan=plan,
+                    product_version=version,
+                    build=self.random.choice(builds),
+                    manager=self._choice_user(),
+                    default_tester=self._choice_user(),
+                )
+                self.dataset.run_ids.append(run.pk)
+                self._generate_case_runs(run, cases)
+
+    def _generate_cases(self, plan, category) -> list[TestCase]:
+        cases = [
+            f.TestCaseFactory.build(
+                case_status=self.case_status,
+                priority=self.random.choice(self.priorities),
+                category=category,
+                author=self._choice_user(),
+                default_tester=self._choice_user(),
+                reviewer=self._choice_user(),
+            )
+            for _ in range(self.spec.cases_per_plan)
+        ]
+        cases = TestCase.objects.bulk_create(cases, batch_size=self.batch_size)
+        TestCasePlan.objects.bulk_create(
+            [
+                TestCasePlan(plan=plan, case=case, sortkey=(i + 1) * 10)
+                for i, case in enumerate(cases)
+            ],
+            batch_size=self.batch_size,
+        )
+        return cases
+
+    def _generate_case_runs(self, run: TestRun, cases: list[TestCase]) -> None:
+        case_runs = []
+        for i, case in enumerate(cases):
+            status = self.random.choice(self.case_run_statuses)
+            tested = status.name not in ("IDLE", "RUNNING")
+            case_runs.append(
+                TestCaseRun(
+                    run=run,
+                    case=case,
+                    build=run.build,
+                    case_run_status=status,
+                    assignee=case.default_tester,
+                    tested_by=case.default_tester if tested else None,
+                    close_date=datetime.now() if tested else None,
+                    case_text_version=1,
+                    sortkey=(i + 1) * 10,
+                    notes="",
+                )
+            )
+        case_runs = TestCaseRun.objects.bulk_create(case_runs, batch_size=self.batch_size)
+        self._counts["case_runs"] += len(case_runs)
+        self._generate_case_run_attachments(case_runs)
+
+    def _generate_case_run_attachments(self, case_runs: list[TestCaseRun]) -> None:
+        comments, logs, issues = [], [], []
+        submit_date = datetime.now() - timedelta(days=1)
+        for case_run in case_runs:
+            if self.random.random() < self.spec.comment_ratio:
+                user = self._choice_user()
+                comments.append(
+                    Comment(
+                        content_type=self.case_run_ct,
+                        object_pk=str(case_run.pk),
+                        site_id=settings.SITE_ID,
+                        user=user,
+                        user_name=user.username,
+                        user_email=user.email,
+                        comment=f"Comment on case run {case_run.pk}",
+                        submit_date=submit_date,
+                    )
+                )
+            if self.random.random() < self.spec.log_ratio:
+                logs.append(
+                    TCMSLogModel(
+                        content_type=self.case_run_ct,
+                        object_pk=case_run.pk,
+                        site_id=settings.SITE_ID,
+                        who=self._choice_user(),
+                        field="case_run_status",
+                        original_value="IDLE",
+                        new_value=case_run.case_run_status.name,
+                        action=f"Field case_run_status changed from IDLE to "
+                        f"{case_run.case_run_status.name}",
+                    )
+                )
+            if self.random.random() < self.spec.issue_ratio:
+                issues.append(
+                    Issue(
+                        issue_key=str(next(self._issue_keys)),
+                        summary=f"Issue of case run {case_run.pk}",
+                        tracker=self.tracker,
+                        case_id=case_run.case_id,
+                        case_run=case_run,
+                    )
+                )
+        Comment.objects.bulk_create(comments, batch_size=self.batch_size)
+        TCMSLogModel.objects.bulk_create(logs, batch_size=self.batch_size)
+        Issue.objects.bulk_create(issues, batch_size=self.batch_size)
+        self._counts["comments"] += len(comments)
+        self._counts["logs"] += len(logs)
+        self._counts["issues"] += len(issues)
+
+
+def generate_dataset(
+    spec: DatasetSpec, seed: int = 0, batch_size: int = 1000, verbose=None
+) -> Dataset:
+    """Generate a dataset into the default database
+
+    :param spec: the spec of the dataset.
+    :type spec: DatasetSpec
+    :param int seed: the seed of the random generator.
+    :param int batch_size: number of objects inserted by one statement.
+    :param verbose: an optional callable to report the progress.
+    :return: the generated dataset.
+    :rtype: Dataset
+    """
+    return DatasetGenerator(spec, seed=seed, batch_size=batch_size, verbose=verbose).generate()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a large synthetic dataset.")
+    parser.add_argument("--preset", choices=list(PRESETS), default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    spec = PRESETS[args.preset]
+    print(f"Generating {spec.case_runs} case runs for preset {args.preset}")
+    dataset = generate_dataset(spec, seed=args.seed, batch_size=args.batch_size, verbose=print)
+    print(f"Generated: {dataset.counts}")
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+"""Record queries of endpoints and detect N+1 queries
+
+An endpoint is called against datasets in different sizes. Queries are
+recorded as fingerprints, which are the SQL with literal values replaced, so
+that queries differing only in values are counted as the same query. A
+fingerprint whose count grows with the dataset size is an N+1 pattern.
+
+Budgets of the endpoints are stored in ``query_budgets.json`` beside this
+module::
+
+    {
+      "<endpoint>": {"max_queries": 20, "scales": false}
+    }
+
+``max_queries`` is the maximum number of queries against the largest dataset.
+``scales`` marks an endpoint known to have N+1 queries, which is tolerated
+until it is fixed, but ``max_queries`` is still enforced.
+"""
+
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BUDGETS_FILE = Path(__file__).parent / "query_budgets.json"
+
+_fingerprint_subs = [
+    # string literals
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    # numbers which are not part of identifiers
+    (re.compile(r"(?<![\w.\"`])-?\d+(?:\.\d+)?\b"), "?"),
+    # list of values in IN clause
+    (re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE), "IN (...)"),
+    # multiple rows of VALUES
+    (re.compile(r"\bVALUES\s*(\([^)]*\))(?:\s*,\s*\([^)]*\))+", re.IGNORECASE), r"VALUES \1"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def fingerprint(sql: str) -> str:
+    """Make the fingerprint of a SQL by replacing the literal values"""
+    for pattern, repl in _fingerprint_subs:
+        sql = pattern.sub(repl, sql)
+    return sql.strip()
+
+
+@dataclass
+class QueryRecord:
+    """Queries recorded from a call"""
+
+    fingerprints: Counter = field(default_factory=Counter)
+
+    @property
+    def count(self) -> int:
+        return sum(self.fingerprints.values())
+
+
+class QueryRecorder(CaptureQueriesContext):
+    """Record query fingerprints executed inside the context
+
+    Usage::
+
+        with QueryRecorder() as recorder:
+            ...
+        recorder.record.count
+    """
+
+    def __init__(self):
+        super().__init__(connection)
+        self.record = QueryRecord()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        self.record.fingerprints.update(
+            fingerprint(query["sql"]) for query in self.captured_queries
+        )
+
+
+def find_n_plus_one(records: dict[int, QueryRecord]) -> list[str]:
+    """Find the queries whose count grows with the dataset size
+
+    :param records: mapping from dataset size to queries recorded against the
+        dataset.
+    :return: the fingerprints of N+1 queries.
+    """
+    sizes = sorted(records)
+    smallest, largest = records[sizes[0]], records[sizes[-1]]
+    return sorted(
+        sql
+        for sql, count in largest.fingerprints.items()
+        if count > smallest.fingerprints.get(sql, 0)
+        # A query run per row repeats more than once
+        and count > 1
+    )
+
+
+def load_budgets() -> dict[str, dict[str, Any]]:
+    return json.loads(BUDGETS_FILE.read_text())
+
+
+def save_budget(endpoint: str, max_queries: int, scales: bool) -> None:
+    budgets = load_budgets() if BUDGETS_FILE.exists() else {}
+    budgets[endpoint] = {"max_queries": max_queries, "scales": scales}
+    BUDGETS_FILE.write_text(json.dumps(budgets, indent=2, sort_keys=True) + "\n")
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""End-to-end benchmarks of hot views and XML-RPC methods
+
+Benchmarks are skipped unless NITRATE_BENCHMARK=1 is set. Run them separately
+from the other tests::
+
+    NITRATE_BENCHMARK=1 pytest --no-cov tests/perf
+
+Environment variables:
+
+* ``NITRATE_BENCHMARK_DATASET``: the preset of dataset, one of the presets in
+  ``tests.perf.datagen``. Defaults to ``small``.
+* ``NITRATE_BENCHMARK_UPDATE``: set to 1 to store the measurements as the new
+  baselines instead of checking regressions.
+* ``NITRATE_BENCHMARK_TIME_RATIO``: the allowed ratio of wall time to the
+  baseline. Defaults to 1.5.
+
+Set ``NITRATE_DB_ENGINE`` to run benchmarks against another database.
+"""
+
+import xmlrpc.client
+from http import HTTPStatus
+
+import pytest
+from django.db import transaction
+from django.urls import reverse
+
+from tcms.testplans.models import TestPlan
+from tcms.testruns.models import TestRun
+from tests.perf.benchmark import (
+    baseline_key,
+    find_regressions,
+    load_baselines,
+    measure,
+    save_baseline,
+)
+from tests.perf.conftest import BENCHMARK_DATASET, BENCHMARK_ENABLED, UPDATE_BASELINES
+
+pytestmark = [
+    pytest.mark.skipif(not BENCHMARK_ENABLED, reason="Set NITRATE_BENCHMARK=1 to run benchmarks"),
+    pytest.mark.django_db,
+]
+
+
+@pytest.fixture
+def benchmark_client(client, benchmark_dataset, django_user_model):
+    user = django_user_model.objects.create_superuser("benchmarker", "benchmarker@example.com")
+    client.force_login(user)
+    return client
+
+
+@pytest.fixture
+def benchmark(request):
+    def _benchmark(func):
+        name = request.node.name
+        key = baseline_key(BENCHMARK_DATASET, name)
+        measurement = measure(func)
+        print(f"\n{key}: {measurement}")
+        if UPDATE_BASELINES:
+            save_baseline(key, measurement)
+            return measurement
+        regressions = find_regressions(measurement, load_baselines().get(key))
+        assert not regressions, f"{name} regressed: {regressions}"
+        return measurement
+
+    return _benchmark
+
+
+def largest_run(dataset) -> TestRun:
+    return TestRun.objects.get(pk=dataset.run_ids[-1])
+
+
+def xmlrpc_call(client, method, *args):
+    def _call():
+        response = client.post(
+            "/xmlrpc/", xmlrpc.client.dumps(args, method), content_type="text/xml"
+        )
+        assert HTTPStatus.OK == response.status_code
+        xmlrpc.client.loads(response.content)
+
+    return _call
+
+
+def get_page(client, url, **data):
+    def _get():
+        response = client.get(url, data=data, follow=True)
+        assert HTTPStatus.OK == response.status_code
+
+    return _get
+
+
+def test_run_page(benchmark, benchmark_client, benchmark_dataset):
+    run = largest_run(benchmark_dataset)
+    benchmark(get_page(benchmark_client, reverse("run-get", args=[run.pk])))
+
+
+def test_plan_page(benchmark, benchmark_client, benchmark_dataset):
+    plan_id = benchmark_dataset.plan_ids[-1]
+    benchmark(get_page(benchmark_client, reverse("plan-get", args=[plan_id])))
+
+
+def test_testing_report(benchmark, benchmark_client, benchmark_dataset):
+    benchmark(
+        get_page(
+            benchmark_client,
+            reverse("testing-report"),
+            report_type="per_build_report",
+            r_product=benchmark_dataset.product_ids[-1],
+        )
+    )
+
+
+def test_plan_clone(benchmark, benchmark_dataset):
+    plan = TestPlan.objects.get(pk=benchmark_dataset.plan_ids[-1])
+
+    def _clone():
+        with transaction.atomic():
+            plan.clone(new_name="Cloned plan")
+            transaction.set_rollback(True)
+
+    benchmark(_clone)
+
+
+def test_xmlrpc_testcaserun_filter(benchmark, benchmark_client, benchmark_dataset):
+    run = largest_run(benchmark_dataset)
+    benchmark(xmlrpc_call(benchmark_client, "TestCaseRun.filter", {"run": run.pk}))
+
+
+def test_xmlrpc_testrun_get_test_case_runs(benchmark, benchmark_client, benchmark_dataset):
+    run = largest_run(benchmark_dataset)
+    benchmark(xmlrpc_call(benchmark_client, "TestRun.get_test_case_runs", run.pk))
+
+
+def test_xmlrpc_testcase_filter(benchmark, benchmark_client, benchmark_dataset):
+    plan_id = benchmark_dataset.plan_ids[-1]
+    benchmark(xmlrpc_call(benchmark_client, "TestCase.filter", {"plan": plan_id}))
+
+
+def test_xmlrpc_testplan_get_test_cases(benchmark, benchmark_client, benchmark_dataset):
+    plan_id = benchmark_dataset.plan_ids[-1]
+    benchmark(xmlrpc_call(benchmark_client, "TestPlan.get_test_cases", plan_id))
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+from collections import Counter
+
+import pytest
+from django_comments.models import Comment
+
+from tcms.issuetracker.models import Issue
+from tcms.logs.models import TCMSLogModel
+from tcms.testcases.models import TestCasePlan
+from tcms.testruns.models import TestCaseRun, TestRun
+from tests.perf.benchmark import Measurement, find_regressions
+from tests.perf.datagen import PRESETS, generate_dataset
+from tests.perf.querycount import QueryRecord, find_n_plus_one, fingerprint
+
+
+@pytest.mark.django_db
+def test_generate_dataset():
+    spec = PRESETS["tiny"]
+    dataset = generate_dataset(spec, batch_size=3)
+
+    runs = TestRun.objects.filter(pk__in=dataset.run_ids)
+    case_runs = TestCaseRun.objects.filter(run__in=dataset.run_ids)
+    case_run_ids = [str(pk) for pk in case_runs.values_list("pk", flat=True)]
+
+    assert spec.runs == len(dataset.run_ids) == runs.count()
+    assert spec.case_runs == dataset.counts["case_runs"] == case_runs.count()
+    assert spec.cases == TestCasePlan.objects.filter(plan__in=dataset.plan_ids).count()
+    assert (
+        dataset.counts["comments"]
+        == Comment.objects.filter(
+            content_type__model="testcaserun", object_pk__in=case_run_ids
+        ).count()
+    )
+    assert (
+        dataset.counts["logs"]
+        == TCMSLogModel.objects.filter(
+            content_type__model="testcaserun", object_pk__in=case_run_ids
+        ).count()
+    )
+    assert dataset.counts["issues"] == Issue.objects.filter(case_run__in=case_runs).count()
+    for run in runs:
+        assert spec.cases_per_plan == run.case_run.count()
+
+
+def test_large_preset_has_1m_case_runs():
+    assert 1_000_000 == PRESETS["large"].case_runs
+
+
+@pytest.mark.parametrize(
+    "measurement,expected",
+    [
+        [Measurement(wall_time=0.1, queries=10, peak_memory=1024), []],
+        [Measurement(wall_time=0.1, queries=13, peak_memory=1024), ["queries"]],
+        [Measurement(wall_time=1, queries=10, peak_memory=10**8), ["wall_time", "peak_memory"]],
+    ],
+)
+def test_find_regressions(measurement, expected):
+    baseline = {"wall_time": 0.1, "queries": 10, "peak_memory": 1024}
+    regressions = find_regressions(measurement, baseline)
+    assert expected == [item.split(":")[0] for item in regressions]
+
+
+def test_no_regression_without_baseline():
+    assert [] == find_regressions(Measurement(1, 1, 1), None)
+
+
+@pytest.mark.parametrize(
+    "sql,expected",
+    [
+        ["SELECT a FROM t WHERE id = 1", "SELECT a FROM t WHERE id = ?"],
+        ["SELECT a FROM t WHERE name = 'x''y'", "SELECT a FROM t WHERE name = ?"],
+        ["SELECT a FROM t WHERE id IN (1, 2,  3)", "SELECT a FROM t WHERE id IN (...)"],
+        ['SELECT "t1"."a" FROM "t1"', 'SELECT "t1"."a" FROM "t1"'],
+        ["INSERT INTO t (a, b) VALUES (1, 'x'), (2, 'y')", "INSERT INTO t (a, b) VALUES (?, ?)"],
+    ],
+)
+def test_fingerprint(sql, expected):
+    assert expected == fingerprint(sql)
+
+
+def test_find_n_plus_one():
+    records = {
+        2: QueryRecord(Counter({"SELECT 1": 1, "SELECT x WHERE id = ?": 2})),
+        6: QueryRecord(Counter({"SELECT 1": 1, "SELECT x WHERE id = ?": 6})),
+    }
+    assert ["SELECT x WHERE id = ?"] == find_n_plus_one(records)
+    records[6].fingerprints["SELECT x WHERE id = ?"] = 2
+    assert [] == find_n_plus_one(records)
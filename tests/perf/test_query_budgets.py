@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""Enforce the query budgets of hot views and XML-RPC methods
+
+Each endpoint is called against datasets in different sizes, the number of
+queries must not exceed its budget in ``query_budgets.json``, and must not
+grow with the dataset size unless the endpoint is marked to scale.
+
+Set ``NITRATE_QUERY_BUDGET_UPDATE=1`` to store the recorded numbers as the
+new budgets.
+"""
+
+import os
+import xmlrpc.client
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Callable
+
+import pytest
+from django.urls import reverse
+
+from tcms.testcases.models import TestCasePlan
+from tests.perf.datagen import Dataset, DatasetSpec, generate_dataset
+from tests.perf.querycount import QueryRecorder, find_n_plus_one, load_budgets, save_budget
+
+UPDATE_BUDGETS = os.environ.get("NITRATE_QUERY_BUDGET_UPDATE") == "1"
+
+DATASET_SIZES = (2, 6)
+
+
+@dataclass
+class Endpoint:
+    #: Make the dataset spec of a size.
+    spec: Callable[[int], DatasetSpec]
+    #: Call the endpoint against a dataset with a logged-in client.
+    call: Callable
+
+
+def spec(**kwargs) -> DatasetSpec:
+    attrs = {
+        "products": 1,
+        "plans_per_product": 1,
+        "cases_per_plan": 2,
+        "runs_per_plan": 1,
+        "users": 3,
+        "builds_per_product": 1,
+        "comment_ratio": 0.5,
+        "log_ratio": 0.5,
+        "issue_ratio": 0.5,
+    }
+    attrs.update(kwargs)
+    return DatasetSpec(**attrs)
+
+
+def get_page(client, url, **data):
+    response = client.get(url, data=data, follow=True)
+    assert HTTPStatus.OK == response.status_code
+
+
+def xmlrpc_call(client, method, *args):
+    response = client.post("/xmlrpc/", xmlrpc.client.dumps(args, method), content_type="text/xml")
+    assert HTTPStatus.OK == response.status_code
+    xmlrpc.client.loads(response.content)
+
+
+def first_case_id(dataset: Dataset) -> int:
+    return TestCasePlan.objects.filter(plan=dataset.plan_ids[0]).order_by("pk")[0].case_id
+
+
+ENDPOINTS: dict[str, Endpoint] = {
+    "testruns.views.get": Endpoint(
+        spec=lambda n: spec(cases_per_plan=n),
+        call=lambda client, dataset: get_page(
+            client, reverse("run-get", args=[dataset.run_ids[0]])
+        ),
+    ),
+    "testcases.views.get": Endpoint(
+        spec=lambda n: spec(runs_per_plan=n),
+        call=lambda client, dataset: get_page(
+            client, reverse("case-get", args=[first_case_id(dataset)])
+        ),
+    ),
+    "report.views.CustomReport": Endpoint(
+        spec=lambda n: spec(builds_per_product=n, runs_per_plan=n),
+        call=lambda client, dataset: get_page(
+            client, reverse("report-custom"), product=dataset.product_ids[0], a="search"
+        ),
+    ),
+    "TestRun.get_test_case_runs": Endpoint(
+        spec=lambda n: spec(cases_per_plan=n),
+        call=lambda client, dataset: xmlrpc_call(
+            client, "TestRun.get_test_case_runs", dataset.run_ids[0]
+        ),
+    ),
+    "TestCase.filter": Endpoint(
+        spec=lambda n: spec(cases_per_plan=n),
+        call=lambda client, dataset: xmlrpc_call(
+            client, "TestCase.filter", {"plan": dataset.plan_ids[0]}
+        ),
+    ),
+    "TestPlan.get_test_cases": Endpoint(
+        spec=lambda n: spec(cases_per_plan=n),
+        call=lambda client, dataset: xmlrpc_call(
+            client, "TestPlan.get_test_cases", dataset.plan_ids[0]
+        ),
+    ),
+}
+
+
+@pytest.fixture
+def superuser_client(client, django_user_model):
+    user = django_user_model.objects.create_superuser("budget", "budget@example.com")
+    client.force_login(user)
+    return client
+
+
+@pytest.mark.parametrize("name", list(ENDPOINTS))
+@pytest.mark.django_db
+def test_query_budget(name, superuser_client):
+    endpoint = ENDPOINTS[name]
+    datasets = {size: generate_dataset(endpoint.spec(size)) for size in DATASET_SIZES}
+
+    records = {}
+    for size, dataset in datasets.items():
+        with QueryRecorder() as recorder:
+            endpoint.call(superuser_client, dataset)
+        records[size] = recorder.record
+
+    n_plus_one = find_n_plus_one(records)
+    max_queries = max(record.count for record in records.values())
+
+    if UPDATE_BUDGETS:
+        save_budget(name, max_queries, bool(n_plus_one))
+        return
+
+    budget = load_budgets()[name]
+    assert max_queries <= budget["max_queries"], (
+        f"{name} executes {max_queries} queries exceeding the budget {budget['max_queries']}: "
+        f"{records[DATASET_SIZES[-1]].fingerprints.most_common(5)}"
+    )
+    if not budget["scales"]:
+        assert not n_plus_one, f"{name} executes queries per row: {n_plus_one}"
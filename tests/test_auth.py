@@ -6,7 +6,7 @@ import string
 from unittest.mock import patch
 
 from django.conf import settings
-from django.contrib.auth.models import User
+from django.contrib.auth.models import Group, Permission, User
 from django.core import mail
 from django.test import TestCase
 from django.urls import reverse
@@ -204,3 +204,52 @@ class TestConfirm(TestCase):
         self.assertTrue(user.is_active)
         activate_key_deleted = not UserActivateKey.objects.filter(user=user).exists()
         self.assertTrue(activate_key_deleted)
+
+
+class TestCachedPermissions(TestCase):
+    """Test permissions are cached by CachedModelBackend"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="perm-user", email="perm-user@example.com")
+        cls.group = Group.objects.create(name="testers")
+        cls.perm = Permission.objects.get(
+            content_type__app_label="testplans", codename="add_testplan"
+        )
+        cls.group.permissions.add(cls.perm)
+
+    def _has_perm(self) -> bool:
+        # Get a fresh user object to avoid the permission cache on instance.
+        return User.objects.get(pk=self.user.pk).has_perm("testplans.add_testplan")
+
+    def test_load_permissions_from_cache(self):
+        self.assertFalse(self._has_perm())
+
+        with self.assertNumQueries(1):
+            # Only the query to get the user.
+            self.assertFalse(self._has_perm())
+
+    def test_invalidate_when_user_groups_change(self):
+        self.assertFalse(self._has_perm())
+        self.user.groups.add(self.group)
+        self.assertTrue(self._has_perm())
+        self.group.user_set.remove(self.user)
+        self.assertFalse(self._has_perm())
+
+    def test_invalidate_when_user_permissions_change(self):
+        self.assertFalse(self._has_perm())
+        self.user.user_permissions.add(self.perm)
+        self.assertTrue(self._has_perm())
+
+    def test_invalidate_when_group_permissions_change(self):
+        self.user.groups.add(self.group)
+        self.assertTrue(self._has_perm())
+        self.group.permissions.remove(self.perm)
+        self.assertFalse(self._has_perm())
+
+    def test_invalidate_when_user_becomes_superuser(self):
+        self.assertFalse(self._has_perm())
+        self.user.is_superuser = True
+        self.user.save()
+        perms = User.objects.get(pk=self.user.pk).get_all_permissions()
+        self.assertIn("testplans.add_testplan", perms)
@@ -215,3 +215,23 @@ class TestOverallProductByBuilds(BaseCaseRun):
                 ),
                 html=True,
             )
+
+
+class TestTestingReport(BaseCaseRun):
+    """Test rendering testing report of each report type"""
+
+    def test_render_reports(self):
+        report_types = (
+            "per_build_report",
+            "per_priority_report",
+            "runs_with_rates_per_plan_tag",
+            "per_plan_tag_report",
+            "runs_with_rates_per_plan_build",
+            "per_plan_build_report",
+        )
+        for report_type in report_types:
+            data = {"report_type": report_type, "r_product": self.product.pk}
+            with self.subTest(report_type=report_type):
+                resp = self.client.get(reverse("testing-report"), data=data)
+                self.assertEqual(200, resp.status_code)
+                self.assertIsNone(resp.context["errors"])
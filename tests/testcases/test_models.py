@@ -806,3 +806,53 @@ def test_case_get_notification_recipients(
     if auto_to_run_tester or auto_to_case_run_assignee:
         assert 1 == recipients.count(run_tester.email)
         assert run_tester.email in recipients
+
+
+class TestLatestTextPointer(test.TestCase):
+    """Test the maintained pointer to the latest text of a case"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.case_1 = f.TestCaseFactory(summary="case 1")
+        cls.case_2 = f.TestCaseFactory(summary="case 2")
+        cls.case_3 = f.TestCaseFactory(summary="case 3 without text")
+
+        cls.case_1.add_text(action="action 1", effect="effect", setup="setup", breakdown="")
+        cls.text_1 = cls.case_1.add_text(
+            action="action 2", effect="effect", setup="setup", breakdown=""
+        )
+        cls.text_2 = cls.case_2.add_text(
+            action="action", effect="effect", setup="setup", breakdown=""
+        )
+
+    def test_pointer_is_moved_to_new_text(self):
+        case = TestCase.objects.get(pk=self.case_1.pk)
+        self.assertEqual(self.text_1.pk, case.current_text_id)
+        self.assertEqual(2, case.current_text_version)
+
+    def test_pointer_is_not_moved_to_older_text(self):
+        TestCaseText.objects.create(
+            case=self.case_2,
+            case_text_version=0,
+            author=self.case_2.author,
+            action_checksum="",
+            effect_checksum="",
+            setup_checksum="",
+            breakdown_checksum="",
+        )
+        self.assertEqual(self.text_2, self.case_2.latest_text())
+
+    def test_pointer_is_reset_after_deleting_latest_text(self):
+        self.text_1.delete()
+        self.assertEqual(1, self.case_1.latest_text_version())
+        self.assertEqual("action 1", self.case_1.latest_text().action)
+
+        TestCaseText.objects.filter(case=self.case_1).delete()
+        self.assertEqual(0, self.case_1.latest_text_version())
+
+    def test_get_latest_texts(self):
+        texts = TestCase.get_latest_texts([self.case_1.pk, self.case_2.pk, self.case_3.pk])
+        self.assertEqual({self.case_1.pk: self.text_1, self.case_2.pk: self.text_2}, texts)
+
+        texts = TestCase.get_latest_texts([self.case_1.pk], text_required=False)
+        self.assertEqual(2, texts[self.case_1.pk].case_text_version)
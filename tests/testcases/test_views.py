@@ -25,6 +25,7 @@ from tcms.core.utils import timedelta2int
 from tcms.issuetracker.models import Issue, IssueTracker
 from tcms.logs.models import TCMSLogModel
 from tcms.management.models import Component, Priority, TestTag
+from tcms.testcases.data import get_case_run_history_summary
 from tcms.testcases.fields import MultipleEmailField
 from tcms.testcases.forms import CaseNotifyForm
 from tcms.testcases.models import (
@@ -40,7 +41,7 @@ from tcms.testcases.views import (
     update_case_email_settings,
 )
 from tcms.testplans.models import TestPlan
-from tcms.testruns.models import TestCaseRun
+from tcms.testruns.models import TestCaseRun, TestCaseRunStatus
 from tests import AuthMixin, BaseCaseRun, BasePlanCase, HelperAssertions, NitrateTestCase
 from tests import factories as f
 from tests import remove_perm_from_user, user_should_have_perm
@@ -2261,6 +2262,65 @@ class TestCaseCaseRunListPaneView(BaseCaseRun):
 
         self.assertContains(resp, "<tbody></tbody>", html=True)
 
+    def test_paginate_case_runs(self):
+        runs = f.TestRunFactory.create_batch(
+            3, plan=self.plan, build=self.build, manager=self.tester, default_tester=self.tester
+        )
+        case_runs = [f.TestCaseRunFactory(run=run, case=self.case_1) for run in runs]
+        url = reverse("caserun-list-pane", args=[self.case_1.pk])
+
+        with patch("tcms.testcases.views.TestCaseCaseRunListPaneView.paginate_by", 2):
+            resp = self.client.get(url, data={"plan_id": self.plan.pk, "page": 2})
+
+        # Newest case runs are on the first page
+        page_case_runs = [case_run["pk"] for case_run in resp.context["case_runs"]]
+        self.assertEqual([case_runs[0].pk, self.case_run_1.pk], page_case_runs)
+        self.assertContains(resp, "Page 2 of 2, 4 case runs")
+        self.assertContains(resp, 'data-page="1"')
+
+
+class TestGetCaseRunHistorySummary(BaseCaseRun):
+    """Test get_case_run_history_summary"""
+
+    def test_summarize_by_plan(self):
+        passed = TestCaseRunStatus.objects.get(name="PASSED")
+        another_plan = f.TestPlanFactory(
+            product=self.product, product_version=self.version, owner=self.tester
+        )
+        runs = f.TestRunFactory.create_batch(
+            3,
+            plan=another_plan,
+            build=self.build,
+            manager=self.tester,
+            default_tester=self.tester,
+        )
+        f.TestCaseRunFactory(run=runs[0], case=self.case_1, case_run_status=passed)
+        f.TestCaseRunFactory(run=runs[1], case=self.case_1, case_run_status=passed)
+        f.TestCaseRunFactory(run=runs[2], case=self.case_1)
+
+        self.assertEqual(
+            [
+                {
+                    "plan_id": self.plan.pk,
+                    "plan_name": self.plan.name,
+                    "case_runs_count": 1,
+                    "status_counts": [("IDLE", 1)],
+                },
+                {
+                    "plan_id": another_plan.pk,
+                    "plan_name": another_plan.name,
+                    "case_runs_count": 3,
+                    "status_counts": [("IDLE", 1), ("PASSED", 2)],
+                },
+            ],
+            get_case_run_history_summary(self.case_1.pk),
+        )
+
+    def test_show_summary_in_case_page(self):
+        resp = self.client.get(reverse("case-get", args=[self.case_1.pk]))
+        self.assertContains(resp, "<span id='case_run_count'>1</span>")
+        self.assertContains(resp, "1 case run:")
+
 
 def format_date(dt: datetime) -> str:
     """Format datetime to string using in the Django way"""
@@ -20,6 +20,7 @@ from tcms.testplans.helpers import email
 from tcms.testplans.models import (
     TCMSEnvPlanMap,
     TestPlan,
+    TestPlanClosure,
     TestPlanComponent,
     TestPlanTag,
     TestPlanText,
@@ -312,6 +313,75 @@ class TestPlanTreeView(BasePlanCase):
             self.assertListEqual(expected, sorted(plan.get_descendant_ids(True)))
 
 
+class TestPlanClosureMaintenance(BasePlanCase):
+    """Test the plan closure table is maintained on plan tree changes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.create_treeview_data()
+
+    def assert_closure_rebuilt_equal(self):
+        links = set(TestPlanClosure.objects.values_list("ancestor", "descendant", "depth"))
+        TestPlanClosure.rebuild()
+        rebuilt = set(TestPlanClosure.objects.values_list("ancestor", "descendant", "depth"))
+        self.assertSetEqual(rebuilt, links)
+
+    def test_new_plan_is_added(self):
+        plan = f.TestPlanFactory(parent=self.plan_4)
+        self.assertListEqual(
+            [self.plan_4.pk, self.plan_3.pk, self.plan_2.pk, self.plan.pk],
+            plan.get_ancestor_ids(),
+        )
+        self.assert_closure_rebuilt_equal()
+
+    def test_move_subtree(self):
+        self.plan_3.parent = self.plan_9
+        self.plan_3.save(update_fields=["parent"])
+
+        self.assertListEqual([self.plan_9.pk], self.plan_3.get_ancestor_ids())
+        self.assertListEqual(
+            [self.plan_4.pk, self.plan_3.pk, self.plan_9.pk], self.plan_5.get_ancestor_ids()
+        )
+        self.assertListEqual([self.plan_8.pk], self.plan_2.get_descendant_ids())
+        self.assert_closure_rebuilt_equal()
+
+    def test_move_subtree_to_root(self):
+        self.plan_4.parent = None
+        self.plan_4.save()
+
+        self.assertListEqual([], self.plan_4.get_ancestor_ids())
+        self.assertListEqual([self.plan_4.pk], self.plan_6.get_ancestor_ids())
+        self.assert_closure_rebuilt_equal()
+
+    def test_do_not_create_cycle(self):
+        with self.assertRaises(ValueError):
+            TestPlanClosure.move_subtree(self.plan_2.pk, self.plan_5.pk)
+        with self.assertRaises(ValueError):
+            TestPlanClosure.move_subtree(self.plan_2.pk, self.plan_2.pk)
+
+    def test_delete_plan_in_middle(self):
+        self.plan_3.delete()
+
+        self.assertListEqual([self.plan_4.pk], self.plan_5.get_ancestor_ids())
+        self.assertListEqual([], TestPlan.objects.get(pk=self.plan_7.pk).get_ancestor_ids())
+        self.assertListEqual([self.plan_8.pk], self.plan_2.get_descendant_ids())
+        self.assert_closure_rebuilt_equal()
+
+    def test_is_descendant_of(self):
+        self.assertTrue(self.plan_5.is_descendant_of(self.plan.pk))
+        self.assertFalse(self.plan_5.is_descendant_of(self.plan_5.pk))
+        self.assertFalse(self.plan_8.is_descendant_of(self.plan_3.pk))
+
+    def test_get_family_cases(self):
+        self.plan_5.add_case(self.case_1)
+        self.plan_8.add_case(self.case_2)
+
+        family_cases = self.plan_3.get_family_cases()
+        self.assertIn(self.case_1, family_cases)
+        self.assertNotIn(self.case_2, family_cases)
+
+
 @pytest.mark.parametrize(
     "text,expected",
     [
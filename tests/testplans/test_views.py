@@ -216,18 +216,35 @@ class TestSortCases(BasePlanCase):
             status_code=HTTPStatus.BAD_REQUEST,
         )
 
+    def get_sortkeys(self, cases):
+        sortkeys = dict(
+            TestCasePlan.objects.filter(plan=self.plan, case__in=cases).values_list(
+                "case", "sortkey"
+            )
+        )
+        return [sortkeys[case.pk] for case in cases]
+
     def test_order_cases(self):
-        post_data = {"case": [self.case_3.pk, self.case_1.pk]}
+        cases = [self.case_1, self.case_2, self.case_3]
+        for i, case in enumerate(cases):
+            TestCasePlan.objects.filter(plan=self.plan, case=case).update(sortkey=(i + 1) * 10)
+
+        post_data = {"case": [self.case_3.pk, self.case_1.pk, self.case_2.pk]}
         response = self.client.post(self.cases_url, post_data)
         data = json.loads(response.content)
 
         self.assertEqual({}, data)
+        # Only the moved case gets a new sort key.
+        self.assertEqual([10, 20, 5], self.get_sortkeys(cases))
+
+    def test_number_cases_again_if_no_gap(self):
+        cases = [self.case_1, self.case_3]
+        TestCasePlan.objects.filter(plan=self.plan, case__in=cases).update(sortkey=1)
 
-        case_plan_rel = TestCasePlan.objects.get(plan=self.plan, case=self.case_3)
-        self.assertEqual(10, case_plan_rel.sortkey)
+        post_data = {"case": [self.case_3.pk, self.case_1.pk]}
+        self.client.post(self.cases_url, post_data)
 
-        case_plan_rel = TestCasePlan.objects.get(plan=self.plan, case=self.case_1)
-        self.assertEqual(20, case_plan_rel.sortkey)
+        self.assertEqual([20, 10], self.get_sortkeys(cases))
 
 
 class TestLinkCases(BasePlanCase):
@@ -744,6 +761,39 @@ class TestPlansPagesView(BasePlanCase):
                 data["aaData"][i]["1"],
             )
 
+    def test_get_first_page_order_by_cases_count(self):
+        search_data = self.search_data.copy()
+        search_data["iSortCol_0"] = 8
+        search_data["bSortable_8"] = "true"
+        search_data["sSortDir_0"] = "desc"
+
+        response = self.client.get(self.search_url, search_data)
+
+        data = json.loads(response.content)
+
+        expected_plans = TestPlan.attach_subtotal(
+            TestPlan.apply_subtotal(TestPlan.objects.all(), cases_count=True).order_by(
+                "-cases_count"
+            )[0:3],
+            cases_count=True,
+        )
+        self.assertEqual(
+            [
+                "<a href='{}#testruns' title='0 test runs'>0</a>".format(plan.get_absolute_url())
+                for plan in expected_plans
+            ],
+            [item["8"] for item in data["aaData"]],
+        )
+        self.assertEqual(
+            [
+                "<a href='{0}' title='{1} test cases'>{1}</a>".format(
+                    plan.get_absolute_url(), plan.cases_count
+                )
+                for plan in expected_plans
+            ],
+            [item["7"] for item in data["aaData"]],
+        )
+
 
 class TestExportView(PlanCaseExportTestHelper, BasePlanCase):
     """Test export view method"""
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime, timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+
+from tcms.comments.models import add_comment
+from tcms.core.db import SQLExecution
+from tcms.report.data import subtotal_case_runs
+from tcms.testcases.data import get_case_run_history_summary
+from tcms.testruns.archive import archive_case_runs, list_case_runs, read_through_archive
+from tcms.testruns.clone import clone_runs
+from tcms.testruns.completion import update_runs_completion_status
+from tcms.testruns.data import stats_case_runs_status
+from tcms.testruns.models import TestCaseRun, TestCaseRunArchive, TestCaseRunStatus, TestRun
+from tcms.xmlrpc.api import testcaserun as testcaserun_api
+from tcms.xmlrpc.api import testrun as testrun_api
+from tests import factories as f
+
+COUNT_CASE_RUNS_SQL = "SELECT COUNT(*) FROM test_case_runs WHERE test_case_runs.run_id = %s"
+
+
+@pytest.fixture
+def archive_enabled(settings):
+    settings.CASE_RUN_ARCHIVE_AGE = 30
+
+
+@pytest.fixture
+def old_run(base_data):
+    run = f.TestRunFactory(plan=base_data.create_plan())
+    passed = TestCaseRunStatus.objects.get(name="PASSED")
+    f.TestCaseRunFactory.create_batch(3, run=run, case_run_status=passed)
+    case_run = f.TestCaseRunFactory(run=run, case_run_status=passed)
+    f.IssueFactory(case_run=case_run, case=case_run.case)
+    run.stop_date = datetime.now() - timedelta(days=60)
+    run.save(update_fields=["stop_date"])
+    return run
+
+
+@pytest.fixture
+def recent_run(base_data):
+    run = f.TestRunFactory(plan=base_data.create_plan(), stop_date=datetime.now())
+    f.TestCaseRunFactory(run=run)
+    return run
+
+
+@pytest.mark.django_db
+def test_archive_case_runs(old_run, recent_run, archive_enabled):
+    case_run_ids = set(old_run.case_run.filter(issues__isnull=True).values_list("pk", flat=True))
+
+    assert 3 == archive_case_runs()
+
+    assert case_run_ids == set(old_run.archived_case_runs.values_list("pk", flat=True))
+    # The case run with an issue is kept.
+    assert 1 == old_run.case_run.count()
+    assert 1 == recent_run.case_run.count()
+    assert not recent_run.archived_case_runs.exists()
+
+    archived = TestCaseRunArchive.objects.order_by("pk").first()
+    assert old_run.pk == archived.run_id
+    assert "PASSED" == archived.case_run_status.name
+
+
+@pytest.mark.django_db
+def test_resume_archival(old_run, archive_enabled):
+    assert 2 == archive_case_runs(batch_size=1, max_batches=2)
+    assert 2 == old_run.archived_case_runs.count()
+    assert 1 == archive_case_runs(batch_size=1)
+    assert 0 == archive_case_runs(batch_size=1)
+    assert 3 == old_run.archived_case_runs.count()
+
+
+@pytest.mark.django_db
+def test_not_read_through_archive_if_disabled(old_run, settings):
+    settings.CASE_RUN_ARCHIVE_AGE = 0
+    archive_case_runs(stopped_before=datetime.now())
+    assert COUNT_CASE_RUNS_SQL == read_through_archive(COUNT_CASE_RUNS_SQL)
+    assert 1 == SQLExecution(COUNT_CASE_RUNS_SQL, [old_run.pk]).scalar
+    assert 1 == stats_case_runs_status([old_run.pk])[old_run.pk].total
+
+
+@pytest.mark.django_db
+def test_read_through_archive(old_run, archive_enabled):
+    archive_case_runs()
+
+    sql = read_through_archive(COUNT_CASE_RUNS_SQL)
+    assert "test_case_runs_archive" in sql
+    assert 4 == SQLExecution(sql, [old_run.pk]).scalar
+
+    stats = stats_case_runs_status([old_run.pk])[old_run.pk]
+    assert 4 == stats.total
+    assert 4 == stats["PASSED"]
+
+    passed = TestCaseRunStatus.objects.get(name="PASSED")
+    assert 4 == subtotal_case_runs({"run": old_run.pk})[passed.pk]
+
+
+@pytest.mark.django_db
+def test_xmlrpc_filter_reads_through_archive(old_run, archive_enabled):
+    archive_case_runs()
+
+    case_runs = testcaserun_api.filter(None, {"run": old_run.pk}, ["case_run_id"])
+    assert sorted(
+        list(old_run.case_run.values_list("pk", flat=True))
+        + list(old_run.archived_case_runs.values_list("pk", flat=True))
+    ) == sorted(item["case_run_id"] for item in case_runs)
+    assert 4 == testcaserun_api.filter_count(None, {"run": old_run.pk})
+
+    # Criteria over relationships which the archived case runs do not have
+    query = {"run": old_run.pk, "issues__isnull": False}
+    assert 1 == len(testcaserun_api.filter(None, query))
+    assert 1 == testcaserun_api.filter_count(None, query)
+
+
+@pytest.mark.django_db
+def test_list_case_runs(old_run, archive_enabled):
+    for sortkey, case_run in enumerate(old_run.case_run.order_by("-pk")):
+        case_run.sortkey = sortkey
+        case_run.save(update_fields=["sortkey"])
+    archive_case_runs()
+
+    case_runs = list_case_runs(
+        lambda model: model.objects.filter(run=old_run), order_by=["sortkey", "pk"]
+    )
+    # The case run with an issue is kept and the last one created.
+    assert [0, 1, 2, 3] == [case_run.sortkey for case_run in case_runs]
+    assert [False, True, True, True] == [case_run.is_archived for case_run in case_runs]
+
+    case_runs = list_case_runs(
+        lambda model: model.objects.filter(run=old_run), order_by=["-sortkey"]
+    )
+    assert [3, 2, 1, 0] == [case_run.sortkey for case_run in case_runs]
+
+
+@pytest.mark.django_db
+def test_run_page_lists_archived_case_runs(client, old_run, archive_enabled):
+    archive_case_runs()
+
+    response = client.get(reverse("run-get", args=[old_run.pk]))
+    content = response.content.decode()
+    assert "Cases: 4" in content
+    for pk in old_run.archived_case_runs.values_list("pk", flat=True):
+        assert f"#{pk} (archived)" in content
+    (pk,) = old_run.case_run.values_list("pk", flat=True)
+    assert f'name="case_run" value="{pk}"' in content
+    assert 1 == content.count('name="case_run"')
+
+
+@pytest.mark.django_db
+def test_run_report_includes_archived_case_runs(client, tester, old_run, archive_enabled):
+    archived_case_run = old_run.case_run.filter(issues__isnull=True).first()
+    add_comment(tester, "testruns.testcaserun", [archived_case_run.pk], "archived comment")
+    archive_case_runs()
+
+    response = client.get(reverse("run-report", args=[old_run.pk]))
+    assert 4 == response.context["test_case_runs_count"]
+    (case_run,) = [
+        item for item in response.context["test_case_runs"] if item.pk == archived_case_run.pk
+    ]
+    assert ["archived comment"] == [item["comment"] for item in case_run.user_comments]
+
+
+@pytest.mark.django_db
+def test_case_history_includes_archived_case_runs(client, old_run, archive_enabled):
+    case_run = old_run.case_run.filter(issues__isnull=True).first()
+    archive_case_runs()
+
+    assert [
+        {
+            "plan_id": old_run.plan_id,
+            "plan_name": old_run.plan.name,
+            "case_runs_count": 1,
+            "status_counts": [("PASSED", 1)],
+        }
+    ] == get_case_run_history_summary(case_run.case_id)
+
+    new_case_run = f.TestCaseRunFactory(run=f.TestRunFactory(plan=old_run.plan), case=case_run.case)
+    response = client.get(
+        reverse("caserun-list-pane", args=[case_run.case_id]), {"plan_id": old_run.plan_id}
+    )
+    assert [new_case_run.pk, case_run.pk] == [item["pk"] for item in response.context["case_runs"]]
+
+    response = client.get(
+        reverse("caserun-simple-pane", args=[case_run.case_id]), {"case_run_id": case_run.pk}
+    )
+    assert case_run.pk == response.context["test_caserun"].pk
+
+
+@pytest.mark.django_db
+def test_clone_archived_run(client, old_run, archive_enabled):
+    archive_case_runs()
+
+    (new_run_id,) = clone_runs([old_run.pk], build_id=old_run.build_id)
+    new_run = TestRun.objects.get(pk=new_run_id)
+    assert sorted(
+        list(old_run.case_run.values_list("case", flat=True))
+        + list(old_run.archived_case_runs.values_list("case", flat=True))
+    ) == sorted(new_run.case_run.values_list("case", flat=True))
+
+    response = client.get(reverse("runs-clone"), {"run": old_run.pk})
+    assert 4 == len(response.context["cases_run"])
+    assert "Selected cases 4:" in response.content.decode()
+
+    case_run_ids = list(old_run.archived_case_runs.values_list("pk", flat=True))
+    response = client.post(reverse("run-clone", args=[old_run.pk]), {"case_run": case_run_ids})
+    assert case_run_ids == [case_run.pk for case_run in response.context["cases_run"]]
+
+
+@pytest.mark.django_db
+def test_completion_status_counts_archived_case_runs(old_run, archive_enabled):
+    archive_case_runs()
+    TestRun.objects.filter(pk=old_run.pk).update(auto_update_run_status=True, stop_date=None)
+
+    update_runs_completion_status([old_run.pk])
+    assert TestRun.objects.get(pk=old_run.pk).stop_date is not None
+
+    TestCaseRunArchive.objects.filter(run=old_run).update(
+        case_run_status=TestCaseRunStatus.objects.get(name="IDLE")
+    )
+    update_runs_completion_status([old_run.pk])
+    assert TestRun.objects.get(pk=old_run.pk).stop_date is None
+
+
+@pytest.mark.django_db
+def test_xmlrpc_run_reads_through_archive(old_run, archive_enabled):
+    archive_case_runs()
+
+    assert 4 == len(testrun_api.get_test_case_runs(None, old_run.pk))
+    cases = testrun_api.get_test_cases(None, old_run.pk)
+    assert 4 == len(cases)
+    assert {"PASSED"} == {case["case_run_status"] for case in cases}
+
+
+@pytest.mark.django_db
+def test_archivecaseruns_command(old_run, archive_enabled):
+    out = StringIO()
+    call_command("archivecaseruns", "--batch-size", "2", stdout=out)
+    assert "Archived 3 case runs" in out.getvalue()
+    assert 1 == TestCaseRun.objects.filter(run=old_run).count()
+
+
+@pytest.mark.django_db
+def test_archivecaseruns_command_if_disabled(settings):
+    settings.CASE_RUN_ARCHIVE_AGE = 0
+    with pytest.raises(CommandError, match="disabled"):
+        call_command("archivecaseruns")
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from tcms.testruns.clone import (
+    CLONE_PROGRESS_KEY,
+    RunCloner,
+    bulk_add_case_runs,
+    clone_runs,
+    get_clone_progress,
+    start_clone_runs,
+)
+from tcms.testruns.models import TestCaseRun, TestRun
+from tests import BaseCaseRun
+from tests import factories as f
+
+
+class TestRunCloner(BaseCaseRun):
+    """Test RunCloner"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.test_run.add_cc(f.UserFactory())
+        cls.test_run.add_tag(f.TestTagFactory(name="cloned"))
+        cls.test_run.add_env_value(f.TCMSEnvValueFactory())
+        cls.new_build = f.TestBuildFactory(product=cls.product)
+
+    def test_clone(self):
+        cloner = RunCloner(self.new_build.pk, clone_cc=True, clone_tag=True, batch_size=2)
+        new_run = cloner.clone(self.test_run)
+
+        self.assertEqual(self.new_build, new_run.build)
+        self.assertEqual(self.test_run.product_version, new_run.product_version)
+        self.assertEqual(self.test_run.manager, new_run.manager)
+
+        origin_case_runs = self.test_run.case_run.order_by("pk")
+        cloned_case_runs = new_run.case_run.order_by("pk")
+        self.assertEqual(
+            [(cr.case_id, cr.assignee_id, cr.sortkey) for cr in origin_case_runs],
+            [(cr.case_id, cr.assignee_id, cr.sortkey) for cr in cloned_case_runs],
+        )
+        for case_run in cloned_case_runs:
+            self.assertEqual("IDLE", case_run.case_run_status.name)
+            self.assertEqual(self.new_build, case_run.build)
+
+        self.assertEqual(
+            list(self.test_run.cc_list.values_list("user", flat=True)),
+            list(new_run.cc_list.values_list("user", flat=True)),
+        )
+        self.assertEqual(["cloned"], list(new_run.tags.values_list("tag__name", flat=True)))
+        self.assertEqual(
+            list(self.test_run.env_value.values_list("pk", flat=True)),
+            list(new_run.env_value.values_list("pk", flat=True)),
+        )
+
+    def test_not_clone_cc_and_tag(self):
+        new_run = RunCloner(self.new_build.pk).clone(self.test_run)
+        self.assertFalse(new_run.cc_list.exists())
+        self.assertFalse(new_run.tags.exists())
+
+    def test_mark_run_dirty_once(self):
+        with patch("tcms.testruns.clone.mark_runs_dirty") as mark_runs_dirty:
+            new_run = RunCloner(self.new_build.pk, batch_size=1).clone(self.test_run)
+        mark_runs_dirty.assert_called_once_with([new_run.pk])
+
+    def test_bulk_add_case_runs(self):
+        run = f.TestRunFactory(plan=self.plan, build=self.build, environment_id=3)
+        count = bulk_add_case_runs(
+            run, [TestCaseRun(case=self.case_1, case_text_version=1, sortkey=10)]
+        )
+        self.assertEqual(1, count)
+        case_run = run.case_run.get()
+        self.assertEqual(self.build, case_run.build)
+        self.assertEqual("IDLE", case_run.case_run_status.name)
+        self.assertEqual(3, case_run.environment_id)
+
+
+@pytest.mark.django_db
+def test_clone_runs_with_progress(base_data):
+    run = f.TestRunFactory(plan=base_data.create_plan())
+    job_id = start_clone_runs([run.pk], build_id=run.build_id)
+
+    progress = get_clone_progress(job_id)
+    assert progress["finished"]
+    assert progress["error"] is None
+    assert 1 == progress["total"]
+    assert run.summary == TestRun.objects.get(pk=progress["cloned_run_ids"][0]).summary
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "backend,run_as_task",
+    [
+        ["django.core.cache.backends.locmem.LocMemCache", False],
+        ["django.core.cache.backends.dummy.DummyCache", False],
+        ["django.core.cache.backends.filebased.FileBasedCache", True],
+    ],
+)
+def test_clone_as_task_if_progress_is_shared(backend, run_as_task, settings, tmp_path):
+    settings.CACHES = {"default": {"BACKEND": backend, "LOCATION": str(tmp_path)}}
+    with patch("tcms.testruns.clone.clone_runs_task") as clone_runs_task:
+        with patch("tcms.testruns.clone.clone_runs") as clone_runs:
+            start_clone_runs([1], build_id=1)
+    assert run_as_task == clone_runs_task.called
+    assert run_as_task != clone_runs.called
+
+
+@pytest.mark.django_db
+def test_rollback_if_failed_to_clone(base_data):
+    runs = f.TestRunFactory.create_batch(2, plan=base_data.create_plan())
+    runs_count = TestRun.objects.count()
+
+    with patch.object(RunCloner, "clone", side_effect=[runs[0], ValueError("error")]):
+        with pytest.raises(ValueError):
+            clone_runs([run.pk for run in runs], job_id="1", build_id=runs[0].build_id)
+
+    assert runs_count == TestRun.objects.count()
+    progress = get_clone_progress("1")
+    assert progress["finished"]
+    assert "error" == progress["error"]
+    assert [] == progress["cloned_run_ids"]
+
+
+def set_clone_progress(job_id, **values):
+    progress = {"total": 2, "cloned_run_ids": [], "finished": False, "error": None}
+    progress.update(values)
+    cache.set(CLONE_PROGRESS_KEY.format(job_id), progress)
+
+
+@pytest.mark.django_db
+def test_clone_job_does_not_exist(client):
+    response = client.get(reverse("runs-clone-progress", args=["xxx"]))
+    assert HTTPStatus.NOT_FOUND == response.status_code
+
+
+@pytest.mark.django_db
+def test_clone_in_progress(client):
+    set_clone_progress("1", cloned_run_ids=[1])
+    response = client.get(reverse("runs-clone-progress", args=["1"]))
+    assert HTTPStatus.OK == response.status_code
+    assert b'http-equiv="refresh"' in response.content
+    assert b"1 of 2 runs are cloned" in response.content
+
+
+@pytest.mark.django_db
+def test_redirect_to_cloned_runs(client, base_data):
+    runs = f.TestRunFactory.create_batch(2, plan=base_data.create_plan())
+    set_clone_progress("1", cloned_run_ids=[run.pk for run in runs], finished=True)
+    response = client.get(reverse("runs-clone-progress", args=["1"]))
+    assert HTTPStatus.FOUND == response.status_code
+    assert response.url.startswith(reverse("runs-all"))
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+import pytest
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from tcms.testruns import signals
+from tcms.testruns.completion import mark_runs_dirty, update_runs_completion_status
+from tcms.testruns.models import TestCaseRun, TestCaseRunStatus, TestRun
+from tests import factories as f
+
+
+@pytest.fixture
+def runs(base_data):
+    plan = base_data.create_plan()
+    runs = f.TestRunFactory.create_batch(3, plan=plan, auto_update_run_status=True)
+    passed = TestCaseRunStatus.objects.get(name="PASSED")
+    idle = TestCaseRunStatus.objects.get(name="IDLE")
+    # The first run is finished, the second one is not, and the third one has
+    # no case runs.
+    f.TestCaseRunFactory.create_batch(2, run=runs[0], case_run_status=passed)
+    f.TestCaseRunFactory(run=runs[1], case_run_status=passed)
+    f.TestCaseRunFactory(run=runs[1], case_run_status=idle)
+    return runs
+
+
+def get_stop_dates(runs):
+    stop_dates = dict(
+        TestRun.objects.filter(pk__in=[run.pk for run in runs]).values_list("pk", "stop_date")
+    )
+    return [stop_dates[run.pk] for run in runs]
+
+
+@pytest.mark.django_db
+def test_update_runs_completion_status(runs, django_assert_num_queries):
+    TestRun.objects.filter(pk__in=[run.pk for run in runs]).update(stop_date="2020-01-01 00:00:00")
+    # Cache the complete statuses, then one aggregate and two updates are left
+    TestCaseRunStatus.completed_status_ids()
+    with django_assert_num_queries(3):
+        update_runs_completion_status([run.pk for run in runs])
+
+    first, second, third = get_stop_dates(runs)
+    assert first.year > 2020
+    assert second is None
+    assert third is None
+
+
+@pytest.mark.django_db
+def test_skip_run_not_auto_updated(runs):
+    TestRun.objects.filter(pk=runs[0].pk).update(auto_update_run_status=False)
+    update_runs_completion_status([runs[0].pk])
+    assert [None, None, None] == get_stop_dates(runs)
+
+
+@pytest.mark.django_db
+def test_recompute_dirty_runs_once_at_commit(runs, django_capture_on_commit_callbacks):
+    with patch(
+        "tcms.testruns.completion.update_runs_completion_status"
+    ) as update_runs_completion_status:
+        with django_capture_on_commit_callbacks(execute=True):
+            mark_runs_dirty([runs[0].pk])
+            mark_runs_dirty([runs[0].pk, runs[1].pk])
+            update_runs_completion_status.assert_not_called()
+
+    update_runs_completion_status.assert_called_once()
+    (run_ids,) = update_runs_completion_status.call_args[0]
+    # Runs left dirty by rolled back transactions could be recomputed as well
+    assert {runs[0].pk, runs[1].pk} <= set(run_ids)
+
+
+@pytest.mark.django_db
+def test_recompute_runs_marked_in_rolled_back_transaction(runs, django_capture_on_commit_callbacks):
+    with pytest.raises(ValueError):
+        with transaction.atomic():
+            mark_runs_dirty([runs[0].pk])
+            raise ValueError
+
+    with django_capture_on_commit_callbacks(execute=True):
+        mark_runs_dirty([runs[1].pk])
+
+    first, second, _ = get_stop_dates(runs)
+    assert first is not None
+    assert second is None
+
+
+@pytest.fixture
+def case_run_signals():
+    post_save.connect(signals.post_case_run_saved, sender=TestCaseRun)
+    post_delete.connect(signals.post_case_run_deleted, sender=TestCaseRun)
+    yield
+    post_save.disconnect(signals.post_case_run_saved, sender=TestCaseRun)
+    post_delete.disconnect(signals.post_case_run_deleted, sender=TestCaseRun)
+
+
+@pytest.mark.django_db
+def test_signals_mark_runs_dirty(runs, case_run_signals, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        runs[1].case_run.filter(case_run_status__name="IDLE").delete()
+    assert get_stop_dates(runs)[1] is not None
+
+    with django_capture_on_commit_callbacks(execute=True):
+        f.TestCaseRunFactory(run=runs[1])
+    assert get_stop_dates(runs)[1] is None
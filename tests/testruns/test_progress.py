@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+import json
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+
+from tcms.testruns.completion import mark_runs_dirty
+from tcms.testruns.models import TestCaseRunStatus
+from tcms.testruns.progress import (
+    get_run_progress,
+    iter_progress_events,
+    publish_runs_progress,
+)
+from tests import factories as f
+
+
+@pytest.fixture
+def run(base_data):
+    run = f.TestRunFactory(plan=base_data.create_plan())
+    passed = TestCaseRunStatus.objects.get(name="PASSED")
+    failed = TestCaseRunStatus.objects.get(name="FAILED")
+    f.TestCaseRunFactory(run=run, case_run_status=passed)
+    case_run = f.TestCaseRunFactory(run=run, case_run_status=failed)
+    f.IssueFactory(case_run=case_run, case=case_run.case)
+    return run
+
+
+@pytest.fixture
+def progress_stream(settings):
+    settings.RUN_PROGRESS_STREAM_TIMEOUT = 30
+    settings.RUN_PROGRESS_POLL_INTERVAL = 1
+
+
+def set_status(run, status_name):
+    run.case_run.update(case_run_status=TestCaseRunStatus.objects.get(name=status_name))
+
+
+@pytest.mark.django_db
+def test_not_publish_if_disabled(run, settings):
+    settings.RUN_PROGRESS_STREAM_TIMEOUT = 0
+    publish_runs_progress([run.pk])
+    assert get_run_progress(run.pk) is None
+
+
+@pytest.mark.django_db
+def test_publish_runs_progress(run, base_data, progress_stream):
+    empty_run = f.TestRunFactory(plan=base_data.create_plan())
+    publish_runs_progress([run.pk, empty_run.pk])
+
+    progress = get_run_progress(run.pk)
+    assert 1 == progress["statuses"]["PASSED"]
+    assert 1 == progress["statuses"]["FAILED"]
+    assert 0 == progress["statuses"]["IDLE"]
+    assert {"PASSED": 1, "FAILED": 1} == progress["delta"]
+    assert 2 == progress["total"]
+    assert 100.0 == progress["complete_percent"]
+    assert 50.0 == progress["failure_percent_in_complete"]
+    assert 1 == progress["issues_count"]
+
+    assert 0 == get_run_progress(empty_run.pk)["total"]
+
+    set_status(run, "IDLE")
+    publish_runs_progress([run.pk])
+    new_progress = get_run_progress(run.pk)
+    assert new_progress["id"] > progress["id"]
+    assert {"PASSED": -1, "FAILED": -1, "IDLE": 2} == new_progress["delta"]
+
+
+@pytest.mark.django_db
+def test_publish_progress_of_dirty_runs_at_commit(
+    run, progress_stream, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        mark_runs_dirty([run.pk])
+        assert get_run_progress(run.pk) is None
+    assert 2 == get_run_progress(run.pk)["total"]
+
+
+def parse_events(events):
+    return [
+        json.loads(event.split("data: ", 1)[1]) for event in events if "event: progress" in event
+    ]
+
+
+@pytest.mark.django_db
+def test_not_send_progress_published_before_connecting(run, progress_stream):
+    publish_runs_progress([run.pk])
+    events = list(iter_progress_events(run.pk, timeout=0, poll_interval=0.5))
+    assert ["retry: 500\n\n"] == events
+
+
+@pytest.mark.django_db
+def test_send_progress_missed_before_reconnecting(run, progress_stream):
+    publish_runs_progress([run.pk])
+    progress = get_run_progress(run.pk)
+    events = list(iter_progress_events(run.pk, last_event_id="1", timeout=0))
+    assert f"id: {progress['id']}\n" in events[1]
+    assert [progress] == parse_events(events)
+
+
+@pytest.mark.django_db
+def test_send_progress_published_while_watching(run, progress_stream):
+    def publish(seconds):
+        set_status(run, "IDLE")
+        publish_runs_progress([run.pk])
+
+    with patch("tcms.testruns.progress.time.sleep", side_effect=publish) as sleep:
+        with patch("tcms.testruns.progress.time.monotonic", side_effect=[0, 0, 0, 1, 1]):
+            events = list(iter_progress_events(run.pk, timeout=1))
+
+    sleep.assert_called_once_with(1)
+    (progress,) = parse_events(events)
+    assert 2 == progress["statuses"]["IDLE"]
+
+
+@pytest.mark.django_db
+def test_progress_stream_is_disabled(client, run, settings):
+    settings.RUN_PROGRESS_STREAM_TIMEOUT = 0
+    response = client.get(reverse("run-progress-stream", args=[run.pk]))
+    assert HTTPStatus.NOT_FOUND == response.status_code
+
+
+@pytest.mark.django_db
+def test_progress_stream(client, run, progress_stream):
+    publish_runs_progress([run.pk])
+    with patch("tcms.testruns.views.iter_progress_events", return_value=iter(["retry: 1\n\n"])):
+        response = client.get(reverse("run-progress-stream", args=[run.pk]), HTTP_LAST_EVENT_ID="1")
+    assert HTTPStatus.OK == response.status_code
+    assert "text/event-stream" == response["Content-Type"]
+    assert b"retry: 1\n\n" == b"".join(response.streaming_content)
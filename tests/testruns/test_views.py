@@ -524,7 +524,7 @@ class TestStartCloneRunFromRunsSearchPage(CloneRunBaseTest):
                 else:
                     # Should use newest case text
                     self.assertEqual(
-                        list(origin_case_run.get_text_versions())[-1],
+                        max(origin_case_run.get_text_versions()),
                         cloned_case_run.case_text_version,
                     )
             else:
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import xmlrpc.client
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from tcms.xmlrpc import get_version
+from tcms.xmlrpc.dispatcher import LazyXMLRPCDispatcher
+
+
+def echo(request, value):
+    return value
+
+
+def test_register_methods_lazily():
+    dispatcher = LazyXMLRPCDispatcher([("tcms.xmlrpc.api.version", "Version"), (echo, "Echo.echo")])
+    assert "Echo.echo" in dispatcher.funcs
+    assert "Version.get" not in dispatcher.funcs
+
+    func = dispatcher.get_function("Version.get")
+    assert get_version() == func(None)
+    assert "Version.get" in dispatcher.funcs
+    assert not dispatcher._pending
+
+
+def test_register_module_function():
+    dispatcher = LazyXMLRPCDispatcher([("tcms.xmlrpc.api.version.get", "Ver.get")])
+    assert dispatcher.get_function("Ver.get") is not None
+    assert dispatcher.get_function("Ver.xxx") is None
+
+
+def test_list_methods_registers_all():
+    dispatcher = LazyXMLRPCDispatcher(
+        [("tcms.xmlrpc.api.version", "Version"), ("tcms.xmlrpc.api.tag", "Tag")]
+    )
+    methods = dispatcher.system_listMethods()
+    assert "Version.get" in methods
+    assert "Tag.get_tags" in methods
+
+
+def test_dispatch(rf):
+    dispatcher = LazyXMLRPCDispatcher([("tcms.xmlrpc.api.version", "Version")])
+    request = rf.post("/xmlrpc/", xmlrpc.client.dumps((), "Version.get"), content_type="text/xml")
+    (result,), _ = xmlrpc.client.loads(dispatcher._marshaled_dispatch(request))
+    assert list(get_version()) == result
+
+
+@pytest.mark.parametrize("path", ["xxx", "tcms.xmlrpc.api.version.xxx", "tcms.xxx.yyy"])
+def test_register_invalid_path(path):
+    dispatcher = LazyXMLRPCDispatcher([(path, "XXX")])
+    with pytest.raises(ImproperlyConfigured):
+        dispatcher.get_function("XXX.get")
+
+
+def test_api_module_is_wrapped_on_import():
+    from tcms.xmlrpc.api import version
+
+    assert version._xmlrpc_apis_wrapped
+
+
+@pytest.mark.django_db
+def test_list_methods_page(client):
+    response = client.get("/xmlrpc/")
+    assert b"TestCase.filter" in response.content
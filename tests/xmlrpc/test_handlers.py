@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+import gzip
+import json
+import xmlrpc.client
+import zlib
+from http import HTTPStatus
+
+import pytest
+from django import test
+from django.http import HttpResponse
+from django.urls import reverse
+
+from tcms.core.data_versions import bump_data_version
+from tcms.xmlrpc.handlers import compress_response, get_accepted_encoding
+from tests import factories as f
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected",
+    [
+        ["", None],
+        ["br", None],
+        ["gzip", "gzip"],
+        ["deflate, gzip;q=0.5", "gzip"],
+        ["gzip;q=0, deflate", "deflate"],
+        ["gzip;q=0", None],
+        ["GZIP ; q=1.0", "gzip"],
+        ["gzip;q=x, deflate", "deflate"],
+    ],
+)
+def test_get_accepted_encoding(accept_encoding, expected, rf):
+    request = rf.post("/xmlrpc/", HTTP_ACCEPT_ENCODING=accept_encoding)
+    assert expected == get_accepted_encoding(request)
+
+
+@pytest.mark.parametrize(
+    "content,expected",
+    [
+        [b"a" * 100, None],
+        [b"a" * 1000, "gzip"],
+        # Not compressed if the compressed content is not shorter.
+        [bytes(range(256)), None],
+    ],
+)
+def test_compress_response(content, expected, rf):
+    request = rf.post("/xmlrpc/", HTTP_ACCEPT_ENCODING="gzip")
+    response = compress_response(request, HttpResponse(content))
+    assert expected == response.get("Content-Encoding")
+    assert "Accept-Encoding" == response["Vary"]
+
+
+class TestResponseCompression(test.TestCase):
+    """Test compressing RPC responses"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(10):
+            f.ProductFactory(name=f"product {i}")
+
+    def call_xmlrpc(self, **headers):
+        body = xmlrpc.client.dumps(({"name__startswith": "product"},), "Product.filter")
+        return self.client.post("/xmlrpc/", body, content_type="text/xml", **headers)
+
+    def test_gzip(self):
+        resp = self.call_xmlrpc(HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual("gzip", resp["Content-Encoding"])
+        self.assertIn("Accept-Encoding", resp["Vary"])
+        self.assertEqual(str(len(resp.content)), resp["Content-Length"])
+        result, _ = xmlrpc.client.loads(gzip.decompress(resp.content))
+        self.assertEqual(10, len(result[0]))
+
+    def test_deflate(self):
+        resp = self.call_xmlrpc(HTTP_ACCEPT_ENCODING="deflate")
+        self.assertEqual("deflate", resp["Content-Encoding"])
+        result, _ = xmlrpc.client.loads(zlib.decompress(resp.content))
+        self.assertEqual(10, len(result[0]))
+
+    def test_not_compressed(self):
+        resp = self.call_xmlrpc()
+        self.assertFalse(resp.has_header("Content-Encoding"))
+        xmlrpc.client.loads(resp.content)
+
+    @test.override_settings(XMLRPC_RESPONSE_COMPRESSION=False)
+    def test_disabled(self):
+        resp = self.call_xmlrpc(HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(resp.has_header("Content-Encoding"))
+
+    def test_jsonrpc(self):
+        resp = self.client.post(
+            reverse("jsonrpc"),
+            json.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "Product.filter",
+                    "params": [{"name__startswith": "product"}],
+                    "id": 1,
+                }
+            ),
+            content_type="application/json",
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+        self.assertEqual("gzip", resp["Content-Encoding"])
+        self.assertEqual(10, len(json.loads(gzip.decompress(resp.content))["result"]))
+
+
+@test.override_settings(XMLRPC_CONDITIONAL_RESPONSE=True)
+class TestConditionalResponse(test.TestCase):
+    """Test ETag and If-None-Match of RPC calls"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.product = f.ProductFactory(name="nitrate")
+
+    def call_xmlrpc(self, method, *args, **headers):
+        body = xmlrpc.client.dumps(args, method)
+        return self.client.post("/xmlrpc/", body, content_type="text/xml", **headers)
+
+    def test_not_modified(self):
+        resp = self.call_xmlrpc("Product.filter", {"name": "nitrate"})
+        etag = resp["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+
+        resp = self.call_xmlrpc("Product.filter", {"name": "nitrate"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(HTTPStatus.NOT_MODIFIED, resp.status_code)
+        self.assertEqual(b"", resp.content)
+        self.assertEqual(etag, resp["ETag"])
+
+    def test_modified(self):
+        etag = self.call_xmlrpc("Product.filter", {"name": "nitrate"})["ETag"]
+        bump_data_version("management")
+        resp = self.call_xmlrpc("Product.filter", {"name": "nitrate"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(HTTPStatus.OK, resp.status_code)
+        self.assertNotEqual(etag, resp["ETag"])
+
+    def test_etag_depends_on_arguments(self):
+        etag1 = self.call_xmlrpc("Product.filter", {"name": "nitrate"})["ETag"]
+        etag2 = self.call_xmlrpc("Product.filter", {"name": "xxx"})["ETag"]
+        self.assertNotEqual(etag1, etag2)
+
+    def test_no_etag_for_other_methods(self):
+        for method, args in (
+            ("Product.check_product", ("nitrate",)),
+            ("Unknown.get", ()),
+        ):
+            resp = self.call_xmlrpc(method, *args)
+            self.assertFalse(resp.has_header("ETag"))
+
+    def test_no_etag_for_faults(self):
+        resp = self.call_xmlrpc("Product.get_unknown")
+        self.assertEqual(HTTPStatus.OK, resp.status_code)
+        self.assertRaises(xmlrpc.client.Fault, xmlrpc.client.loads, resp.content)
+        self.assertFalse(resp.has_header("ETag"))
+
+        payload = json.dumps({"jsonrpc": "2.0", "method": "Product.get_unknown", "id": 1})
+        resp = self.client.post(reverse("jsonrpc"), payload, content_type="application/json")
+        self.assertIn("error", json.loads(resp.content))
+        self.assertFalse(resp.has_header("ETag"))
+
+    def test_jsonrpc(self):
+        payload = json.dumps({"jsonrpc": "2.0", "method": "Version.get", "id": 1})
+        url = reverse("jsonrpc")
+        etag = self.client.post(url, payload, content_type="application/json")["ETag"]
+        resp = self.client.post(
+            url, payload, content_type="application/json", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(HTTPStatus.NOT_MODIFIED, resp.status_code)
+
+        # Batch is not conditional
+        resp = self.client.post(url, f"[{payload}]", content_type="application/json")
+        self.assertFalse(resp.has_header("ETag"))
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+import json
+from datetime import date, datetime, timedelta
+from http import HTTPStatus
+
+import pytest
+from django import test
+from django.urls import reverse
+
+from tcms.xmlrpc import get_version
+from tcms.xmlrpc.jsonrpc import INVALID_REQUEST, METHOD_NOT_FOUND, PARSE_ERROR, dumps
+from tests import factories as f
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        [datetime(2024, 1, 2, 3, 4, 5), "2024-01-02 03:04:05"],
+        [timedelta(hours=1, minutes=30), "01:30:00"],
+        [date(2024, 1, 2), "2024-01-02"],
+        [{1: {"a"}}, {"1": ["a"]}],
+        ["名字".encode("utf-8"), "名字"],
+    ],
+)
+def test_dumps(value, expected):
+    assert expected == json.loads(dumps(value))
+
+
+class TestJSONRPCHandler(test.TestCase):
+    """Test the JSON-RPC endpoint"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.product = f.ProductFactory(name="nitrate")
+        cls.url = reverse("jsonrpc")
+
+    def call(self, payload, raw=False):
+        return self.client.post(
+            self.url, payload if raw else json.dumps(payload), content_type="application/json"
+        )
+
+    def test_call_method(self):
+        resp = self.call({"jsonrpc": "2.0", "method": "Version.get", "params": [], "id": 1})
+        self.assertEqual(HTTPStatus.OK, resp.status_code)
+        self.assertEqual("application/json", resp["Content-Type"])
+        self.assertEqual(
+            {"jsonrpc": "2.0", "result": list(get_version()), "id": 1}, json.loads(resp.content)
+        )
+
+    def test_call_with_named_params(self):
+        resp = self.call(
+            {
+                "jsonrpc": "2.0",
+                "method": "Product.check_product",
+                "params": {"name": "nitrate"},
+                "id": "a",
+            }
+        )
+        data = json.loads(resp.content)
+        self.assertEqual("a", data["id"])
+        self.assertEqual(self.product.pk, data["result"]["id"])
+
+    def test_fault_is_returned_as_error(self):
+        resp = self.call({"jsonrpc": "2.0", "method": "Product.get", "params": [999999], "id": 1})
+        data = json.loads(resp.content)
+        self.assertEqual(HTTPStatus.NOT_FOUND, data["error"]["code"])
+        self.assertNotIn("result", data)
+
+    def test_method_not_found(self):
+        resp = self.call({"jsonrpc": "2.0", "method": "Product.xxx", "id": 1})
+        self.assertEqual(METHOD_NOT_FOUND, json.loads(resp.content)["error"]["code"])
+
+    def test_parse_error(self):
+        resp = self.call("{", raw=True)
+        data = json.loads(resp.content)
+        self.assertEqual(PARSE_ERROR, data["error"]["code"])
+        self.assertIsNone(data["id"])
+
+    def test_invalid_request(self):
+        for payload in (
+            {"method": "Version.get", "id": 1},
+            {"jsonrpc": "2.0", "method": 1, "id": 1},
+            {"jsonrpc": "2.0", "method": "Version.get", "params": 1, "id": 1},
+            [],
+        ):
+            resp = self.call(payload)
+            self.assertEqual(INVALID_REQUEST, json.loads(resp.content)["error"]["code"])
+
+    def test_batch(self):
+        resp = self.call(
+            [
+                {"jsonrpc": "2.0", "method": "Version.get", "id": 1},
+                {"jsonrpc": "2.0", "method": "Version.get"},
+                {"jsonrpc": "2.0", "method": "Product.get", "params": [999999], "id": 2},
+                1,
+            ]
+        )
+        data = json.loads(resp.content)
+        self.assertEqual(3, len(data))
+        self.assertEqual(list(get_version()), data[0]["result"])
+        self.assertEqual(HTTPStatus.NOT_FOUND, data[1]["error"]["code"])
+        self.assertEqual(INVALID_REQUEST, data[2]["error"]["code"])
+
+    def test_notifications_only(self):
+        resp = self.call(
+            [
+                {"jsonrpc": "2.0", "method": "Version.get"},
+                {"jsonrpc": "2.0", "method": "Version.get"},
+            ]
+        )
+        self.assertEqual(HTTPStatus.NO_CONTENT, resp.status_code)
+
+    def test_get_is_not_allowed(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(HTTPStatus.METHOD_NOT_ALLOWED, resp.status_code)
@@ -45,6 +45,19 @@ class TestXMLSerializer(test.TestCase):
         self.assertEqual(self.testcase.alias, result["alias"])
         self.assertEqual(self.testcase.arguments, result["arguments"])
 
+    def test_serialize_model_with_fields(self):
+        serializer = XMLRPCSerializer(model=TestCase.objects.get(pk=self.testcase.pk))
+
+        # Only the components are queried.
+        with self.assertNumQueries(1):
+            result = serializer.serialize_model(fields=["summary", "category_id", "component"])
+
+        self.assertEqual({"summary", "category_id", "component"}, set(result))
+        self.assertEqual(self.testcase.category.pk, result["category_id"])
+        self.assertEqual(
+            sorted(c.pk for c in self.testcase.component.all()), sorted(result["component"])
+        )
+
 
 class TestUtilityMethods(unittest.TestCase):
     def test_datetime_to_str(self):
@@ -275,6 +288,42 @@ class TestQuerySetBasedSerializer(test.TestCase):
             self.assertEqual(expected_plan.product_version_id, plan["product_version_id"])
             self.assertEqual(encode(expected_plan.product_version.value), plan["product_version"])
 
+    def test_serialize_queryset_with_fields(self):
+        serializer = MockTestPlanSerializer(
+            TestPlan, self.plans, fields=["name", "case", "default_product_version"]
+        )
+
+        # One query for plans and the other one for cases.
+        with self.assertNumQueries(2):
+            serialize_result = serializer.serialize_queryset()
+
+        self.assertEqual(len(self.plans), len(serialize_result))
+        for plan, expected_plan in zip(serialize_result, self.plans.order_by("pk")):
+            self.assertEqual({"name", "case", "default_product_version"}, set(plan))
+            self.assertEqual(expected_plan.name, plan["name"])
+            self.assertEqual(
+                sorted(case.pk for case in expected_plan.case.all()), sorted(plan["case"])
+            )
+            self.assertEqual(
+                encode(expected_plan.product_version.value), plan["default_product_version"]
+            )
+
+    def test_serialize_queryset_without_m2m_fields(self):
+        serializer = MockTestPlanSerializer(TestPlan, self.plans, fields=["plan_id", "unknown"])
+        with self.assertNumQueries(1):
+            serialize_result = serializer.serialize_queryset()
+        self.assertEqual(
+            [{"plan_id": plan.pk} for plan in self.plans.order_by("pk")], serialize_result
+        )
+
+    def test_serialize_queryset_without_known_fields(self):
+        for fields in ([], ["unknown"]):
+            serializer = MockTestPlanSerializer(TestPlan, self.plans, fields=fields)
+            with self.assertNumQueries(0):
+                self.assertRaisesRegex(
+                    ValueError, "None of the requested fields", serializer.serialize_queryset
+                )
+
     def test_serialize_queryset_with_empty_querset(self):
         cases = self.cases.filter(pk__lt=0)
         serializer = MockTestCaseSerializer(TestCase, cases)
@@ -293,6 +293,20 @@ class TestAttachIssue(XmlrpcAPIBaseTest):
         self.assertIsNotNone(issue)
         self.assertEqual("abc", issue.summary)
 
+    def test_skip_issue_added_already(self):
+        f.IssueFactory(issue_key="123456", tracker=self.tracker, case=self.case)
+        XmlrpcTestCase.attach_issue(
+            self.request,
+            [
+                {"case": self.case.pk, "issue_key": "123456", "tracker": self.tracker.pk},
+                {"case": self.case.pk, "issue_key": "789012", "tracker": self.tracker.pk},
+            ],
+        )
+        self.assertEqual(
+            ["123456", "789012"],
+            sorted(Issue.objects.filter(case=self.case).values_list("issue_key", flat=True)),
+        )
+
     def test_nonexisting_case_id(self):
         self.assertXmlrpcFaultBadRequest(
             XmlrpcTestCase.attach_issue,
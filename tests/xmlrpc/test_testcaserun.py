@@ -2,13 +2,20 @@
 
 import unittest
 from datetime import datetime
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django_comments.models import Comment
 
 from tcms.issuetracker.models import Issue
 from tcms.linkreference.models import LinkReference
+from tcms.logs.models import TCMSLogModel
 from tcms.testruns.models import TestCaseRunStatus
 from tcms.xmlrpc.api import testcaserun
 from tests import encode
 from tests import factories as f
+from tests import user_should_have_perm
 from tests.xmlrpc.utils import XmlrpcAPIBaseTest, make_http_request
 
 
@@ -1180,3 +1187,210 @@ class TestCaseRunUpdate(XmlrpcAPIBaseTest):
             self.case_run_1.pk,
             {"notes": "AAAA"},
         )
+
+
+class TestReportResults(XmlrpcAPIBaseTest):
+    """Test testcaserun.report_results"""
+
+    permission = "testruns.change_testcaserun"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        user_should_have_perm(cls.tester, "issuetracker.add_issue")
+        cls.request.META["REMOTE_ADDR"] = "127.0.0.1"
+
+        cls.tracker = f.IssueTrackerFactory()
+        cls.case_run_1 = f.TestCaseRunFactory()
+        cls.case_run_2 = f.TestCaseRunFactory(run=cls.case_run_1.run)
+        cls.case_run_3 = f.TestCaseRunFactory(run=cls.case_run_1.run, notes="old notes")
+        cls.status_passed = TestCaseRunStatus.objects.get(name="PASSED")
+        cls.status_failed = TestCaseRunStatus.objects.get(name="FAILED")
+
+    def test_report_results(self):
+        result = testcaserun.report_results(
+            self.request,
+            [
+                {
+                    "case_run_id": self.case_run_1.pk,
+                    "status": "PASSED",
+                    "logs": [{"name": "console", "url": "http://localhost/job/1/console"}],
+                },
+                {
+                    "case_run_id": self.case_run_2.pk,
+                    "status": self.status_failed.pk,
+                    "comment": "Timeout",
+                    "issues": [{"issue_key": "1000", "tracker": self.tracker.pk}],
+                },
+                {"case_run_id": self.case_run_3.pk, "notes": "new notes"},
+            ],
+        )
+
+        self.assertEqual(
+            [
+                {"case_run_id": self.case_run_1.pk, "ok": True},
+                {"case_run_id": self.case_run_2.pk, "ok": True},
+                {"case_run_id": self.case_run_3.pk, "ok": True},
+            ],
+            result,
+        )
+
+        self.case_run_1.refresh_from_db()
+        self.assertEqual(self.status_passed, self.case_run_1.case_run_status)
+        self.assertEqual(self.tester, self.case_run_1.tested_by)
+        self.assertIsNotNone(self.case_run_1.close_date)
+        self.assertEqual(
+            ["http://localhost/job/1/console"],
+            [link.url for link in LinkReference.get_from(self.case_run_1)],
+        )
+
+        self.case_run_2.refresh_from_db()
+        self.assertEqual(self.status_failed, self.case_run_2.case_run_status)
+        self.assertTrue(
+            Issue.objects.filter(
+                issue_key="1000", case=self.case_run_2.case, case_run=self.case_run_2
+            ).exists()
+        )
+        self.assertEqual(
+            ["Timeout"],
+            [c.comment for c in Comment.objects.for_model(self.case_run_2)],
+        )
+
+        self.case_run_3.refresh_from_db()
+        self.assertEqual("new notes", self.case_run_3.notes)
+        self.assertEqual(
+            [("notes", "old notes", "new notes")],
+            list(
+                TCMSLogModel.objects.for_model(self.case_run_3).values_list(
+                    "field", "original_value", "new_value"
+                )
+            ),
+        )
+        self.assertEqual(
+            {"case_run_status", "close_date", "tested_by"},
+            set(TCMSLogModel.objects.for_model(self.case_run_1).values_list("field", flat=True)),
+        )
+
+    @patch("tcms.xmlrpc.api.testcaserun.mark_runs_dirty")
+    def test_mark_runs_dirty(self, mark_runs_dirty):
+        testcaserun.report_results(
+            self.request, [{"case_run_id": self.case_run_3.pk, "notes": "new notes"}]
+        )
+        mark_runs_dirty.assert_not_called()
+
+        testcaserun.report_results(
+            self.request,
+            [
+                {"case_run_id": self.case_run_1.pk, "status": "PASSED"},
+                {"case_run_id": self.case_run_2.pk, "status": "FAILED", "notes": "timeout"},
+            ],
+        )
+        mark_runs_dirty.assert_called_once_with({self.case_run_1.run_id})
+
+    def test_number_of_queries_does_not_grow_with_results(self):
+        case_runs = [f.TestCaseRunFactory(run=self.case_run_1.run) for _ in range(5)]
+
+        def report(case_runs):
+            return testcaserun.report_results(
+                self.request,
+                [
+                    {"case_run_id": case_run.pk, "status": "FAILED", "notes": "timeout"}
+                    for case_run in case_runs
+                ],
+            )
+
+        # Permissions and content type are cached by the first call.
+        report(case_runs[:1])
+        with CaptureQueriesContext(connection) as context:
+            report(case_runs[1:2])
+        with self.assertNumQueries(len(context.captured_queries)):
+            report(case_runs[2:])
+
+    def test_skip_invalid_results(self):
+        result = testcaserun.report_results(
+            self.request,
+            [
+                {"case_run_id": 999999, "status": "PASSED"},
+                {"case_run_id": self.case_run_1.pk, "status": "XXX"},
+                {
+                    "case_run_id": self.case_run_2.pk,
+                    "issues": [{"issue_key": "abc", "tracker": self.tracker.pk}],
+                },
+                {"case_run_id": self.case_run_3.pk, "logs": [{"name": "log", "url": "xxx"}]},
+                {"case_run_id": self.case_run_3.pk, "status": "PASSED"},
+            ],
+        )
+
+        self.assertEqual([False, False, False, False, True], [item["ok"] for item in result])
+        self.assertIn("does not exist", result[0]["error"])
+        self.assertIn("XXX", result[1]["error"])
+        self.assertIn("wrong format", result[2]["error"])
+        self.assertIn("not valid", result[3]["error"])
+
+        self.case_run_1.refresh_from_db()
+        self.assertNotEqual(self.status_passed, self.case_run_1.case_run_status)
+        self.assertFalse(Issue.objects.filter(case_run=self.case_run_2).exists())
+        self.case_run_3.refresh_from_db()
+        self.assertEqual(self.status_passed, self.case_run_3.case_run_status)
+
+    def test_skip_malformed_results(self):
+        result = testcaserun.report_results(
+            self.request,
+            [
+                {"case_run_id": [self.case_run_1.pk], "status": "PASSED"},
+                {"case_run_id": {"id": self.case_run_1.pk}, "status": "PASSED"},
+                {"case_run_id": self.case_run_1.pk, "status": ["PASSED"]},
+                {"case_run_id": self.case_run_1.pk, "issues": {"issue_key": "1000"}},
+                {"case_run_id": self.case_run_1.pk, "logs": "http://localhost/"},
+                {
+                    "case_run_id": self.case_run_1.pk,
+                    "issues": [{"issue_key": "1000", "tracker": [self.tracker.pk]}],
+                },
+                {"case_run_id": self.case_run_2.pk, "status": "PASSED", "issues": None},
+                {"case_run_id": self.case_run_3.pk, "status": "PASSED", "logs": None},
+            ],
+        )
+
+        self.assertEqual(
+            [False, False, False, False, False, False, True, True],
+            [item["ok"] for item in result],
+        )
+        self.assertIn("does not exist", result[0]["error"])
+        self.assertIn("does not exist", result[1]["error"])
+        self.assertIn("does not exist", result[2]["error"])
+        self.assertEqual("Issues must be a list.", result[3]["error"])
+        self.assertEqual("Log links must be a list.", result[4]["error"])
+        self.assertIn("does not exist", result[5]["error"])
+
+        for case_run in (self.case_run_1, self.case_run_2, self.case_run_3):
+            case_run.refresh_from_db()
+        self.assertNotEqual(self.status_passed, self.case_run_1.case_run_status)
+        self.assertEqual(self.status_passed, self.case_run_2.case_run_status)
+        self.assertEqual(self.status_passed, self.case_run_3.case_run_status)
+
+    def test_skip_existing_issues(self):
+        results = [
+            {
+                "case_run_id": self.case_run_1.pk,
+                "issues": [{"issue_key": "2000", "tracker": self.tracker.pk}],
+            }
+        ]
+        testcaserun.report_results(self.request, results)
+        testcaserun.report_results(self.request, results)
+        self.assertEqual(1, Issue.objects.filter(issue_key="2000").count())
+
+    def test_add_issues_without_permission(self):
+        request = make_http_request(user_perm=self.permission)
+        self.assertXmlrpcFaultForbidden(
+            testcaserun.report_results,
+            request,
+            [
+                {
+                    "case_run_id": self.case_run_1.pk,
+                    "issues": [{"issue_key": "1000", "tracker": self.tracker.pk}],
+                }
+            ],
+        )
+
+    def test_results_must_be_a_list(self):
+        self.assertXmlrpcFaultBadRequest(testcaserun.report_results, self.request, {})
@@ -75,6 +75,31 @@ class TestFilter(XmlrpcAPIBaseTest):
         self.assertEqual([self.case_1.pk, self.case_2.pk], plan["case"])
         self.assertEqual(0, len(plans[1]["case"]))
 
+    def test_filter_plans_with_fields(self):
+        plans = XmlrpcTestPlan.filter(
+            self.request, {"pk__in": [self.plan_1.pk, self.plan_2.pk]}, ["plan_id", "case"]
+        )
+        self.assertEqual(
+            [
+                {"plan_id": self.plan_1.pk, "case": [self.case_1.pk, self.case_2.pk]},
+                {"plan_id": self.plan_2.pk, "case": []},
+            ],
+            plans,
+        )
+
+    def test_get_plan_with_fields(self):
+        plan = XmlrpcTestPlan.get(
+            self.request, self.plan_1.pk, ["name", "default_product_version", "tag"]
+        )
+        self.assertEqual(
+            {
+                "name": self.plan_1.name,
+                "default_product_version": self.version.value,
+                "tag": [],
+            },
+            plan,
+        )
+
     def test_filter_out_all_plans(self):
         plans_total = TestPlan.objects.all().count()
         self.assertEqual(plans_total, len(XmlrpcTestPlan.filter(None)))